@@ -0,0 +1,55 @@
+# Firestore 대량 쓰기 처리량 벤치마크
+"""
+FakeFirestore에 커밋 1회당 왕복 지연(--latency)을 주고
+firestore_bulk.commit_ops의 스레드 수별 처리량(문서/초)을 비교한다.
+
+    python benchmarks/bench_bulk_write.py --docs 20000 --latency 0.05 --workers 1,2,4,8,16
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import firestore_bulk  # noqa: E402
+from fake_firestore import FakeFirestore  # noqa: E402
+
+
+def run(docs, latency, workers):
+    client = FakeFirestore(commit_latency=latency)
+    ops = [
+        ('set', client.collection('roll_inventory').document(f"R-{i:06d}"), {'현재고_롤': i % 50})
+        for i in range(docs)
+    ]
+    t0 = time.perf_counter()
+    results = firestore_bulk.commit_ops(client, ops, max_workers=workers)
+    seconds = time.perf_counter() - t0
+    return {
+        'workers': workers,
+        'chunks': len(results),
+        'seconds': round(seconds, 3),
+        'docs_per_sec': round(docs / seconds, 1),
+        'writes': client.writes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--latency', type=float, default=0.05, help='커밋 1회 왕복 지연(초)')
+    parser.add_argument('--workers', default='1,2,4,8,16')
+    args = parser.parse_args()
+
+    report = {
+        'docs': args.docs,
+        'latency': args.latency,
+        'runs': [run(args.docs, args.latency, int(w)) for w in args.workers.split(',')],
+    }
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+# 거래 기록 사용량 쿼리 벤치마크 (인덱스 마이그레이션 전/후)
+"""
+임시 SQLite DB에 거래 기록을 채운 뒤, 마이그레이션이 만든 transactions 인덱스를 적용하기 전과 후의
+월별 사용량 쿼리 지연 시간을 비교한다.
+
+    python benchmarks/bench_usage_query.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import db_functions  # noqa: E402
+
+ITEM_QUERY = (
+    "SELECT SUM(-delta) FROM transactions "
+    "WHERE item_type = ? AND item_id = ? AND delta < 0 AND timestamp >= ? AND timestamp < ?"
+)
+BULK_QUERY = (
+    "SELECT item_id, SUM(-delta) FROM transactions "
+    "WHERE item_type = ? AND delta < 0 AND timestamp >= ? AND timestamp < ? GROUP BY item_id"
+)
+
+
+def fill_ledger(conn, rows, items, days):
+    """rows건의 임의 거래 기록 생성"""
+    start = datetime.now() - timedelta(days=days)
+    rng = random.Random(42)
+    batch = []
+    for _ in range(rows):
+        item_type = rng.choice(('roll', 'cut'))
+        ts = start + timedelta(seconds=rng.randrange(days * 86400))
+        batch.append((
+            item_type, f"{item_type[0].upper()}-{rng.randrange(items):05d}",
+            float(rng.choice((-3, -2, -1, 1, 2, 5))), '', ts.strftime("%Y-%m-%d %H:%M:%S")
+        ))
+    conn.executemany("INSERT INTO transactions (item_type, item_id, delta, note, timestamp) VALUES (?, ?, ?, ?, ?)", batch)
+    conn.commit()
+
+
+def ledger_indexes(conn):
+    """transactions 테이블의 인덱스 [(이름, CREATE 문)] (sqlite_master 기준, 자동 인덱스 제외)"""
+    return conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions' AND sql IS NOT NULL"
+    ).fetchall()
+
+
+def time_query(conn, sql, params_list):
+    """쿼리별 지연 시간(ms) 목록"""
+    timings = []
+    for params in params_list:
+        t0 = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return timings
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        'p50_ms': round(timings[len(timings) // 2], 3),
+        'p95_ms': round(timings[int(len(timings) * 0.95) - 1], 3),
+        'max_ms': round(timings[-1], 3),
+    }
+
+
+def run(rows, items, days, repeat):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_functions.DB_PATH = os.path.join(tmp, 'bench.db')
+        db_functions.init_db()
+        conn = db_functions.get_connection()
+
+        # 인덱스 적용 전 상태로 되돌림 (마이그레이션이 만든 transactions 인덱스 제거)
+        indexes = ledger_indexes(conn)
+        for name, _ in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+        conn.commit()
+
+        fill_ledger(conn, rows, items, days)
+
+        now = datetime.now()
+        month_start = datetime(now.year, now.month, 1).strftime("%Y-%m-%d %H:%M:%S")
+        month_end = (datetime(now.year, now.month, 28) + timedelta(days=4)).replace(day=1).strftime("%Y-%m-%d %H:%M:%S")
+        rng = random.Random(7)
+        item_params = [('roll', f"R-{rng.randrange(items):05d}", month_start, month_end) for _ in range(repeat)]
+        bulk_params = [('roll', month_start, month_end)] * max(3, repeat // 10)
+
+        result = {'rows': rows, 'items': items, 'days': days}
+        result['before'] = {
+            'item_usage': summarize(time_query(conn, ITEM_QUERY, item_params)),
+            'bulk_usage': summarize(time_query(conn, BULK_QUERY, bulk_params)),
+        }
+
+        t0 = time.perf_counter()
+        for _, sql in indexes:
+            conn.execute(sql)
+        conn.commit()
+        result['index_ms'] = round((time.perf_counter() - t0) * 1000, 1)
+        result['indexes'] = [name for name, _ in indexes]
+
+        result['after'] = {
+            'item_usage': summarize(time_query(conn, ITEM_QUERY, item_params)),
+            'bulk_usage': summarize(time_query(conn, BULK_QUERY, bulk_params)),
+        }
+        result['plan_after'] = [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + ITEM_QUERY, item_params[0])]
+        db_functions.close_connection()
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=200000, help='거래 기록 건수')
+    parser.add_argument('--items', type=int, default=2000, help='품목 수')
+    parser.add_argument('--days', type=int, default=365 * 3, help='기록 기간(일)')
+    parser.add_argument('--repeat', type=int, default=50, help='쿼리 반복 횟수')
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.items, args.days, args.repeat), ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,423 @@
+# 프로세스 내 Firestore 대역 (벤치마크용)
+"""
+firebase_db가 사용하는 Firestore API 일부를 dict로 흉내 낸다.
+네트워크 지연은 없고, 대신 문서 읽기/쓰기 횟수를 세어 비용(과금 단위)을 비교한다.
+
+    client = FakeFirestore()
+    with installed(client):
+        firebase_db.load_roll_inventory()
+    print(client.reads, client.writes)
+"""
+import math
+import operator
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+MAX_BATCH_WRITES = 500
+
+_OPS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda a, b: a in b,
+    'not-in': lambda a, b: a not in b,
+    'array_contains': lambda a, b: isinstance(a, list) and b in a,
+}
+
+
+class Increment:
+    def __init__(self, value):
+        self.value = value
+
+
+SERVER_TIMESTAMP = object()
+
+
+def _resolve(current, value):
+    """Increment/SERVER_TIMESTAMP 센티널 처리"""
+    if isinstance(value, Increment):
+        return (current or 0) + value.value
+    if value is SERVER_TIMESTAMP:
+        return datetime.now(timezone.utc)
+    return value
+
+
+def _apply(store, path, data, merge=False, update=False):
+    collection, doc_id = path
+    docs = store.setdefault(collection, {})
+    if update and doc_id not in docs:
+        raise KeyError(f"No document to update: {collection}/{doc_id}")
+    base = dict(docs.get(doc_id, {})) if (merge or update) else {}
+    for key, value in data.items():
+        base[key] = _resolve(base.get(key), value)
+    docs[doc_id] = base
+
+
+class DocumentSnapshot:
+    def __init__(self, reference, data, fields=None):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+        self._fields = fields
+
+    def to_dict(self):
+        if self._data is None:
+            return None
+        data = dict(self._data)
+        if self._fields is not None:
+            data = {k: v for k, v in data.items() if k in self._fields}
+        return data
+
+    def get(self, field):
+        return (self._data or {}).get(field)
+
+
+class DocumentReference:
+    def __init__(self, client, collection, doc_id):
+        self._client = client
+        self.collection_name = collection
+        self.id = doc_id
+        self.path = f"{collection}/{doc_id}"
+
+    @property
+    def parent(self):
+        return CollectionReference(self._client, self.collection_name)
+
+    def _key(self):
+        return self.collection_name, self.id
+
+    def get(self, transaction=None):
+        with self._client._lock:
+            self._client.reads += 1
+            data = self._client._store.get(self.collection_name, {}).get(self.id)
+            return DocumentSnapshot(self, dict(data) if data is not None else None)
+
+    def set(self, data, merge=False):
+        with self._client._lock:
+            self._client.writes += 1
+            _apply(self._client._store, self._key(), data, merge=merge)
+            self._client._notify([self])
+
+    def update(self, data):
+        with self._client._lock:
+            self._client.writes += 1
+            _apply(self._client._store, self._key(), data, update=True)
+            self._client._notify([self])
+
+    def delete(self):
+        with self._client._lock:
+            self._client.writes += 1
+            self._client._store.get(self.collection_name, {}).pop(self.id, None)
+            self._client._notify([self])
+
+
+class Query:
+    ASCENDING = 'ASCENDING'
+    DESCENDING = 'DESCENDING'
+
+    def __init__(self, client, collection, filters=(), orders=(), limit=None, fields=None, cursor=None):
+        self._client = client
+        self._collection = collection
+        self._filters = tuple(filters)
+        self._orders = tuple(orders)
+        self._limit = limit
+        self._fields = fields
+        self._cursor = cursor
+
+    def _copy(self, **changes):
+        args = dict(filters=self._filters, orders=self._orders, limit=self._limit,
+                    fields=self._fields, cursor=self._cursor)
+        args.update(changes)
+        return Query(self._client, self._collection, **args)
+
+    def where(self, field, op, value):
+        return self._copy(filters=self._filters + ((field, op, value),))
+
+    def order_by(self, field, direction=ASCENDING):
+        return self._copy(orders=self._orders + ((field, direction),))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def select(self, fields):
+        return self._copy(fields=set(fields))
+
+    def start_after(self, document):
+        return self._copy(cursor=document)
+
+    def _value(self, doc_id, data, field):
+        return doc_id if field == '__name__' else data.get(field)
+
+    def _matches(self, doc_id, data):
+        for field, op, value in self._filters:
+            current = self._value(doc_id, data, field)
+            if current is None and field != '__name__':
+                return False
+            if not _OPS[op](current, value):
+                return False
+        return True
+
+    def _order_key(self, doc_id, data):
+        return tuple(self._value(doc_id, data, f) for f, _ in self._orders)
+
+    def _results(self):
+        docs = self._client._store.get(self._collection, {})
+        rows = [(doc_id, data) for doc_id, data in docs.items() if self._matches(doc_id, data)]
+        # 부등호 필터 필드는 정렬 기준에 없으면 문서 ID 순으로 둔다 (실제 Firestore와 결과 집합은 같음)
+        rows.sort(key=lambda r: r[0])
+        if self._orders:
+            descending = self._orders[0][1] == Query.DESCENDING
+            rows.sort(key=lambda r: self._order_key(*r), reverse=descending)
+            if self._cursor is not None:
+                if isinstance(self._cursor, DocumentSnapshot):
+                    cursor = self._order_key(self._cursor.id, self._cursor._data or {})
+                else:
+                    cursor = tuple(self._cursor.get(f) for f, _ in self._orders)
+                after = operator.lt if descending else operator.gt
+                rows = [r for r in rows if after(self._order_key(*r), cursor)]
+        if self._limit is not None:
+            rows = rows[:self._limit]
+        return rows
+
+    def stream(self, transaction=None):
+        with self._client._lock:
+            rows = self._results()
+            # 결과가 없어도 쿼리 1회는 읽기 1건으로 과금된다
+            self._client.reads += max(1, len(rows))
+            snapshots = [
+                DocumentSnapshot(DocumentReference(self._client, self._collection, doc_id),
+                                 dict(data), self._fields)
+                for doc_id, data in rows
+            ]
+        return iter(snapshots)
+
+    def get(self, transaction=None):
+        return list(self.stream(transaction))
+
+    def count(self, alias=None):
+        return AggregationQuery(self).count(alias)
+
+    def sum(self, field, alias=None):
+        return AggregationQuery(self).sum(field, alias)
+
+
+class AggregationResult:
+    def __init__(self, alias, value):
+        self.alias = alias
+        self.value = value
+
+
+class AggregationQuery:
+    """count()/sum() 집계 쿼리: 문서를 돌려주지 않고 색인 1천 건당 읽기 1건으로 과금"""
+
+    def __init__(self, query):
+        self._query = query
+        self._aggregations = []
+
+    def count(self, alias=None):
+        self._aggregations.append(('count', None, alias or f'field_{len(self._aggregations) + 1}'))
+        return self
+
+    def sum(self, field, alias=None):
+        self._aggregations.append(('sum', field, alias or f'field_{len(self._aggregations) + 1}'))
+        return self
+
+    def get(self, transaction=None):
+        client = self._query._client
+        with client._lock:
+            rows = self._query._results()
+            client.reads += max(1, math.ceil(len(rows) / 1000))
+        results = []
+        for kind, field, alias in self._aggregations:
+            if kind == 'count':
+                value = len(rows)
+            else:
+                value = sum(data[field] for _, data in rows if isinstance(data.get(field), (int, float)))
+            results.append(AggregationResult(alias, value))
+        return [results]
+
+
+class CollectionReference(Query):
+    def __init__(self, client, name):
+        super().__init__(client, name)
+        self.id = name
+
+    def document(self, doc_id=None):
+        return DocumentReference(self._client, self._collection, doc_id or uuid.uuid4().hex[:20])
+
+    def on_snapshot(self, callback):
+        """실시간 리스너: 등록 즉시 전체 문서를 ADDED로, 이후 쓰기마다 변경분을 전달 (동기 호출)"""
+        return self._client._listen(self._collection, callback)
+
+
+class WriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def set(self, reference, data, merge=False):
+        self._ops.append(('set', reference, data, merge))
+
+    def update(self, reference, data):
+        self._ops.append(('update', reference, data, False))
+
+    def delete(self, reference):
+        self._ops.append(('delete', reference, None, False))
+
+    def __len__(self):
+        return len(self._ops)
+
+    def commit(self):
+        if len(self._ops) > MAX_BATCH_WRITES:
+            raise ValueError(f"maximum {MAX_BATCH_WRITES} writes allowed per request")
+        if self._client.commit_latency:
+            # 네트워크 왕복 시간 흉내 (잠금 밖에서 대기하므로 동시 커밋은 겹쳐서 진행된다)
+            time.sleep(self._client.commit_latency)
+        with self._client._lock:
+            for kind, ref, data, merge in self._ops:
+                if kind == 'delete':
+                    self._client._store.get(ref.collection_name, {}).pop(ref.id, None)
+                else:
+                    _apply(self._client._store, ref._key(), data, merge=merge, update=(kind == 'update'))
+            self._client.writes += len(self._ops)
+            self._client.commits += 1
+            self._client._notify([ref for _, ref, _, _ in self._ops])
+        ops, self._ops = self._ops, []
+        return ops
+
+
+class Transaction(WriteBatch):
+    """읽기는 즉시, 쓰기는 커밋 시 적용 (단일 프로세스이므로 충돌 재시도는 없음)"""
+
+
+def transactional(func):
+    def wrapper(transaction, *args, **kwargs):
+        result = func(transaction, *args, **kwargs)
+        transaction.commit()
+        return result
+    return wrapper
+
+
+class DocumentChange:
+    def __init__(self, kind, document):
+        self.type = SimpleNamespace(name=kind)
+        self.document = document
+
+
+class Watch:
+    """on_snapshot 반환값. disconnect()로 연결 끊김을 흉내 낸다."""
+
+    def __init__(self, client, collection, callback):
+        self._client = client
+        self.collection = collection
+        self.callback = callback
+        self.is_active = True
+
+    def unsubscribe(self):
+        self.is_active = False
+        self._client._watches.discard(self)
+
+    def disconnect(self):
+        self.unsubscribe()
+
+
+class FakeFirestore:
+    """firebase_db가 사용하는 Client API (collection/batch/transaction/get_all)"""
+
+    def __init__(self, commit_latency=0.0):
+        self.commit_latency = commit_latency
+        self._store = {}
+        self._lock = threading.RLock()
+        self._watches = set()
+        self.reads = 0
+        self.writes = 0
+        self.commits = 0
+
+    def collection(self, name):
+        return CollectionReference(self, name)
+
+    def batch(self):
+        return WriteBatch(self)
+
+    def transaction(self):
+        return Transaction(self)
+
+    def get_all(self, references):
+        return [ref.get() for ref in references]
+
+    def reset_counters(self):
+        self.reads = self.writes = self.commits = 0
+
+    def counters(self):
+        return {'reads': self.reads, 'writes': self.writes, 'commits': self.commits}
+
+    def _snapshot(self, collection, doc_id):
+        data = self._store.get(collection, {}).get(doc_id)
+        return DocumentSnapshot(DocumentReference(self, collection, doc_id), dict(data) if data is not None else None)
+
+    def _listen(self, collection, callback):
+        with self._lock:
+            watch = Watch(self, collection, callback)
+            self._watches.add(watch)
+            docs = [self._snapshot(collection, doc_id) for doc_id in sorted(self._store.get(collection, {}))]
+            # 첫 동기화는 컬렉션 전체 문서 수만큼 읽기로 과금된다
+            self.reads += max(1, len(docs))
+        callback(docs, [DocumentChange('ADDED', d) for d in docs], datetime.now(timezone.utc))
+        return watch
+
+    def _notify(self, refs):
+        """쓰기 후 리스너에 변경분 전달 (변경 문서 1건당 읽기 1건)"""
+        for watch in list(self._watches):
+            changed = {ref.id for ref in refs if ref.collection_name == watch.collection}
+            if not changed:
+                continue
+            changes = []
+            for doc_id in sorted(changed):
+                snapshot = self._snapshot(watch.collection, doc_id)
+                changes.append(DocumentChange('MODIFIED' if snapshot.exists else 'REMOVED', snapshot))
+            self.reads += len(changes)
+            watch.callback([], changes, datetime.now(timezone.utc))
+
+    def load(self, collection, docs):
+        """{문서ID: 데이터}를 과금 없이 직접 적재 (데이터셋 준비용)"""
+        with self._lock:
+            self._store.setdefault(collection, {}).update(docs)
+
+
+# firebase_db의 `firestore` 모듈 자리에 넣을 네임스페이스
+fake_firestore_module = SimpleNamespace(
+    Increment=Increment,
+    SERVER_TIMESTAMP=SERVER_TIMESTAMP,
+    transactional=transactional,
+    Query=Query,
+)
+
+
+@contextmanager
+def installed(client, modules=None):
+    """
+    firebase_db(및 지정 모듈)의 get_firestore_client/firestore를 대역으로 바꾼 뒤 복구
+    """
+    if modules is None:
+        import firebase_db
+        modules = [firebase_db]
+
+    saved = []
+    for module in modules:
+        for name, value in (('get_firestore_client', lambda: client), ('firestore', fake_firestore_module)):
+            if hasattr(module, name):
+                saved.append((module, name, getattr(module, name)))
+                setattr(module, name, value)
+    try:
+        yield client
+    finally:
+        for module, name, value in reversed(saved):
+            setattr(module, name, value)
@@ -0,0 +1,223 @@
+# 합성 공장 데이터셋 생성기
+"""
+실제 운영 규모를 흉내 낸 재고/작업/거래 기록 데이터를 만들고
+SQLite DB 파일 또는 FakeFirestore에 적재한다.
+
+scale=1.0 기준: 롤 5,000종 / 재단 20,000종 / 작업 2,000건 / 거래 기록 2,000,000건 (3년)
+
+    python benchmarks/generate_dataset.py --scale 0.1 --sqlite /tmp/bench.db
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import db_functions  # noqa: E402
+
+FULL_SCALE = {
+    'rolls': 5_000,
+    'cuts': 20_000,
+    'jobs': 2_000,
+    'ledger_rows': 2_000_000,
+}
+COMPANIES = ['대한포장', '서울비닐', '한빛산업', '동양팩', '미래화학', '제일농산', '성진물산', '우성상사']
+WORKERS = ['김철수', '이영희', '박민수', '최지훈']
+STATUSES = ['대기', '진행중', '완료']
+PRIORITIES = ['긴급', '높음', '보통', '낮음']
+RAW_NAMES = ['LDPE', 'LLDPE', 'HDPE', 'PP']
+
+
+def sizes(scale):
+    """scale에 맞춘 행 수 (최소 1)"""
+    return {k: max(1, int(v * scale)) for k, v in FULL_SCALE.items()}
+
+
+def generate(scale=1.0, years=3, seed=42, end=None):
+    """
+    데이터셋 생성
+
+    Returns:
+        dict: roll/cut/workflow/raw 는 load_* 결과와 같은 표시 컬럼의 DataFrame,
+              ledger 는 transactions 행(item_type, item_id, delta, note, timestamp, ts_epoch),
+              reorder 는 (item_type, item_id, threshold) DataFrame
+    """
+    n = sizes(scale)
+    rng = np.random.default_rng(seed)
+    end = end or datetime.now().replace(microsecond=0)
+    stamp = end.strftime("%Y-%m-%d %H:%M")
+
+    roll_ids = np.array([f"R-{i:05d}" for i in range(n['rolls'])])
+    roll = pd.DataFrame({
+        '제품ID': roll_ids,
+        '두께(mm)': rng.choice([0.03, 0.05, 0.08, 0.1, 0.15], n['rolls']),
+        '폭(cm)': rng.choice([50, 80, 100, 120, 150, 200], n['rolls']).astype(float),
+        '롤 길이(m)': rng.choice([300, 500, 1000], n['rolls']).astype(float),
+        '현재고(롤)': rng.integers(0, 60, n['rolls']),
+        '최근업데이트': stamp,
+    })
+
+    cut_ids = np.array([f"C-{i:06d}" for i in range(n['cuts'])])
+    cut = pd.DataFrame({
+        '재단ID': cut_ids,
+        '업체명': rng.choice(COMPANIES, n['cuts']),
+        '가로(cm)': rng.integers(10, 200, n['cuts']).astype(float),
+        '세로(cm)': rng.integers(10, 300, n['cuts']).astype(float),
+        '두께(mm)': rng.choice([0.03, 0.05, 0.08, 0.1], n['cuts']),
+        '현재고(장)': rng.integers(0, 5000, n['cuts']),
+        '최근업데이트': stamp,
+    })
+
+    created = [end - timedelta(days=int(d)) for d in rng.integers(0, 90, n['jobs'])]
+    workflow = pd.DataFrame({
+        '작업ID': [f"W{i:06d}" for i in range(n['jobs'])],
+        '업체명': rng.choice(COMPANIES, n['jobs']),
+        '제품규격': [f"{t}x{w}" for t, w in zip(rng.choice([0.05, 0.08, 0.1], n['jobs']),
+                                                 rng.choice([80, 100, 120], n['jobs']))],
+        '수량': rng.integers(1, 500, n['jobs']),
+        '단위': rng.choice(['롤', '장', 'kg'], n['jobs']),
+        '담당자': rng.choice(WORKERS, n['jobs']),
+        '상태': rng.choice(STATUSES, n['jobs'], p=[0.3, 0.2, 0.5]),
+        '우선순위': rng.choice(PRIORITIES, n['jobs']),
+        '납기일': [(c + timedelta(days=14)).strftime("%Y-%m-%d") for c in created],
+        '메모': '',
+        '등록일': [c.strftime("%Y-%m-%d %H:%M") for c in created],
+    })
+
+    raw = pd.DataFrame([
+        {'품명': name, 'Grade': str(grade), '현재고_kg': float(rng.integers(100, 5000)),
+         '입고일': end.strftime("%Y-%m-%d"), '비고': ''}
+        for name in RAW_NAMES for grade in (530, 620, 7000)
+    ])
+
+    # 거래 기록: 롤 30% / 재단 70%, 출고가 입고보다 잦다
+    rows = n['ledger_rows']
+    is_roll = rng.random(rows) < 0.3
+    item_id = np.where(
+        is_roll,
+        roll_ids[rng.integers(0, n['rolls'], rows)],
+        cut_ids[rng.integers(0, n['cuts'], rows)],
+    )
+    delta = np.where(is_roll, rng.choice([-3, -2, -1, -1, 1, 5], rows),
+                     rng.choice([-200, -100, -50, -50, 100, 500], rows)).astype(float)
+    start = end - timedelta(days=365 * years)
+    offset = np.sort(rng.integers(0, 365 * years * 86400, rows))
+    ts_epoch = int(start.timestamp()) + offset
+    timestamp = (pd.Timestamp(start) + pd.to_timedelta(offset, unit='s')).strftime("%Y-%m-%d %H:%M:%S")
+    ledger = pd.DataFrame({
+        'item_type': np.where(is_roll, 'roll', 'cut'),
+        'item_id': item_id,
+        'delta': delta,
+        'note': np.where(delta < 0, '출고', '입고'),
+        'timestamp': timestamp,
+        'ts_epoch': ts_epoch,
+    })
+
+    # 품목의 약 30%에 재주문 임계값 설정
+    reorder = pd.concat([
+        pd.DataFrame({'item_type': 'roll', 'item_id': roll_ids[rng.random(n['rolls']) < 0.3]}),
+        pd.DataFrame({'item_type': 'cut', 'item_id': cut_ids[rng.random(n['cuts']) < 0.3]}),
+    ], ignore_index=True)
+    reorder['threshold'] = np.where(reorder['item_type'] == 'roll', 5.0, 500.0)
+
+    return {'roll': roll, 'cut': cut, 'workflow': workflow, 'raw': raw, 'ledger': ledger, 'reorder': reorder}
+
+
+def _db_rows(df, columns):
+    """DataFrame -> executemany용 파이썬 값 튜플"""
+    return df[columns].astype(object).itertuples(index=False, name=None)
+
+
+def load_sqlite(dataset, path):
+    """데이터셋을 새 SQLite DB 파일에 적재 (usage_monthly 집계 포함)"""
+    if os.path.exists(path):
+        os.remove(path)
+    db_functions.DB_PATH = path
+    db_functions.init_db()
+
+    with db_functions.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO roll_inventory (제품ID, 두께_mm, 폭_cm, 롤길이_m, 현재고_롤, 최근업데이트) VALUES (?, ?, ?, ?, ?, ?)",
+            _db_rows(dataset['roll'], db_functions.ROLL_COLUMNS))
+        conn.executemany(
+            "INSERT INTO cut_inventory (재단ID, 업체명, 가로_cm, 세로_cm, 두께_mm, 현재고_장, 최근업데이트) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _db_rows(dataset['cut'], db_functions.CUT_COLUMNS))
+        conn.executemany(
+            "INSERT INTO workflow (작업ID, 업체명, 제품규격, 수량, 단위, 담당자, 상태, 우선순위, 납기일, 메모, 등록일) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            _db_rows(dataset['workflow'], db_functions.WORKFLOW_COLUMNS))
+        raw = dataset['raw']
+        conn.executemany(
+            "INSERT INTO raw_materials (원료ID, 품명, Grade, 현재고_kg, 입고일, 비고) VALUES (?, ?, ?, ?, ?, ?)",
+            zip(raw['품명'] + '_' + raw['Grade'], *(raw[c] for c in db_functions.RAW_COLUMNS)))
+        conn.executemany(
+            "INSERT INTO transactions (item_type, item_id, delta, note, timestamp) VALUES (?, ?, ?, ?, ?)",
+            _db_rows(dataset['ledger'], ['item_type', 'item_id', 'delta', 'note', 'timestamp']))
+        conn.executemany(
+            "INSERT INTO reorder_levels (item_type, item_id, threshold) VALUES (?, ?, ?)",
+            _db_rows(dataset['reorder'], ['item_type', 'item_id', 'threshold']))
+
+    db_functions.rebuild_usage_monthly()
+    db_functions.get_connection().execute("ANALYZE")
+
+
+def load_firestore(dataset, client):
+    """데이터셋을 FakeFirestore에 과금 없이 적재 (usage_monthly 집계 포함)"""
+    roll = dataset['roll']
+    client.load('roll_inventory', {
+        r['제품ID']: {'두께_mm': r['두께(mm)'], '폭_cm': r['폭(cm)'], '롤길이_m': r['롤 길이(m)'],
+                     '현재고_롤': int(r['현재고(롤)']), '최근업데이트': r['최근업데이트']}
+        for r in roll.to_dict('records')
+    })
+    cut = dataset['cut']
+    client.load('cut_inventory', {
+        r['재단ID']: {'업체명': r['업체명'], '가로_cm': r['가로(cm)'], '세로_cm': r['세로(cm)'],
+                     '두께_mm': r['두께(mm)'], '현재고_장': int(r['현재고(장)']), '최근업데이트': r['최근업데이트']}
+        for r in cut.to_dict('records')
+    })
+    client.load('workflow', {
+        r.pop('작업ID'): {**r, '수량': int(r['수량'])} for r in dataset['workflow'].to_dict('records')
+    })
+    client.load('raw_materials', {f"{r['품명']}_{r['Grade']}": r for r in dataset['raw'].to_dict('records')})
+
+    ledger = dataset['ledger']
+    client.load('transactions', {
+        f"T{i:09d}": r for i, r in enumerate(ledger.to_dict('records'))
+    })
+    client.load('reorder_levels', {
+        f"{r['item_type']}_{r['item_id']}": r for r in dataset['reorder'].to_dict('records')
+    })
+
+    out = ledger[ledger['delta'] < 0]
+    usage = (-out['delta']).groupby([out['item_type'], out['item_id'], out['timestamp'].str[:7]]).sum()
+    client.load('usage_monthly', {
+        f"{t}_{i}_{m}": {'item_type': t, 'item_id': i, 'month': m, 'usage': float(u)}
+        for (t, i, m), u in usage.items()
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=0.1, help='운영 규모 대비 비율 (1.0 = 거래 200만 건)')
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--sqlite', required=True, help='생성할 SQLite DB 경로')
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    dataset = generate(args.scale, args.years, args.seed)
+    load_sqlite(dataset, args.sqlite)
+    print(json.dumps({
+        'path': args.sqlite,
+        'rows': {name: len(df) for name, df in dataset.items()},
+        'seconds': round(time.perf_counter() - t0, 2),
+    }, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
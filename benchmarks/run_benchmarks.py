@@ -0,0 +1,222 @@
+# 데이터 계층 벤치마크
+"""
+합성 데이터셋(generate_dataset.py)을 SQLite와 프로세스 내 Firestore 대역(fake_firestore.py)에
+적재한 뒤, 앱의 각 화면이 호출하는 데이터 경로를 반복 실행해
+지연 시간 백분위수와 작업당 읽기/쓰기 횟수를 JSON으로 출력한다.
+
+    python benchmarks/run_benchmarks.py --scale 0.1 --repeat 50 --output bench.json
+
+SQLite의 읽기/쓰기 횟수는 실행된 SELECT / INSERT·UPDATE·DELETE 문 수,
+Firestore 대역은 과금 단위(문서 읽기/쓰기 수, 리스너로 받은 변경 문서 포함)다.
+firestore는 실시간 미러(firestore_mirror) 사용, firestore_stream은 미러 없이 매번 stream()으로 읽는다.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+import db_functions  # noqa: E402
+import firebase_db  # noqa: E402
+import firestore_mirror  # noqa: E402
+from reorder_alerts import find_reorder_alerts  # noqa: E402
+
+import fake_firestore  # noqa: E402
+import generate_dataset  # noqa: E402
+
+
+# ==================== 화면별 데이터 경로 ====================
+
+def _list_page(store, load, item_type, id_col, stock_col):
+    df = load()
+    usage = store.get_monthly_usage_bulk(item_type)
+    df['이번달 사용량'] = df[id_col].map(usage).fillna(0.0)
+    find_reorder_alerts(df, store.load_reorder_levels(item_type, df[id_col].tolist()), id_col, stock_col)
+
+
+def roll_list(store, ctx):
+    """롤 재고 현황: 목록 + 이번달 사용량 + 재주문 알림"""
+    _list_page(store, store.load_roll_inventory, 'roll', '제품ID', '현재고(롤)')
+
+
+def cut_list(store, ctx):
+    """재단 재고 현황: 목록 + 이번달 사용량 + 재주문 알림"""
+    _list_page(store, store.load_cut_inventory, 'cut', '재단ID', '현재고(장)')
+
+
+def workflow_list(store, ctx):
+    """작업 현황판: 완료되지 않은 작업만 (상태 조건 조회)"""
+    store.load_workflow(generate_dataset.STATUSES[:-1])
+
+
+def stock_movement(store, ctx):
+    """롤 입고 1건 (재고 증감 + 거래 기록 + 사용량 집계)"""
+    store.adjust_roll_stock(ctx['rng'].choice(ctx['roll_ids']), 1, note='입고')
+
+
+def registration(store, ctx):
+    """신규 롤 등록: 중복 확인용 로드 + 새 행 저장"""
+    df = store.load_roll_inventory()
+    ctx['seq'] += 1
+    new_id = f"NEW-{ctx['seq']:06d}"
+    assert new_id not in set(df['제품ID'])
+    store.save_roll_inventory(pd.DataFrame([{
+        '제품ID': new_id, '두께(mm)': 0.05, '폭(cm)': 100.0, '롤 길이(m)': 500.0,
+        '현재고(롤)': 10, '최근업데이트': datetime.now().strftime("%Y-%m-%d %H:%M")
+    }]))
+
+
+def workflow_status(store, ctx):
+    """작업 상태 변경 1건"""
+    store.update_workflow_item(ctx['rng'].choice(ctx['job_ids']),
+                               상태=ctx['rng'].choice(generate_dataset.STATUSES))
+
+
+SCENARIOS = [roll_list, cut_list, workflow_list, stock_movement, registration, workflow_status]
+
+
+# ==================== 계측 ====================
+
+class SqliteCounter:
+    """현재 스레드 연결에서 실행된 SQL 문을 읽기/쓰기로 분류해 센다"""
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+        db_functions.get_connection().set_trace_callback(self._trace)
+
+    def _trace(self, sql):
+        verb = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+        if verb in ('SELECT', 'WITH'):
+            self.reads += 1
+        elif verb in ('INSERT', 'UPDATE', 'DELETE', 'REPLACE'):
+            self.writes += 1
+
+    def reset_counters(self):
+        self.reads = self.writes = 0
+
+    def counters(self):
+        return {'reads': self.reads, 'writes': self.writes}
+
+    def close(self):
+        db_functions.get_connection().set_trace_callback(None)
+
+
+def summarize(timings, reads, writes):
+    timings = np.asarray(timings)
+    return {
+        'n': int(len(timings)),
+        'p50_ms': round(float(np.percentile(timings, 50)), 3),
+        'p95_ms': round(float(np.percentile(timings, 95)), 3),
+        'p99_ms': round(float(np.percentile(timings, 99)), 3),
+        'max_ms': round(float(timings.max()), 3),
+        'mean_ms': round(float(timings.mean()), 3),
+        'reads_per_op': round(reads / len(timings), 1),
+        'writes_per_op': round(writes / len(timings), 1),
+    }
+
+
+def run_scenarios(store, counter, ctx, repeat, warmup=1):
+    results = {}
+    for scenario in SCENARIOS:
+        for _ in range(warmup):
+            scenario(store, ctx)
+        timings = []
+        reads = writes = 0
+        for _ in range(repeat):
+            counter.reset_counters()
+            t0 = time.perf_counter()
+            scenario(store, ctx)
+            timings.append((time.perf_counter() - t0) * 1000)
+            counts = counter.counters()
+            reads += counts['reads']
+            writes += counts['writes']
+        results[scenario.__name__] = summarize(timings, reads, writes)
+    return results
+
+
+def _context(dataset, seed):
+    return {
+        'rng': random.Random(seed),
+        'roll_ids': dataset['roll']['제품ID'].tolist(),
+        'job_ids': dataset['workflow']['작업ID'].tolist(),
+        'seq': 0,
+    }
+
+
+def bench_sqlite(dataset, repeat, seed):
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_dataset.load_sqlite(dataset, os.path.join(tmp, 'bench.db'))
+        counter = SqliteCounter()
+        try:
+            return run_scenarios(db_functions, counter, _context(dataset, seed), repeat)
+        finally:
+            counter.close()
+            db_functions.close_connection()
+
+
+def bench_firestore(dataset, repeat, seed, realtime=True):
+    client = fake_firestore.FakeFirestore()
+    generate_dataset.load_firestore(dataset, client)
+    saved = os.environ.get('INVENTORY_REALTIME')
+    os.environ['INVENTORY_REALTIME'] = '1' if realtime else '0'
+    try:
+        with fake_firestore.installed(client):
+            return run_scenarios(firebase_db, client, _context(dataset, seed), repeat)
+    finally:
+        firestore_mirror.stop_all()
+        if saved is None:
+            os.environ.pop('INVENTORY_REALTIME', None)
+        else:
+            os.environ['INVENTORY_REALTIME'] = saved
+
+
+def bench_firestore_stream(dataset, repeat, seed):
+    """실시간 미러 없이 매번 stream()으로 읽는 경우"""
+    return bench_firestore(dataset, repeat, seed, realtime=False)
+
+
+BACKENDS = {
+    'sqlite': bench_sqlite,
+    'firestore': bench_firestore,
+    'firestore_stream': bench_firestore_stream,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', type=float, default=0.1, help='운영 규모 대비 비율 (1.0 = 거래 200만 건)')
+    parser.add_argument('--repeat', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--backends', default=','.join(BACKENDS), help='쉼표 구분: sqlite,firestore,firestore_stream')
+    parser.add_argument('--output', help='결과 JSON 파일 (없으면 표준출력)')
+    args = parser.parse_args()
+
+    dataset = generate_dataset.generate(args.scale, seed=args.seed)
+    report = {
+        'scale': args.scale,
+        'repeat': args.repeat,
+        'rows': {name: len(df) for name, df in dataset.items()},
+        'backends': {},
+    }
+    for name in args.backends.split(','):
+        report['backends'][name] = BACKENDS[name.strip()](dataset, args.repeat, args.seed)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,208 @@
+# 재단 계획 (롤 -> 재단 시트)
+"""
+재단 주문(가로×세로×두께, 수량)을 롤 재고(폭×길이×두께)에 배정한다.
+
+롤 하나를 폭 방향으로 여러 레인(lane)으로 나눈 뒤 각 레인을 길이 방향으로 잘라 시트를 얻는다.
+  - 패턴: 롤 1개의 레인 구성 (예: 50cm 레인 2개 + 30cm 레인 1개)
+  - 두께가 같은 롤만 쓰며, 주문마다 가로/세로 중 어느 쪽을 폭 방향에 둘지(방향) 고른다.
+
+탐욕 알고리즘 (주문 수백 건에서도 1초 미만):
+  1. 남은 주문을 폭 방향 치수가 큰 순으로(FFD) 레인에 채워 롤 종류별 패턴을 만든다.
+  2. 주문 면적 대비 롤 면적(수율)이 가장 높은 패턴을 골라, 주문이 모자라지 않는 한 여러 롤에 반복한다.
+  3. 모든 주문이 채워지거나 맞는 롤이 없을 때까지 반복한다.
+"""
+import math
+import re
+
+import pandas as pd
+
+ORDER_COLUMNS = ['주문ID', '두께(mm)', '가로(cm)', '세로(cm)', '수량']
+PATTERN_COLUMNS = ['롤 제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '롤 수', '레인 구성',
+                   '사용 폭(cm)', '손실 폭(cm)', '수율(%)']
+ORDER_RESULT_COLUMNS = ['주문ID', '두께(mm)', '가로(cm)', '세로(cm)', '수량', '생산 수량', '여분', '미배정']
+
+_THICKNESS = re.compile(r'(\d+(?:\.\d+)?)\s*(?:T|t|mm)')
+_CM = re.compile(r'(\d+(?:\.\d+)?)\s*cm')
+
+
+def parse_spec(text):
+    """
+    제품 규격 문자열 -> (두께 mm, 가로 cm, 세로 cm)
+
+    예: '0.05T x 50cm x 70cm' -> (0.05, 50.0, 70.0), 해석할 수 없으면 None
+    """
+    thickness = _THICKNESS.search(str(text))
+    dims = _CM.findall(str(text))
+    if thickness is None or len(dims) < 2:
+        return None
+    return float(thickness.group(1)), float(dims[0]), float(dims[1])
+
+
+def orders_from_workflow(df, statuses=('접수', '생산중')):
+    """
+    작업 목록 중 시트(단위 '장') 작업을 재단 주문으로 변환 (규격을 해석할 수 없는 작업은 제외)
+
+    Returns:
+        DataFrame: ORDER_COLUMNS (주문ID = 작업ID)
+    """
+    rows = []
+    jobs = df[(df['단위'] == '장') & df['상태'].isin(statuses)]
+    for job in jobs.itertuples(index=False):
+        spec = parse_spec(job.제품규격)
+        if spec is None:
+            continue
+        rows.append({'주문ID': job.작업ID, '두께(mm)': spec[0], '가로(cm)': spec[1],
+                     '세로(cm)': spec[2], '수량': int(job.수량)})
+    return pd.DataFrame(rows, columns=ORDER_COLUMNS)
+
+
+def _orientations(order, width, length_cm):
+    """롤에 놓을 수 있는 (폭 방향 치수, 길이 방향 치수) 목록"""
+    a, b = order['가로(cm)'], order['세로(cm)']
+    options = {(a, b), (b, a)}
+    return [(across, along) for across, along in options if across <= width and along <= length_cm]
+
+
+def _pattern(roll, orders, queue, remaining, smallest):
+    """
+    롤 1개의 레인 구성 (queue: 폭 방향 치수가 큰 순으로 정렬된 주문 번호, First Fit Decreasing)
+
+    Returns:
+        [(주문 번호, 폭 방향, 길이 방향, 레인 수, 레인당 시트 수)], 남은 폭
+    """
+    width, length_cm = roll['폭(cm)'], roll['롤 길이(m)'] * 100
+    free = width
+    lanes = []
+    for idx in queue:
+        if free < smallest:
+            break
+        if remaining.get(idx, 0) <= 0:
+            continue
+        best = None
+        for across, along in _orientations(orders[idx], free, length_cm):
+            per_lane = int(length_cm // along)
+            count = min(math.ceil(remaining[idx] / per_lane), int(free // across))
+            # 폭을 더 많이 쓰는 방향, 같으면 여분이 적은 방향
+            key = (count * across, -(count * per_lane - remaining[idx]))
+            if count > 0 and (best is None or key > best[0]):
+                best = (key, (idx, across, along, count, per_lane))
+        if best is not None:
+            lanes.append(best[1])
+            free -= best[1][1] * best[1][3]
+    return lanes, free
+
+
+def _pattern_yield(roll, orders, lanes, remaining):
+    """패턴 롤 1개에서 주문에 쓰이는 시트 면적 / 롤 면적"""
+    used = sum(min(count * per_lane, remaining[idx]) * orders[idx]['가로(cm)'] * orders[idx]['세로(cm)']
+               for idx, _, _, count, per_lane in lanes)
+    return used / (roll['폭(cm)'] * roll['롤 길이(m)'] * 100)
+
+
+def _roll_types(rolls):
+    """두께 -> 같은 규격(폭, 길이)끼리 묶은 롤 종류 목록 [{'폭(cm)', '롤 길이(m)', 'stock': [[제품ID, 남은 수]]}]"""
+    types = {}
+    for row in rolls.to_dict('records'):
+        if int(row['현재고(롤)']) <= 0:
+            continue
+        key = (round(float(row['두께(mm)']), 4), float(row['폭(cm)']), float(row['롤 길이(m)']))
+        spec = types.setdefault(key, {'두께(mm)': row['두께(mm)'], '폭(cm)': key[1], '롤 길이(m)': key[2], 'stock': []})
+        spec['stock'].append([row['제품ID'], int(row['현재고(롤)'])])
+
+    by_thickness = {}
+    for (thickness, _, _), spec in types.items():
+        by_thickness.setdefault(thickness, []).append(spec)
+    return by_thickness
+
+
+def _plan_thickness(orders, queue, remaining, produced, roll_types, patterns):
+    """두께 하나의 주문(queue)을 같은 두께 롤 종류에 배정 (remaining/produced/patterns를 갱신)"""
+    while any(remaining.get(idx, 0) > 0 for idx in queue):
+        queue = [idx for idx in queue if remaining.get(idx, 0) > 0]
+        smallest = min(min(orders[idx]['가로(cm)'], orders[idx]['세로(cm)']) for idx in queue)
+        best = None
+        for roll in roll_types:
+            if not any(left > 0 for _, left in roll['stock']):
+                continue
+            lanes, free = _pattern(roll, orders, queue, remaining, smallest)
+            if not lanes:
+                continue
+            score = (_pattern_yield(roll, orders, lanes, remaining), roll['폭(cm)'] * roll['롤 길이(m)'])
+            if best is None or score > best[0]:
+                best = (score, roll, lanes, free)
+        if best is None:
+            return
+
+        (pattern_yield, _), roll, lanes, free = best
+        # 주문이 남는 동안 같은 패턴을 반복 (가장 먼저 끝나는 주문까지, 최소 1롤)
+        repeat = max(1, min(remaining[idx] // (count * per_lane) for idx, _, _, count, per_lane in lanes))
+        repeat = min(repeat, sum(left for _, left in roll['stock']))
+        for idx, _, _, count, per_lane in lanes:
+            produced[idx] += count * per_lane * repeat
+            remaining[idx] -= count * per_lane * repeat
+
+        layout = ' + '.join(f"{orders[idx]['주문ID']} {across:g}cm×{count} ({along:g}cm 간격 {per_lane}장)"
+                            for idx, across, along, count, per_lane in lanes)
+        # 같은 규격의 롤 ID들에서 차례로 꺼내 쓴다
+        for entry in roll['stock']:
+            take = min(entry[1], repeat)
+            if take <= 0:
+                continue
+            entry[1] -= take
+            repeat -= take
+            patterns.append({
+                '롤 제품ID': entry[0],
+                '두께(mm)': roll['두께(mm)'],
+                '폭(cm)': roll['폭(cm)'],
+                '롤 길이(m)': roll['롤 길이(m)'],
+                '롤 수': take,
+                '레인 구성': layout,
+                '사용 폭(cm)': roll['폭(cm)'] - free,
+                '손실 폭(cm)': free,
+                '수율(%)': round(pattern_yield * 100, 1),
+            })
+            if repeat == 0:
+                break
+
+
+def plan_cuts(orders, rolls):
+    """
+    재단 주문을 롤 재고에 배정
+
+    Args:
+        orders: DataFrame (ORDER_COLUMNS)
+        rolls: 롤 재고 DataFrame (제품ID, 두께(mm), 폭(cm), 롤 길이(m), 현재고(롤))
+
+    Returns:
+        dict: patterns(패턴별 롤 수와 레인 구성), orders(주문별 생산/여분/미배정),
+              rolls({롤 제품ID: 사용 롤 수}), yield(전체 수율 %)
+    """
+    order_rows = orders[ORDER_COLUMNS].to_dict('records')
+    remaining = {i: int(o['수량']) for i, o in enumerate(order_rows) if int(o['수량']) > 0}
+    produced = {i: 0 for i in range(len(order_rows))}
+    roll_types = _roll_types(rolls)
+
+    # 두께별로 따로 배정 (폭 방향 치수가 큰 순으로 한 번만 정렬)
+    queues = {}
+    for idx in sorted(remaining, key=lambda i: -max(order_rows[i]['가로(cm)'], order_rows[i]['세로(cm)'])):
+        queues.setdefault(round(float(order_rows[idx]['두께(mm)']), 4), []).append(idx)
+
+    patterns = []
+    for thickness, queue in queues.items():
+        _plan_thickness(order_rows, queue, remaining, produced, roll_types.get(thickness, []), patterns)
+
+    result = pd.DataFrame(order_rows, columns=ORDER_COLUMNS)
+    quantity = result['수량'].astype(int)
+    result['생산 수량'] = [produced[i] for i in range(len(order_rows))]
+    result['여분'] = (result['생산 수량'] - quantity).clip(lower=0)
+    result['미배정'] = (quantity - result['생산 수량']).clip(lower=0)
+
+    plan = pd.DataFrame(patterns, columns=PATTERN_COLUMNS)
+    used_area = float((plan['폭(cm)'] * plan['롤 길이(m)'] * 100 * plan['롤 수']).sum())
+    sheet_area = float(((quantity - result['미배정']) * result['가로(cm)'] * result['세로(cm)']).sum())
+    return {
+        'patterns': plan,
+        'orders': result[ORDER_RESULT_COLUMNS],
+        'rolls': plan.groupby('롤 제품ID')['롤 수'].sum().astype(int).to_dict(),
+        'yield': round(sheet_area / used_area * 100, 1) if used_area else 0.0,
+    }
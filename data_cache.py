@@ -0,0 +1,138 @@
+# 프로세스 공용 데이터 캐시
+"""
+Streamlit은 위젯을 조작할 때마다 스크립트 전체를 다시 실행하므로
+캐시가 없으면 모든 세션이 클릭마다 컬렉션 전체를 다시 읽는다.
+
+- 키: (저장소 범위, 네임스페이스(컬렉션), 함수, 인자), 값과 함께 네임스페이스 버전을 기록
+- 쓰기 함수가 네임스페이스 버전을 올리면 이전 값은 더 이상 쓰이지 않는다 (자기 쓰기 즉시 반영)
+- 다른 프로세스/기기의 쓰기는 TTL(초)이 지나면 반영된다
+- 크기 제한을 넘으면 가장 오래 쓰이지 않은 항목부터 제거 (LRU)
+- 반환값은 복사본이므로 호출자가 수정해도 캐시는 바뀌지 않는다
+"""
+import functools
+import os
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+import pandas as pd
+
+DEFAULT_MAX_ENTRIES = int(os.environ.get('INVENTORY_CACHE_SIZE', '64'))
+DEFAULT_TTL = float(os.environ.get('INVENTORY_CACHE_TTL', '30'))
+
+
+def _copy(value):
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+def _freeze(value):
+    """인자를 해시 가능한 키로 변환 (리스트 -> 튜플)"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class DataCache:
+    """버전 기반 LRU 캐시"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl=DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()   # key -> (version, stored_at, value)
+        self._versions = defaultdict(int)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def version(self, namespace):
+        with self._lock:
+            return self._versions[namespace]
+
+    def get_or_load(self, namespace, key, loader):
+        """캐시 값(복사본) 반환. 없거나 버전/TTL이 맞지 않으면 loader()로 읽어 저장"""
+        with self._lock:
+            version = self._versions[namespace]
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version and time.monotonic() - entry[1] < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return _copy(entry[2])
+            self.misses += 1
+
+        # 느린 읽기(Firestore) 동안 다른 세션이 막히지 않도록 잠금 밖에서 로드
+        value = loader()
+
+        with self._lock:
+            # 로드 중에 쓰기가 있었으면 이미 오래된 값이므로 저장하지 않는다
+            if self._versions[namespace] == version:
+                self._entries[key] = (version, time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return _copy(value)
+
+    def bump(self, *namespaces):
+        """네임스페이스 버전 증가 (해당 캐시 값 무효화)"""
+        with self._lock:
+            for namespace in namespaces:
+                self._versions[namespace] += 1
+
+    def clear(self):
+        """모든 값 삭제 (새로고침 버튼 등)"""
+        with self._lock:
+            self._entries.clear()
+            for namespace in list(self._versions):
+                self._versions[namespace] += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'hit_ratio': round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+cache = DataCache()
+
+
+def cached_loader(namespace, scope=lambda: None, data_cache=None):
+    """
+    읽기 함수 데코레이터
+
+    Args:
+        namespace: 읽는 컬렉션 이름 (쓰기 함수의 invalidates와 같은 이름)
+        scope: 저장소 구분 값을 돌려주는 함수 (예: SQLite DB 경로)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            target = data_cache or cache
+            key = (scope(), namespace, func.__name__, _freeze(args), _freeze(kwargs))
+            return target.get_or_load(namespace, key, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def invalidates(*namespaces, data_cache=None):
+    """쓰기 함수 데코레이터: 실행 후(실패해도) 네임스페이스 버전을 올린다"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                (data_cache or cache).bump(*namespaces)
+        return wrapper
+    return decorator
@@ -0,0 +1,324 @@
+# 대량 가져오기/내보내기
+"""
+재고·작업·거래 기록을 CSV / Excel(xlsx) / Parquet 파일로 가져오고 내보낸다.
+
+가져오기는 파일 전체를 벡터 연산으로 검사해 모든 오류(누락 컬럼, 빈 ID, 중복 키,
+숫자 아님, 음수 재고)를 한 번에 돌려주고, 오류가 없을 때만 저장소의 save_*
+(SQLite executemany / Firestore 500건 묶음)로 한 번에 기록한다.
+내보내기는 저장소의 iter_table 묶음을 차례로 파일에 써서 전체 표를 메모리에 올리지 않는다.
+
+Excel은 openpyxl(requirements.txt)이 설치되어 있어야 한다.
+"""
+import io
+import os
+from datetime import datetime
+
+import pandas as pd
+
+import storage
+
+FORMATS = ('csv', 'xlsx', 'parquet')
+ERROR_COLUMNS = ['행', '컬럼', '오류']
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+# kind -> 컬럼 규칙
+#   keys: 중복 검사 키 (빈 목록이면 검사 안 함)
+#   integer: 정수여야 하는 컬럼 (numeric의 부분집합)
+#   defaults: 파일에 없어도 되는 컬럼의 기본값 (None이면 현재 시각)
+#   save: 저장에 쓰는 storage 함수 이름
+KINDS = {
+    'roll': {
+        'label': '롤 재고',
+        'columns': ['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)', '최근업데이트'],
+        'keys': ['제품ID'],
+        'numeric': ['두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)'],
+        'integer': ['현재고(롤)'],
+        'non_negative': ['현재고(롤)'],
+        'defaults': {'최근업데이트': None},
+        'save': 'save_roll_inventory',
+    },
+    'cut': {
+        'label': '재단 재고',
+        'columns': ['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)', '최근업데이트'],
+        'keys': ['재단ID'],
+        'numeric': ['가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)'],
+        'integer': ['현재고(장)'],
+        'non_negative': ['현재고(장)'],
+        'defaults': {'업체명': '', '최근업데이트': None},
+        'save': 'save_cut_inventory',
+    },
+    'raw': {
+        'label': '원료 재고',
+        'columns': ['품명', 'Grade', '현재고_kg', '입고일', '비고'],
+        'keys': ['품명', 'Grade'],
+        'numeric': ['현재고_kg'],
+        'non_negative': ['현재고_kg'],
+        'defaults': {'입고일': '', '비고': ''},
+        'save': 'save_raw_materials',
+    },
+    'workflow': {
+        'label': '작업 플로우',
+        'columns': ['작업ID', '업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모', '등록일'],
+        'keys': ['작업ID'],
+        'numeric': ['수량'],
+        'integer': ['수량'],
+        'non_negative': ['수량'],
+        'defaults': {'단위': '', '담당자': '', '상태': '접수', '우선순위': '보통',
+                     '납기일': '', '메모': '', '등록일': None},
+        'save': 'save_workflow',
+    },
+    'transactions': {
+        'label': '거래 기록',
+        'columns': ['item_type', 'item_id', 'delta', 'note', 'timestamp'],
+        'keys': [],
+        'numeric': ['delta'],
+        'defaults': {'note': ''},
+        'save': 'import_transactions',
+    },
+}
+
+ITEM_TYPES = ('roll', 'cut', 'raw')
+
+
+# ==================== 파일 읽기 ====================
+
+def _format_of(source, fmt=None):
+    """fmt가 없으면 파일 이름 확장자로 형식 결정"""
+    if fmt is None:
+        name = source if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+        fmt = os.path.splitext(str(name))[1].lstrip('.').lower()
+        fmt = {'xls': 'xlsx', 'pq': 'parquet'}.get(fmt, fmt)
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식: {fmt or '(없음)'} (가능: {', '.join(FORMATS)})")
+    return fmt
+
+
+def _require_openpyxl():
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportError("Excel(xlsx) 파일을 쓰려면 openpyxl을 설치하세요: pip install openpyxl") from None
+    return openpyxl
+
+
+def read_table(source, fmt=None):
+    """
+    CSV / xlsx / Parquet 파일을 DataFrame으로 읽기
+
+    CSV·xlsx는 모든 값을 문자열로 읽는다 (ID 앞자리 0 보존, 숫자 변환은 validate_import에서).
+    """
+    fmt = _format_of(source, fmt)
+    if fmt == 'csv':
+        return pd.read_csv(source, dtype=str, keep_default_na=False, encoding='utf-8-sig')
+    if fmt == 'xlsx':
+        _require_openpyxl()
+        return pd.read_excel(source, dtype=str, keep_default_na=False)
+    return pd.read_parquet(source)
+
+
+# ==================== 검증 ====================
+
+def _errors(rows, column, message):
+    """오류 행 번호 목록 -> 오류 DataFrame"""
+    return pd.DataFrame({'행': list(rows), '컬럼': column, '오류': message}, columns=ERROR_COLUMNS)
+
+
+def validate_import(kind, df):
+    """
+    가져올 표 검사 (전체 행을 벡터 연산으로 한 번에)
+
+    Args:
+        kind: 'roll' / 'cut' / 'raw' / 'workflow' / 'transactions'
+        df: read_table 결과
+
+    Returns:
+        (clean, errors)
+        clean: 저장소 컬럼/형식으로 정리한 DataFrame (오류 행 제외)
+        errors: ['행', '컬럼', '오류'] DataFrame. 행은 파일 기준 번호 (머리글 = 1행)
+    """
+    spec = KINDS[kind]
+    df = df.rename(columns=lambda c: str(c).strip())
+
+    missing = [c for c in spec['columns'] if c not in df.columns and c not in spec['defaults']]
+    if missing:
+        errors = pd.DataFrame([{'행': 1, '컬럼': c, '오류': '컬럼 없음'} for c in missing], columns=ERROR_COLUMNS)
+        return pd.DataFrame(columns=spec['columns']), errors
+
+    df = df.reset_index(drop=True).copy()
+    now = datetime.now().strftime("%Y-%m-%d %H:%M")
+    for col, default in spec['defaults'].items():
+        if col not in df.columns:
+            df[col] = now if default is None else default
+    df = df[spec['columns']]
+
+    row_no = df.index + 2
+    found = []
+    bad = pd.Series(False, index=df.index)
+
+    # 문자열 컬럼: 앞뒤 공백 제거, 결측은 빈 문자열
+    for col in spec['columns']:
+        if col not in spec['numeric']:
+            df[col] = df[col].where(df[col].notna(), '').astype(str).str.strip()
+
+    for col in spec['keys']:
+        empty = df[col] == ''
+        found.append(_errors(row_no[empty], col, '값 없음'))
+        bad |= empty
+
+    if spec['keys']:
+        dup = df.duplicated(subset=spec['keys'], keep=False) & ~bad
+        found.append(_errors(row_no[dup], '+'.join(spec['keys']), '중복 키'))
+        bad |= dup
+
+    for col in spec['numeric']:
+        raw = df[col]
+        if raw.dtype == object or pd.api.types.is_string_dtype(raw):
+            raw = raw.astype(str).str.strip().str.replace(',', '', regex=False)
+        values = pd.to_numeric(raw, errors='coerce')
+        not_number = values.isna()
+        found.append(_errors(row_no[not_number], col, '숫자가 아님'))
+        bad |= not_number
+        if col in spec.get('integer', []):
+            fractional = ~not_number & (values % 1 != 0)
+            found.append(_errors(row_no[fractional], col, '정수가 아님'))
+            bad |= fractional
+        if col in spec.get('non_negative', []):
+            negative = ~not_number & (values < 0)
+            found.append(_errors(row_no[negative], col, '음수일 수 없음'))
+            bad |= negative
+        df[col] = values
+
+    if kind == 'transactions':
+        wrong_type = ~df['item_type'].isin(ITEM_TYPES)
+        found.append(_errors(row_no[wrong_type], 'item_type', f"{'/'.join(ITEM_TYPES)} 중 하나여야 함"))
+        stamps = pd.to_datetime(df['timestamp'], errors='coerce', format='mixed')
+        bad_time = stamps.isna()
+        found.append(_errors(row_no[bad_time], 'timestamp', '날짜/시각 형식 아님'))
+        bad |= wrong_type | bad_time
+        df['timestamp'] = stamps.dt.strftime(TIMESTAMP_FORMAT)
+
+    errors = pd.concat(found, ignore_index=True).astype({'행': 'int64'})
+    errors = errors.sort_values('행', kind='stable').reset_index(drop=True)
+    clean = df[~bad].reset_index(drop=True)
+    for col in spec.get('integer', []):
+        clean[col] = clean[col].astype('int64')
+    return clean, errors
+
+
+def import_table(kind, source, fmt=None):
+    """
+    파일을 검사한 뒤 오류가 없으면 저장소에 한 번에 기록
+
+    기존 품목(같은 키)은 파일 값으로 바뀌고 새 품목은 추가된다 (파일에 없는 품목은 그대로).
+    오류가 하나라도 있으면 아무것도 기록하지 않는다.
+
+    Returns:
+        dict: {'rows': 기록한 행 수, 'errors': 오류 DataFrame}
+    """
+    clean, errors = validate_import(kind, read_table(source, fmt))
+    if not errors.empty or clean.empty:
+        return {'rows': 0, 'errors': errors}
+
+    storage.get_function(KINDS[kind]['save'])(clean)
+    return {'rows': len(clean), 'errors': errors}
+
+
+# ==================== 내보내기 ====================
+
+def _open_binary(dest):
+    """경로면 파일을 열고, 파일 객체면 그대로 (닫을 필요 여부와 함께) 반환"""
+    if isinstance(dest, (str, os.PathLike)):
+        return open(dest, 'wb'), True
+    return dest, False
+
+
+def _write_csv(chunks, out):
+    first = True
+    for chunk in chunks:
+        # 첫 묶음에만 머리글과 BOM(엑셀에서 한글이 깨지지 않도록)
+        out.write(chunk.to_csv(index=False, header=first).encode('utf-8-sig' if first else 'utf-8'))
+        first = False
+
+
+def _write_parquet(chunks, out):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(out, schema, compression='zstd')
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_xlsx(chunks, out, sheet_name):
+    openpyxl = _require_openpyxl()
+    # write_only 모드는 행을 바로 파일 스트림에 쓰므로 메모리 사용량이 행 수와 무관하다
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet(sheet_name)
+    first = True
+    for chunk in chunks:
+        if first:
+            sheet.append([str(c) for c in chunk.columns])
+            first = False
+        for row in chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None):
+            sheet.append(list(row))
+    workbook.save(out)
+
+
+def _chunks_with_header(kind, chunk_size, counter):
+    """저장소 묶음을 차례로 내보내되, 비어 있으면 머리글용 빈 프레임 1개를 낸다"""
+    columns = KINDS[kind]['columns']
+    empty = True
+    for chunk in storage.get_function('iter_table')(kind, chunk_size):
+        if chunk.empty:
+            continue
+        empty = False
+        counter['rows'] += len(chunk)
+        yield chunk[columns]
+    if empty:
+        yield pd.DataFrame(columns=columns)
+
+
+def export_table(kind, dest, fmt=None, chunk_size=5000):
+    """
+    저장소의 표를 파일로 내보내기 (chunk_size행씩 읽어 바로 씀)
+
+    Args:
+        kind: 'roll' / 'cut' / 'raw' / 'workflow' / 'transactions'
+        dest: 파일 경로 또는 쓰기 가능한 바이너리 파일 객체 (예: io.BytesIO)
+        fmt: 'csv' / 'xlsx' / 'parquet' (없으면 dest 확장자)
+
+    Returns:
+        int: 내보낸 행 수
+    """
+    fmt = _format_of(dest, fmt)
+    if fmt == 'xlsx':
+        _require_openpyxl()
+    counter = {'rows': 0}
+    chunks = _chunks_with_header(kind, chunk_size, counter)
+    out, owned = _open_binary(dest)
+    try:
+        if fmt == 'csv':
+            _write_csv(chunks, out)
+        elif fmt == 'parquet':
+            _write_parquet(chunks, out)
+        else:
+            _write_xlsx(chunks, out, KINDS[kind]['label'])
+    finally:
+        if owned:
+            out.close()
+    return counter['rows']
+
+
+def export_bytes(kind, fmt, chunk_size=5000):
+    """다운로드 버튼용: 내보낸 파일 내용(bytes)과 행 수"""
+    buffer = io.BytesIO()
+    rows = export_table(kind, buffer, fmt, chunk_size)
+    return buffer.getvalue(), rows
@@ -3,48 +3,102 @@
 """
 import sqlite3
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 import pandas as pd
+from frame_diff import diff_frame, remember_snapshot
+import instrumentation
+import ledger_archive
+import paging
 
 # 데이터베이스 파일 경로
 DB_PATH = os.path.join(os.path.dirname(__file__), 'inventory.db')
 
+# 커넥션 튜닝 값
+CACHE_SIZE_KB = 20000           # 페이지 캐시 (약 20MB)
+MMAP_SIZE = 256 * 1024 * 1024   # 메모리 맵 I/O (256MB)
+CACHED_STATEMENTS = 256         # 커넥션별 prepared statement 캐시 크기
 
-def init_db():
-    """데이터베이스 초기화 - 테이블 생성"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # 롤 재고 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS roll_inventory (
+# 화면(데이터프레임) 컬럼 구성
+ROLL_COLUMNS = ['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)', '최근업데이트']
+CUT_COLUMNS = ['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)', '최근업데이트']
+RAW_COLUMNS = ['품명', 'Grade', '현재고_kg', '입고일', '비고']
+
+# update_*_item 인자명(DB 컬럼명/화면 컬럼명) -> DB 컬럼명
+ROLL_FIELDS = {
+    '두께_mm': '두께_mm', '두께(mm)': '두께_mm',
+    '폭_cm': '폭_cm', '폭(cm)': '폭_cm',
+    '롤길이_m': '롤길이_m', '롤 길이(m)': '롤길이_m',
+    '현재고_롤': '현재고_롤', '현재고(롤)': '현재고_롤',
+}
+CUT_FIELDS = {
+    '업체명': '업체명',
+    '가로_cm': '가로_cm', '가로(cm)': '가로_cm',
+    '세로_cm': '세로_cm', '세로(cm)': '세로_cm',
+    '두께_mm': '두께_mm', '두께(mm)': '두께_mm',
+    '현재고_장': '현재고_장', '현재고(장)': '현재고_장',
+}
+WORKFLOW_COLUMNS = ['작업ID', '업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모', '등록일']
+WORKFLOW_FIELDS = ['업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모']
+WORKFLOW_ARCHIVE_COLUMNS = WORKFLOW_COLUMNS + ['완료일']
+COMPLETED_STATUS = '납품완료'
+
+# 스키마 마이그레이션: (버전, 설명, SQL 목록). 버전 순서대로 한 번씩만 적용된다.
+# 새 마이그레이션은 항상 목록 끝에 다음 버전 번호로 추가한다 (기존 항목 수정 금지).
+MIGRATIONS = [
+    (1, '거래 기록 인덱스: 품목별 기간 조회', [
+        'CREATE INDEX IF NOT EXISTS idx_transactions_item_ts ON transactions (item_type, item_id, timestamp)',
+    ]),
+    (2, '거래 기록 인덱스: 품목유형별 기간 조회', [
+        'CREATE INDEX IF NOT EXISTS idx_transactions_type_ts ON transactions (item_type, timestamp)',
+    ]),
+    (3, '원료 입출고 기록 인덱스: 원료별 기간 조회', [
+        'CREATE INDEX IF NOT EXISTS idx_raw_transactions_item_date ON raw_material_transactions (품명, Grade, 날짜)',
+    ]),
+    (4, '재주문 임계값 인덱스: 품목유형별 조회', [
+        'CREATE INDEX IF NOT EXISTS idx_reorder_levels_type ON reorder_levels (item_type)',
+    ]),
+    (5, '재주문 임계값 키를 (item_type, item_id)로 변경 (롤/재단 ID 충돌 방지, Firestore와 동일)', [
+        '''CREATE TABLE reorder_levels_v5 (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            제품ID TEXT UNIQUE,
-            두께_mm REAL,
-            폭_cm REAL,
-            롤길이_m REAL,
-            현재고_롤 INTEGER,
-            최근업데이트 TEXT
-        )
-    ''')
-    
-    # 재단 재고 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS cut_inventory (
+            item_type TEXT,
+            item_id TEXT,
+            threshold REAL,
+            UNIQUE (item_type, item_id)
+        )''',
+        'INSERT INTO reorder_levels_v5 (item_type, item_id, threshold) SELECT item_type, item_id, threshold FROM reorder_levels',
+        'DROP TABLE reorder_levels',
+        'ALTER TABLE reorder_levels_v5 RENAME TO reorder_levels',
+        'CREATE INDEX IF NOT EXISTS idx_reorder_levels_type ON reorder_levels (item_type)',
+    ]),
+    (6, '재고 스냅샷 테이블 + 거래 기록 시각 인덱스 (월별 보관)', [
+        '''CREATE TABLE IF NOT EXISTS stock_snapshots (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            재단ID TEXT UNIQUE,
-            업체명 TEXT,
-            가로_cm REAL,
-            세로_cm REAL,
-            두께_mm REAL,
-            현재고_장 INTEGER,
-            최근업데이트 TEXT
-        )
-    ''')
-    
-    # 작업 플로우 테이블
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS workflow (
+            taken_at TEXT,
+            item_type TEXT,
+            item_id TEXT,
+            stock REAL,
+            UNIQUE (taken_at, item_type, item_id)
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_transactions_ts ON transactions (timestamp)',
+        'CREATE INDEX IF NOT EXISTS idx_raw_transactions_ts ON raw_material_transactions (timestamp)',
+    ]),
+    (7, '재고 목록 페이지 인덱스: (정렬/필터 컬럼, 품목 ID)', [
+        'CREATE INDEX IF NOT EXISTS idx_roll_stock ON roll_inventory (현재고_롤, 제품ID)',
+        'CREATE INDEX IF NOT EXISTS idx_roll_thickness ON roll_inventory (두께_mm, 제품ID)',
+        'CREATE INDEX IF NOT EXISTS idx_cut_company ON cut_inventory (업체명, 재단ID)',
+        'CREATE INDEX IF NOT EXISTS idx_cut_stock ON cut_inventory (현재고_장, 재단ID)',
+        'CREATE INDEX IF NOT EXISTS idx_raw_name ON raw_materials (품명, 원료ID)',
+        'CREATE INDEX IF NOT EXISTS idx_raw_stock ON raw_materials (현재고_kg, 원료ID)',
+    ]),
+    (8, '롤 규격 인덱스: 두께/폭/길이 범위 검색', [
+        'CREATE INDEX IF NOT EXISTS idx_roll_spec ON roll_inventory (두께_mm, 폭_cm, 롤길이_m)',
+    ]),
+    (9, '작업 상태 인덱스 + 완료일 + 완료 작업 보관 테이블', [
+        "ALTER TABLE workflow ADD COLUMN 완료일 TEXT DEFAULT ''",
+        'CREATE INDEX IF NOT EXISTS idx_workflow_status ON workflow (상태, 완료일)',
+        '''CREATE TABLE IF NOT EXISTS workflow_archive (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             작업ID TEXT UNIQUE,
             업체명 TEXT,
@@ -56,71 +110,325 @@ def init_db():
             우선순위 TEXT,
             납기일 TEXT,
             메모 TEXT,
-            등록일 TEXT
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
-
-    # 추가 테이블: 거래 기록(transactions)과 재주문 임계값(reorder_levels)
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS transactions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            item_type TEXT,
-            item_id TEXT,
-            delta REAL,
-            note TEXT,
-            timestamp TEXT
-        )
-    ''')
+            등록일 TEXT,
+            완료일 TEXT
+        )''',
+        'CREATE INDEX IF NOT EXISTS idx_workflow_archive_done ON workflow_archive (완료일, 작업ID)',
+    ]),
+    (10, '재고 스냅샷에 반영된 마지막 거래 id (스냅샷 이후 거래 구분)', [
+        'ALTER TABLE stock_snapshots ADD COLUMN ledger_id INTEGER',
+    ]),
+]
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS reorder_levels (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            item_type TEXT,
-            item_id TEXT UNIQUE,
-            threshold REAL
-        )
-    ''')
-    conn.commit()
-    conn.close()
+
+# ========== 커넥션 관리 ==========
+
+_local = threading.local()
+
+
+def get_connection():
+    """
+    현재 스레드의 SQLite 커넥션 반환
+
+    스레드당 하나의 커넥션을 재사용하며(prepared statement 캐시 유지), DB_PATH가 바뀌면 새로 연결한다.
+    WAL + synchronous=NORMAL로 커밋마다의 fsync 비용을 줄인다.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.path != DB_PATH:
+        if conn is not None:
+            conn.close()
+        conn = sqlite3.connect(DB_PATH, cached_statements=CACHED_STATEMENTS, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        _local.conn = conn
+        _local.path = DB_PATH
+        _local.depth = 0
+        _local.failed = False
+    return conn
+
+
+def close_connection():
+    """현재 스레드의 커넥션 닫기"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+@contextmanager
+def transaction():
+    """
+    여러 작업을 하나의 트랜잭션으로 묶는 컨텍스트 매니저
+
+    중첩해서 사용할 수 있으며 가장 바깥 블록이 끝날 때 한 번만 커밋한다.
+    블록 안에서 예외가 발생하면 (안쪽에서 잡혔더라도) 가장 바깥에서 전체를 롤백한다.
+
+        with transaction():
+            adjust_roll_stock('V-001', -1, note='출고')
+            adjust_cut_stock('C-001', 10, note='입고')
+    """
+    conn = get_connection()
+    _local.depth += 1
+    try:
+        yield conn
+    except BaseException:
+        _local.failed = True
+        raise
+    finally:
+        _local.depth -= 1
+        if _local.depth == 0:
+            if _local.failed:
+                conn.rollback()
+            else:
+                conn.commit()
+            _local.failed = False
+
+
+def init_db():
+    """데이터베이스 초기화 - 테이블 생성"""
+    with transaction() as conn:
+        cursor = conn.cursor()
+
+        # 롤 재고 테이블
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS roll_inventory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                제품ID TEXT UNIQUE,
+                두께_mm REAL,
+                폭_cm REAL,
+                롤길이_m REAL,
+                현재고_롤 INTEGER,
+                최근업데이트 TEXT
+            )
+        ''')
+
+        # 재단 재고 테이블
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS cut_inventory (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                재단ID TEXT UNIQUE,
+                업체명 TEXT,
+                가로_cm REAL,
+                세로_cm REAL,
+                두께_mm REAL,
+                현재고_장 INTEGER,
+                최근업데이트 TEXT
+            )
+        ''')
+
+        # 작업 플로우 테이블
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS workflow (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                작업ID TEXT UNIQUE,
+                업체명 TEXT,
+                제품규격 TEXT,
+                수량 INTEGER,
+                단위 TEXT,
+                담당자 TEXT,
+                상태 TEXT,
+                우선순위 TEXT,
+                납기일 TEXT,
+                메모 TEXT,
+                등록일 TEXT
+            )
+        ''')
+
+        # 추가 테이블: 거래 기록(transactions)과 재주문 임계값(reorder_levels)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_type TEXT,
+                item_id TEXT,
+                delta REAL,
+                note TEXT,
+                timestamp TEXT
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS reorder_levels (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                item_type TEXT,
+                item_id TEXT UNIQUE,
+                threshold REAL
+            )
+        ''')
+
+        # 원료 재고 및 원료 입출고 기록 (firebase_db와 동일한 구조)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS raw_materials (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                원료ID TEXT UNIQUE,
+                품명 TEXT,
+                Grade TEXT,
+                현재고_kg REAL,
+                입고일 TEXT,
+                비고 TEXT
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS raw_material_transactions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                품명 TEXT,
+                Grade TEXT,
+                수량변경 REAL,
+                구분 TEXT,
+                날짜 TEXT,
+                timestamp TEXT
+            )
+        ''')
+
+        # 월별 사용량 집계(rollup): 거래 기록 시 같은 커밋에서 갱신
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'usage_monthly'")
+        rollup_exists = cursor.fetchone() is not None
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS usage_monthly (
+                item_type TEXT,
+                item_id TEXT,
+                month TEXT,
+                usage REAL,
+                PRIMARY KEY (item_type, item_id, month)
+            )
+        ''')
+
+        # 기존 DB에 집계 테이블이 새로 생긴 경우 거래 기록으로부터 채운다
+        if not rollup_exists:
+            rebuild_usage_monthly()
+
+    migrate()
+
+
+def get_schema_version():
+    """적용된 마지막 마이그레이션 버전 (없으면 0)"""
+    conn = get_connection()
+    exists = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'").fetchone()
+    if exists is None:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate():
+    """
+    아직 적용되지 않은 마이그레이션을 순서대로 적용 (앱 시작 시 여러 번 호출해도 안전)
+
+    BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡으므로 여러 프로세스가 동시에 시작해도 한 곳에서만 적용된다.
+
+    Returns:
+        list: 이번에 적용된 버전 목록
+    """
+    applied = []
+    with transaction() as conn:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT,
+                applied_at TEXT
+            )
+        ''')
+        current = conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+        for version, description, statements in MIGRATIONS:
+            if version <= current:
+                continue
+            for sql in statements:
+                conn.execute(sql)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            applied.append(version)
+    return applied
 
 
 def load_roll_inventory():
     """롤 재고 데이터 로드"""
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query("SELECT * FROM roll_inventory", conn)
-    conn.close()
-    
+    df = pd.read_sql_query("SELECT * FROM roll_inventory", get_connection())
+
     if df.empty:
-        return pd.DataFrame(columns=['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)', '최근업데이트'])
-    
-    # 컬럼명 변환
-    df = df.rename(columns={
-        '두께_mm': '두께(mm)',
-        '폭_cm': '폭(cm)',
-        '롤길이_m': '롤 길이(m)',
-        '현재고_롤': '현재고(롤)'
-    })
-    return df[['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)', '최근업데이트']]
+        df = pd.DataFrame(columns=ROLL_COLUMNS)
+    else:
+        # 컬럼명 변환
+        df = df.rename(columns={
+            '두께_mm': '두께(mm)',
+            '폭_cm': '폭(cm)',
+            '롤길이_m': '롤 길이(m)',
+            '현재고_롤': '현재고(롤)'
+        })[ROLL_COLUMNS]
+    # 저장 시 변경분만 쓰도록 로드 시점 상태를 기록
+    remember_snapshot(df, df['제품ID'], ROLL_COLUMNS)
+    return df
+
+
+def _add_usage(cursor, item_type, item_id, month, delta):
+    """출고(음수 delta)를 월별 사용량 집계에 반영. 호출자가 커밋한다."""
+    if delta >= 0:
+        return
+    cursor.execute('''
+        INSERT INTO usage_monthly (item_type, item_id, month, usage) VALUES (?, ?, ?, ?)
+        ON CONFLICT (item_type, item_id, month) DO UPDATE SET usage = usage + excluded.usage
+    ''', (item_type, item_id, month, -delta))
+
+
+def _record_transaction(item_type, item_id, delta, note=""):
+    """거래 기록과 월별 사용량 집계를 하나의 커밋으로 저장"""
+    now = datetime.now()
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO transactions (item_type, item_id, delta, note, timestamp) VALUES (?, ?, ?, ?, ?)",
+            (item_type, item_id, delta, note, now.strftime("%Y-%m-%d %H:%M:%S"))
+        )
+        _add_usage(cursor, item_type, item_id, now.strftime("%Y-%m"), delta)
 
 
 def record_roll_transaction(item_id, delta, note=""):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO transactions (item_type, item_id, delta, note, timestamp) VALUES (?, ?, ?, ?, ?)",
-        ('roll', item_id, delta, note, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    )
-    conn.commit()
-    conn.close()
+    _record_transaction('roll', item_id, delta, note)
 
 
-def get_monthly_usage_roll(item_id, year=None, month=None):
-    """주어진 연/월의 사용량(출고)을 합산해서 반환. 기본은 현재 달."""
+def _adjust_and_record(table, id_col, stock_col, item_type, item_id, delta, note):
+    """단일 행 조건부 UPDATE(음수 재고 거부) + 거래 기록을 하나의 커밋으로 처리"""
+    now = datetime.now()
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"UPDATE {table} SET {stock_col} = {stock_col} + ?, 최근업데이트 = ? WHERE {id_col} = ? AND {stock_col} + ? >= 0",
+            (delta, now.strftime("%Y-%m-%d %H:%M"), item_id, delta)
+        )
+        updated = cursor.rowcount
+        cursor.execute(f"SELECT {stock_col} FROM {table} WHERE {id_col} = ?", (item_id,))
+        row = cursor.fetchone()
+        if row is None:
+            raise KeyError(f"{id_col} {item_id} 없음")
+        if updated == 0:
+            raise ValueError(f"{stock_col}은 음수일 수 없습니다 (현재고: {row[0]}, 변경: {delta})")
+
+        cursor.execute(
+            "INSERT INTO transactions (item_type, item_id, delta, note, timestamp) VALUES (?, ?, ?, ?, ?)",
+            (item_type, item_id, delta, note, now.strftime("%Y-%m-%d %H:%M:%S"))
+        )
+        _add_usage(cursor, item_type, item_id, now.strftime("%Y-%m"), delta)
+        return row[0]
+
+
+def adjust_roll_stock(item_id, delta, note=""):
+    """롤 재고 증감 + 거래 기록을 하나의 트랜잭션으로 처리. 변경 후 재고 반환"""
+    return _adjust_and_record('roll_inventory', '제품ID', '현재고_롤', 'roll', item_id, delta, note)
+
+
+def adjust_cut_stock(item_id, delta, note=""):
+    """재단 재고 증감 + 거래 기록을 하나의 트랜잭션으로 처리. 변경 후 재고 반환"""
+    return _adjust_and_record('cut_inventory', '재단ID', '현재고_장', 'cut', item_id, delta, note)
+
+
+def _month_range(year=None, month=None):
+    """연/월의 [시작, 끝) 구간 반환. 기본은 현재 달."""
     if year is None or month is None:
         now = datetime.now()
         year = now.year
@@ -131,230 +439,611 @@ def get_monthly_usage_roll(item_id, year=None, month=None):
         end = datetime(year + 1, 1, 1)
     else:
         end = datetime(year, month + 1, 1)
+    return start, end
+
+
+def get_monthly_usage_roll(item_id, year=None, month=None):
+    """주어진 연/월의 사용량(출고)을 합산해서 반환. 기본은 현재 달."""
+    return _get_monthly_usage('roll', item_id, year, month)
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT SUM(-delta) FROM transactions WHERE item_type = ? AND item_id = ? AND delta < 0 AND timestamp >= ? AND timestamp < ?",
-        ('roll', item_id, start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S"))
-    )
-    res = cursor.fetchone()[0]
-    conn.close()
-    return float(res) if res is not None else 0.0
+
+def _get_monthly_usage(item_type, item_id, year=None, month=None):
+    """월별 사용량 집계 테이블에서 단건 조회 (거래 기록 크기와 무관)"""
+    start, _ = _month_range(year, month)
+
+    row = get_connection().execute(
+        "SELECT usage FROM usage_monthly WHERE item_type = ? AND item_id = ? AND month = ?",
+        (item_type, item_id, start.strftime("%Y-%m"))
+    ).fetchone()
+    return float(row[0]) if row is not None else 0.0
 
 
 def record_cut_transaction(item_id, delta, note=""):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO transactions (item_type, item_id, delta, note, timestamp) VALUES (?, ?, ?, ?, ?)",
-        ('cut', item_id, delta, note, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-    )
-    conn.commit()
-    conn.close()
+    _record_transaction('cut', item_id, delta, note)
 
 
 def get_monthly_usage_cut(item_id, year=None, month=None):
-    if year is None or month is None:
-        now = datetime.now()
-        year = now.year
-        month = now.month
+    return _get_monthly_usage('cut', item_id, year, month)
 
-    start = datetime(year, month, 1)
-    if month == 12:
-        end = datetime(year + 1, 1, 1)
-    else:
-        end = datetime(year, month + 1, 1)
 
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(
+def get_monthly_usage_bulk(item_type, year=None, month=None):
+    """item_type('roll'/'cut'/'raw') 전체 품목의 월 사용량을 한 번의 쿼리로 조회.
+
+    Returns:
+        dict: {item_id: 사용량} (사용 기록이 없는 품목은 포함되지 않음)
+    """
+    start, _ = _month_range(year, month)
+
+    rows = get_connection().execute(
+        "SELECT item_id, usage FROM usage_monthly WHERE item_type = ? AND month = ?",
+        (item_type, start.strftime("%Y-%m"))
+    ).fetchall()
+    return {item_id: float(total) for item_id, total in rows if total is not None}
+
+
+def get_usage_between(item_type, item_id, start, end):
+    """
+    [start, end) 구간의 사용량(출고) 합계를 거래 기록에서 직접 조회 (idx_transactions_item_ts 사용)
+    보관(ledger_archive)된 달이 구간에 있으면 보관 파일도 함께 합산한다.
+    """
+    row = get_connection().execute(
         "SELECT SUM(-delta) FROM transactions WHERE item_type = ? AND item_id = ? AND delta < 0 AND timestamp >= ? AND timestamp < ?",
-        ('cut', item_id, start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S"))
-    )
-    res = cursor.fetchone()[0]
-    conn.close()
-    return float(res) if res is not None else 0.0
+        (item_type, item_id, start.strftime("%Y-%m-%d %H:%M:%S"), end.strftime("%Y-%m-%d %H:%M:%S"))
+    ).fetchone()
+    hot = float(row[0]) if row[0] is not None else 0.0
+    return hot + ledger_archive.archived_usage(item_type, item_id, start, end)
+
+
+def rebuild_usage_monthly():
+    """월별 사용량 집계를 거래 기록(transactions, raw_material_transactions)으로부터 재생성"""
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM usage_monthly")
+        cursor.execute('''
+            INSERT INTO usage_monthly (item_type, item_id, month, usage)
+            SELECT item_type, item_id, substr(timestamp, 1, 7), SUM(-delta)
+            FROM transactions
+            WHERE delta < 0
+            GROUP BY item_type, item_id, substr(timestamp, 1, 7)
+        ''')
+        cursor.execute('''
+            INSERT INTO usage_monthly (item_type, item_id, month, usage)
+            SELECT 'raw', 품명 || '_' || Grade, substr(날짜, 1, 7), SUM(-수량변경)
+            FROM raw_material_transactions
+            WHERE 수량변경 < 0
+            GROUP BY 품명, Grade, substr(날짜, 1, 7)
+        ''')
+        # 보관 파일로 옮겨진 기록의 사용량
+        cursor.executemany('''
+            INSERT INTO usage_monthly (item_type, item_id, month, usage) VALUES (?, ?, ?, ?)
+            ON CONFLICT (item_type, item_id, month) DO UPDATE SET usage = usage + excluded.usage
+        ''', [(t, i, m, usage) for (t, i, m), usage in ledger_archive.archived_monthly_usage().items()])
 
 
 def set_reorder_level(item_type, item_id, threshold):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT OR REPLACE INTO reorder_levels (item_type, item_id, threshold)
-        VALUES (?, ?, ?)
-    ''', (item_type, item_id, threshold))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute('''
+            INSERT OR REPLACE INTO reorder_levels (item_type, item_id, threshold)
+            VALUES (?, ?, ?)
+        ''', (item_type, item_id, threshold))
+
+
+def set_reorder_levels(item_type, thresholds):
+    """여러 품목의 재주문 임계값을 한 트랜잭션(executemany)으로 설정. thresholds: {item_id: 임계값}"""
+    with transaction() as conn:
+        conn.executemany('''
+            INSERT OR REPLACE INTO reorder_levels (item_type, item_id, threshold)
+            VALUES (?, ?, ?)
+        ''', [(item_type, str(item_id), float(threshold)) for item_id, threshold in thresholds.items()])
 
 
 def get_reorder_level(item_type, item_id):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('SELECT threshold FROM reorder_levels WHERE item_type = ? AND item_id = ?', (item_type, item_id))
-    row = cursor.fetchone()
-    conn.close()
+    row = get_connection().execute(
+        'SELECT threshold FROM reorder_levels WHERE item_type = ? AND item_id = ?', (item_type, item_id)
+    ).fetchone()
     return float(row[0]) if row is not None else None
 
 
+def load_reorder_levels(item_type, item_ids=None):
+    """item_type의 재주문 임계값을 한 번에 조회. {item_id: threshold} 반환
+
+    item_ids가 주어지면 해당 품목만 남긴다.
+    """
+    rows = get_connection().execute(
+        'SELECT item_id, threshold FROM reorder_levels WHERE item_type = ?', (item_type,)
+    ).fetchall()
+
+    wanted = None if item_ids is None else {str(i) for i in item_ids}
+    return {item_id: float(thr) for item_id, thr in rows
+            if thr is not None and (wanted is None or item_id in wanted)}
+
+
 def save_roll_inventory(df):
-    """롤 재고 데이터 저장"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    for _, row in df.iterrows():
-        # 재고는 음수일 수 없음
-        if float(row['현재고(롤)']) < 0:
-            conn.close()
-            raise ValueError("현재고(롤)은 음수일 수 없습니다")
+    """롤 재고 데이터 저장 (load_roll_inventory 이후 변경/추가된 행만 기록)"""
+    # 재고는 음수일 수 없음
+    if (pd.to_numeric(df['현재고(롤)']) < 0).any():
+        raise ValueError("현재고(롤)은 음수일 수 없습니다")
 
-        cursor.execute('''
+    changed = diff_frame(df, df['제품ID'], ROLL_COLUMNS)
+
+    with transaction() as conn:
+        conn.executemany('''
             INSERT OR REPLACE INTO roll_inventory (제품ID, 두께_mm, 폭_cm, 롤길이_m, 현재고_롤, 최근업데이트)
             VALUES (?, ?, ?, ?, ?, ?)
-        ''', (row['제품ID'], row['두께(mm)'], row['폭(cm)'], row['롤 길이(m)'], row['현재고(롤)'], row['최근업데이트']))
-    
-    conn.commit()
-    conn.close()
+        ''', changed[ROLL_COLUMNS].astype(object).itertuples(index=False, name=None))
+
+    remember_snapshot(df, df['제품ID'], ROLL_COLUMNS)
+
+
+def _update_row(table, id_col, item_id, fields, stock_col):
+    """단일 행 UPDATE (전체 테이블을 읽지 않음)"""
+    if stock_col in fields and float(fields[stock_col]) < 0:
+        raise ValueError(f"{stock_col}은 음수일 수 없습니다")
+    fields['최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+    with transaction() as conn:
+        cursor = conn.execute(
+            f"UPDATE {table} SET {', '.join(f'{col} = ?' for col in fields)} WHERE {id_col} = ?",
+            list(fields.values()) + [item_id]
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(f"{id_col} {item_id} 없음")
 
 
 def update_roll_item(product_id, **kwargs):
-    df = load_roll_inventory()
-    if product_id not in df['제품ID'].values:
-        raise KeyError(f"제품ID {product_id} 없음")
-    idx = df[df['제품ID'] == product_id].index[0]
-    for k, v in kwargs.items():
-        if k == '두께_mm' or k == '두께(mm)':
-            df.loc[idx, '두께(mm)'] = v
-        elif k == '폭_cm' or k == '폭(cm)':
-            df.loc[idx, '폭(cm)'] = v
-        elif k == '롤길이_m' or k == '롤 길이(m)':
-            df.loc[idx, '롤 길이(m)'] = v
-        elif k == '현재고_롤' or k == '현재고(롤)':
-            df.loc[idx, '현재고(롤)'] = v
-    df.loc[idx, '최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
-    save_roll_inventory(df)
+    fields = {ROLL_FIELDS[k]: v for k, v in kwargs.items() if k in ROLL_FIELDS}
+    _update_row('roll_inventory', '제품ID', product_id, fields, '현재고_롤')
 
 
 def delete_roll_item(product_id):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM roll_inventory WHERE 제품ID = ?', (product_id,))
-    conn.commit()
-    conn.close()
+    with transaction() as conn:
+        conn.execute('DELETE FROM roll_inventory WHERE 제품ID = ?', (product_id,))
+
+
+def find_rolls_by_spec(thickness=None, width=None, length=None):
+    """
+    두께/폭/길이 범위((최소, 최대), None이면 제한 없음)에 맞는 롤 (두께, 폭, 길이 순)
+    (두께_mm, 폭_cm, 롤길이_m) 인덱스로 두께 구간만 훑는다.
+    """
+    conditions, params = [], []
+    for col, bounds in (('두께_mm', thickness), ('폭_cm', width), ('롤길이_m', length)):
+        low, high = bounds or (None, None)
+        if low is not None and low == high:
+            # 같은 값이면 = 조건으로 두어 다음 인덱스 컬럼(폭, 길이)까지 범위 검색에 쓰이게 한다
+            conditions.append(f'{col} = ?')
+            params.append(float(low))
+            continue
+        if low is not None:
+            conditions.append(f'{col} >= ?')
+            params.append(float(low))
+        if high is not None:
+            conditions.append(f'{col} <= ?')
+            params.append(float(high))
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    return pd.read_sql_query(
+        f'SELECT {PAGE_TABLES["roll"][1]} FROM roll_inventory {where} '
+        'ORDER BY 두께_mm, 폭_cm, 롤길이_m, 제품ID', get_connection(), params=params)
 
 
 def load_cut_inventory():
     """재단 재고 데이터 로드"""
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query("SELECT * FROM cut_inventory", conn)
-    conn.close()
-    
+    df = pd.read_sql_query("SELECT * FROM cut_inventory", get_connection())
+
     if df.empty:
-        return pd.DataFrame(columns=['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)', '최근업데이트'])
-    
-    df = df.rename(columns={
-        '가로_cm': '가로(cm)',
-        '세로_cm': '세로(cm)',
-        '두께_mm': '두께(mm)',
-        '현재고_장': '현재고(장)'
-    })
-    return df[['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)', '최근업데이트']]
+        df = pd.DataFrame(columns=CUT_COLUMNS)
+    else:
+        df = df.rename(columns={
+            '가로_cm': '가로(cm)',
+            '세로_cm': '세로(cm)',
+            '두께_mm': '두께(mm)',
+            '현재고_장': '현재고(장)'
+        })[CUT_COLUMNS]
+    remember_snapshot(df, df['재단ID'], CUT_COLUMNS)
+    return df
 
 
 def save_cut_inventory(df):
-    """재단 재고 데이터 저장"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    for _, row in df.iterrows():
-        # 재고는 음수일 수 없음
-        if float(row['현재고(장)']) < 0:
-            conn.close()
-            raise ValueError("현재고(장)은 음수일 수 없습니다")
+    """재단 재고 데이터 저장 (load_cut_inventory 이후 변경/추가된 행만 기록)"""
+    # 재고는 음수일 수 없음
+    if (pd.to_numeric(df['현재고(장)']) < 0).any():
+        raise ValueError("현재고(장)은 음수일 수 없습니다")
 
-        cursor.execute('''
+    changed = diff_frame(df, df['재단ID'], CUT_COLUMNS)
+
+    with transaction() as conn:
+        conn.executemany('''
             INSERT OR REPLACE INTO cut_inventory (재단ID, 업체명, 가로_cm, 세로_cm, 두께_mm, 현재고_장, 최근업데이트)
             VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (row['재단ID'], row['업체명'], row['가로(cm)'], row['세로(cm)'], row['두께(mm)'], row['현재고(장)'], row['최근업데이트']))
-    
-    conn.commit()
-    conn.close()
+        ''', changed[CUT_COLUMNS].astype(object).itertuples(index=False, name=None))
+
+    remember_snapshot(df, df['재단ID'], CUT_COLUMNS)
 
 
 def update_cut_item(item_id, **kwargs):
-    df = load_cut_inventory()
-    if item_id not in df['재단ID'].values:
-        raise KeyError(f"재단ID {item_id} 없음")
-    idx = df[df['재단ID'] == item_id].index[0]
-    for k, v in kwargs.items():
-        # kwargs use DB column names (업체명, 가로_cm etc)
-        if k in ['업체명', '가로_cm', '세로_cm', '두께_mm', '현재고_장']:
-            # map to display columns if necessary
-            if k == '업체명':
-                df.loc[idx, '업체명'] = v
-            elif k == '가로_cm':
-                df.loc[idx, '가로(cm)'] = v
-            elif k == '세로_cm':
-                df.loc[idx, '세로(cm)'] = v
-            elif k == '두께_mm':
-                df.loc[idx, '두께(mm)'] = v
-            elif k == '현재고_장':
-                df.loc[idx, '현재고(장)'] = v
-    df.loc[idx, '최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
-    save_cut_inventory(df)
+    # kwargs use DB column names (업체명, 가로_cm etc)
+    fields = {CUT_FIELDS[k]: v for k, v in kwargs.items() if k in CUT_FIELDS}
+    _update_row('cut_inventory', '재단ID', item_id, fields, '현재고_장')
 
 
 def delete_cut_item(item_id):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute('DELETE FROM cut_inventory WHERE 재단ID = ?', (item_id,))
-    conn.commit()
-    conn.close()
-
-
-def load_workflow():
-    """작업 플로우 데이터 로드"""
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query("SELECT * FROM workflow", conn)
-    conn.close()
-    
+    with transaction() as conn:
+        conn.execute('DELETE FROM cut_inventory WHERE 재단ID = ?', (item_id,))
+
+
+def load_workflow(statuses=None):
+    """작업 플로우 데이터 로드 (statuses: 이 상태의 작업만, (상태, 완료일) 인덱스 사용)"""
+    if statuses is None:
+        df = pd.read_sql_query("SELECT * FROM workflow", get_connection())
+    else:
+        statuses = list(statuses)
+        df = pd.read_sql_query(f"SELECT * FROM workflow WHERE 상태 IN ({', '.join('?' * len(statuses))})",
+                               get_connection(), params=statuses)
+
     if df.empty:
-        return pd.DataFrame(columns=['작업ID', '업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모', '등록일'])
-    
-    return df[['작업ID', '업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모', '등록일']]
+        df = pd.DataFrame(columns=WORKFLOW_COLUMNS)
+    else:
+        df = df[WORKFLOW_COLUMNS]
+    # 저장 시 변경분만 쓰도록 로드 시점 상태를 기록
+    remember_snapshot(df, df['작업ID'], WORKFLOW_COLUMNS)
+    return df
 
 
 def save_workflow(df):
-    """작업 플로우 데이터 저장"""
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    # 기존 데이터 삭제 후 새로 저장
-    cursor.execute("DELETE FROM workflow")
-    
-    for _, row in df.iterrows():
-        cursor.execute('''
-            INSERT INTO workflow (작업ID, 업체명, 제품규격, 수량, 단위, 담당자, 상태, 우선순위, 납기일, 메모, 등록일)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (row['작업ID'], row['업체명'], row['제품규격'], row['수량'], row['단위'], 
-              row['담당자'], row['상태'], row['우선순위'], row['납기일'], row['메모'], row['등록일']))
-    
-    conn.commit()
-    conn.close()
+    """작업 플로우 데이터 저장 (load_workflow 이후 변경/추가된 작업만 기록)"""
+    changed = diff_frame(df, df['작업ID'], WORKFLOW_COLUMNS)
+
+    with transaction() as conn:
+        cursor = conn.cursor()
+        rows = changed[WORKFLOW_COLUMNS].astype({'수량': int}).astype(object)
+        ids = rows['작업ID'].tolist()
+        existing = set()
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            cursor.execute(f"SELECT 작업ID FROM workflow WHERE 작업ID IN ({', '.join('?' * len(chunk))})", chunk)
+            existing.update(r[0] for r in cursor.fetchall())
+
+        updates = [values + [work_id] for work_id, *values in rows.itertuples(index=False, name=None) if work_id in existing]
+        inserts = [row for row in rows.itertuples(index=False, name=None) if row[0] not in existing]
+        cursor.executemany(
+            f"UPDATE workflow SET {', '.join(f'{col} = ?' for col in WORKFLOW_COLUMNS[1:])} WHERE 작업ID = ?", updates
+        )
+        # 새 작업은 일반 INSERT (같은 작업ID가 두 번 들어오면 UNIQUE 제약으로 IntegrityError)
+        cursor.executemany(
+            f"INSERT INTO workflow ({', '.join(WORKFLOW_COLUMNS)}) VALUES ({', '.join('?' * len(WORKFLOW_COLUMNS))})", inserts
+        )
+
+    remember_snapshot(df, df['작업ID'], WORKFLOW_COLUMNS)
 
 
 def update_workflow_item(work_id, **kwargs):
-    df = load_workflow()
-    if work_id not in df['작업ID'].values:
-        raise KeyError(f"작업ID {work_id} 없음")
-    idx = df[df['작업ID'] == work_id].index[0]
-    for k, v in kwargs.items():
-        if k in df.columns:
-            df.loc[idx, k] = v
-    save_workflow(df)
+    """작업 1건의 지정 필드만 UPDATE"""
+    fields = {k: (int(v) if k == '수량' else v) for k, v in kwargs.items() if k in WORKFLOW_FIELDS}
+    if not fields:
+        return
+    if '상태' in fields:
+        # 납품완료로 바뀐 날부터 보관 기간을 센다
+        fields['완료일'] = datetime.now().strftime("%Y-%m-%d") if fields['상태'] == COMPLETED_STATUS else ''
+
+    with transaction() as conn:
+        cursor = conn.execute(
+            f"UPDATE workflow SET {', '.join(f'{col} = ?' for col in fields)} WHERE 작업ID = ?",
+            list(fields.values()) + [work_id]
+        )
+        if cursor.rowcount == 0:
+            raise KeyError(f"작업ID {work_id} 없음")
 
 
 def delete_workflow_item(work_id):
-    df = load_workflow()
-    df = df[df['작업ID'] != work_id]
-    save_workflow(df)
+    """작업 삭제 (보관된 작업이면 보관 테이블에서 삭제)"""
+    with transaction() as conn:
+        conn.execute('DELETE FROM workflow WHERE 작업ID = ?', (work_id,))
+        conn.execute('DELETE FROM workflow_archive WHERE 작업ID = ?', (work_id,))
+
+
+def archive_workflow(before):
+    """
+    완료일이 before('YYYY-MM-DD')보다 이른 납품완료 작업을 workflow_archive로 옮긴다
+
+    완료일이 비어 있는 납품완료 작업(이전 버전 데이터, 가져오기)은 오늘을 완료일로 기록만 한다.
+
+    Returns:
+        int: 옮긴 작업 수
+    """
+    columns = ', '.join(WORKFLOW_ARCHIVE_COLUMNS)
+    with transaction() as conn:
+        conn.execute(
+            "UPDATE workflow SET 완료일 = ? WHERE 상태 = ? AND (완료일 IS NULL OR 완료일 = '')",
+            (datetime.now().strftime("%Y-%m-%d"), COMPLETED_STATUS)
+        )
+        conn.execute(
+            f"INSERT OR REPLACE INTO workflow_archive ({columns}) "
+            f"SELECT {columns} FROM workflow WHERE 상태 = ? AND 완료일 < ?",
+            (COMPLETED_STATUS, before)
+        )
+        cursor = conn.execute("DELETE FROM workflow WHERE 상태 = ? AND 완료일 < ?", (COMPLETED_STATUS, before))
+        return cursor.rowcount
+
+
+def load_workflow_archive(limit=50, after=None):
+    """
+    보관된 작업 한 페이지 (완료일 최신순, after: 이전 페이지 마지막 행의 (완료일, 작업ID))
+    """
+    params = []
+    where = ''
+    if after is not None:
+        where = 'WHERE (완료일, 작업ID) < (?, ?)'
+        params.extend(after)
+    query = (f"SELECT {', '.join(WORKFLOW_ARCHIVE_COLUMNS)} FROM workflow_archive {where} "
+             "ORDER BY 완료일 DESC, 작업ID DESC LIMIT ?")
+    return pd.read_sql_query(query, get_connection(), params=params + [limit])
+
+
+def workflow_archive_count():
+    """보관된 작업 수"""
+    return get_connection().execute("SELECT COUNT(*) FROM workflow_archive").fetchone()[0]
+
+
+# --------------------------------------------------------------------------------
+# 원료 재고 관리 함수
+# --------------------------------------------------------------------------------
+
+def load_raw_materials():
+    """원료 재고 데이터 로드"""
+    df = pd.read_sql_query("SELECT * FROM raw_materials", get_connection())
+
+    if df.empty:
+        df = pd.DataFrame(columns=RAW_COLUMNS)
+    else:
+        df = df[RAW_COLUMNS]
+    remember_snapshot(df, _raw_material_keys(df), RAW_COLUMNS)
+    return df
+
+
+def _raw_material_keys(df):
+    """원료ID ('품명_Grade') Series"""
+    return df['품명'].astype(str) + '_' + df['Grade'].astype(str)
+
+
+def save_raw_materials(df):
+    """원료 재고 데이터 저장 (load_raw_materials 이후 변경/추가된 행만 기록)"""
+    keys = _raw_material_keys(df)
+    changed = diff_frame(df, keys, RAW_COLUMNS)
+
+    rows = []
+    for key, (name, grade, stock, in_date, note) in zip(keys.loc[changed.index], changed[RAW_COLUMNS].astype(object).itertuples(index=False, name=None)):
+        # 원료ID는 '품명_Grade' 조합으로 생성하여 유니크하게 관리
+        rows.append((key, name, grade, float(stock), str(in_date), str(note)))
+
+    with transaction() as conn:
+        conn.executemany('''
+            INSERT OR REPLACE INTO raw_materials (원료ID, 품명, Grade, 현재고_kg, 입고일, 비고)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
+
+    remember_snapshot(df, keys, RAW_COLUMNS)
+
+
+def log_raw_material_transaction(product_name, grade, change_amount, transaction_type, date):
+    """원료 입출고 기록 (월별 사용량 집계도 같은 커밋에서 갱신)"""
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO raw_material_transactions (품명, Grade, 수량변경, 구분, 날짜, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            (product_name, grade, float(change_amount), transaction_type, date, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+        _add_usage(cursor, 'raw', f"{product_name}_{grade}", str(date)[:7], float(change_amount))
+
+
+def adjust_raw_material_stock(product_name, grade, delta, transaction_type, date):
+    """원료 재고 증감 + 입출고 기록을 하나의 트랜잭션으로 처리. 변경 후 재고(kg) 반환"""
+    material_id = f"{product_name}_{grade}"
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE raw_materials SET 현재고_kg = 현재고_kg + ? WHERE 원료ID = ? AND 현재고_kg + ? >= 0",
+            (float(delta), material_id, float(delta))
+        )
+        updated = cursor.rowcount
+        cursor.execute("SELECT 현재고_kg FROM raw_materials WHERE 원료ID = ?", (material_id,))
+        row = cursor.fetchone()
+        if row is None:
+            raise KeyError(f"원료 {material_id} 없음")
+        if updated == 0:
+            raise ValueError(f"현재고_kg은 음수일 수 없습니다 (현재고: {row[0]}, 변경: {delta})")
+
+        cursor.execute(
+            "INSERT INTO raw_material_transactions (품명, Grade, 수량변경, 구분, 날짜, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            (product_name, grade, float(delta), transaction_type, date, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+        _add_usage(cursor, 'raw', material_id, str(date)[:7], float(delta))
+        return float(row[0])
+
+
+# ========== 가져오기/내보내기 ==========
+
+# 내보내기 대상: kind -> 표시 컬럼으로 읽는 SELECT (id 순)
+EXPORT_QUERIES = {
+    'roll': '''SELECT 제품ID, 두께_mm AS "두께(mm)", 폭_cm AS "폭(cm)", 롤길이_m AS "롤 길이(m)",
+                      현재고_롤 AS "현재고(롤)", 최근업데이트 FROM roll_inventory ORDER BY id''',
+    'cut': '''SELECT 재단ID, 업체명, 가로_cm AS "가로(cm)", 세로_cm AS "세로(cm)", 두께_mm AS "두께(mm)",
+                     현재고_장 AS "현재고(장)", 최근업데이트 FROM cut_inventory ORDER BY id''',
+    'raw': "SELECT 품명, Grade, 현재고_kg, 입고일, 비고 FROM raw_materials ORDER BY id",
+    'workflow': f"SELECT {', '.join(WORKFLOW_COLUMNS)} FROM workflow ORDER BY id",
+    'transactions': "SELECT item_type, item_id, delta, note, timestamp FROM transactions ORDER BY id",
+}
+
+
+def iter_table(kind, chunk_size=5000):
+    """
+    kind('roll'/'cut'/'raw'/'workflow'/'transactions') 전체를 chunk_size행씩 DataFrame으로 차례로 반환
+    (내보내기용, 전체를 메모리에 올리지 않음)
+    """
+    yield from pd.read_sql_query(EXPORT_QUERIES[kind], get_connection(), chunksize=chunk_size)
+
+
+def import_transactions(df):
+    """
+    거래 기록 일괄 추가 (item_type, item_id, delta, note, timestamp 'YYYY-MM-DD HH:MM:SS')
+    거래 기록과 월별 사용량 집계를 하나의 트랜잭션에서 executemany로 기록한다.
+    """
+    rows = list(df[['item_type', 'item_id', 'delta', 'note', 'timestamp']].astype(
+        {'item_type': str, 'item_id': str, 'delta': float, 'note': str, 'timestamp': str}
+    ).itertuples(index=False, name=None))
+
+    out = df[df['delta'] < 0]
+    usage = (-out['delta']).groupby([out['item_type'], out['item_id'].astype(str), out['timestamp'].str[:7]]).sum()
+
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(
+            "INSERT INTO transactions (item_type, item_id, delta, note, timestamp) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        cursor.executemany('''
+            INSERT INTO usage_monthly (item_type, item_id, month, usage) VALUES (?, ?, ?, ?)
+            ON CONFLICT (item_type, item_id, month) DO UPDATE SET usage = usage + excluded.usage
+        ''', [(t, i, m, float(total)) for (t, i, m), total in usage.items()])
+
+
+# ========== 목록 페이지 ==========
+
+# kind -> (테이블, 표시 컬럼 SELECT 목록, 품목 ID 컬럼, 표시명 -> DB 컬럼)
+PAGE_TABLES = {
+    'roll': ('roll_inventory',
+             '제품ID, 두께_mm AS "두께(mm)", 폭_cm AS "폭(cm)", 롤길이_m AS "롤 길이(m)", '
+             '현재고_롤 AS "현재고(롤)", 최근업데이트',
+             '제품ID', {'제품ID': '제품ID', **ROLL_FIELDS}),
+    'cut': ('cut_inventory',
+            '재단ID, 업체명, 가로_cm AS "가로(cm)", 세로_cm AS "세로(cm)", 두께_mm AS "두께(mm)", '
+            '현재고_장 AS "현재고(장)", 최근업데이트',
+            '재단ID', {'재단ID': '재단ID', **CUT_FIELDS}),
+    'raw': ('raw_materials', '품명, Grade, 현재고_kg, 입고일, 비고', '원료ID',
+            {'품명': '품명', 'Grade': 'Grade', '현재고_kg': '현재고_kg', '입고일': '입고일'}),
+}
+
+
+def _page_where(kind, filters):
+    """필터 dict -> (WHERE 조건 목록, 인자 목록)"""
+    _, _, _, fields = PAGE_TABLES[kind]
+    return [f'{fields[col]} = ?' for col in filters], list(filters.values())
+
+
+def load_inventory_page(kind, sort_by=None, descending=False, filters=None,
+                        limit=paging.DEFAULT_PAGE_SIZE, after=None):
+    """
+    kind('roll'/'cut'/'raw') 목록 한 페이지
+
+    (정렬 컬럼, 품목 ID) 인덱스 순으로 after 다음부터 limit행만 읽는다 (OFFSET 없이 keyset 방식)
+    """
+    sort_by, filters = paging.check_query(kind, sort_by, filters)
+    table, select, id_col, fields = PAGE_TABLES[kind]
+    sort_col = fields[sort_by]
+    conditions, params = _page_where(kind, filters)
+
+    if after is not None:
+        # (정렬 값, ID)가 커서보다 뒤인 행 (행 값 비교)
+        conditions.append(f'({sort_col}, {id_col}) {"<" if descending else ">"} (?, ?)')
+        params.extend(after)
+
+    direction = 'DESC' if descending else 'ASC'
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    query = (f'SELECT {select} FROM {table} {where} '
+             f'ORDER BY {sort_col} {direction}, {id_col} {direction} LIMIT ?')
+    return pd.read_sql_query(query, get_connection(), params=params + [limit])
+
+
+def inventory_summary(kind, filters=None):
+    """kind 목록의 {'count': 품목 수, 'total': 현재고 합계} (필터 적용, 집계 쿼리 1회)"""
+    _, filters = paging.check_query(kind, None, filters)
+    table, _, _, fields = PAGE_TABLES[kind]
+    conditions, params = _page_where(kind, filters)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+    stock_col = fields[paging.PAGE_KINDS[kind]['stock']]
+    count, total = get_connection().execute(
+        f'SELECT COUNT(*), COALESCE(SUM({stock_col}), 0) FROM {table} {where}', params
+    ).fetchone()
+    return {'count': int(count), 'total': float(total)}
+
+
+# ========== 거래 기록 보관 / 재고 스냅샷 ==========
+
+# 원장 -> 조회문 (컬럼은 ledger_archive.LEDGERS와 동일)
+LEDGER_QUERIES = {
+    'transactions': "SELECT CAST(id AS TEXT) AS id, item_type, item_id, delta, note, timestamp FROM transactions",
+    'raw_material_transactions': "SELECT CAST(id AS TEXT) AS id, 품명, Grade, 수량변경, 구분, 날짜, timestamp FROM raw_material_transactions",
+}
+SNAPSHOT_COLUMNS = ['taken_at', 'item_type', 'item_id', 'stock', 'ledger_id']
+# 원장에서 지금까지 발급한 마지막 id (AUTOINCREMENT라 보관으로 지운 id도 다시 쓰지 않는다)
+LAST_LEDGER_ID = "COALESCE((SELECT seq FROM sqlite_sequence WHERE name = '{}'), 0)"
+
+
+def _ledger_table(ledger):
+    """원장 이름 확인 (SQL에 테이블명으로 넣기 전에)"""
+    if ledger not in LEDGER_QUERIES:
+        raise ValueError(f"알 수 없는 원장: {ledger}")
+    return ledger
+
+
+def load_ledger(ledger, start=None, end=None):
+    """운영 DB의 거래 기록 중 timestamp가 [start, end)인 행 (보관 파일 제외, timestamp 순)"""
+    conditions, params = [], []
+    if start is not None:
+        conditions.append("timestamp >= ?")
+        params.append(start.strftime("%Y-%m-%d %H:%M:%S"))
+    if end is not None:
+        conditions.append("timestamp < ?")
+        params.append(end.strftime("%Y-%m-%d %H:%M:%S"))
+    sql = LEDGER_QUERIES[_ledger_table(ledger)]
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    return pd.read_sql_query(sql + " ORDER BY timestamp, rowid", get_connection(), params=params)
+
+
+def oldest_ledger_time(ledger):
+    """가장 오래된 거래 기록 시각 (없으면 None)"""
+    row = get_connection().execute(f"SELECT MIN(timestamp) FROM {_ledger_table(ledger)}").fetchone()
+    return datetime.strptime(row[0][:19], "%Y-%m-%d %H:%M:%S") if row[0] else None
+
+
+def delete_ledger_entries(ledger, ids):
+    """거래 기록 삭제 (보관 후 호출). 삭제한 건수 반환"""
+    table = _ledger_table(ledger)
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.executemany(f"DELETE FROM {table} WHERE id = ?", [(int(i),) for i in ids])
+        return cursor.rowcount
+
+
+def take_stock_snapshot():
+    """
+    롤/재단/원료 현재고를 한 문장으로 stock_snapshots에 기록. 기록 시각 반환
+
+    행마다 그 재고에 반영된 마지막 거래 id(ledger_id: 롤/재단은 transactions, 원료는 raw_material_transactions)를 남긴다.
+    재고 변경과 거래 기록은 같은 커밋에 들어가므로 스냅샷 이후 거래는 id > ledger_id인 기록이다.
+    """
+    taken_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    ledger_id = LAST_LEDGER_ID.format('transactions')
+    raw_ledger_id = LAST_LEDGER_ID.format('raw_material_transactions')
+    with transaction() as conn:
+        conn.execute(f'''
+            INSERT OR REPLACE INTO stock_snapshots (taken_at, item_type, item_id, stock, ledger_id)
+            SELECT ?, 'roll', 제품ID, 현재고_롤, {ledger_id} FROM roll_inventory
+            UNION ALL SELECT ?, 'cut', 재단ID, 현재고_장, {ledger_id} FROM cut_inventory
+            UNION ALL SELECT ?, 'raw', 원료ID, 현재고_kg, {raw_ledger_id} FROM raw_materials
+        ''', (taken_at, taken_at, taken_at))
+    return taken_at
+
+
+def load_stock_snapshot(at=None):
+    """at(기본: 지금) 이전 가장 최근 스냅샷의 품목별 재고 (taken_at, item_type, item_id, stock, ledger_id)"""
+    at = (at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    return pd.read_sql_query(f'''
+        SELECT {', '.join(SNAPSHOT_COLUMNS)} FROM stock_snapshots
+        WHERE taken_at = (SELECT MAX(taken_at) FROM stock_snapshots WHERE taken_at <= ?)
+    ''', get_connection(), params=(at,))
+
+
+# ========== 계측 (instrumentation.py): 함수별 지연 시간, 반환/변경 행 수 ==========
+instrumentation.instrument_module(globals(), 'sqlite', changes=lambda: get_connection().total_changes,
+                                  count_rows=True)
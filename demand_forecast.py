@@ -0,0 +1,136 @@
+# 수요 예측 / 재주문 임계값 제안
+"""
+거래 기록을 한 번 읽어 모든 롤·재단·원료 품목의 일별 사용량 행렬(품목×일)을 만들고,
+이동평균·EWMA·표준편차·재고 일수를 행렬 연산으로 한 번에 계산한다.
+
+제안 임계값(재주문점) = EWMA 일사용량 × 조달 기간 + z × 표준편차 × √조달 기간
+(z: 서비스 수준에 해당하는 정규분포 값, 95% -> 1.645)
+
+통계는 usage_analytics 캐시에 저장되어 새 거래가 기록될 때까지 다시 계산하지 않는다.
+"""
+import math
+from datetime import datetime, timedelta
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+import storage
+import usage_analytics
+
+DEFAULT_LOOKBACK_DAYS = 90
+DEFAULT_SPAN = 14             # EWMA 기간(일)
+DEFAULT_LEAD_TIME_DAYS = 7
+DEFAULT_SERVICE_LEVEL = 0.95
+
+FORECAST_COLUMNS = ['품목ID', '현재고', '일평균 사용량', 'EWMA 사용량', '사용량 표준편차',
+                    '재고 일수', '제안 임계값', '현재 임계값']
+STATS_COLUMNS = ['item_type', 'item_id', 'mean', 'ewma', 'std']
+
+
+def _usage_stats(start, days, span):
+    """[start, start+days) 일별 사용량 행렬에서 품목별 평균/EWMA/표준편차 (모든 품목 구분 한 번에)"""
+    frame = usage_analytics.ledger_frame(start, start + timedelta(days=days))
+    out = frame[frame['delta'] < 0]
+    if out.empty:
+        return pd.DataFrame(columns=STATS_COLUMNS)
+
+    # 품목마다 행 번호, 날짜마다 열 번호를 매겨 np.add.at으로 한 번에 행렬을 채운다
+    groups = out.groupby(['item_type', 'item_id'], observed=True)
+    rows = groups.ngroup().to_numpy()
+    cols = (out['timestamp'] - pd.Timestamp(start)).dt.days.to_numpy()
+    matrix = np.zeros((groups.ngroups, days))
+    np.add.at(matrix, (rows, cols), -out['delta'].to_numpy())
+
+    # EWMA(adjust=True)는 가중치 벡터와의 행렬곱 한 번으로 계산된다
+    alpha = 2.0 / (span + 1.0)
+    weights = (1.0 - alpha) ** np.arange(days - 1, -1, -1)
+
+    keys = pd.DataFrame(list(groups.groups.keys()), columns=['item_type', 'item_id'])
+    return keys.assign(
+        mean=matrix.mean(axis=1),
+        ewma=matrix @ weights / weights.sum(),
+        std=matrix.std(axis=1, ddof=1) if days > 1 else 0.0,
+    )
+
+
+def usage_stats(lookback_days=DEFAULT_LOOKBACK_DAYS, span=DEFAULT_SPAN, today=None):
+    """최근 lookback_days일(오늘 제외) 품목별 사용량 통계 (캐시, 새 거래 기록 시 다시 계산)"""
+    today = today or datetime.now().date()
+    start = datetime.combine(today, datetime.min.time()) - timedelta(days=lookback_days)
+    key = usage_analytics.cache_key('forecast', start, lookback_days, span)
+    return usage_analytics.analytics_cache.get_or_load(
+        'forecast', key, lambda: _usage_stats(start, lookback_days, span))
+
+
+def _current_stock(item_type):
+    """{품목ID: 현재고}"""
+    if item_type == 'roll':
+        df = storage.get_function('load_roll_inventory')()
+        return pd.Series(df['현재고(롤)'].to_numpy(), index=df['제품ID'].astype(str), dtype='float64')
+    if item_type == 'cut':
+        df = storage.get_function('load_cut_inventory')()
+        return pd.Series(df['현재고(장)'].to_numpy(), index=df['재단ID'].astype(str), dtype='float64')
+    df = storage.get_function('load_raw_materials')()
+    keys = df['품명'].astype(str) + '_' + df['Grade'].astype(str)
+    return pd.Series(df['현재고_kg'].to_numpy(), index=keys, dtype='float64')
+
+
+def forecast(item_type, lead_time_days=DEFAULT_LEAD_TIME_DAYS, service_level=DEFAULT_SERVICE_LEVEL,
+             lookback_days=DEFAULT_LOOKBACK_DAYS, span=DEFAULT_SPAN, today=None):
+    """
+    품목 구분 전체의 사용량 통계와 제안 임계값
+
+    Args:
+        item_type: 'roll' / 'cut' / 'raw'
+        lead_time_days: 발주 후 입고까지 걸리는 일수
+        service_level: 조달 기간 중 재고가 떨어지지 않을 확률 (0.5 ~ 0.999)
+
+    Returns:
+        DataFrame: FORECAST_COLUMNS (등록된 품목 전체, 재고 일수가 짧은 순)
+    """
+    stock = _current_stock(item_type)
+    stats = usage_stats(lookback_days, span, today)
+    stats = stats[stats['item_type'] == item_type].set_index('item_id')[['mean', 'ewma', 'std']]
+    stats.index = stats.index.astype(str)
+    stats = stats.reindex(stock.index, fill_value=0.0)
+
+    z = NormalDist().inv_cdf(service_level)
+    demand = stats['ewma'].to_numpy(dtype=float)
+    reorder_point = demand * lead_time_days + z * stats['std'].to_numpy(dtype=float) * math.sqrt(lead_time_days)
+    with np.errstate(divide='ignore'):
+        cover = np.where(demand > 0, stock.to_numpy() / demand, np.inf)
+
+    levels = storage.get_function('load_reorder_levels')(item_type, stock.index.tolist())
+    result = pd.DataFrame({
+        '품목ID': stock.index,
+        '현재고': stock.to_numpy(),
+        '일평균 사용량': stats['mean'].to_numpy(dtype=float).round(3),
+        'EWMA 사용량': demand.round(3),
+        '사용량 표준편차': stats['std'].to_numpy(dtype=float).round(3),
+        '재고 일수': np.round(cover, 1),
+        # 롤/재단은 정수 단위, 원료(kg)는 소수 첫째 자리까지 올림
+        '제안 임계값': np.ceil(reorder_point) if item_type != 'raw' else np.ceil(reorder_point * 10) / 10,
+        '현재 임계값': [levels.get(item_id) for item_id in stock.index],
+    }, columns=FORECAST_COLUMNS)
+    return result.sort_values('재고 일수', kind='stable').reset_index(drop=True)
+
+
+def apply_suggestions(item_type, suggestions, only_changed=True):
+    """
+    제안 임계값을 set_reorder_levels로 한 번에 저장
+
+    Args:
+        suggestions: forecast() 결과 (또는 그중 선택한 행)
+        only_changed: 현재 임계값과 같은 품목은 건너뜀
+
+    Returns:
+        int: 저장한 품목 수
+    """
+    rows = suggestions
+    if only_changed:
+        rows = rows[rows['현재 임계값'].isna() | (rows['현재 임계값'] != rows['제안 임계값'])]
+    thresholds = dict(zip(rows['품목ID'].astype(str), rows['제안 임계값'].astype(float)))
+    if thresholds:
+        storage.get_function('set_reorder_levels')(item_type, thresholds)
+    return len(thresholds)
@@ -2,63 +2,83 @@
 """
 Firebase 연결 설정 및 회사 코드 인증 관리
 """
+import hashlib
+import hmac
 import os
 import json
+import secrets
+import threading
+import time
 import streamlit as st
 
+import startup_profile
+
 # Firebase 클라이언트 초기화 (lazy loading)
+# firebase_admin/firestore는 무거우므로 처음 초기화할 때 import한다.
+# 여러 세션(스레드)이 동시에 초기화해도 클라이언트는 프로세스에 하나만 만든다 (_init_lock).
 _db = None
 _initialized = False
+_init_error = None
+_init_lock = threading.Lock()
+_warmup_lock = threading.Lock()
+_warmup_thread = None
 
 
 def initialize_firebase():
-    """Firebase 초기화"""
-    global _db, _initialized
+    """Firebase 초기화 (다른 스레드가 초기화 중이면 끝날 때까지 기다린다)"""
+    global _db, _initialized, _init_error
     
     if _initialized:
         return _db
     
-    try:
-        import firebase_admin
-        from firebase_admin import credentials, firestore
+    with _init_lock:
+        if _initialized:
+            return _db
         
-        # Streamlit Cloud secrets에서 설정 로드 시도
-        use_secrets = False
         try:
-            if hasattr(st, 'secrets') and 'firebase' in st.secrets:
-                use_secrets = True
-        except Exception:
-            pass
-        
-        if use_secrets:
-            # Streamlit Cloud 배포 환경
-            cred_dict = dict(st.secrets['firebase'])
-            cred = credentials.Certificate(cred_dict)
-        else:
-            # 로컬 개발 환경 - JSON 파일 사용
-            cred_path = os.environ.get(
-                'FIREBASE_CREDENTIALS_PATH',
-                os.path.join(os.path.dirname(__file__), 'firebase_credentials.json')
-            )
+            import firebase_admin
+            from firebase_admin import credentials, firestore
             
-            if not os.path.exists(cred_path):
-                return None
+            # Streamlit Cloud secrets에서 설정 로드 시도
+            use_secrets = False
+            try:
+                if hasattr(st, 'secrets') and 'firebase' in st.secrets:
+                    use_secrets = True
+            except Exception:
+                pass
             
-            cred = credentials.Certificate(cred_path)
-        
-        # Firebase 앱이 이미 초기화되어 있는지 확인
-        try:
-            firebase_admin.get_app()
-        except ValueError:
-            firebase_admin.initialize_app(cred)
-        
-        _db = firestore.client()
-        _initialized = True
-        return _db
-        
-    except Exception as e:
-        st.error(f"Firebase 초기화 오류: {e}")
-        return None
+            if use_secrets:
+                # Streamlit Cloud 배포 환경
+                cred_dict = dict(st.secrets['firebase'])
+                cred = credentials.Certificate(cred_dict)
+            else:
+                # 로컬 개발 환경 - JSON 파일 사용
+                cred_path = os.environ.get(
+                    'FIREBASE_CREDENTIALS_PATH',
+                    os.path.join(os.path.dirname(__file__), 'firebase_credentials.json')
+                )
+                
+                if not os.path.exists(cred_path):
+                    return None
+                
+                cred = credentials.Certificate(cred_path)
+            
+            # Firebase 앱이 이미 초기화되어 있는지 확인
+            try:
+                firebase_admin.get_app()
+            except ValueError:
+                firebase_admin.initialize_app(cred)
+            
+            _db = firestore.client()
+            _initialized = True
+            _init_error = None
+            return _db
+            
+        except Exception as e:
+            # 백그라운드 스레드에서도 불릴 수 있으므로 화면 대신 기록 (firebase_status로 표시)
+            _init_error = str(e)
+            print(f"Firebase 초기화 오류: {e}")
+            return None
 
 
 def get_firestore_client():
@@ -66,71 +86,272 @@ def get_firestore_client():
     return initialize_firebase()
 
 
-def verify_company_code(input_code: str) -> bool:
+def _warm_up(preload):
+    """클라이언트 생성 + 첫 문서 읽기(회사 코드)로 gRPC 채널을 미리 연결하고, preload 함수들을 실행"""
+    started = time.perf_counter()
+    if initialize_firebase() is not None:
+        refresh_auth_cache()
+    startup_profile.record('firebase_warmup', time.perf_counter() - started)
+    for func in preload:
+        try:
+            func()
+        except Exception as e:
+            print(f"시작 준비 오류: {e}")
+
+
+def start_warmup(*preload):
     """
-    회사 코드 검증
+    프로세스 시작 시 한 번: 백그라운드 스레드에서 Firebase 클라이언트를 만들고 채널을 연결한다
     
     Args:
-        input_code: 사용자가 입력한 회사 코드
-        
+        preload: 같은 스레드에서 이어서 실행할 함수 (예: storage.get_backend로 저장소 모듈 import)
+    
     Returns:
-        bool: 코드가 일치하면 True
+        Thread (이미 시작했으면 그 스레드)
+    """
+    global _warmup_thread
+    
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(target=_warm_up, args=(preload,), name='firebase-warmup', daemon=True)
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+def firebase_status():
+    """
+    기다리지 않고 보는 연결 상태
+    
+    Returns:
+        'connected' / 'connecting'(백그라운드 초기화 중) / 'offline'
+    """
+    if _initialized:
+        return 'connected'
+    if _warmup_thread is not None and _warmup_thread.is_alive():
+        return 'connecting'
+    return 'offline'
+
+
+def firebase_error():
+    """마지막 초기화 오류 메시지 (없으면 None)"""
+    return _init_error
+
+
+# ========== 회사 코드 인증 ==========
+#
+# 회사 코드는 settings/auth 문서에 솔트+해시(PBKDF2-SHA256)로만 저장하고, 프로세스 안에 캐시한다.
+#   - 로그인은 캐시된 해시와 상수 시간 비교(hmac.compare_digest)만 하므로 네트워크를 기다리지 않는다.
+#   - 캐시가 AUTH_CACHE_TTL초보다 오래되면 백그라운드 스레드가 Firestore에서 다시 읽는다.
+#   - 마지막으로 읽은 해시는 로컬 파일(INVENTORY_AUTH_CACHE)에도 남겨, 재시작 직후나
+#     Firestore 장애 중에도 로그인할 수 있다. 파일도 없으면 COMPANY_CODE 환경변수를 쓴다.
+#   - 평문 company_code만 있는 이전 문서는 처음 읽을 때 해시로 바꿔 저장한다.
+
+DEFAULT_COMPANY_CODE = '2026'
+HASH_ITERATIONS = 100_000
+AUTH_CACHE_TTL = 300.0      # 캐시 유효 시간(초), INVENTORY_AUTH_TTL
+RETRY_INTERVAL = 30.0       # Firestore에서 읽지 못했을 때 다시 시도하는 간격(초)
+REFRESH_WAIT = 2.0          # 로컬/기본 코드로 실패한 로그인이 새로고침을 기다리는 최대 시간(초)
+
+_auth = None                # {'salt', 'hash', 'iterations', 'source': firestore/local/env, 'loaded_at'}
+_auth_lock = threading.Lock()
+_refresh_thread = None
+_last_attempt = None
+
+
+def hash_code(code, salt=None, iterations=None):
+    """
+    회사 코드 -> (솔트 hex, 해시 hex). 솔트가 없으면 새로 만든다.
+    """
+    salt = salt or secrets.token_hex(16)
+    digest = hashlib.pbkdf2_hmac('sha256', str(code).encode('utf-8'), bytes.fromhex(salt),
+                                 iterations or HASH_ITERATIONS)
+    return salt, digest.hex()
+
+
+def _auth_entry(salt, code_hash, iterations, source):
+    return {'salt': salt, 'hash': code_hash, 'iterations': int(iterations),
+            'source': source, 'loaded_at': time.monotonic()}
+
+
+def _hashed_entry(code, source):
+    salt, code_hash = hash_code(code)
+    return _auth_entry(salt, code_hash, HASH_ITERATIONS, source)
+
+
+def _auth_cache_ttl():
+    return float(os.environ.get('INVENTORY_AUTH_TTL', AUTH_CACHE_TTL))
+
+
+def _auth_cache_path():
+    return os.environ.get('INVENTORY_AUTH_CACHE', os.path.join(os.path.dirname(__file__), '.auth_cache.json'))
+
+
+def _read_local_auth():
+    """로컬에 남겨 둔 마지막 해시 (없거나 읽을 수 없으면 None)"""
+    try:
+        with open(_auth_cache_path(), encoding='utf-8') as f:
+            data = json.load(f)
+        return _auth_entry(data['salt'], data['hash'], data['iterations'], 'local')
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_local_auth(auth):
+    """해시만 저장 (임시 파일에 쓴 뒤 교체)"""
+    path = _auth_cache_path()
+    try:
+        tmp = f"{path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({k: auth[k] for k in ('salt', 'hash', 'iterations')}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"인증 캐시 파일 저장 오류: {e}")
+
+
+def _fetch_auth():
+    """
+    settings/auth 문서에서 해시 읽기 (Firebase 미설정이면 None)
+    
+    평문 company_code만 있으면 해시로 바꿔 저장하고, 문서가 없으면 기본 코드로 만든다.
     """
     db = get_firestore_client()
     
     if db is None:
-        # Firebase 연결 실패 시 환경변수로 폴백
-        env_code = os.environ.get('COMPANY_CODE', '2026')
-        return input_code == env_code
+        return None
+    
+    settings_ref = db.collection('settings').document('auth')
+    settings = settings_ref.get()
+    data = settings.to_dict() if settings.exists else {}
+    
+    if data.get('code_hash'):
+        return _auth_entry(data['code_salt'], data['code_hash'],
+                           data.get('hash_iterations', HASH_ITERATIONS), 'firestore')
+    
+    code = data.get('company_code') or os.environ.get('COMPANY_CODE', DEFAULT_COMPANY_CODE)
+    auth = _hashed_entry(code, 'firestore')
+    fields = {k: v for k, v in data.items() if k != 'company_code'}
+    fields.update({'code_salt': auth['salt'], 'code_hash': auth['hash'], 'hash_iterations': auth['iterations']})
+    settings_ref.set(fields)
+    return auth
+
+
+def refresh_auth_cache():
+    """
+    Firestore에서 회사 코드 해시를 다시 읽어 캐시와 로컬 파일 갱신
+    
+    Returns:
+        bool: Firestore에서 읽었으면 True (미설정/오류면 기존 캐시 유지)
+    """
+    global _auth
     
     try:
-        # Firestore에서 회사 코드 조회
-        settings_ref = db.collection('settings').document('auth')
-        settings = settings_ref.get()
-        
-        if settings.exists:
-            company_code = settings.to_dict().get('company_code', '')
-            return input_code == company_code
-        else:
-            # 설정이 없으면 기본 코드 생성
-            default_code = os.environ.get('COMPANY_CODE', '2026')
-            settings_ref.set({'company_code': default_code})
-            return input_code == default_code
-            
+        auth = _fetch_auth()
     except Exception as e:
-        st.error(f"인증 확인 오류: {e}")
+        print(f"회사 코드 새로고침 오류: {e}")
+        return False
+    
+    if auth is None:
         return False
+    with _auth_lock:
+        _auth = auth
+    _write_local_auth(auth)
+    return True
 
 
-def get_company_code() -> str:
-    """현재 설정된 회사 코드 반환 (관리용)"""
-    db = get_firestore_client()
+def _start_refresh(force=False):
+    """백그라운드 새로고침 시작 (이미 실행 중이면 그 스레드, 재시도 간격 안이면 None)"""
+    global _refresh_thread, _last_attempt
     
-    if db is None:
-        return os.environ.get('COMPANY_CODE', '2026')
+    with _auth_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return _refresh_thread
+        now = time.monotonic()
+        if not force and _last_attempt is not None and now - _last_attempt < RETRY_INTERVAL:
+            return None
+        _last_attempt = now
+        _refresh_thread = threading.Thread(target=refresh_auth_cache, name='auth-refresh', daemon=True)
+        _refresh_thread.start()
+        return _refresh_thread
+
+
+def _current_auth():
+    """캐시된 해시 (없으면 로컬 파일/환경변수). 오래되었으면 백그라운드 새로고침을 건다."""
+    global _auth
     
-    try:
-        settings_ref = db.collection('settings').document('auth')
-        settings = settings_ref.get()
-        
-        if settings.exists:
-            return settings.to_dict().get('company_code', '2026')
-        return '2026'
+    with _auth_lock:
+        if _auth is None:
+            _auth = _read_local_auth() or _hashed_entry(os.environ.get('COMPANY_CODE', DEFAULT_COMPANY_CODE), 'env')
+        auth = _auth
+    
+    if auth['source'] != 'firestore' or time.monotonic() - auth['loaded_at'] > _auth_cache_ttl():
+        _start_refresh()
+    return auth
+
+
+def warm_auth_cache():
+    """로그인 화면 표시 시 호출: 사용자가 코드를 입력하는 동안 해시를 미리 읽는다"""
+    _current_auth()
+
+
+def clear_auth_cache():
+    """프로세스 캐시 비우기 (로컬 파일은 유지)"""
+    global _auth, _last_attempt
+    
+    with _auth_lock:
+        _auth = None
+        _last_attempt = None
+
+
+def _matches(auth, input_code):
+    _, code_hash = hash_code(input_code, auth['salt'], auth['iterations'])
+    return hmac.compare_digest(code_hash, auth['hash'])
+
+
+def verify_company_code(input_code: str) -> bool:
+    """
+    회사 코드 검증 (캐시된 솔트+해시와 상수 시간 비교, 네트워크 읽기 없음)
+    
+    Args:
+        input_code: 사용자가 입력한 회사 코드
         
-    except Exception:
-        return '2026'
+    Returns:
+        bool: 코드가 일치하면 True
+    """
+    auth = _current_auth()
+    if _matches(auth, input_code):
+        return True
+    
+    # 아직 Firestore 값을 읽기 전(로컬 파일/기본 코드)이면 새로고침을 잠시 기다렸다가 한 번 더 비교
+    if auth['source'] != 'firestore':
+        thread = _start_refresh(force=True)
+        if thread is not None:
+            thread.join(REFRESH_WAIT)
+        latest = _auth
+        if latest is not auth and _matches(latest, input_code):
+            return True
+    return False
 
 
 def update_company_code(new_code: str) -> bool:
-    """회사 코드 업데이트"""
+    """회사 코드 변경 (새 솔트로 해시해 저장하고 캐시도 바로 갱신)"""
+    global _auth
+    
     db = get_firestore_client()
     
     if db is None:
         return False
     
     try:
+        auth = _hashed_entry(new_code, 'firestore')
         settings_ref = db.collection('settings').document('auth')
-        settings_ref.set({'company_code': new_code}, merge=True)
-        return True
+        settings = settings_ref.get()
+        fields = {k: v for k, v in (settings.to_dict() if settings.exists else {}).items() if k != 'company_code'}
+        fields.update({'code_salt': auth['salt'], 'code_hash': auth['hash'], 'hash_iterations': auth['iterations']})
+        settings_ref.set(fields)
     except Exception:
         return False
+    
+    with _auth_lock:
+        _auth = auth
+    _write_local_auth(auth)
+    return True
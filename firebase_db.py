@@ -1,11 +1,217 @@
 # Firebase Firestore 데이터베이스 함수
 """
 기존 SQLite 함수를 Firebase Firestore로 대체
-실시간 동기화 지원
+실시간 동기화 지원 (재고/작업/원료/임계값 컬렉션은 firestore_mirror의 on_snapshot 사본에서 읽음)
 """
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
+from firebase_admin import firestore
+from google.api_core.exceptions import NotFound
 from firebase_config import get_firestore_client
+from frame_diff import diff_frame, remember_snapshot
+import firestore_mirror
+import instrumentation
+import ledger_archive
+import paging
+import spec_index
+from firestore_bulk import MAX_BATCH_OPS, BulkWriteError, commit_ops
+
+ROLL_COLUMNS = ['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)', '최근업데이트']
+CUT_COLUMNS = ['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)', '최근업데이트']
+RAW_COLUMNS = ['품명', 'Grade', '현재고_kg', '입고일', '비고']
+WORKFLOW_COLUMNS = ['작업ID', '업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모', '등록일']
+WORKFLOW_ARCHIVE_COLUMNS = WORKFLOW_COLUMNS + ['완료일']
+COMPLETED_STATUS = '납품완료'
+TRANSACTION_COLUMNS = ['item_type', 'item_id', 'delta', 'note', 'timestamp']
+
+
+def _month_range(year=None, month=None):
+    """연/월의 [시작, 끝) 구간 반환. 기본은 현재 달."""
+    if year is None or month is None:
+        now = datetime.now()
+        year = now.year
+        month = now.month
+    
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, month + 1, 1)
+    return start, end
+
+
+def _roll_row(doc_id, d):
+    """roll_inventory 문서 -> 표시 컬럼 행"""
+    return {
+        '제품ID': doc_id,
+        '두께(mm)': d.get('두께_mm', 0),
+        '폭(cm)': d.get('폭_cm', 0),
+        '롤 길이(m)': d.get('롤길이_m', 0),
+        '현재고(롤)': d.get('현재고_롤', 0),
+        '최근업데이트': d.get('최근업데이트', '')
+    }
+
+
+def _cut_row(doc_id, d):
+    """cut_inventory 문서 -> 표시 컬럼 행"""
+    return {
+        '재단ID': doc_id,
+        '업체명': d.get('업체명', ''),
+        '가로(cm)': d.get('가로_cm', 0),
+        '세로(cm)': d.get('세로_cm', 0),
+        '두께(mm)': d.get('두께_mm', 0),
+        '현재고(장)': d.get('현재고_장', 0),
+        '최근업데이트': d.get('최근업데이트', '')
+    }
+
+
+def _raw_row(doc_id, d):
+    """raw_materials 문서 -> 표시 컬럼 행"""
+    return {
+        '품명': d.get('품명', ''),
+        'Grade': d.get('Grade', ''),
+        '현재고_kg': d.get('현재고_kg', 0),
+        '입고일': d.get('입고일', ''),
+        '비고': d.get('비고', '')
+    }
+
+
+def _workflow_row(doc_id, d):
+    """workflow 문서 -> 표시 컬럼 행"""
+    return {
+        '작업ID': doc_id,
+        '업체명': d.get('업체명', ''),
+        '제품규격': d.get('제품규격', ''),
+        '수량': d.get('수량', 0),
+        '단위': d.get('단위', ''),
+        '담당자': d.get('담당자', ''),
+        '상태': d.get('상태', '접수'),
+        '우선순위': d.get('우선순위', '보통'),
+        '납기일': d.get('납기일', ''),
+        '메모': d.get('메모', ''),
+        '등록일': d.get('등록일', '')
+    }
+
+
+def _transaction_row(doc_id, d):
+    """transactions 문서 -> 내보내기 행"""
+    return {
+        'item_type': d.get('item_type', ''),
+        'item_id': d.get('item_id', ''),
+        'delta': d.get('delta', 0),
+        'note': d.get('note', ''),
+        'timestamp': d.get('timestamp', '')
+    }
+
+
+def _collection_docs(db, name):
+    """(문서ID, 데이터) 목록. 실시간 미러가 동기화되어 있으면 메모리에서(읽기 0건), 아니면 stream()"""
+    docs = firestore_mirror.documents(db, name)
+    if docs is not None:
+        return docs.items()
+    return ((doc.id, doc.to_dict()) for doc in db.collection(name).stream())
+
+
+def _usage_doc_id(item_type, item_id, month):
+    """월별 사용량 집계(usage_monthly) 문서 ID"""
+    return f"{item_type}_{item_id}_{month}"
+
+
+def _add_usage(batch, db, item_type, item_id, month, delta):
+    """출고(음수 delta)를 월별 사용량 집계에 반영 (batch/transaction에 추가만 함)"""
+    if delta >= 0:
+        return
+    doc_ref = db.collection('usage_monthly').document(_usage_doc_id(item_type, item_id, month))
+    batch.set(doc_ref, {
+        'item_type': item_type,
+        'item_id': str(item_id),
+        'month': month,
+        'usage': firestore.Increment(-float(delta))
+    }, merge=True)
+
+
+def _ledger_entry(item_type, item_id, delta, note, now):
+    """transactions 문서 내용. 문자열 timestamp와 함께 범위 조회용 정수 ts_epoch(초)를 저장한다."""
+    return {
+        'item_type': item_type,
+        'item_id': str(item_id),
+        'delta': float(delta),
+        'note': note,
+        'timestamp': now.strftime("%Y-%m-%d %H:%M:%S"),
+        'ts_epoch': int(now.timestamp())
+    }
+
+
+def _record_transaction(item_type, item_id, delta, note=""):
+    """거래 기록과 월별 사용량 집계를 하나의 batch로 저장"""
+    db = get_firestore_client()
+    
+    if db is None:
+        return
+    
+    now = datetime.now()
+    batch = db.batch()
+    batch.set(db.collection('transactions').document(), _ledger_entry(item_type, item_id, delta, note, now))
+    _add_usage(batch, db, item_type, item_id, now.strftime("%Y-%m"), float(delta))
+    batch.commit()
+
+
+def _get_monthly_usage(item_type, item_id, year=None, month=None):
+    """월별 사용량 집계 문서 1건 조회 (거래 기록 크기와 무관)"""
+    start, _ = _month_range(year, month)
+    
+    db = get_firestore_client()
+    
+    if db is None:
+        return 0.0
+    
+    try:
+        doc_id = _usage_doc_id(item_type, item_id, start.strftime("%Y-%m"))
+        doc = db.collection('usage_monthly').document(doc_id).get()
+        
+        if doc.exists:
+            return float(doc.to_dict().get('usage', 0))
+        return 0.0
+        
+    except Exception:
+        return 0.0
+
+
+def _adjust_stock(doc_ref, stock_field, delta, cast, ledger_collection, ledger_data, usage_key, touch_updated=True):
+    """
+    Firestore 트랜잭션으로 재고 증감 + 거래 기록 + 사용량 집계를 원자적으로 처리
+    
+    동시에 다른 작업자가 같은 문서를 수정하면 트랜잭션이 재시도되므로 덮어쓰기가 발생하지 않는다.
+    """
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    ledger_ref = db.collection(ledger_collection).document()
+    
+    @firestore.transactional
+    def _run(transaction):
+        snapshot = doc_ref.get(transaction=transaction)
+        if not snapshot.exists:
+            raise KeyError(f"{doc_ref.id} 없음")
+        
+        current = cast(snapshot.to_dict().get(stock_field, 0))
+        new_value = cast(current + delta)
+        if new_value < 0:
+            raise ValueError(f"{stock_field}은 음수일 수 없습니다 (현재고: {current}, 변경: {delta})")
+        
+        update_data = {stock_field: new_value}
+        if touch_updated:
+            update_data['최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
+        transaction.update(doc_ref, update_data)
+        transaction.set(ledger_ref, ledger_data)
+        item_type, item_id, month = usage_key
+        _add_usage(transaction, db, item_type, item_id, month, float(delta))
+        return new_value
+    
+    firestore_mirror.note_local_write(doc_ref.parent.id)
+    return _run(db.transaction())
 
 
 # ========== 롤 재고 관리 ==========
@@ -18,24 +224,15 @@ def load_roll_inventory():
         return pd.DataFrame(columns=['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)', '최근업데이트'])
     
     try:
-        docs = db.collection('roll_inventory').stream()
         data = []
         
-        for doc in docs:
-            d = doc.to_dict()
-            data.append({
-                '제품ID': doc.id,
-                '두께(mm)': d.get('두께_mm', 0),
-                '폭(cm)': d.get('폭_cm', 0),
-                '롤 길이(m)': d.get('롤길이_m', 0),
-                '현재고(롤)': d.get('현재고_롤', 0),
-                '최근업데이트': d.get('최근업데이트', '')
-            })
-        
-        if not data:
-            return pd.DataFrame(columns=['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)', '최근업데이트'])
+        for doc_id, d in _collection_docs(db, 'roll_inventory'):
+            data.append(_roll_row(doc_id, d))
         
-        return pd.DataFrame(data)
+        df = pd.DataFrame(data) if data else pd.DataFrame(columns=ROLL_COLUMNS)
+        # 저장 시 변경분만 쓰도록 로드 시점 상태를 기록
+        remember_snapshot(df, df['제품ID'], ROLL_COLUMNS)
+        return df
         
     except Exception as e:
         print(f"롤 재고 로드 오류: {e}")
@@ -43,28 +240,32 @@ def load_roll_inventory():
 
 
 def save_roll_inventory(df):
-    """롤 재고 데이터 저장"""
+    """롤 재고 데이터 저장 (load_roll_inventory 이후 변경/추가된 문서만 기록)"""
     db = get_firestore_client()
     
     if db is None:
         raise Exception("Firebase 연결 실패")
     
-    batch = db.batch()
+    if (pd.to_numeric(df['현재고(롤)']) < 0).any():
+        raise ValueError("현재고(롤)은 음수일 수 없습니다")
     
-    for _, row in df.iterrows():
-        if float(row['현재고(롤)']) < 0:
-            raise ValueError("현재고(롤)은 음수일 수 없습니다")
-        
+    changed = diff_frame(df, df['제품ID'], ROLL_COLUMNS)
+    ops = []
+    
+    for _, row in changed.iterrows():
         doc_ref = db.collection('roll_inventory').document(str(row['제품ID']))
-        batch.set(doc_ref, {
+        ops.append(('set', doc_ref, {
             '두께_mm': float(row['두께(mm)']),
             '폭_cm': float(row['폭(cm)']),
             '롤길이_m': float(row['롤 길이(m)']),
             '현재고_롤': int(row['현재고(롤)']),
             '최근업데이트': row['최근업데이트']
-        })
+        }))
     
-    batch.commit()
+    if ops:
+        firestore_mirror.note_local_write('roll_inventory')
+        commit_ops(db, ops)
+    remember_snapshot(df, df['제품ID'], ROLL_COLUMNS)
 
 
 def update_roll_item(product_id, **kwargs):
@@ -91,7 +292,11 @@ def update_roll_item(product_id, **kwargs):
         elif k == '현재고_롤' or k == '현재고(롤)':
             update_data['현재고_롤'] = int(v)
     
+    if update_data.get('현재고_롤', 0) < 0:
+        raise ValueError("현재고(롤)은 음수일 수 없습니다")
+    
     update_data['최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
+    firestore_mirror.note_local_write('roll_inventory')
     doc_ref.update(update_data)
 
 
@@ -102,61 +307,45 @@ def delete_roll_item(product_id):
     if db is None:
         raise Exception("Firebase 연결 실패")
     
+    firestore_mirror.note_local_write('roll_inventory')
     db.collection('roll_inventory').document(str(product_id)).delete()
 
 
+def find_rolls_by_spec(thickness=None, width=None, length=None):
+    """
+    두께/폭/길이 범위에 맞는 롤 (spec_index 정렬 색인)
+    
+    서버 쿼리로도 세 필드 범위를 걸 수 있지만(색인 필요, get_usage_between처럼) 결과 문서마다 읽기가 과금되고
+    범위 필드 조합마다 복합 색인을 두어야 한다. 롤 규격은 수천 건 규모로 이미 미러에 올라와 있으므로
+    롤 목록(미러)에서 정렬 색인을 만들어 읽기 없이 찾는다.
+    앱은 캐시된 색인을 쓰는 spec_index.find_rolls()를 호출한다.
+    """
+    return spec_index.SpecIndex(load_roll_inventory()).query(thickness, width, length).reset_index(drop=True)
+
+
 def record_roll_transaction(item_id, delta, note=""):
     """롤 거래 기록"""
-    db = get_firestore_client()
-    
-    if db is None:
-        return
-    
-    db.collection('transactions').add({
-        'item_type': 'roll',
-        'item_id': str(item_id),
-        'delta': float(delta),
-        'note': note,
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    })
+    _record_transaction('roll', item_id, delta, note)
 
 
 def get_monthly_usage_roll(item_id, year=None, month=None):
     """월별 롤 사용량 조회"""
-    if year is None or month is None:
-        now = datetime.now()
-        year = now.year
-        month = now.month
-    
-    start = datetime(year, month, 1)
-    if month == 12:
-        end = datetime(year + 1, 1, 1)
-    else:
-        end = datetime(year, month + 1, 1)
-    
+    return _get_monthly_usage('roll', item_id, year, month)
+
+
+def adjust_roll_stock(item_id, delta, note=""):
+    """롤 재고 증감 + 거래 기록 (트랜잭션). 변경 후 재고 반환"""
     db = get_firestore_client()
     
     if db is None:
-        return 0.0
+        raise Exception("Firebase 연결 실패")
     
-    try:
-        docs = db.collection('transactions')\
-            .where('item_type', '==', 'roll')\
-            .where('item_id', '==', str(item_id))\
-            .stream()
-        
-        total = 0.0
-        for doc in docs:
-            d = doc.to_dict()
-            ts = datetime.strptime(d.get('timestamp', ''), "%Y-%m-%d %H:%M:%S")
-            delta = d.get('delta', 0)
-            if start <= ts < end and delta < 0:
-                total += -delta
-        
-        return total
-        
-    except Exception:
-        return 0.0
+    now = datetime.now()
+    return _adjust_stock(
+        db.collection('roll_inventory').document(str(item_id)), '현재고_롤', int(delta), int,
+        'transactions', _ledger_entry('roll', item_id, delta, note, now),
+        ('roll', item_id, now.strftime("%Y-%m"))
+    )
 
 
 # ========== 재단 재고 관리 ==========
@@ -169,25 +358,15 @@ def load_cut_inventory():
         return pd.DataFrame(columns=['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)', '최근업데이트'])
     
     try:
-        docs = db.collection('cut_inventory').stream()
         data = []
         
-        for doc in docs:
-            d = doc.to_dict()
-            data.append({
-                '재단ID': doc.id,
-                '업체명': d.get('업체명', ''),
-                '가로(cm)': d.get('가로_cm', 0),
-                '세로(cm)': d.get('세로_cm', 0),
-                '두께(mm)': d.get('두께_mm', 0),
-                '현재고(장)': d.get('현재고_장', 0),
-                '최근업데이트': d.get('최근업데이트', '')
-            })
-        
-        if not data:
-            return pd.DataFrame(columns=['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)', '최근업데이트'])
+        for doc_id, d in _collection_docs(db, 'cut_inventory'):
+            data.append(_cut_row(doc_id, d))
         
-        return pd.DataFrame(data)
+        df = pd.DataFrame(data) if data else pd.DataFrame(columns=CUT_COLUMNS)
+        # 저장 시 변경분만 쓰도록 로드 시점 상태를 기록
+        remember_snapshot(df, df['재단ID'], CUT_COLUMNS)
+        return df
         
     except Exception as e:
         print(f"재단 재고 로드 오류: {e}")
@@ -195,29 +374,33 @@ def load_cut_inventory():
 
 
 def save_cut_inventory(df):
-    """재단 재고 데이터 저장"""
+    """재단 재고 데이터 저장 (load_cut_inventory 이후 변경/추가된 문서만 기록)"""
     db = get_firestore_client()
     
     if db is None:
         raise Exception("Firebase 연결 실패")
     
-    batch = db.batch()
+    if (pd.to_numeric(df['현재고(장)']) < 0).any():
+        raise ValueError("현재고(장)은 음수일 수 없습니다")
     
-    for _, row in df.iterrows():
-        if float(row['현재고(장)']) < 0:
-            raise ValueError("현재고(장)은 음수일 수 없습니다")
-        
+    changed = diff_frame(df, df['재단ID'], CUT_COLUMNS)
+    ops = []
+    
+    for _, row in changed.iterrows():
         doc_ref = db.collection('cut_inventory').document(str(row['재단ID']))
-        batch.set(doc_ref, {
+        ops.append(('set', doc_ref, {
             '업체명': row['업체명'],
             '가로_cm': float(row['가로(cm)']),
             '세로_cm': float(row['세로(cm)']),
             '두께_mm': float(row['두께(mm)']),
             '현재고_장': int(row['현재고(장)']),
             '최근업데이트': row['최근업데이트']
-        })
+        }))
     
-    batch.commit()
+    if ops:
+        firestore_mirror.note_local_write('cut_inventory')
+        commit_ops(db, ops)
+    remember_snapshot(df, df['재단ID'], CUT_COLUMNS)
 
 
 def update_cut_item(item_id, **kwargs):
@@ -237,16 +420,20 @@ def update_cut_item(item_id, **kwargs):
     for k, v in kwargs.items():
         if k == '업체명':
             update_data['업체명'] = v
-        elif k == '가로_cm':
+        elif k == '가로_cm' or k == '가로(cm)':
             update_data['가로_cm'] = float(v)
-        elif k == '세로_cm':
+        elif k == '세로_cm' or k == '세로(cm)':
             update_data['세로_cm'] = float(v)
-        elif k == '두께_mm':
+        elif k == '두께_mm' or k == '두께(mm)':
             update_data['두께_mm'] = float(v)
-        elif k == '현재고_장':
+        elif k == '현재고_장' or k == '현재고(장)':
             update_data['현재고_장'] = int(v)
     
+    if update_data.get('현재고_장', 0) < 0:
+        raise ValueError("현재고(장)은 음수일 수 없습니다")
+    
     update_data['최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
+    firestore_mirror.note_local_write('cut_inventory')
     doc_ref.update(update_data)
 
 
@@ -257,63 +444,477 @@ def delete_cut_item(item_id):
     if db is None:
         raise Exception("Firebase 연결 실패")
     
+    firestore_mirror.note_local_write('cut_inventory')
     db.collection('cut_inventory').document(str(item_id)).delete()
 
 
 def record_cut_transaction(item_id, delta, note=""):
     """재단 거래 기록"""
+    _record_transaction('cut', item_id, delta, note)
+
+
+def get_monthly_usage_cut(item_id, year=None, month=None):
+    """월별 재단 사용량 조회"""
+    return _get_monthly_usage('cut', item_id, year, month)
+
+
+def adjust_cut_stock(item_id, delta, note=""):
+    """재단 재고 증감 + 거래 기록 (트랜잭션). 변경 후 재고 반환"""
     db = get_firestore_client()
     
     if db is None:
-        return
+        raise Exception("Firebase 연결 실패")
     
-    db.collection('transactions').add({
-        'item_type': 'cut',
-        'item_id': str(item_id),
-        'delta': float(delta),
-        'note': note,
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    })
+    now = datetime.now()
+    return _adjust_stock(
+        db.collection('cut_inventory').document(str(item_id)), '현재고_장', int(delta), int,
+        'transactions', _ledger_entry('cut', item_id, delta, note, now),
+        ('cut', item_id, now.strftime("%Y-%m"))
+    )
 
 
-def get_monthly_usage_cut(item_id, year=None, month=None):
-    """월별 재단 사용량 조회"""
-    if year is None or month is None:
-        now = datetime.now()
-        year = now.year
-        month = now.month
+def get_monthly_usage_bulk(item_type, year=None, month=None):
+    """item_type('roll'/'cut'/'raw') 전체 품목의 월 사용량을 한 번의 쿼리로 조회
     
-    start = datetime(year, month, 1)
-    if month == 12:
-        end = datetime(year + 1, 1, 1)
-    else:
-        end = datetime(year, month + 1, 1)
+    Returns:
+        dict: {item_id: 사용량} (사용 기록이 없는 품목은 포함되지 않음)
+    """
+    start, _ = _month_range(year, month)
     
     db = get_firestore_client()
     
     if db is None:
-        return 0.0
+        return {}
     
     try:
-        docs = db.collection('transactions')\
-            .where('item_type', '==', 'cut')\
-            .where('item_id', '==', str(item_id))\
+        docs = db.collection('usage_monthly')\
+            .where('item_type', '==', item_type)\
+            .where('month', '==', start.strftime("%Y-%m"))\
             .stream()
         
-        total = 0.0
+        usage = {}
         for doc in docs:
             d = doc.to_dict()
-            ts = datetime.strptime(d.get('timestamp', ''), "%Y-%m-%d %H:%M:%S")
-            delta = d.get('delta', 0)
-            if start <= ts < end and delta < 0:
-                total += -delta
+            usage[d.get('item_id', '')] = float(d.get('usage', 0))
+        
+        return usage
+        
+    except Exception:
+        return {}
+
+
+def rebuild_usage_monthly():
+    """월별 사용량 집계를 거래 기록(transactions, raw_material_transactions)으로부터 재생성"""
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    totals = {}
+    for doc in db.collection('transactions').stream():
+        d = doc.to_dict()
+        delta = float(d.get('delta', 0))
+        if delta < 0:
+            key = (d.get('item_type', ''), d.get('item_id', ''), str(d.get('timestamp', ''))[:7])
+            totals[key] = totals.get(key, 0.0) - delta
+    
+    for doc in db.collection('raw_material_transactions').stream():
+        d = doc.to_dict()
+        delta = float(d.get('수량변경', 0))
+        if delta < 0:
+            key = ('raw', f"{d.get('품명', '')}_{d.get('Grade', '')}", str(d.get('날짜', ''))[:7])
+            totals[key] = totals.get(key, 0.0) - delta
+    
+    # 보관 파일로 옮겨진 기록의 사용량
+    for key, usage in ledger_archive.archived_monthly_usage().items():
+        totals[key] = totals.get(key, 0.0) + usage
+    
+    # 새 집계를 set으로 덮어쓴 뒤, 더 이상 만들어지지 않는 문서만 삭제
+    # (batch는 최대 500건이므로 firestore_bulk가 나눠서 커밋. 같은 문서를 set과 delete가 함께 건드리지 않는다)
+    existing = [doc.id for doc in db.collection('usage_monthly').stream()]
+    ops = []
+    produced = set()
+    for (item_type, item_id, month), usage in totals.items():
+        doc_id = _usage_doc_id(item_type, item_id, month)
+        produced.add(doc_id)
+        ops.append(('set', db.collection('usage_monthly').document(doc_id),
+                    {'item_type': item_type, 'item_id': item_id, 'month': month, 'usage': usage}))
+    commit_ops(db, ops)
+    
+    commit_ops(db, [('delete', db.collection('usage_monthly').document(doc_id), None)
+                    for doc_id in existing if doc_id not in produced])
+
+
+def get_usage_between(item_type, item_id, start, end):
+    """
+    [start, end) 구간의 사용량(출고) 합계를 거래 기록에서 직접 조회
+    
+    item_type/item_id 일치 + ts_epoch 범위 + delta < 0 조건을 모두 서버에서 처리하므로
+    읽기 비용은 해당 구간의 출고 건수에만 비례한다 (firestore.indexes.json의 복합 색인 필요).
+    보관(ledger_archive)된 달이 구간에 있으면 보관 파일도 함께 합산한다.
+    """
+    db = get_firestore_client()
+    
+    if db is None:
+        return 0.0
+    
+    return _hot_usage_between(db, item_type, item_id, start, end) + \
+        ledger_archive.archived_usage(item_type, item_id, start, end)
+
+
+def _hot_usage_between(db, item_type, item_id, start, end):
+    try:
+        docs = db.collection('transactions')\
+            .where('item_type', '==', item_type)\
+            .where('item_id', '==', str(item_id))\
+            .where('ts_epoch', '>=', int(start.timestamp()))\
+            .where('ts_epoch', '<', int(end.timestamp()))\
+            .where('delta', '<', 0)\
+            .select(['delta'])\
+            .stream()
         
-        return total
+        return sum(-float(doc.to_dict().get('delta', 0)) for doc in docs)
         
     except Exception:
         return 0.0
 
 
+def backfill_transaction_epochs(batch_size=400):
+    """
+    ts_epoch가 없는 기존 거래 기록에 문자열 timestamp로부터 ts_epoch를 채운다 (1회성)
+    
+    문서 ID 순으로 batch_size씩 페이지를 나눠 읽고 같은 크기의 batch로 갱신한다.
+    
+    Returns:
+        int: 갱신한 문서 수
+    """
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    updated = 0
+    last = None
+    while True:
+        query = db.collection('transactions').order_by('__name__').limit(batch_size)
+        if last is not None:
+            query = query.start_after(last)
+        docs = list(query.stream())
+        if not docs:
+            break
+        
+        batch = db.batch()
+        pending = 0
+        for doc in docs:
+            d = doc.to_dict()
+            if 'ts_epoch' in d:
+                continue
+            try:
+                ts = datetime.strptime(d.get('timestamp', ''), "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                continue
+            batch.update(doc.reference, {'ts_epoch': int(ts.timestamp())})
+            pending += 1
+        
+        if pending:
+            batch.commit()
+            updated += pending
+        last = docs[-1]
+    
+    return updated
+
+
+
+# 내보내기 대상: kind -> (컬렉션, 문서 -> 행 변환, 컬럼)
+TABLES = {
+    'roll': ('roll_inventory', _roll_row, ROLL_COLUMNS),
+    'cut': ('cut_inventory', _cut_row, CUT_COLUMNS),
+    'raw': ('raw_materials', _raw_row, RAW_COLUMNS),
+    'workflow': ('workflow', _workflow_row, WORKFLOW_COLUMNS),
+    'transactions': ('transactions', _transaction_row, TRANSACTION_COLUMNS),
+}
+
+
+def iter_table(kind, chunk_size=5000):
+    """
+    kind('roll'/'cut'/'raw'/'workflow'/'transactions') 전체를 문서 ID 순으로
+    chunk_size개씩 읽어 DataFrame을 차례로 반환 (내보내기용, 전체를 메모리에 올리지 않음)
+    """
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    collection, to_row, columns = TABLES[kind]
+    last = None
+    while True:
+        query = db.collection(collection).order_by('__name__').limit(chunk_size)
+        if last is not None:
+            query = query.start_after(last)
+        docs = list(query.stream())
+        if not docs:
+            break
+        yield pd.DataFrame([to_row(doc.id, doc.to_dict()) for doc in docs], columns=columns)
+        if len(docs) < chunk_size:
+            break
+        last = docs[-1]
+
+
+def import_transactions(df):
+    """
+    거래 기록 일괄 추가 (item_type, item_id, delta, note, timestamp 'YYYY-MM-DD HH:MM:SS')
+    
+    월별 사용량 집계는 (품목, 월)별로 합산해 Increment 1건씩만 쓴다.
+    묶음 재시도로 집계가 어긋나면 rebuild_usage_monthly()로 보정한다.
+    """
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    ops = []
+    for row in df[TRANSACTION_COLUMNS].itertuples(index=False):
+        now = datetime.strptime(row.timestamp, "%Y-%m-%d %H:%M:%S")
+        ops.append(('set', db.collection('transactions').document(),
+                    _ledger_entry(row.item_type, row.item_id, row.delta, row.note, now)))
+    
+    out = df[df['delta'] < 0]
+    usage = (-out['delta']).groupby([out['item_type'], out['item_id'].astype(str), out['timestamp'].str[:7]]).sum()
+    for (item_type, item_id, month), total in usage.items():
+        doc_ref = db.collection('usage_monthly').document(_usage_doc_id(item_type, item_id, month))
+        ops.append(('merge', doc_ref, {
+            'item_type': item_type,
+            'item_id': item_id,
+            'month': month,
+            'usage': firestore.Increment(float(total))
+        }))
+    
+    commit_ops(db, ops)
+
+
+# ========== 목록 페이지 ==========
+
+# kind -> 표시 컬럼 -> 문서 필드 (품목 ID는 문서 ID)
+PAGE_FIELDS = {
+    'roll': {'제품ID': '__name__', '두께(mm)': '두께_mm', '폭(cm)': '폭_cm',
+             '롤 길이(m)': '롤길이_m', '현재고(롤)': '현재고_롤'},
+    'cut': {'재단ID': '__name__', '업체명': '업체명', '가로(cm)': '가로_cm', '세로(cm)': '세로_cm',
+            '두께(mm)': '두께_mm', '현재고(장)': '현재고_장'},
+    'raw': {'원료ID': '__name__', '품명': '품명', 'Grade': 'Grade', '현재고_kg': '현재고_kg', '입고일': '입고일'},
+}
+
+
+def _page_query(db, kind, filters):
+    """필터(일치 조건)를 건 컬렉션 쿼리"""
+    query = db.collection(TABLES[kind][0])
+    for col, value in filters.items():
+        query = query.where(PAGE_FIELDS[kind][col], '==', value)
+    return query
+
+
+def _page_order(kind, sort_by, filters):
+    """
+    페이지 쿼리의 order_by 필드 목록 (마지막은 항상 문서 ID)
+
+    필터로 값이 하나로 정해진 필드는 정렬해도 순서가 같으므로 빼서 필요한 복합 색인을 줄인다.
+    """
+    field = PAGE_FIELDS[kind][sort_by]
+    if field == '__name__' or sort_by in filters:
+        return ['__name__']
+    return [field, '__name__']
+
+
+def load_inventory_page(kind, sort_by=None, descending=False, filters=None,
+                        limit=paging.DEFAULT_PAGE_SIZE, after=None):
+    """
+    kind('roll'/'cut'/'raw') 목록 한 페이지
+    
+    order_by(정렬 필드, 문서 ID) + start_after 커서로 limit건만 읽는다 (읽기 limit건).
+    실시간 미러가 동기화되어 있으면 메모리에서 고른다 (읽기 0건).
+    필터와 함께 쓰는 정렬은 복합 색인이 필요하며(firestore.indexes.json), 색인이 없는 등
+    쿼리 오류는 빈 목록으로 바꾸지 않고 그대로 발생한다.
+    """
+    sort_by, filters = paging.check_query(kind, sort_by, filters)
+    collection, to_row, columns = TABLES[kind]
+    db = get_firestore_client()
+    
+    if db is None:
+        return pd.DataFrame(columns=columns)
+    
+    docs = firestore_mirror.documents(db, collection)
+    if docs is not None:
+        rows = [to_row(doc_id, d) for doc_id, d in docs.items()]
+        return pd.DataFrame(paging.page_rows(kind, rows, sort_by, descending, filters, limit, after),
+                            columns=columns)
+    
+    direction = firestore.Query.DESCENDING if descending else firestore.Query.ASCENDING
+    order = _page_order(kind, sort_by, filters)
+    query = _page_query(db, kind, filters)
+    for field in order:
+        query = query.order_by(field, direction=direction)
+    if after is not None:
+        value, item_id = after
+        cursor = {'__name__': item_id} if len(order) == 1 else {order[0]: value, '__name__': item_id}
+        query = query.start_after(cursor)
+    
+    rows = [to_row(doc.id, doc.to_dict()) for doc in query.limit(limit).stream()]
+    return pd.DataFrame(rows, columns=columns)
+
+
+def inventory_summary(kind, filters=None):
+    """
+    kind 목록의 {'count': 품목 수, 'total': 현재고 합계} (count/sum 집계 쿼리, 1천 건당 읽기 1건)
+    
+    쿼리 오류는 0건으로 바꾸지 않고 그대로 발생한다.
+    """
+    _, filters = paging.check_query(kind, None, filters)
+    db = get_firestore_client()
+    
+    if db is None:
+        return {'count': 0, 'total': 0.0}
+    
+    docs = firestore_mirror.documents(db, TABLES[kind][0])
+    if docs is not None:
+        to_row = TABLES[kind][1]
+        return paging.summarize_rows(kind, [to_row(doc_id, d) for doc_id, d in docs.items()], filters)
+    
+    stock_field = PAGE_FIELDS[kind][paging.PAGE_KINDS[kind]['stock']]
+    results = _page_query(db, kind, filters).count(alias='count').sum(stock_field, alias='total').get()
+    values = {result.alias: result.value for result in results[0]}
+    return {'count': int(values.get('count') or 0), 'total': float(values.get('total') or 0)}
+
+
+# ========== 거래 기록 보관 / 재고 스냅샷 ==========
+
+SNAPSHOT_COLUMNS = ['taken_at', 'item_type', 'item_id', 'stock', 'ledger_id']
+# 원장 -> 기간 조회 필드 (transactions는 정수 ts_epoch, 원료 기록은 서버 timestamp)
+LEDGER_TIME_FIELDS = {'transactions': 'ts_epoch', 'raw_material_transactions': 'timestamp'}
+
+
+def _ledger_bound(ledger, when):
+    """기간 조회 조건 값 (로컬 시각 -> ts_epoch 또는 UTC timestamp)"""
+    if LEDGER_TIME_FIELDS[ledger] == 'ts_epoch':
+        return int(when.timestamp())
+    return when.astimezone(timezone.utc)
+
+
+def _local_time_text(value):
+    """Firestore timestamp(UTC) 또는 문자열 -> 로컬 'YYYY-MM-DD HH:MM:SS'"""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone().replace(tzinfo=None)
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    return str(value or '')
+
+
+def load_ledger(ledger, start=None, end=None):
+    """거래 기록 중 기록 시각이 [start, end)인 문서 (보관 파일 제외, timestamp 순)"""
+    db = get_firestore_client()
+    columns = ledger_archive.LEDGERS[ledger]
+    
+    if db is None:
+        return pd.DataFrame(columns=columns)
+    
+    field = LEDGER_TIME_FIELDS[ledger]
+    query = db.collection(ledger)
+    if start is not None:
+        query = query.where(field, '>=', _ledger_bound(ledger, start))
+    if end is not None:
+        query = query.where(field, '<', _ledger_bound(ledger, end))
+    
+    rows = []
+    for doc in query.stream():
+        d = doc.to_dict()
+        row = {col: d.get(col, '') for col in columns}
+        row['id'] = doc.id
+        row['timestamp'] = _local_time_text(d.get('timestamp'))
+        rows.append(row)
+    
+    df = pd.DataFrame(rows, columns=columns)
+    return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def oldest_ledger_time(ledger):
+    """가장 오래된 거래 기록 시각 (없으면 None)"""
+    db = get_firestore_client()
+    
+    if db is None:
+        return None
+    
+    field = LEDGER_TIME_FIELDS[ledger]
+    docs = list(db.collection(ledger).order_by(field).limit(1).stream())
+    if not docs:
+        return None
+    value = docs[0].to_dict().get(field)
+    if field == 'ts_epoch':
+        return datetime.fromtimestamp(value)
+    return datetime.strptime(_local_time_text(value), "%Y-%m-%d %H:%M:%S")
+
+
+def delete_ledger_entries(ledger, ids):
+    """거래 기록 문서 삭제 (보관 후 호출). 삭제한 건수 반환"""
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    if ledger not in LEDGER_TIME_FIELDS:
+        raise ValueError(f"알 수 없는 원장: {ledger}")
+    commit_ops(db, [('delete', db.collection(ledger).document(str(doc_id)), None) for doc_id in ids])
+    return len(ids)
+
+
+def take_stock_snapshot():
+    """
+    롤/재단/원료 현재고를 stock_snapshots 컬렉션에 기록. 기록 시각 반환
+    
+    Firestore는 읽기와 쓰기 사이에 다른 기기의 입출고를 막을 수 없고 거래 문서 id에 순서가 없으므로
+    (ledger_id 없음, stock_at은 taken_at 이후 기록을 더함) 입출고가 없는 시간(야간 보관 작업 등)에 실행한다.
+    """
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    taken_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    ops = []
+    for collection, item_type, stock_field in (('roll_inventory', 'roll', '현재고_롤'),
+                                               ('cut_inventory', 'cut', '현재고_장'),
+                                               ('raw_materials', 'raw', '현재고_kg')):
+        for doc_id, d in _collection_docs(db, collection):
+            doc_ref = db.collection('stock_snapshots').document(f"{taken_at}_{item_type}_{doc_id}")
+            ops.append(('set', doc_ref, {
+                'taken_at': taken_at,
+                'item_type': item_type,
+                'item_id': doc_id,
+                'stock': float(d.get(stock_field, 0)),
+                'ledger_id': None
+            }))
+    commit_ops(db, ops)
+    return taken_at
+
+
+def load_stock_snapshot(at=None):
+    """at(기본: 지금) 이전 가장 최근 스냅샷의 품목별 재고 (taken_at, item_type, item_id, stock, ledger_id)"""
+    db = get_firestore_client()
+    
+    if db is None:
+        return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+    
+    at = (at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    latest = list(db.collection('stock_snapshots')
+                  .where('taken_at', '<=', at)
+                  .order_by('taken_at', direction=firestore.Query.DESCENDING)
+                  .limit(1).stream())
+    if not latest:
+        return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+    
+    taken_at = latest[0].to_dict()['taken_at']
+    docs = db.collection('stock_snapshots').where('taken_at', '==', taken_at).stream()
+    return pd.DataFrame([{col: doc.to_dict().get(col) for col in SNAPSHOT_COLUMNS} for doc in docs],
+                        columns=SNAPSHOT_COLUMNS)
+
+
 # ========== 재주문 임계값 관리 ==========
 
 def set_reorder_level(item_type, item_id, threshold):
@@ -324,6 +925,7 @@ def set_reorder_level(item_type, item_id, threshold):
         return
     
     doc_id = f"{item_type}_{item_id}"
+    firestore_mirror.note_local_write('reorder_levels')
     db.collection('reorder_levels').document(doc_id).set({
         'item_type': item_type,
         'item_id': str(item_id),
@@ -331,6 +933,27 @@ def set_reorder_level(item_type, item_id, threshold):
     })
 
 
+def set_reorder_levels(item_type, thresholds):
+    """여러 품목의 재주문 임계값을 500건 묶음으로 설정. thresholds: {item_id: 임계값}"""
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    ops = []
+    for item_id, threshold in thresholds.items():
+        doc_ref = db.collection('reorder_levels').document(f"{item_type}_{item_id}")
+        ops.append(('set', doc_ref, {
+            'item_type': item_type,
+            'item_id': str(item_id),
+            'threshold': float(threshold)
+        }))
+    
+    if ops:
+        firestore_mirror.note_local_write('reorder_levels')
+        commit_ops(db, ops)
+
+
 def get_reorder_level(item_type, item_id):
     """재주문 임계값 조회"""
     db = get_firestore_client()
@@ -340,6 +963,11 @@ def get_reorder_level(item_type, item_id):
     
     try:
         doc_id = f"{item_type}_{item_id}"
+        mirrored = firestore_mirror.documents(db, 'reorder_levels')
+        if mirrored is not None:
+            d = mirrored.get(doc_id)
+            return float(d.get('threshold', 0)) if d is not None else None
+        
         doc = db.collection('reorder_levels').document(doc_id).get()
         
         if doc.exists:
@@ -350,63 +978,101 @@ def get_reorder_level(item_type, item_id):
         return None
 
 
+def load_reorder_levels(item_type, item_ids=None):
+    """재주문 임계값 일괄 조회
+    
+    Args:
+        item_type: 'roll' / 'cut'
+        item_ids: 지정 시 해당 문서만 get_all로 한 번에 조회, 없으면 item_type 전체 쿼리
+                  (실시간 미러가 동기화되어 있으면 메모리에서 조회)
+        
+    Returns:
+        dict: {item_id: threshold}
+    """
+    db = get_firestore_client()
+    
+    if db is None:
+        return {}
+    
+    try:
+        mirrored = firestore_mirror.documents(db, 'reorder_levels')
+        if mirrored is not None:
+            wanted = None if item_ids is None else {str(i) for i in item_ids}
+            return {
+                d.get('item_id', ''): float(d.get('threshold', 0))
+                for d in mirrored.values()
+                if d.get('item_type') == item_type and (wanted is None or d.get('item_id') in wanted)
+            }
+        
+        if item_ids is not None:
+            refs = [db.collection('reorder_levels').document(f"{item_type}_{item_id}") for item_id in item_ids]
+            docs = db.get_all(refs) if refs else []
+        else:
+            docs = db.collection('reorder_levels').where('item_type', '==', item_type).stream()
+        
+        levels = {}
+        for doc in docs:
+            if not doc.exists:
+                continue
+            d = doc.to_dict()
+            levels[d.get('item_id', '')] = float(d.get('threshold', 0))
+        
+        return levels
+        
+    except Exception:
+        return {}
+
+
 # ========== 작업 플로우 관리 ==========
 
-def load_workflow():
-    """작업 플로우 데이터 로드"""
+def _workflow_docs(db, statuses=None):
+    """workflow (문서ID, 데이터) 목록. statuses가 있으면 where('상태', 'in', ...)로 그 상태의 문서만 읽는다."""
+    docs = firestore_mirror.documents(db, 'workflow')
+    if docs is not None:
+        return [(doc_id, d) for doc_id, d in docs.items() if statuses is None or d.get('상태', '접수') in statuses]
+    query = db.collection('workflow')
+    if statuses is not None:
+        query = query.where('상태', 'in', list(statuses))
+    return [(doc.id, doc.to_dict()) for doc in query.stream()]
+
+
+def load_workflow(statuses=None):
+    """작업 플로우 데이터 로드 (statuses: 이 상태의 작업만)"""
     db = get_firestore_client()
     
     if db is None:
-        return pd.DataFrame(columns=['작업ID', '업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모', '등록일'])
+        return pd.DataFrame(columns=WORKFLOW_COLUMNS)
     
     try:
-        docs = db.collection('workflow').stream()
         data = []
         
-        for doc in docs:
-            d = doc.to_dict()
-            data.append({
-                '작업ID': doc.id,
-                '업체명': d.get('업체명', ''),
-                '제품규격': d.get('제품규격', ''),
-                '수량': d.get('수량', 0),
-                '단위': d.get('단위', ''),
-                '담당자': d.get('담당자', ''),
-                '상태': d.get('상태', '접수'),
-                '우선순위': d.get('우선순위', '보통'),
-                '납기일': d.get('납기일', ''),
-                '메모': d.get('메모', ''),
-                '등록일': d.get('등록일', '')
-            })
-        
-        if not data:
-            return pd.DataFrame(columns=['작업ID', '업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모', '등록일'])
-        
-        return pd.DataFrame(data)
+        for doc_id, d in _workflow_docs(db, statuses):
+            data.append(_workflow_row(doc_id, d))
+        
+        df = pd.DataFrame(data) if data else pd.DataFrame(columns=WORKFLOW_COLUMNS)
+        # 저장 시 변경분만 쓰도록 로드 시점 상태를 기록
+        remember_snapshot(df, df['작업ID'], WORKFLOW_COLUMNS)
+        return df
         
     except Exception as e:
         print(f"작업 플로우 로드 오류: {e}")
-        return pd.DataFrame(columns=['작업ID', '업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모', '등록일'])
+        return pd.DataFrame(columns=WORKFLOW_COLUMNS)
 
 
 def save_workflow(df):
-    """작업 플로우 데이터 저장"""
+    """작업 플로우 데이터 저장 (load_workflow 이후 변경/추가된 작업 문서만 기록)"""
     db = get_firestore_client()
     
     if db is None:
         raise Exception("Firebase 연결 실패")
     
-    batch = db.batch()
-    
-    # 기존 문서 삭제
-    existing_docs = db.collection('workflow').stream()
-    for doc in existing_docs:
-        batch.delete(doc.reference)
+    changed = diff_frame(df, df['작업ID'], WORKFLOW_COLUMNS)
+    ops = []
     
-    # 새 데이터 추가
-    for _, row in df.iterrows():
+    for _, row in changed.iterrows():
         doc_ref = db.collection('workflow').document(str(row['작업ID']))
-        batch.set(doc_ref, {
+        # merge: 프레임에 없는 완료일(보관 기준)은 유지
+        ops.append(('merge', doc_ref, {
             '업체명': row['업체명'],
             '제품규격': row['제품규격'],
             '수량': int(row['수량']),
@@ -417,24 +1083,21 @@ def save_workflow(df):
             '납기일': row['납기일'],
             '메모': row['메모'],
             '등록일': row['등록일']
-        })
+        }))
     
-    batch.commit()
+    if ops:
+        firestore_mirror.note_local_write('workflow')
+        commit_ops(db, ops)
+    remember_snapshot(df, df['작업ID'], WORKFLOW_COLUMNS)
 
 
 def update_workflow_item(work_id, **kwargs):
-    """작업 플로우 아이템 업데이트"""
+    """작업 플로우 아이템 업데이트 (지정 필드만 쓰기 1건, 존재 확인 읽기 없음)"""
     db = get_firestore_client()
     
     if db is None:
         raise Exception("Firebase 연결 실패")
     
-    doc_ref = db.collection('workflow').document(str(work_id))
-    doc = doc_ref.get()
-    
-    if not doc.exists:
-        raise KeyError(f"작업ID {work_id} 없음")
-    
     update_data = {}
     for k, v in kwargs.items():
         if k in ['업체명', '제품규격', '단위', '담당자', '상태', '우선순위', '납기일', '메모']:
@@ -442,7 +1105,17 @@ def update_workflow_item(work_id, **kwargs):
         elif k == '수량':
             update_data[k] = int(v)
     
-    doc_ref.update(update_data)
+    if not update_data:
+        return
+    if '상태' in update_data:
+        # 납품완료로 바뀐 날부터 보관 기간을 센다
+        update_data['완료일'] = datetime.now().strftime("%Y-%m-%d") if update_data['상태'] == COMPLETED_STATUS else ''
+    
+    firestore_mirror.note_local_write('workflow')
+    try:
+        db.collection('workflow').document(str(work_id)).update(update_data)
+    except NotFound:
+        raise KeyError(f"작업ID {work_id} 없음")
 
 
 def delete_workflow_item(work_id):
@@ -452,7 +1125,98 @@ def delete_workflow_item(work_id):
     if db is None:
         raise Exception("Firebase 연결 실패")
     
-    db.collection('workflow').document(str(work_id)).delete()
+    firestore_mirror.note_local_write('workflow')
+    commit_ops(db, [('delete', db.collection('workflow').document(str(work_id)), None),
+                    ('delete', db.collection('workflow_archive').document(str(work_id)), None)])
+
+
+def archive_workflow(before):
+    """
+    완료일이 before('YYYY-MM-DD')보다 이른 납품완료 작업을 workflow_archive 컬렉션으로 옮긴다
+    
+    where('상태', '==', '납품완료')로 완료 작업만 읽고, 보관 문서 쓰기가 성공한 묶음의 원본만 지운다.
+    보관 쓰기는 set이라 다시 실행해도 안전하다: 일부 묶음이 실패하면 BulkWriteError가 발생하고
+    실패한 작업은 원본에 남으므로 다음 실행에서 다시 옮긴다. 완료일이 없는 완료 작업은 오늘을 완료일로 기록만 한다.
+    
+    Returns:
+        int: 옮긴 작업 수
+    """
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    today = datetime.now().strftime("%Y-%m-%d")
+    stamps, moved = [], []
+    for doc_id, d in _workflow_docs(db, [COMPLETED_STATUS]):
+        if not d.get('완료일'):
+            d = {**d, '완료일': today}
+            if today >= before:
+                stamps.append(('update', db.collection('workflow').document(doc_id), {'완료일': today}))
+        if d['완료일'] < before:
+            moved.append((doc_id, d))
+    
+    if stamps:
+        firestore_mirror.note_local_write('workflow')
+        commit_ops(db, stamps)
+    if not moved:
+        return 0
+    
+    results = commit_ops(db, [('set', db.collection('workflow_archive').document(doc_id), d) for doc_id, d in moved],
+                         raise_on_error=False)
+    archived = [doc_id for r in results if r['ok']
+                for doc_id, _ in moved[r['chunk'] * MAX_BATCH_OPS:(r['chunk'] + 1) * MAX_BATCH_OPS]]
+    if archived:
+        firestore_mirror.note_local_write('workflow')
+        commit_ops(db, [('delete', db.collection('workflow').document(doc_id), None) for doc_id in archived])
+    if len(archived) < len(moved):
+        raise BulkWriteError(results)
+    return len(archived)
+
+
+def load_workflow_archive(limit=50, after=None):
+    """
+    보관된 작업 한 페이지 (완료일 최신순, after: 이전 페이지 마지막 행의 (완료일, 작업ID))
+    
+    order_by(완료일, 문서 ID) + start_after 커서로 limit건만 읽는다.
+    """
+    db = get_firestore_client()
+    
+    if db is None:
+        return pd.DataFrame(columns=WORKFLOW_ARCHIVE_COLUMNS)
+    
+    try:
+        query = (db.collection('workflow_archive')
+                 .order_by('완료일', direction=firestore.Query.DESCENDING)
+                 .order_by('__name__', direction=firestore.Query.DESCENDING))
+        if after is not None:
+            query = query.start_after({'완료일': after[0], '__name__': after[1]})
+    
+        rows = []
+        for doc in query.limit(limit).stream():
+            d = doc.to_dict()
+            rows.append({**_workflow_row(doc.id, d), '완료일': d.get('완료일', '')})
+        return pd.DataFrame(rows, columns=WORKFLOW_ARCHIVE_COLUMNS)
+    
+    except Exception as e:
+        print(f"보관 작업 로드 오류: {e}")
+        return pd.DataFrame(columns=WORKFLOW_ARCHIVE_COLUMNS)
+
+
+def workflow_archive_count():
+    """보관된 작업 수 (count 집계 쿼리)"""
+    db = get_firestore_client()
+    
+    if db is None:
+        return 0
+    
+    try:
+        results = db.collection('workflow_archive').count(alias='count').get()
+        return int(results[0][0].value or 0)
+    
+    except Exception as e:
+        print(f"보관 작업 수 조회 오류: {e}")
+        return 0
 
 
 # --------------------------------------------------------------------------------
@@ -467,61 +1231,63 @@ def load_raw_materials():
         return pd.DataFrame(columns=['품명', 'Grade', '현재고_kg', '입고일', '비고'])
     
     try:
-        docs = db.collection('raw_materials').stream()
         data = []
         
-        for doc in docs:
-            d = doc.to_dict()
-            data.append({
-                '품명': d.get('품명', ''),
-                'Grade': d.get('Grade', ''),
-                '현재고_kg': d.get('현재고_kg', 0),
-                '입고일': d.get('입고일', ''),
-                '비고': d.get('비고', '')
-            })
-        
-        if not data:
-            return pd.DataFrame(columns=['품명', 'Grade', '현재고_kg', '입고일', '비고'])
+        for doc_id, d in _collection_docs(db, 'raw_materials'):
+            data.append(_raw_row(doc_id, d))
         
-        return pd.DataFrame(data)
+        df = pd.DataFrame(data) if data else pd.DataFrame(columns=RAW_COLUMNS)
+        # 저장 시 변경분만 쓰도록 로드 시점 상태를 기록
+        remember_snapshot(df, _raw_material_keys(df), RAW_COLUMNS)
+        return df
         
     except Exception as e:
         print(f"원료 재고 로드 오류: {e}")
         return pd.DataFrame(columns=['품명', 'Grade', '현재고_kg', '입고일', '비고'])
 
 
+def _raw_material_keys(df):
+    """원료 문서 ID ('품명_Grade') Series"""
+    return df['품명'].astype(str) + '_' + df['Grade'].astype(str)
+
+
 def save_raw_materials(df):
-    """원료 재고 데이터 저장"""
+    """원료 재고 데이터 저장 (load_raw_materials 이후 변경/추가된 문서만 기록)"""
     db = get_firestore_client()
     
     if db is None:
         raise Exception("Firebase 연결 실패")
     
-    batch = db.batch()
+    keys = _raw_material_keys(df)
+    changed = diff_frame(df, keys, RAW_COLUMNS)
+    ops = []
     
-    for _, row in df.iterrows():
+    for idx, row in changed.iterrows():
         # 문서 ID는 '품명_Grade' 조합으로 생성하여 유니크하게 관리
-        doc_id = f"{row['품명']}_{row['Grade']}"
-        doc_ref = db.collection('raw_materials').document(doc_id)
+        doc_ref = db.collection('raw_materials').document(keys.loc[idx])
         
-        batch.set(doc_ref, {
+        ops.append(('set', doc_ref, {
             '품명': row['품명'],
             'Grade': row['Grade'],
             '현재고_kg': float(row['현재고_kg']),
             '입고일': str(row['입고일']),
             '비고': str(row['비고'])
-        })
+        }))
     
-    batch.commit()
+    if ops:
+        firestore_mirror.note_local_write('raw_materials')
+        commit_ops(db, ops)
+    remember_snapshot(df, keys, RAW_COLUMNS)
 
 
 def log_raw_material_transaction(product_name, grade, change_amount, transaction_type, date):
-    """원료 입출고 기록"""
+    """원료 입출고 기록 (월별 사용량 집계도 같은 batch로 갱신)"""
     db = get_firestore_client()
     if db is None: return
 
     try:
-        db.collection('raw_material_transactions').add({
+        batch = db.batch()
+        batch.set(db.collection('raw_material_transactions').document(), {
             '품명': product_name,
             'Grade': grade,
             '수량변경': float(change_amount),
@@ -529,5 +1295,35 @@ def log_raw_material_transaction(product_name, grade, change_amount, transaction
             '날짜': date,
             'timestamp': firestore.SERVER_TIMESTAMP
         })
+        _add_usage(batch, db, 'raw', f"{product_name}_{grade}", str(date)[:7], float(change_amount))
+        batch.commit()
     except Exception as e:
         print(f"로그 저장 오류: {e}")
+
+
+def adjust_raw_material_stock(product_name, grade, delta, transaction_type, date):
+    """원료 재고 증감 + 입출고 기록 (트랜잭션). 변경 후 재고(kg) 반환"""
+    db = get_firestore_client()
+    
+    if db is None:
+        raise Exception("Firebase 연결 실패")
+    
+    doc_id = f"{product_name}_{grade}"
+    return _adjust_stock(
+        db.collection('raw_materials').document(doc_id), '현재고_kg', float(delta), float,
+        'raw_material_transactions', {
+            '품명': product_name,
+            'Grade': grade,
+            '수량변경': float(delta),
+            '구분': transaction_type,
+            '날짜': date,
+            'timestamp': firestore.SERVER_TIMESTAMP
+        },
+        ('raw', doc_id, str(date)[:7]),
+        touch_updated=False
+    )
+
+
+# ========== 계측 (instrumentation.py): 함수별 지연 시간, 문서 읽기/쓰기 건수 ==========
+instrumentation.install_firestore_hooks()
+instrumentation.instrument_module(globals(), 'firestore')
@@ -0,0 +1,149 @@
+# Firestore 대량 쓰기
+"""
+Firestore batch는 최대 500건까지만 커밋할 수 있다.
+쓰기 목록을 500건 이하 묶음(chunk)으로 나눠 스레드 풀에서 동시에 커밋하고,
+일시적 오류는 지수 백오프로 재시도한 뒤 묶음별 결과를 돌려준다.
+
+묶음끼리는 원자적이지 않다. 일부 묶음이 실패하면 BulkWriteError가 발생하며,
+set/delete는 멱등이므로 같은 쓰기를 다시 실행하면 된다 (Increment를 담은 merge는 멱등이 아님).
+
+같은 문서를 여러 묶음에서 쓰는 목록은 순서가 바뀌면 결과가 달라지므로(예: delete 뒤 set),
+이때는 묶음을 차례로 커밋하고 실패한 묶음 뒤의 묶음은 커밋하지 않는다.
+작업 스레드가 1개(max_workers=1, FIRESTORE_BULK_WORKERS=1)일 때도 같은 방식으로 커밋한다.
+
+    ops = [('set', doc_ref, data), ('merge', doc_ref, data), ('update', doc_ref, data), ('delete', doc_ref, None)]
+    result = commit_ops(db, ops)
+"""
+import contextvars
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from google.api_core import exceptions as gexc
+
+MAX_BATCH_OPS = 500
+DEFAULT_WORKERS = int(os.environ.get('FIRESTORE_BULK_WORKERS', '8'))
+DEFAULT_RETRIES = 4
+DEFAULT_BACKOFF = 0.5   # 첫 재시도 대기(초), 이후 2배씩
+
+# 다시 시도하면 성공할 수 있는 오류
+RETRYABLE = (
+    gexc.Aborted,
+    gexc.DeadlineExceeded,
+    gexc.InternalServerError,
+    gexc.ResourceExhausted,
+    gexc.ServiceUnavailable,
+    gexc.TooManyRequests,
+)
+
+
+class BulkWriteError(Exception):
+    """재시도 후에도 실패한 묶음이 있을 때 발생. results에 묶음별 결과가 있다."""
+
+    def __init__(self, results):
+        self.results = results
+        failed = [r for r in results if not r['ok']]
+        super().__init__(
+            f"Firestore 대량 쓰기 실패: {len(failed)}/{len(results)}개 묶음 "
+            f"(첫 오류: {failed[0]['error'] if failed else ''})"
+        )
+
+
+def chunk_ops(ops, chunk_size=MAX_BATCH_OPS):
+    """쓰기 목록을 chunk_size(최대 500) 이하 묶음으로 나눔"""
+    chunk_size = min(chunk_size, MAX_BATCH_OPS)
+    return [ops[i:i + chunk_size] for i in range(0, len(ops), chunk_size)]
+
+
+def _commit_chunk(db, index, chunk, retries, backoff):
+    """묶음 1개 커밋 (일시적 오류는 재시도). 결과 dict 반환"""
+    started = time.perf_counter()
+    attempt = 0
+    while True:
+        attempt += 1
+        batch = db.batch()
+        for op, doc_ref, data in chunk:
+            if op == 'delete':
+                batch.delete(doc_ref)
+            elif op == 'update':
+                batch.update(doc_ref, data)
+            elif op == 'merge':
+                batch.set(doc_ref, data, merge=True)
+            else:
+                batch.set(doc_ref, data)
+        try:
+            batch.commit()
+            error = None
+            break
+        except RETRYABLE as e:
+            error = e
+            if attempt > retries:
+                break
+            # 동시에 실패한 묶음들이 같은 시각에 재시도하지 않도록 지터를 둔다
+            time.sleep(backoff * (2 ** (attempt - 1)) * (0.5 + random.random()))
+        except Exception as e:
+            error = e
+            break
+
+    return {
+        'chunk': index,
+        'ops': len(chunk),
+        'attempts': attempt,
+        'ok': error is None,
+        'error': None if error is None else f"{type(error).__name__}: {error}",
+        'seconds': round(time.perf_counter() - started, 4),
+    }
+
+
+def _spans_chunks(chunks):
+    """같은 문서가 두 개 이상의 묶음에 나오는지"""
+    seen = {}
+    for index, chunk in enumerate(chunks):
+        for _, doc_ref, _ in chunk:
+            if seen.setdefault(doc_ref.path, index) != index:
+                return True
+    return False
+
+
+def _skipped(index, chunk):
+    return {'chunk': index, 'ops': len(chunk), 'attempts': 0, 'ok': False,
+            'error': "앞 묶음 실패로 커밋하지 않음", 'seconds': 0.0}
+
+
+def commit_ops(db, ops, max_workers=None, chunk_size=MAX_BATCH_OPS,
+               retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, raise_on_error=True):
+    """
+    쓰기 목록을 묶음으로 나눠 동시에 커밋 (같은 문서가 여러 묶음에 있거나 작업 스레드가 1개면 차례로 커밋)
+
+    Args:
+        db: Firestore 클라이언트
+        ops: [('set'|'merge'|'update'|'delete', doc_ref, data)]
+        max_workers: 동시에 커밋할 묶음 수 (기본 FIRESTORE_BULK_WORKERS 또는 8)
+        raise_on_error: 실패한 묶음이 있으면 BulkWriteError 발생
+
+    Returns:
+        list: 묶음별 결과 dict (chunk, ops, attempts, ok, error, seconds)
+    """
+    chunks = chunk_ops(ops, chunk_size)
+    if not chunks:
+        return []
+
+    workers = max(1, min(max_workers or DEFAULT_WORKERS, len(chunks)))
+    if workers == 1 or _spans_chunks(chunks):
+        results = []
+        for i, chunk in enumerate(chunks):
+            if results and not results[-1]['ok']:
+                results.append(_skipped(i, chunk))
+            else:
+                results.append(_commit_chunk(db, i, chunk, retries, backoff))
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='firestore-bulk') as pool:
+            # 호출한 쪽의 컨텍스트를 복사해 넘긴다 (쓰기 건수가 호출한 데이터 함수/페이지에 집계되도록)
+            futures = [pool.submit(contextvars.copy_context().run, _commit_chunk, db, i, chunk, retries, backoff)
+                       for i, chunk in enumerate(chunks)]
+            results = [f.result() for f in futures]
+
+    if raise_on_error and not all(r['ok'] for r in results):
+        raise BulkWriteError(results)
+    return results
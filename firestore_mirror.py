@@ -0,0 +1,173 @@
+# Firestore 실시간 미러
+"""
+자주 읽는 컬렉션을 on_snapshot 리스너로 프로세스 메모리에 유지한다.
+첫 동기화 이후 load_*는 문서 읽기 없이 메모리에서 응답하고,
+다른 작업자의 변경은 리스너가 받아 data_cache 버전을 올린다 (폴링 없음).
+
+리스너가 끊기거나 첫 동기화가 늦으면 None을 돌려주어 호출자가 stream()으로 읽게 하고,
+RETRY_INTERVAL초마다 리스너를 다시 연결한다.
+
+환경변수 INVENTORY_REALTIME=0 으로 끌 수 있다.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import instrumentation
+from data_cache import cache
+
+MIRRORED_COLLECTIONS = ('roll_inventory', 'cut_inventory', 'workflow', 'raw_materials', 'reorder_levels')
+INITIAL_SYNC_TIMEOUT = 10.0   # 첫 동기화 대기(초)
+CATCH_UP_TIMEOUT = 2.0        # 자기 쓰기가 리스너에 도착하기를 기다리는 시간(초)
+RETRY_INTERVAL = 30.0         # 끊긴 리스너 재연결 간격(초)
+
+
+def enabled():
+    return os.environ.get('INVENTORY_REALTIME', '1') != '0'
+
+
+class CollectionMirror:
+    """컬렉션 1개의 {문서ID: 데이터} 사본"""
+
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.docs = {}
+        self.read_time = None       # 마지막으로 반영한 서버 시각
+        self.local_write = None     # 마지막 자기 쓰기 시각
+        self.watch = None
+        self.started_at = 0.0
+        self.synced = False
+        self._cond = threading.Condition()
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self.synced = False
+        self.docs = {}
+        try:
+            self.watch = self.db.collection(self.name).on_snapshot(self._on_snapshot)
+        except Exception as e:
+            print(f"{self.name} 리스너 시작 오류: {e}")
+            self.watch = None
+
+    def stop(self):
+        if self.watch is not None:
+            try:
+                self.watch.unsubscribe()
+            except Exception:
+                pass
+        self.watch = None
+        with self._cond:
+            self.synced = False
+
+    def _on_snapshot(self, docs, changes, read_time):
+        with self._cond:
+            for change in changes:
+                if change.type.name == 'REMOVED':
+                    self.docs.pop(change.document.id, None)
+                else:
+                    self.docs[change.document.id] = change.document.to_dict()
+            self.read_time = read_time
+            self.synced = True
+            self._cond.notify_all()
+        # 리스너가 받은 문서도 읽기로 과금된다
+        instrumentation.count(reads=len(changes))
+        # 다른 세션/기기의 변경도 다음 로드에서 보이도록 캐시 무효화
+        cache.bump(self.name)
+
+    def healthy(self):
+        if self.watch is None:
+            return False
+        # google-cloud-firestore Watch는 연결이 끊기면 is_active가 False가 된다
+        return getattr(self.watch, 'is_active', True)
+
+    def _caught_up(self):
+        if not self.synced:
+            return False
+        if self.local_write is None:
+            return True
+        return self.read_time is not None and self.read_time >= self.local_write
+
+    def documents(self, timeout):
+        """사본(dict 복사) 반환. 동기화/자기 쓰기 반영을 timeout초까지 기다린 뒤에도 안 되면 None"""
+        with self._cond:
+            if not self._cond.wait_for(self._caught_up, timeout=timeout):
+                # 서버/로컬 시계 차이로 계속 기다리지 않도록 이번 한 번만 stream()으로 넘긴다
+                if self.synced:
+                    self.local_write = None
+                return None
+            return {doc_id: dict(data) for doc_id, data in self.docs.items()}
+
+    def note_local_write(self):
+        with self._cond:
+            self.local_write = datetime.now(timezone.utc)
+
+
+_mirrors = {}
+_lock = threading.Lock()
+
+
+def _mirror(db, name):
+    """컬렉션 미러 반환 (없거나 끊겼으면 재시작)"""
+    with _lock:
+        mirror = _mirrors.get(name)
+        if mirror is not None and mirror.db is not db:
+            mirror.stop()
+            mirror = None
+        if mirror is None:
+            mirror = _mirrors[name] = CollectionMirror(db, name)
+            mirror.start()
+        elif not mirror.healthy() and time.monotonic() - mirror.started_at >= RETRY_INTERVAL:
+            mirror.stop()
+            mirror.start()
+        return mirror
+
+
+def documents(db, name):
+    """
+    미러된 컬렉션의 {문서ID: 데이터}
+
+    Returns:
+        dict 또는 None (미러 비활성/미대상 컬렉션/리스너 끊김/동기화 지연 -> 호출자가 stream()으로 읽음)
+    """
+    if db is None or not enabled() or name not in MIRRORED_COLLECTIONS:
+        return None
+
+    mirror = _mirror(db, name)
+    if not mirror.healthy():
+        return None
+    if mirror.synced:
+        timeout = CATCH_UP_TIMEOUT
+    else:
+        # 첫 동기화는 시작 후 INITIAL_SYNC_TIMEOUT까지만 기다리고, 그 뒤로는 기다리지 않는다
+        timeout = max(0.0, INITIAL_SYNC_TIMEOUT - (time.monotonic() - mirror.started_at))
+    return mirror.documents(timeout)
+
+
+def note_local_write(name):
+    """자기 쓰기 직전 호출: 리스너가 이 쓰기를 반영하기 전에는 미러로 응답하지 않는다"""
+    mirror = _mirrors.get(name)
+    if mirror is not None:
+        mirror.note_local_write()
+
+
+def stop_all():
+    with _lock:
+        for mirror in _mirrors.values():
+            mirror.stop()
+        _mirrors.clear()
+
+
+def status():
+    """{컬렉션: {'healthy', 'synced', 'docs', 'read_time'}} (상태 표시용)"""
+    with _lock:
+        return {
+            name: {
+                'healthy': mirror.healthy(),
+                'synced': mirror.synced,
+                'docs': len(mirror.docs),
+                'read_time': mirror.read_time,
+            }
+            for name, mirror in _mirrors.items()
+        }
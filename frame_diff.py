@@ -0,0 +1,68 @@
+# 데이터프레임 변경분 계산
+"""
+load_* 시점의 행 해시 스냅샷과 비교해 저장 시 변경된 행만 골라낸다
+(save_*가 전체 행을 다시 쓰지 않도록)
+
+프레임에서 빠진 행은 삭제로 보지 않는다. 스냅샷은 DataFrame.attrs에 있어 필터/슬라이스/head()에도
+그대로 따라가므로, 빠진 행을 삭제로 보면 필터한 화면을 저장할 때 나머지 행이 모두 지워진다.
+삭제는 delete_*_item으로만 한다.
+"""
+import pandas as pd
+
+SNAPSHOT_ATTR = 'row_snapshot'
+
+
+class RowSnapshot:
+    """{키: 행 해시} 스냅샷. DataFrame.attrs에 붙어 다니며 불변이므로 복사하지 않는다."""
+
+    def __init__(self, hashes):
+        self.hashes = hashes
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __copy__(self):
+        return self
+
+
+def _hash_values(df, cols):
+    """행 해시 목록. 숫자 컬럼은 float로 맞춰 int/float 표현 차이를 무시한다."""
+    frame = df[cols].copy()
+    for col in cols:
+        if pd.api.types.is_numeric_dtype(frame[col]):
+            frame[col] = frame[col].astype(float)
+    return pd.util.hash_pandas_object(frame, index=False).tolist()
+
+
+def row_hashes(df, keys, cols):
+    """{키: 행 해시} 계산"""
+    if df.empty:
+        return {}
+    return dict(zip(keys.astype(str).tolist(), _hash_values(df, cols)))
+
+
+def remember_snapshot(df, keys, cols):
+    """현재 내용을 '저장된 상태'로 기록 (load_* 직후, save_* 직후 호출)"""
+    df.attrs[SNAPSHOT_ATTR] = RowSnapshot(row_hashes(df, keys, cols))
+
+
+def diff_frame(df, keys, cols):
+    """
+    스냅샷 대비 변경분 계산
+
+    Args:
+        df: 저장할 데이터프레임
+        keys: 행 키 Series (df와 같은 인덱스)
+        cols: 비교할 컬럼 목록
+
+    Returns:
+        추가/수정된 행 DataFrame.
+        스냅샷이 없는 프레임(직접 만든 프레임 등)은 전체 행을 돌려준다.
+    """
+    snapshot = df.attrs.get(SNAPSHOT_ATTR)
+    if snapshot is None or df.empty:
+        return df
+
+    old = snapshot.hashes
+    changed_mask = [old.get(k) != h for k, h in zip(keys.astype(str).tolist(), _hash_values(df, cols))]
+    return df[changed_mask]
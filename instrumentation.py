@@ -0,0 +1,426 @@
+# 데이터 계층 계측
+"""
+firebase_db / db_functions의 데이터 함수(storage.API)를 감싸 함수별 호출 수, 지연 시간 히스토그램,
+읽기/쓰기 건수를 모으고, Streamlit 재실행(rerun)과 페이지(menu)별 합계를 낸다.
+
+- Firestore: 문서 읽기/쓰기 건수(과금 기준). SDK의 stream/get/commit에 건수 집계를 건다.
+  실시간 미러에서 응답한 로드는 읽기 0건이고, 리스너가 받은 변경 문서는 리스너 쪽 읽기로 센다.
+  집계 쿼리(count/sum)는 1건으로 센다 (실제로는 색인 1천 건당 1건이라 큰 컬렉션에서는 조금 적게 센다).
+- SQLite: 반환한 DataFrame 행 수(읽기)와 변경된 행 수(쓰기, 커넥션 total_changes)
+- 함수 안에서 다른 데이터 함수를 부르면 함수별 통계에는 각각 더하고, 페이지/재실행 합계에는 가장 바깥 호출만 더한다.
+- 데이터 함수 밖의 읽기(리스너, 인증 갱신 등 백그라운드)는 BACKGROUND 페이지로 모은다.
+- 제너레이터를 돌려주는 함수(iter_table)는 만드는 시간만 재고, 실제 읽기는 소비하는 쪽 페이지 합계로 간다.
+
+INVENTORY_METRICS_FILE을 지정하면 INVENTORY_METRICS_INTERVAL초(기본 60)마다 파일로 기록한다
+(.json이면 JSON, 그 밖에는 Prometheus 텍스트 형식). INVENTORY_METRICS=0이면 함수를 감싸지 않는다.
+"""
+import bisect
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+
+from storage import API
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)   # 초 (Prometheus 기본값)
+BACKGROUND = '(background)'
+RECENT_RERUNS = 20
+DEFAULT_INTERVAL = 60.0
+
+_lock = threading.Lock()
+_functions = {}                          # (저장소, 함수) -> 누적 통계
+_pages = {}                              # 페이지 -> 누적 합계
+_recent = deque(maxlen=RECENT_RERUNS)    # 끝난 재실행 요약 (최근 순서대로)
+
+# 진행 중인 데이터 함수 호출 (안쪽 호출 -> 바깥 호출을 parent로 연결)
+# contextvars라서 세션 스레드별로 따로이며, firestore_bulk 작업 스레드에는 복사해서 넘긴다
+_call = contextvars.ContextVar('inventory_data_call', default=None)
+_rerun = contextvars.ContextVar('inventory_rerun', default=None)
+
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def enabled():
+    return os.environ.get('INVENTORY_METRICS', '1') != '0'
+
+
+def _totals():
+    return {'calls': 0, 'errors': 0, 'seconds': 0.0, 'reads': 0, 'writes': 0}
+
+
+def _add(totals, calls=0, errors=0, seconds=0.0, reads=0, writes=0):
+    totals['calls'] += calls
+    totals['errors'] += errors
+    totals['seconds'] += seconds
+    totals['reads'] += reads
+    totals['writes'] += writes
+
+
+# ==================== 재실행 / 페이지 ====================
+
+def begin_rerun(page=BACKGROUND):
+    """Streamlit 스크립트 실행 시작 (같은 세션의 이전 재실행이 끝나지 않았으면 먼저 마감)"""
+    end_rerun()
+    rerun = _totals()
+    rerun.update(page=page, started=time.perf_counter(), functions={})
+    _rerun.set(rerun)
+    return rerun
+
+
+def set_page(page):
+    """현재 재실행의 페이지(menu) 지정. 이후 호출은 이 페이지 합계로 간다"""
+    rerun = _rerun.get()
+    if rerun is None:
+        rerun = begin_rerun(page)
+    rerun['page'] = page
+
+
+def end_rerun():
+    """현재 재실행을 마감해 최근 목록과 페이지 재실행 수에 반영 (요약 반환, 없으면 None)"""
+    rerun = _rerun.get()
+    if rerun is None:
+        return None
+    _rerun.set(None)
+    summary = _rerun_summary(rerun)
+    with _lock:
+        _pages.setdefault(rerun['page'], dict(_totals(), reruns=0))['reruns'] += 1
+        _recent.append(summary)
+    return summary
+
+
+def current_rerun():
+    """진행 중인 재실행 요약 (없으면 None)"""
+    rerun = _rerun.get()
+    if rerun is None:
+        return None
+    with _lock:
+        return _rerun_summary(rerun)
+
+
+def _rerun_summary(rerun):
+    summary = {k: rerun[k] for k in ('page', 'calls', 'errors', 'seconds', 'reads', 'writes')}
+    summary['wall_seconds'] = time.perf_counter() - rerun['started']
+    summary['functions'] = {name: dict(totals) for name, totals in rerun['functions'].items()}
+    return summary
+
+
+# ==================== 건수 집계 ====================
+
+def count(reads=0, writes=0):
+    """
+    현재 데이터 함수 호출(과 바깥 호출들)에 읽기/쓰기 건수를 더한다.
+    호출 밖이면 현재 재실행/페이지(없으면 BACKGROUND) 합계에 바로 더한다.
+    """
+    if not reads and not writes:
+        return
+    call = _call.get()
+    with _lock:
+        if call is None:
+            rerun = _rerun.get()
+            page = rerun['page'] if rerun is not None else BACKGROUND
+            _add(_pages.setdefault(page, dict(_totals(), reruns=0)), reads=reads, writes=writes)
+            if rerun is not None:
+                _add(rerun, reads=reads, writes=writes)
+            return
+        while call is not None:
+            call['reads'] += reads
+            call['writes'] += writes
+            call = call['parent']
+
+
+def _record(backend, name, call, seconds, error):
+    with _lock:
+        stats = _functions.get((backend, name))
+        if stats is None:
+            stats = _functions[(backend, name)] = dict(_totals(), buckets=[0] * (len(LATENCY_BUCKETS) + 1))
+        _add(stats, 1, int(error), seconds, call['reads'], call['writes'])
+        stats['buckets'][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        if call['parent'] is not None:
+            return
+
+        rerun = _rerun.get()
+        page = rerun['page'] if rerun is not None else BACKGROUND
+        _add(_pages.setdefault(page, dict(_totals(), reruns=0)), 1, int(error), seconds, call['reads'], call['writes'])
+        if rerun is not None:
+            _add(rerun, 1, int(error), seconds, call['reads'], call['writes'])
+            _add(rerun['functions'].setdefault(name, _totals()), 1, int(error), seconds, call['reads'], call['writes'])
+
+
+# ==================== 함수 감싸기 ====================
+
+def instrument(func, backend, changes=None, count_rows=False, name=None):
+    """
+    데이터 함수 하나를 계측 래퍼로 감싼다
+
+    Args:
+        backend: 통계에 붙는 저장소 이름
+        changes: 현재 스레드의 누적 변경 행 수를 돌려주는 함수 (SQLite total_changes). 호출 전후 차이를 쓰기로 센다
+        count_rows: 반환한 DataFrame 행 수를 읽기로 센다
+        name: 통계에 붙는 함수 이름 (기본 func.__name__)
+    """
+    if getattr(func, '_instrumented', False):
+        return func
+    name = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        call = {'parent': _call.get(), 'reads': 0, 'writes': 0}
+        token = _call.set(call)
+        before = changes() if changes is not None else 0
+        started = time.perf_counter()
+        error = True
+        try:
+            result = func(*args, **kwargs)
+            error = False
+            if count_rows and isinstance(result, pd.DataFrame):
+                count(reads=len(result))
+            return result
+        finally:
+            if changes is not None:
+                # 안쪽 데이터 함수가 이미 센 변경은 빼고 더한다
+                count(writes=max(0, changes() - before - call['writes']))
+            _call.reset(token)
+            _record(backend, name, call, time.perf_counter() - started, error)
+
+    wrapper._instrumented = True
+    return wrapper
+
+
+def instrument_module(namespace, backend, changes=None, count_rows=False):
+    """모듈 globals()에서 storage.API에 있는 함수를 계측 래퍼로 바꾼다 (모듈 맨 끝에서 호출)"""
+    if not enabled():
+        return
+    for name in API:
+        if callable(namespace.get(name)):
+            namespace[name] = instrument(namespace[name], backend, changes, count_rows, name)
+
+
+# ==================== Firestore SDK 건수 집계 ====================
+
+def _counting(docs, minimum):
+    n = 0
+    try:
+        for doc in docs:
+            n += 1
+            yield doc
+    finally:
+        count(reads=max(minimum, n))
+
+
+def _hook_query(method):
+    # 결과가 없어도 쿼리 1회는 읽기 1건으로 과금된다
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return _counting(method(self, *args, **kwargs), 1)
+    return wrapper
+
+
+def _hook_get_all(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return _counting(method(self, *args, **kwargs), 0)
+    return wrapper
+
+
+def _hook_read(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        count(reads=1)
+        return result
+    return wrapper
+
+
+def _hook_write(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        count(writes=1)
+        return result
+    return wrapper
+
+
+def _hook_commit(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        writes = len(self)
+        result = method(self, *args, **kwargs)
+        count(writes=writes)
+        return result
+    return wrapper
+
+
+HOOKS = {'query': _hook_query, 'get_all': _hook_get_all, 'read': _hook_read, 'write': _hook_write,
+         'commit': _hook_commit}
+
+
+def firestore_targets():
+    """google-cloud-firestore에서 문서를 읽고 쓰는 메서드 [(클래스, 메서드, 종류)]"""
+    from google.cloud.firestore_v1 import aggregation, batch, client, document, query, transaction
+
+    # DocumentReference.set/update/delete는 내부에서 WriteBatch.commit을 쓰고,
+    # CollectionReference.stream / Query.get / Transaction.get은 Query.stream 또는 Client.get_all을 거친다
+    return [
+        (query.Query, 'stream', 'query'),
+        (document.DocumentReference, 'get', 'read'),
+        (client.Client, 'get_all', 'get_all'),
+        (aggregation.AggregationQuery, 'stream', 'read'),
+        (batch.WriteBatch, 'commit', 'commit'),
+        (transaction.Transaction, '_commit', 'commit'),
+    ]
+
+
+def install_firestore_hooks(targets=None):
+    """Firestore 클라이언트 메서드에 읽기/쓰기 건수 집계를 건다 (이미 걸린 메서드는 건너뜀)"""
+    if not enabled():
+        return
+    if targets is None:
+        try:
+            targets = firestore_targets()
+        except ImportError:
+            return
+    for cls, name, kind in targets:
+        method = getattr(cls, name)
+        if getattr(method, '_instrumented', False):
+            continue
+        hooked = HOOKS[kind](method)
+        hooked._instrumented = True
+        setattr(cls, name, hooked)
+
+
+# ==================== 조회 / 내보내기 ====================
+
+def function_stats():
+    """함수별 누적 통계 [{backend, function, calls, errors, seconds, reads, writes, buckets}]"""
+    with _lock:
+        return [dict(stats, backend=backend, function=name, buckets=list(stats['buckets']))
+                for (backend, name), stats in sorted(_functions.items())]
+
+
+def page_stats():
+    """{페이지: {reruns, calls, errors, seconds, reads, writes}}"""
+    with _lock:
+        return {page: dict(totals) for page, totals in _pages.items()}
+
+
+def recent_reruns():
+    with _lock:
+        return list(_recent)
+
+
+def snapshot():
+    """JSON으로 내보낼 전체 통계"""
+    return {
+        'generated_at': time.time(),
+        'latency_buckets': list(LATENCY_BUCKETS),
+        'functions': function_stats(),
+        'pages': page_stats(),
+        'recent_reruns': recent_reruns(),
+    }
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{k}="{escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def prometheus_text():
+    """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+    functions = function_stats()
+    pages = page_stats()
+    lines = []
+
+    def metric(name, kind, help_text, samples):
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        lines.extend(f'{sample_name}{labels} {value}' for sample_name, labels, value in samples)
+
+    metric('inventory_data_calls_total', 'counter', 'Data-layer function calls',
+           [('inventory_data_calls_total', _labels(backend=s['backend'], function=s['function']), s['calls'])
+            for s in functions])
+    metric('inventory_data_errors_total', 'counter', 'Data-layer function calls that raised',
+           [('inventory_data_errors_total', _labels(backend=s['backend'], function=s['function']), s['errors'])
+            for s in functions])
+    metric('inventory_data_reads_total', 'counter', 'Documents/rows read by data-layer functions',
+           [('inventory_data_reads_total', _labels(backend=s['backend'], function=s['function']), s['reads'])
+            for s in functions])
+    metric('inventory_data_writes_total', 'counter', 'Documents/rows written by data-layer functions',
+           [('inventory_data_writes_total', _labels(backend=s['backend'], function=s['function']), s['writes'])
+            for s in functions])
+
+    samples = []
+    for s in functions:
+        cumulative = 0
+        for le, n in zip(list(LATENCY_BUCKETS) + ['+Inf'], s['buckets']):
+            cumulative += n
+            samples.append(('inventory_data_call_seconds_bucket',
+                            _labels(backend=s['backend'], function=s['function'], le=le), cumulative))
+        labels = _labels(backend=s['backend'], function=s['function'])
+        samples.append(('inventory_data_call_seconds_sum', labels, round(s['seconds'], 6)))
+        samples.append(('inventory_data_call_seconds_count', labels, s['calls']))
+    metric('inventory_data_call_seconds', 'histogram', 'Data-layer function latency', samples)
+
+    for field, help_text in (('reruns', 'Streamlit reruns'), ('calls', 'Outermost data-layer calls'),
+                             ('reads', 'Documents/rows read'), ('writes', 'Documents/rows written'),
+                             ('seconds', 'Seconds spent in data-layer calls')):
+        name = f'inventory_page_{field}_total'
+        metric(name, 'counter', f'{help_text} per page',
+               [(name, _labels(page=page), round(totals[field], 6)) for page, totals in sorted(pages.items())])
+    return '\n'.join(lines) + '\n'
+
+
+def write_metrics(path):
+    """통계를 path에 기록 (.json이면 JSON, 그 밖에는 Prometheus 텍스트). 임시 파일에 쓴 뒤 교체"""
+    if path.endswith('.json'):
+        content = json.dumps(snapshot(), ensure_ascii=False, indent=2)
+    else:
+        content = prometheus_text()
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def start_exporter(path=None, interval=None):
+    """
+    INVENTORY_METRICS_FILE(또는 path)에 주기적으로 통계를 쓰는 백그라운드 스레드 시작 (프로세스당 한 번)
+
+    Returns:
+        threading.Thread 또는 None (경로가 없으면)
+    """
+    global _exporter
+
+    path = path or os.environ.get('INVENTORY_METRICS_FILE')
+    if not path:
+        return None
+    interval = interval or float(os.environ.get('INVENTORY_METRICS_INTERVAL', DEFAULT_INTERVAL))
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                write_metrics(path)
+            except Exception as e:
+                print(f"계측 파일 기록 오류: {e}")
+
+    with _exporter_lock:
+        if _exporter is None:
+            _exporter = threading.Thread(target=run, name='metrics-exporter', daemon=True)
+            _exporter.start()
+        return _exporter
+
+
+def reset():
+    """누적 통계 초기화 (테스트용)"""
+    with _lock:
+        _functions.clear()
+        _pages.clear()
+        _recent.clear()
+    _rerun.set(None)
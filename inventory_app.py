@@ -1,20 +1,42 @@
 
+import startup_profile  # 가장 먼저 import (시작 시각 기준)
+import hmac
+import math
 import os
 from datetime import datetime, date
 import pandas as pd
 import streamlit as st
 
-# Firebase 데이터베이스 함수 import
-from firebase_db import (
+# 데이터베이스 함수 import (INVENTORY_BACKEND 환경변수로 저장소 선택, 기본 Firebase)
+from storage import (
     load_roll_inventory, save_roll_inventory, update_roll_item, delete_roll_item,
-    record_roll_transaction, get_monthly_usage_roll,
+    record_roll_transaction, get_monthly_usage_roll, adjust_roll_stock,
     load_cut_inventory, save_cut_inventory, update_cut_item, delete_cut_item,
-    record_cut_transaction, get_monthly_usage_cut,
+    record_cut_transaction, get_monthly_usage_cut, get_monthly_usage_bulk, adjust_cut_stock,
     load_workflow, save_workflow, update_workflow_item, delete_workflow_item,
-    set_reorder_level, get_reorder_level,
-    load_raw_materials, save_raw_materials, log_raw_material_transaction
+    load_workflow_archive, workflow_archive_count,
+    set_reorder_level, get_reorder_level, load_reorder_levels,
+    load_raw_materials, save_raw_materials, log_raw_material_transaction, adjust_raw_material_stock,
+    load_inventory_page, inventory_summary
 )
-from firebase_config import verify_company_code, get_firestore_client
+from storage import current_backend_name, clear_cache, get_backend, cache_stats
+from firebase_config import (
+    verify_company_code, warm_auth_cache, get_firestore_client, start_warmup, firebase_status, firebase_error
+)
+from reorder_alerts import find_reorder_alerts
+import paging
+import spec_index
+import workflow_archive
+import instrumentation
+# 페이지 전용 모듈(data_io, usage_analytics, demand_forecast, cutting_planner)은 해당 페이지에서 import
+
+# Firebase 클라이언트 생성/채널 연결과 저장소 모듈 import는 백그라운드에서 (프로세스당 한 번)
+start_warmup(get_backend)
+startup_profile.mark('imports')
+
+# 데이터 계층 계측: 이번 실행의 데이터 함수 호출/읽기/쓰기를 모은다 (INVENTORY_METRICS_FILE이 있으면 주기적으로 기록)
+instrumentation.start_exporter()
+instrumentation.begin_rerun()
 
 # 페이지 기본 설정
 st.set_page_config(page_title="비닐 공장 재고 현황판", layout="wide")
@@ -49,6 +71,8 @@ if not st.session_state.authenticated:
     # 로그인 화면
     st.markdown("<h1 style='text-align: center; color: #667eea;'>🏭 유한화학 재고 시스템</h1>", unsafe_allow_html=True)
     st.markdown("<p style='text-align: center; color: #666;'>회사 인증 코드를 입력하세요</p>", unsafe_allow_html=True)
+    # 코드를 입력하는 동안 회사 코드 해시를 미리 읽어 둔다 (로그인은 네트워크를 기다리지 않음)
+    warm_auth_cache()
     
     col1, col2, col3 = st.columns([1, 2, 1])
     
@@ -77,12 +101,15 @@ if not st.session_state.authenticated:
         
         st.markdown("<br>", unsafe_allow_html=True)
         
-        # Firebase 연결 상태 표시
-        db = get_firestore_client()
-        if db is not None:
+        # 연결 상태 표시
+        if current_backend_name() != 'firestore':
+            st.info(f"💾 로컬 저장소 사용 중 ({current_backend_name()})")
+        elif firebase_status() == 'connected':
             st.success("☁️ 클라우드 연결됨")
+        elif firebase_status() == 'connecting':
+            st.info("☁️ 클라우드 연결 중...")
         else:
-            st.warning("⚠️ 오프라인 모드 (Firebase 설정 필요)")
+            st.warning(f"⚠️ 오프라인 모드 ({firebase_error() or 'Firebase 설정 필요'})")
             with st.expander("Firebase 설정 안내"):
                 st.markdown("""
                 1. [Firebase Console](https://console.firebase.google.com/)에서 프로젝트 생성
@@ -91,6 +118,8 @@ if not st.session_state.authenticated:
                 4. `firebase_credentials.json` 파일을 프로젝트 폴더에 저장
                 """)
     
+    startup_profile.mark('first_paint')
+    startup_profile.log_once()
     st.stop()
 
 # ========== 메인 앱 (인증 후) ==========
@@ -98,9 +127,12 @@ if not st.session_state.authenticated:
 # 제목
 st.title("🏭 유한화학 재고 현황판")
 
-# Firebase 연결 상태 표시
-db = get_firestore_client()
-if db is not None:
+# 연결 상태 표시
+if current_backend_name() == 'sqlite':
+    st.caption("💾 로컬 SQLite 데이터베이스 사용 중")
+elif current_backend_name() == 'memory':
+    st.caption("🧪 메모리 저장소 사용 중 (종료 시 데이터 삭제)")
+elif get_firestore_client() is not None:
     st.caption("☁️ Firebase 클라우드 데이터베이스 연동됨")
 else:
     st.caption("⚠️ 오프라인 모드 - Firebase 설정 필요")
@@ -111,30 +143,72 @@ st.markdown("---")
 col_refresh, col_logout, col_empty = st.columns([1, 1, 4])
 with col_refresh:
     if st.button("🔄 새로고침"):
+        clear_cache()
         st.rerun()
 with col_logout:
     if st.button("🚪 로그아웃"):
         st.session_state.authenticated = False
         st.rerun()
 
-# 데이터 로드 함수 (캐싱 없이 항상 최신 데이터)
+# 데이터 로드 함수 (프로세스 공용 캐시, 쓰기 시 자동 무효화 - data_cache.py)
 def get_roll_inventory():
     return load_roll_inventory()
 
 def get_cut_inventory():
     return load_cut_inventory()
 
-def get_workflow():
-    return load_workflow()
+def get_workflow(statuses=None):
+    # 보관 기간이 지난 완료 작업은 하루 한 번 보관 테이블로 옮긴다 (workflow_archive.py)
+    workflow_archive.maybe_archive()
+    return load_workflow(statuses)
+
+def show_inventory_page(kind, sort_by, descending, filters, key):
+    """
+    목록의 보이는 한 페이지만 조회 (정렬/필터는 저장소에서 적용)
+    페이지별 시작 커서를 세션에 쌓아 이전/다음으로 이동하며, 정렬/필터가 바뀌면 첫 페이지로 돌아간다.
+
+    Returns:
+        (페이지 DataFrame, {'count': 품목 수, 'total': 현재고 합계})
+    """
+    query = (sort_by, descending, tuple(sorted(filters.items())))
+    state = st.session_state.get(key)
+    if state is None or state['query'] != query:
+        state = st.session_state[key] = {'query': query, 'cursors': [None]}
+    cursors = state['cursors']
+
+    try:
+        summary = inventory_summary(kind, filters)
+        page = load_inventory_page(kind, sort_by, descending, filters, paging.DEFAULT_PAGE_SIZE, cursors[-1])
+    except Exception as e:
+        # 색인 누락(FAILED_PRECONDITION) 등 조회 오류를 '재고 없음'으로 보이지 않게 여기서 멈춘다
+        st.error(f"목록을 불러오지 못했습니다: {e}")
+        st.stop()
+
+    page_no = len(cursors)
+    total_pages = max(1, math.ceil(summary['count'] / paging.DEFAULT_PAGE_SIZE))
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("◀ 이전", disabled=page_no == 1, key=f"{key}_prev"):
+            cursors.pop()
+            st.rerun()
+    with col_info:
+        st.caption(f"{page_no} / {total_pages} 페이지 (전체 {summary['count']}개)")
+    with col_next:
+        cursor = paging.next_cursor(kind, page, sort_by, paging.DEFAULT_PAGE_SIZE)
+        if st.button("다음 ▶", disabled=cursor is None or page_no >= total_pages, key=f"{key}_next"):
+            cursors.append(cursor)
+            st.rerun()
+    return page, summary
 
 # 상태 순서 정의
 STATUS_ORDER = ['접수', '생산중', '재단중', '완료', '납품완료']
+ACTIVE_STATUSES = STATUS_ORDER[:-1]
 PRIORITY_OPTIONS = ['긴급', '높음', '보통', '낮음']
 
 # 사이드바: 작업 선택
 st.sidebar.header("🛠 작업 메뉴")
 
-menu_category = st.sidebar.selectbox("카테고리 선택", ["📦 롤 재고 관리", "✂️ 재단 재고 관리", "🛢️ 원료 재고 관리", "📋 작업 플로우 (TODO)"])
+menu_category = st.sidebar.selectbox("카테고리 선택", ["📦 롤 재고 관리", "✂️ 재단 재고 관리", "🛢️ 원료 재고 관리", "📋 작업 플로우 (TODO)", "📈 사용량 분석", "📁 데이터 가져오기/내보내기"])
 
 if menu_category == "📦 롤 재고 관리":
     menu = st.sidebar.radio("작업을 선택하세요", [
@@ -154,37 +228,74 @@ elif menu_category == "🛢️ 원료 재고 관리":
         "원료 입/출고",
         "신규 원료 등록"
     ])
+elif menu_category == "📈 사용량 분석":
+    menu = st.sidebar.radio("작업을 선택하세요", [
+        "품목별 사용량 추이",
+        "재주문 임계값 제안"
+    ])
+elif menu_category == "📁 데이터 가져오기/내보내기":
+    menu = st.sidebar.radio("작업을 선택하세요", [
+        "파일 가져오기",
+        "파일 내보내기"
+    ])
 else:
     menu = st.sidebar.radio("작업을 선택하세요", [
         "작업 현황판 (칸반)",
         "신규 작업 등록",
         "작업 상태 변경",
+        "재단 계획",
         "완료된 작업 보기"
     ])
 
+instrumentation.set_page(menu)
+
 # ========== 롤 재고 관리 ==========
 if menu == "롤 재고 현황 보기":
     st.subheader("📊 현재 롤 재고 목록")
     
-    df = get_roll_inventory()
-    # 이번 달 사용량 컬럼 추가
-    df['이번달 사용량'] = df['제품ID'].apply(lambda pid: get_monthly_usage_roll(pid))
+    # 규격 검색 (두께 ± 허용오차, 폭/길이 범위, 0 = 제한 없음)
+    with st.expander("🔍 규격으로 롤 찾기"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            spec_thickness = st.number_input('두께 (mm)', min_value=0.0, step=0.001, format="%.3f", key='spec_thickness')
+            spec_tolerance = st.number_input('두께 허용오차 (±mm)', min_value=0.0, step=0.001, format="%.3f", key='spec_tolerance')
+        with col2:
+            spec_width_min = st.number_input('폭 최소 (cm)', min_value=0.0, step=1.0, key='spec_width_min')
+            spec_width_max = st.number_input('폭 최대 (cm)', min_value=0.0, step=1.0, key='spec_width_max')
+        with col3:
+            spec_length_min = st.number_input('길이 최소 (m)', min_value=0.0, step=10.0, key='spec_length_min')
+            spec_length_max = st.number_input('길이 최대 (m)', min_value=0.0, step=10.0, key='spec_length_max')
+
+        thickness_range = spec_index.spec_range(spec_thickness, spec_tolerance) if spec_thickness > 0 else None
+        width_range = (spec_width_min or None, spec_width_max or None)
+        length_range = (spec_length_min or None, spec_length_max or None)
+        if thickness_range or any(width_range) or any(length_range):
+            matches = spec_index.find_rolls(thickness_range, width_range, length_range)
+            st.caption(f"조건에 맞는 롤 {len(matches)}개 / 재고 합계 {int(matches['현재고(롤)'].sum())}롤")
+            st.dataframe(matches, use_container_width=True, height=250)
+        else:
+            st.caption("두께, 폭, 길이 중 하나 이상을 입력하세요.")
+
+    # 정렬/필터 컨트롤 (저장소에서 정렬해 한 페이지만 읽음, 필터가 있으면 색인이 있는 정렬 기준만)
+    col1, col2, col3 = st.columns(3)
+    with col3:
+        thickness_filter = st.number_input('두께 (mm) 필터 (0 = 전체)', min_value=0.0, step=0.001, format="%.3f")
+    filters = {'두께(mm)': thickness_filter} if thickness_filter > 0 else {}
+    with col1:
+        sort_col = st.selectbox('정렬 기준', paging.sort_columns('roll', bool(filters)), index=0)
+    with col2:
+        sort_order = st.radio('정렬 순서', ['오름차순', '내림차순'], horizontal=True)
+
+    df, summary = show_inventory_page('roll', sort_col, sort_order == '내림차순', filters, 'roll_pages')
+    # 이번 달 사용량 컬럼 추가 (전체 품목 사용량을 한 번에 조회 후 현재 페이지에 조인)
+    usage = get_monthly_usage_bulk('roll')
+    df['이번달 사용량'] = df['제품ID'].astype(str).map(usage).fillna(0.0)
     
     if df.empty:
-        st.info("등록된 롤 재고가 없습니다. '신규 롤 규격 등록'에서 추가해주세요.")
+        st.info("조건에 맞는 롤 재고가 없습니다." if filters else "등록된 롤 재고가 없습니다. '신규 롤 규격 등록'에서 추가해주세요.")
     else:
-        # 정렬 컨트롤
-        sort_cols = ['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)', '이번달 사용량']
-        sort_col = st.selectbox('정렬 기준', sort_cols, index=0)
-        sort_order = st.radio('정렬 순서', ['오름차순', '내림차순'], horizontal=True)
-        ascending = True if sort_order == '오름차순' else False
-        if sort_col in df.columns:
-            disp_df = df.sort_values(by=sort_col, ascending=ascending)
-        else:
-            disp_df = df
-
         st.dataframe(
-            disp_df.style.format({
+            df.style.format({
                 "두께(mm)": "{:.3f}",
                 "폭(cm)": "{:.1f}",
                 "롤 길이(m)": "{:.1f}",
@@ -194,18 +305,20 @@ if menu == "롤 재고 현황 보기":
             height=400
         )
         
-        total_rolls = df['현재고(롤)'].sum()
-        st.info(f"📋 총 보유 롤 수량: {int(total_rolls)} 롤")
+        st.info(f"📋 총 보유 롤 수량: {int(summary['total'])} 롤")
 
+    # 편집/임계값 선택과 재주문 알림은 현재 페이지가 아닌 전체 품목 기준 (프로세스 공용 캐시의 전체 목록)
+    all_rolls = get_roll_inventory()
+    if not all_rolls.empty:
         # 편집 및 삭제 UI
         with st.expander('제품 수정/삭제'):
-            edit_prod = st.selectbox('편집할 제품 선택', df['제품ID'].tolist())
-            idx = df[df['제품ID'] == edit_prod].index[0]
+            edit_prod = st.selectbox('편집할 제품 선택', all_rolls['제품ID'].tolist())
+            idx = all_rolls[all_rolls['제품ID'] == edit_prod].index[0]
 
-            new_thickness = st.number_input('두께 (mm)', value=float(df.loc[idx, '두께(mm)']), format="%.3f")
-            new_width = st.number_input('폭 (cm)', value=float(df.loc[idx, '폭(cm)']), format="%.1f")
-            new_length = st.number_input('롤 길이 (m)', value=float(df.loc[idx, '롤 길이(m)']), format="%.1f")
-            new_stock = st.number_input('현재고 (롤)', min_value=0, value=int(df.loc[idx, '현재고(롤)']), step=1)
+            new_thickness = st.number_input('두께 (mm)', value=float(all_rolls.loc[idx, '두께(mm)']), format="%.3f")
+            new_width = st.number_input('폭 (cm)', value=float(all_rolls.loc[idx, '폭(cm)']), format="%.1f")
+            new_length = st.number_input('롤 길이 (m)', value=float(all_rolls.loc[idx, '롤 길이(m)']), format="%.1f")
+            new_stock = st.number_input('현재고 (롤)', min_value=0, value=int(all_rolls.loc[idx, '현재고(롤)']), step=1)
 
             col_a, col_b = st.columns(2)
             with col_a:
@@ -217,20 +330,14 @@ if menu == "롤 재고 현황 보기":
                     delete_roll_item(edit_prod)
                     st.success(f"[{edit_prod}]가 삭제되었습니다.")
 
-        # 재주문 임계값 알림
-        alerts = []
-        for _, row in df.iterrows():
-            thr = get_reorder_level('roll', row['제품ID'])
-            if thr is not None and float(row['현재고(롤)']) <= thr:
-                alerts.append(f"재주문 필요: [{row['제품ID']}] 현재 {int(row['현재고(롤)'])} ≤ 임계값 {int(thr)}")
-
-        if alerts:
-            for a in alerts:
-                st.warning(a)
+        # 재주문 임계값 알림 (전체 임계값 1회 조회)
+        alerts = find_reorder_alerts(all_rolls, load_reorder_levels('roll'), '제품ID', '현재고(롤)')
+        for _, row in alerts.iterrows():
+            st.warning(f"재주문 필요: [{row['제품ID']}] 현재 {int(row['현재고(롤)'])} ≤ 임계값 {int(row['임계값'])}")
 
         # 임계값 설정 UI (간단히 제품 선택 후 설정)
         with st.expander('재주문 임계값 설정'):
-            prod = st.selectbox('제품 선택', df['제품ID'].tolist())
+            prod = st.selectbox('제품 선택', all_rolls['제품ID'].tolist())
             current_thr = get_reorder_level('roll', prod)
             new_thr = st.number_input('임계값 (롤)', min_value=0, value=int(current_thr) if current_thr is not None else 0)
             if st.button('임계값 저장'):
@@ -259,26 +366,17 @@ elif menu == "롤 입/출고 입력":
             qty = st.number_input("수량 (롤 단위)", min_value=1, value=1, step=1)
         
         if st.button("재고 반영"):
-            idx = df[df['제품ID'] == selected_id].index[0]
-            current_qty = df.loc[idx, '현재고(롤)']
-            
+            # 해당 제품 1건만 원자적으로 증감 + 거래 기록 (출고는 음수)
             if input_type == "생산 (입고 +)":
-                df.loc[idx, '현재고(롤)'] = current_qty + qty
-                df.loc[idx, '최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
-                # 거래 기록
-                record_roll_transaction(selected_id, qty, note='입고')
-                save_roll_inventory(df)
-                st.success(f"{qty}롤 생산 등록 완료! (현재: {current_qty + qty}롤)")
+                new_qty = adjust_roll_stock(selected_id, qty, note='입고')
+                st.success(f"{qty}롤 생산 등록 완료! (현재: {new_qty}롤)")
             else:
-                if current_qty < qty:
+                try:
+                    new_qty = adjust_roll_stock(selected_id, -qty, note='출고')
+                    st.success(f"{qty}롤 사용 등록 완료! (현재: {new_qty}롤)")
+                except ValueError:
+                    current_qty = df[df['제품ID'] == selected_id]['현재고(롤)'].values[0]
                     st.error(f"재고가 부족합니다! (현재고: {current_qty}롤)")
-                else:
-                    df.loc[idx, '현재고(롤)'] = current_qty - qty
-                    df.loc[idx, '최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
-                    # 거래 기록 (출고는 음수)
-                    record_roll_transaction(selected_id, -qty, note='출고')
-                    save_roll_inventory(df)
-                    st.success(f"{qty}롤 사용 등록 완료! (현재: {current_qty - qty}롤)")
 
 elif menu == "신규 롤 규격 등록":
     st.subheader("✨ 새로운 롤 규격 등록")
@@ -311,37 +409,34 @@ elif menu == "신규 롤 규격 등록":
                     '현재고(롤)': initial_stock,
                     '최근업데이트': datetime.now().strftime("%Y-%m-%d %H:%M")
                 }])
-                df = pd.concat([df, new_data], ignore_index=True)
-                save_roll_inventory(df)
+                # 신규 1건만 저장 (기존 행은 다시 쓰지 않음)
+                save_roll_inventory(new_data)
                 st.success(f"[{new_id}] 신규 롤 규격이 등록되었습니다.")
 
 # ========== 재단 재고 관리 ==========
 elif menu == "재단 재고 현황 보기":
     st.subheader("✂️ 현재 재단 재고 목록")
     
-    df = get_cut_inventory()
-    # 이번 달 사용량 컬럼 추가
-    def get_cut_usage_wrapper(cid):
-        # reuse roll function but for cuts we will implement below
-        return get_monthly_usage_cut(cid)
+    # 정렬/필터 컨트롤 (재단, 저장소에서 정렬해 한 페이지만 읽음)
+    col1, col2, col3 = st.columns(3)
+    with col3:
+        company_filter = st.text_input('업체명 필터', key='cut_company_filter').strip()
+    filters = {'업체명': company_filter} if company_filter else {}
+    with col1:
+        sort_col = st.selectbox('정렬 기준', paging.sort_columns('cut', bool(filters)), index=0, key='cut_sort_col')
+    with col2:
+        sort_order = st.radio('정렬 순서', ['오름차순', '내림차순'], horizontal=True, key='cut_sort_order')
 
-    df['이번달 사용량'] = df['재단ID'].apply(lambda pid: get_monthly_usage_cut(pid))
+    df, summary = show_inventory_page('cut', sort_col, sort_order == '내림차순', filters, 'cut_pages')
+    # 이번 달 사용량 컬럼 추가 (전체 품목 사용량을 한 번에 조회 후 현재 페이지에 조인)
+    usage = get_monthly_usage_bulk('cut')
+    df['이번달 사용량'] = df['재단ID'].astype(str).map(usage).fillna(0.0)
     
     if df.empty:
-        st.info("등록된 재단 규격이 없습니다.")
+        st.info("조건에 맞는 재단 규격이 없습니다." if filters else "등록된 재단 규격이 없습니다.")
     else:
-        # 정렬 컨트롤 (재단)
-        sort_cols = ['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)', '이번달 사용량']
-        sort_col = st.selectbox('정렬 기준', sort_cols, index=0, key='cut_sort_col')
-        sort_order = st.radio('정렬 순서', ['오름차순', '내림차순'], horizontal=True, key='cut_sort_order')
-        ascending = True if sort_order == '오름차순' else False
-        if sort_col in df.columns:
-            disp_df = df.sort_values(by=sort_col, ascending=ascending)
-        else:
-            disp_df = df
-
         st.dataframe(
-            disp_df.style.format({
+            df.style.format({
                 "가로(cm)": "{:.1f}",
                 "세로(cm)": "{:.1f}",
                 "두께(mm)": "{:.3f}",
@@ -351,19 +446,21 @@ elif menu == "재단 재고 현황 보기":
             height=400
         )
         
-        total_sheets = df['현재고(장)'].sum()
-        st.info(f"📋 총 보유 재단 수량: {int(total_sheets)} 장")
+        st.info(f"📋 총 보유 재단 수량: {int(summary['total'])} 장")
 
+    # 편집/임계값 선택과 재주문 알림은 현재 페이지가 아닌 전체 품목 기준 (프로세스 공용 캐시의 전체 목록)
+    all_cuts = get_cut_inventory()
+    if not all_cuts.empty:
         # 편집 및 삭제 UI (재단)
         with st.expander('재단 수정/삭제'):
-            edit_prod = st.selectbox('편집할 재단 선택', df['재단ID'].tolist(), key='select_cut_edit')
-            idx = df[df['재단ID'] == edit_prod].index[0]
+            edit_prod = st.selectbox('편집할 재단 선택', all_cuts['재단ID'].tolist(), key='select_cut_edit')
+            idx = all_cuts[all_cuts['재단ID'] == edit_prod].index[0]
 
-            new_company = st.text_input('업체명', value=df.loc[idx, '업체명'])
-            new_width = st.number_input('가로 (cm)', value=float(df.loc[idx, '가로(cm)']))
-            new_height = st.number_input('세로 (cm)', value=float(df.loc[idx, '세로(cm)']))
-            new_thickness = st.number_input('두께 (mm)', value=float(df.loc[idx, '두께(mm)']), format="%.3f")
-            new_stock = st.number_input('현재고 (장)', min_value=0, value=int(df.loc[idx, '현재고(장)']), step=1)
+            new_company = st.text_input('업체명', value=all_cuts.loc[idx, '업체명'])
+            new_width = st.number_input('가로 (cm)', value=float(all_cuts.loc[idx, '가로(cm)']))
+            new_height = st.number_input('세로 (cm)', value=float(all_cuts.loc[idx, '세로(cm)']))
+            new_thickness = st.number_input('두께 (mm)', value=float(all_cuts.loc[idx, '두께(mm)']), format="%.3f")
+            new_stock = st.number_input('현재고 (장)', min_value=0, value=int(all_cuts.loc[idx, '현재고(장)']), step=1)
 
             col_a, col_b = st.columns(2)
             with col_a:
@@ -375,19 +472,13 @@ elif menu == "재단 재고 현황 보기":
                     delete_cut_item(edit_prod)
                     st.success(f"[{edit_prod}] 재단 데이터가 삭제되었습니다.")
 
-        # 재주문 임계값 알림
-        alerts = []
-        for _, row in df.iterrows():
-            thr = get_reorder_level('cut', row['재단ID'])
-            if thr is not None and float(row['현재고(장)']) <= thr:
-                alerts.append(f"재주문 필요: [{row['재단ID']}] 현재 {int(row['현재고(장)'])} ≤ 임계값 {int(thr)}")
-
-        if alerts:
-            for a in alerts:
-                st.warning(a)
+        # 재주문 임계값 알림 (전체 임계값 1회 조회)
+        alerts = find_reorder_alerts(all_cuts, load_reorder_levels('cut'), '재단ID', '현재고(장)')
+        for _, row in alerts.iterrows():
+            st.warning(f"재주문 필요: [{row['재단ID']}] 현재 {int(row['현재고(장)'])} ≤ 임계값 {int(row['임계값'])}")
 
         with st.expander('재주문 임계값 설정 (재단)'):
-            prod = st.selectbox('재단 선택', df['재단ID'].tolist())
+            prod = st.selectbox('재단 선택', all_cuts['재단ID'].tolist())
             current_thr = get_reorder_level('cut', prod)
             new_thr = st.number_input('임계값 (장)', min_value=0, value=int(current_thr) if current_thr is not None else 0, key='cut_thr')
             if st.button('임계값 저장(재단)'):
@@ -419,26 +510,17 @@ elif menu == "재단 입/출고 입력":
             qty = st.number_input("수량 (장 단위)", min_value=1, value=1, step=1)
         
         if st.button("재단 재고 반영"):
-            idx = df[df['재단ID'] == selected_id].index[0]
-            current_qty = df.loc[idx, '현재고(장)']
-            
+            # 해당 재단 1건만 원자적으로 증감 + 거래 기록 (출고 음수)
             if input_type == "재단 완료 (입고 +)":
-                df.loc[idx, '현재고(장)'] = current_qty + qty
-                df.loc[idx, '최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
-                # 거래 기록
-                record_cut_transaction(selected_id, qty, note='입고')
-                save_cut_inventory(df)
-                st.success(f"{qty}장 재단 입고 완료! (현재: {current_qty + qty}장)")
+                new_qty = adjust_cut_stock(selected_id, qty, note='입고')
+                st.success(f"{qty}장 재단 입고 완료! (현재: {new_qty}장)")
             else:
-                if current_qty < qty:
+                try:
+                    new_qty = adjust_cut_stock(selected_id, -qty, note='출고')
+                    st.success(f"{qty}장 출고 완료! (현재: {new_qty}장)")
+                except ValueError:
+                    current_qty = df[df['재단ID'] == selected_id]['현재고(장)'].values[0]
                     st.error(f"재고가 부족합니다! (현재고: {current_qty}장)")
-                else:
-                    df.loc[idx, '현재고(장)'] = current_qty - qty
-                    df.loc[idx, '최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
-                    # 거래 기록 (출고 음수)
-                    record_cut_transaction(selected_id, -qty, note='출고')
-                    save_cut_inventory(df)
-                    st.success(f"{qty}장 출고 완료! (현재: {current_qty - qty}장)")
 
 elif menu == "신규 재단 규격 등록":
     st.subheader("✨ 새로운 재단 규격 등록 (업체별 맞춤 사이즈)")
@@ -474,28 +556,29 @@ elif menu == "신규 재단 규격 등록":
                     '현재고(장)': initial_stock,
                     '최근업데이트': datetime.now().strftime("%Y-%m-%d %H:%M")
                 }])
-                df = pd.concat([df, new_data], ignore_index=True)
-                save_cut_inventory(df)
+                # 신규 1건만 저장 (기존 행은 다시 쓰지 않음)
+                save_cut_inventory(new_data)
                 st.success(f"[{new_id}] {company} 재단 규격이 등록되었습니다.")
 
 # ========== 원료 재고 관리 ==========
 elif menu == "원료 재고 현황":
     st.subheader("🛢️ 원료 재고 목록")
     
-    df = load_raw_materials()
+    # 정렬/필터 (저장소에서 정렬해 한 페이지만 읽음)
+    col1, col2, col3 = st.columns(3)
+    with col3:
+        name_filter = st.text_input('품명 필터', key='raw_name_filter').strip()
+    filters = {'품명': name_filter} if name_filter else {}
+    with col1:
+        sort_col = st.selectbox('정렬 기준', paging.sort_columns('raw', bool(filters)), index=0, key='raw_sort')
+    with col2:
+        sort_order = st.radio('정렬 순서', ['오름차순', '내림차순'], horizontal=True, key='raw_order')
+
+    df, summary = show_inventory_page('raw', sort_col, sort_order == '내림차순', filters, 'raw_pages')
 
     if df.empty:
-        st.info("등록된 원료가 없습니다. '신규 원료 등록' 메뉴에서 추가해주세요.")
+        st.info("조건에 맞는 원료가 없습니다." if filters else "등록된 원료가 없습니다. '신규 원료 등록' 메뉴에서 추가해주세요.")
     else:
-        # 정렬
-        sort_cols = ['품명', 'Grade', '현재고_kg', '입고일']
-        sort_col = st.selectbox('정렬 기준', sort_cols, index=0, key='raw_sort')
-        sort_order = st.radio('정렬 순서', ['오름차순', '내림차순'], horizontal=True, key='raw_order')
-        ascending = True if sort_order == '오름차순' else False
-        
-        if sort_col in df.columns:
-            df = df.sort_values(by=sort_col, ascending=ascending)
-
         st.dataframe(
             df.style.format({
                 "현재고_kg": "{:.1f}"
@@ -504,8 +587,7 @@ elif menu == "원료 재고 현황":
             height=400
         )
         
-        total_kg = df['현재고_kg'].sum()
-        st.info(f"📋 총 원료 보유량: {total_kg:,.1f} kg")
+        st.info(f"📋 총 원료 보유량: {summary['total']:,.1f} kg")
 
 elif menu == "원료 입/출고":
     st.subheader("📝 원료 입고 및 사용 등록")
@@ -521,7 +603,6 @@ elif menu == "원료 입/출고":
         
         # 선택된 원료 찾기
         selected_row = df[df['label'] == selected_str].iloc[0]
-        selected_idx = df[df['label'] == selected_str].index[0]
         
         col1, col2 = st.columns(2)
         with col1:
@@ -530,25 +611,17 @@ elif menu == "원료 입/출고":
             qty = st.number_input("수량 (kg)", min_value=1.0, step=10.0, key='raw_qty')
 
         if st.button("재고 반영", key='raw_submit'):
-            current_qty = float(selected_row['현재고_kg'])
-            
+            # 해당 원료 1건만 원자적으로 증감 + 입출고 기록
+            today = datetime.now().strftime("%Y-%m-%d")
             if input_type == "입고 (+)":
-                new_qty = current_qty + qty
-                df.at[selected_idx, '현재고_kg'] = new_qty
-                # 로그 저장
-                log_raw_material_transaction(selected_row['품명'], selected_row['Grade'], qty, '입고', datetime.now().strftime("%Y-%m-%d"))
-                save_raw_materials(df)
+                new_qty = adjust_raw_material_stock(selected_row['품명'], selected_row['Grade'], qty, '입고', today)
                 st.success(f"입고 완료! 현재고: {new_qty} kg")
             else:
-                if current_qty < qty:
-                    st.error("재고가 부족합니다!")
-                else:
-                    new_qty = current_qty - qty
-                    df.at[selected_idx, '현재고_kg'] = new_qty
-                    # 로그 저장
-                    log_raw_material_transaction(selected_row['품명'], selected_row['Grade'], -qty, '출고', datetime.now().strftime("%Y-%m-%d"))
-                    save_raw_materials(df)
+                try:
+                    new_qty = adjust_raw_material_stock(selected_row['품명'], selected_row['Grade'], -qty, '출고', today)
                     st.success(f"사용 등록 완료! 현재고: {new_qty} kg")
+                except ValueError:
+                    st.error("재고가 부족합니다!")
 
 elif menu == "신규 원료 등록":
     st.subheader("✨ 신규 원료 등록")
@@ -584,8 +657,8 @@ elif menu == "신규 원료 등록":
                         '입고일': in_date.strftime("%Y-%m-%d"),
                         '비고': note
                     }])
-                    df = pd.concat([df, new_data], ignore_index=True)
-                    save_raw_materials(df)
+                    # 신규 1건만 저장 (기존 행은 다시 쓰지 않음)
+                    save_raw_materials(new_data)
                     st.success(f"[{name} {grade}] 등록되었습니다.")
 
 
@@ -593,13 +666,8 @@ elif menu == "신규 원료 등록":
 elif menu == "작업 현황판 (칸반)":
     st.subheader("📋 작업 현황판 (칸반 보드)")
     
-    df = get_workflow()
-    
-    # 납품완료 제외한 작업만 표시
-    if df.empty:
-        active_df = df
-    else:
-        active_df = df[df['상태'] != '납품완료']
+    # 납품완료 제외한 작업만 조회
+    active_df = get_workflow(ACTIVE_STATUSES)
     
     if active_df.empty:
         st.info("진행 중인 작업이 없습니다.")
@@ -682,19 +750,15 @@ elif menu == "신규 작업 등록":
                     '메모': memo,
                     '등록일': datetime.now().strftime("%Y-%m-%d %H:%M")
                 }])
-                df = pd.concat([df, new_data], ignore_index=True)
-                save_workflow(df)
+                # 새 작업 문서만 추가 (기존 작업은 다시 쓰지 않음)
+                save_workflow(new_data)
                 st.success(f"[{work_id}] 작업이 등록되었습니다.")
 
 elif menu == "작업 상태 변경":
     st.subheader("🔄 작업 상태 변경")
     
-    df = get_workflow()
-    
-    if df.empty:
-        active_df = df
-    else:
-        active_df = df[df['상태'] != '납품완료']
+    df = get_workflow(ACTIVE_STATUSES)
+    active_df = df
     
     if active_df.empty:
         st.info("진행 중인 작업이 없습니다.")
@@ -716,9 +780,7 @@ elif menu == "작업 상태 변경":
         
         with col2:
             if st.button("상태 변경"):
-                idx = df[df['작업ID'] == selected_id].index[0]
-                df.loc[idx, '상태'] = new_status
-                save_workflow(df)
+                update_workflow_item(selected_id, 상태=new_status)
                 st.success(f"작업 [{selected_id}] 상태가 '{new_status}'(으)로 변경되었습니다.")
                 st.rerun()
         
@@ -727,9 +789,7 @@ elif menu == "작업 상태 변경":
             if current_idx < len(STATUS_ORDER) - 1:
                 next_status = STATUS_ORDER[current_idx + 1]
                 if st.button(f"▶️ {next_status}로 진행"):
-                    idx = df[df['작업ID'] == selected_id].index[0]
-                    df.loc[idx, '상태'] = next_status
-                    save_workflow(df)
+                    update_workflow_item(selected_id, 상태=next_status)
                     st.success(f"작업이 '{next_status}' 단계로 진행되었습니다.")
                     st.rerun()
 
@@ -758,34 +818,248 @@ elif menu == "작업 상태 변경":
                     st.success(f"[{selected_id}] 작업이 삭제되었습니다.")
                     st.rerun()
 
+elif menu == "재단 계획":
+    import cutting_planner
+    st.subheader("📐 재단 계획")
+    st.caption("접수/생산중인 시트(장) 작업을 같은 두께의 롤에 배정하고, 폭 방향 레인 구성과 필요한 롤 수를 계산합니다.")
+
+    orders = cutting_planner.orders_from_workflow(get_workflow(['접수', '생산중']))
+
+    if orders.empty:
+        st.info("재단할 시트 작업이 없습니다. (단위 '장', 규격 예: 0.05T x 50cm x 70cm)")
+    else:
+        selected = st.multiselect("계획할 작업", orders['주문ID'].tolist(), default=orders['주문ID'].tolist())
+        batch = orders[orders['주문ID'].isin(selected)]
+
+        if not batch.empty:
+            with st.spinner("재단 패턴 계산 중..."):
+                plan = cutting_planner.plan_cuts(batch, load_roll_inventory())
+
+            result = plan['orders']
+            m1, m2, m3 = st.columns(3)
+            m1.metric("필요 롤 수", f"{sum(plan['rolls'].values())}롤")
+            m2.metric("수율", f"{plan['yield']}%")
+            m3.metric("미배정 작업", f"{int((result['미배정'] > 0).sum())}건")
+
+            st.markdown("**재단 패턴**")
+            st.dataframe(plan['patterns'], use_container_width=True, height=300)
+            st.markdown("**작업별 배정 결과**")
+            st.dataframe(result, use_container_width=True, height=300)
+            if (result['미배정'] > 0).any():
+                st.warning("같은 두께의 롤 재고가 없거나 모자라 배정하지 못한 수량이 있습니다.")
+            st.download_button("CSV 다운로드", plan['patterns'].to_csv(index=False).encode('utf-8-sig'),
+                               file_name="cutting_plan.csv")
+
 elif menu == "완료된 작업 보기":
     st.subheader("✅ 완료된 작업 목록")
     
-    df = get_workflow()
-    
-    if df.empty:
-        completed_df = df
+    recent_df = get_workflow(['납품완료'])
+    st.markdown(f"**최근 완료** (완료 후 {workflow_archive.retention_days()}일이 지나면 보관됩니다)")
+    if recent_df.empty:
+        st.info("최근 완료된 작업이 없습니다.")
     else:
-        completed_df = df[df['상태'] == '납품완료']
+        st.dataframe(recent_df, use_container_width=True, height=300)
     
-    if completed_df.empty:
-        st.info("완료된 작업이 없습니다.")
-    else:
-        st.dataframe(completed_df, use_container_width=True, height=400)
-        
+    # 보관된 작업: 페이지별 시작 커서를 세션에 쌓아 이전/다음으로 이동
+    archive_count = workflow_archive_count()
+    st.markdown(f"**보관된 작업** ({archive_count}건)")
+    cursors = st.session_state.setdefault('workflow_archive_cursors', [None])
+    archive_df = load_workflow_archive(paging.DEFAULT_PAGE_SIZE, cursors[-1])
+    if archive_df.empty and len(cursors) > 1:
+        # 보관 작업이 삭제되어 현재 페이지가 비었으면 첫 페이지로
+        cursors[:] = [None]
+        st.rerun()
+    
+    if not archive_df.empty:
+        st.dataframe(archive_df, use_container_width=True, height=400)
+        page_no = len(cursors)
+        total_pages = max(1, math.ceil(archive_count / paging.DEFAULT_PAGE_SIZE))
+        col_prev, col_info, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if st.button("◀ 이전", disabled=page_no == 1, key="archive_prev"):
+                cursors.pop()
+                st.rerun()
+        with col_info:
+            st.caption(f"{page_no} / {total_pages} 페이지")
+        with col_next:
+            cursor = workflow_archive.next_cursor(archive_df, paging.DEFAULT_PAGE_SIZE)
+            if st.button("다음 ▶", disabled=cursor is None or page_no >= total_pages, key="archive_next"):
+                cursors.append(cursor)
+                st.rerun()
+    
+    work_list = recent_df['작업ID'].tolist() + archive_df['작업ID'].tolist()
+    if work_list:
         st.markdown("---")
         st.caption("⚠️ 완료된 작업 정리")
         
-        work_list = completed_df['작업ID'].tolist()
         selected_to_delete = st.multiselect("삭제할 작업 선택", work_list)
         
         if st.button("선택한 작업 삭제", type="secondary"):
             if selected_to_delete:
-                df = df[~df['작업ID'].isin(selected_to_delete)]
-                save_workflow(df)
+                for work_id in selected_to_delete:
+                    delete_workflow_item(work_id)
                 st.success(f"{len(selected_to_delete)}개 작업이 삭제되었습니다.")
                 st.rerun()
 
+# ========== 사용량 분석 ==========
+elif menu == "품목별 사용량 추이":
+    import usage_analytics
+    st.subheader("📈 품목별 사용량 추이")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        item_type = st.selectbox("품목 구분", list(usage_analytics.ITEM_TYPES), format_func=usage_analytics.ITEM_TYPES.get)
+    with col2:
+        freq = st.radio("기간 단위", list(usage_analytics.FREQS), index=2, format_func=usage_analytics.FREQS.get, horizontal=True)
+    with col3:
+        today = date.today()
+        period = st.date_input("조회 기간", value=(date(today.year - 1, today.month, 1), today))
+
+    if isinstance(period, (tuple, list)) and len(period) == 2:
+        start = datetime.combine(period[0], datetime.min.time())
+        end = datetime.combine(period[1], datetime.min.time()) + pd.Timedelta(days=1)
+
+        with st.spinner("거래 기록 집계 중..."):
+            matrix = usage_analytics.get_usage_matrix(item_type, freq, start, end)
+
+        if matrix.empty:
+            st.info("조회 기간에 사용(출고) 기록이 없습니다.")
+        else:
+            table = usage_analytics.period_labels(matrix)
+            totals = table.sum(axis=1).sort_values(ascending=False)
+
+            m1, m2 = st.columns(2)
+            m1.metric("사용 품목 수", f"{len(table)}개")
+            m2.metric("총 사용량", f"{totals.sum():,.1f}")
+
+            st.markdown("**기간별 총 사용량**")
+            st.bar_chart(table.sum(axis=0))
+
+            top_n = st.slider("추이를 볼 상위 품목 수", 1, min(20, len(table)), min(5, len(table)))
+            st.markdown(f"**사용량 상위 {top_n}개 품목 추이**")
+            st.line_chart(table.loc[totals.index[:top_n]].T)
+
+            st.markdown("**품목 × 기간 사용량**")
+            ordered = table.loc[totals.index]
+            st.dataframe(ordered, use_container_width=True, height=400)
+            st.download_button("CSV 다운로드", ordered.to_csv().encode('utf-8-sig'),
+                               file_name=f"usage_{item_type}_{freq}_{period[0]}_{period[1]}.csv")
+
+elif menu == "재주문 임계값 제안":
+    import demand_forecast
+    import usage_analytics
+    st.subheader("🔮 재주문 임계값 제안")
+    st.caption("최근 사용량의 EWMA와 변동성으로 조달 기간 동안 필요한 재고(재주문점)를 계산합니다.")
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        item_type = st.selectbox("품목 구분", list(usage_analytics.ITEM_TYPES), format_func=usage_analytics.ITEM_TYPES.get)
+    with col2:
+        lead_time = st.number_input("조달 기간(일)", min_value=1, max_value=180, value=demand_forecast.DEFAULT_LEAD_TIME_DAYS)
+    with col3:
+        service_level = st.slider("서비스 수준", 0.50, 0.999, demand_forecast.DEFAULT_SERVICE_LEVEL, step=0.005)
+    with col4:
+        lookback = st.number_input("분석 기간(일)", min_value=7, max_value=730, value=demand_forecast.DEFAULT_LOOKBACK_DAYS)
+
+    with st.spinner("사용량 통계 계산 중..."):
+        suggestions = demand_forecast.forecast(item_type, int(lead_time), service_level, int(lookback))
+
+    if suggestions.empty:
+        st.info("등록된 품목이 없습니다.")
+    else:
+        changed = suggestions[suggestions['현재 임계값'].isna() | (suggestions['현재 임계값'] != suggestions['제안 임계값'])]
+        m1, m2 = st.columns(2)
+        m1.metric("품목 수", f"{len(suggestions)}개")
+        m2.metric("임계값이 바뀔 품목", f"{len(changed)}개")
+
+        st.dataframe(suggestions, use_container_width=True, height=400)
+        st.download_button("CSV 다운로드", suggestions.to_csv(index=False).encode('utf-8-sig'),
+                           file_name=f"reorder_suggestions_{item_type}.csv")
+
+        if st.button(f"제안 임계값 적용 ({len(changed)}개)", type="primary", disabled=changed.empty):
+            count = demand_forecast.apply_suggestions(item_type, changed)
+            st.success(f"{count}개 품목의 재주문 임계값이 저장되었습니다.")
+            st.rerun()
+
+# ========== 데이터 가져오기/내보내기 ==========
+elif menu == "파일 가져오기":
+    import data_io
+    st.subheader("📥 파일 가져오기 (CSV / Excel / Parquet)")
+    st.caption("같은 ID의 품목은 파일 값으로 바뀌고 새 품목은 추가됩니다. 오류가 하나라도 있으면 아무것도 저장하지 않습니다.")
+
+    kind = st.selectbox("대상", list(data_io.KINDS), format_func=lambda k: data_io.KINDS[k]['label'])
+    st.caption("필요한 컬럼: " + ", ".join(data_io.KINDS[kind]['columns']))
+    uploaded = st.file_uploader("파일 선택", type=['csv', 'xlsx', 'parquet'])
+
+    if uploaded is not None:
+        try:
+            raw = data_io.read_table(uploaded)
+        except (ImportError, ValueError) as e:
+            st.error(str(e))
+            st.stop()
+
+        clean, errors = data_io.validate_import(kind, raw)
+        st.write(f"전체 {len(raw)}행 / 정상 {len(clean)}행 / 오류 {len(errors)}건")
+        if not errors.empty:
+            st.error("오류를 고친 뒤 다시 올려 주세요.")
+            st.dataframe(errors, use_container_width=True, height=300)
+        else:
+            st.dataframe(clean.head(100), use_container_width=True, height=300)
+            if st.button("가져오기", type="primary"):
+                uploaded.seek(0)
+                result = data_io.import_table(kind, uploaded)
+                st.success(f"{result['rows']}행을 저장했습니다.")
+
+elif menu == "파일 내보내기":
+    import data_io
+    st.subheader("📤 파일 내보내기")
+
+    kind = st.selectbox("대상", list(data_io.KINDS), format_func=lambda k: data_io.KINDS[k]['label'])
+    fmt = st.radio("형식", list(data_io.FORMATS), horizontal=True)
+
+    if st.button("파일 만들기"):
+        try:
+            content, rows = data_io.export_bytes(kind, fmt)
+        except ImportError as e:
+            st.error(str(e))
+        else:
+            st.success(f"{rows}행")
+            st.download_button("다운로드", content, file_name=f"{kind}_{datetime.now():%Y%m%d}.{fmt}")
+
+# ========== 관리자: 데이터 계층 계측 (ADMIN_CODE 설정 시) ==========
+admin_code = os.environ.get('ADMIN_CODE', '')
+if admin_code:
+    with st.sidebar.expander("🔧 데이터 계측 (관리자)"):
+        entered = st.text_input("관리자 코드", type="password", key="metrics_admin_code")
+        if entered and hmac.compare_digest(entered.encode(), admin_code.encode()):
+            rerun = instrumentation.current_rerun()
+            st.caption(f"이번 실행 ({rerun['page']}): 호출 {rerun['calls']}회 / 읽기 {rerun['reads']}건 / "
+                       f"쓰기 {rerun['writes']}건 / {rerun['seconds'] * 1000:.0f}ms")
+            if rerun['functions']:
+                st.dataframe(pd.DataFrame.from_dict(rerun['functions'], orient='index'), use_container_width=True)
+
+            st.caption("페이지별 누적")
+            pages = instrumentation.page_stats()
+            if pages:
+                st.dataframe(pd.DataFrame.from_dict(pages, orient='index').sort_values('reads', ascending=False),
+                             use_container_width=True)
+
+            st.caption("함수별 누적")
+            functions = instrumentation.function_stats()
+            if functions:
+                table = pd.DataFrame(functions)
+                table['avg_ms'] = (table['seconds'] / table['calls'] * 1000).round(1)
+                st.dataframe(table[['backend', 'function', 'calls', 'errors', 'avg_ms', 'reads', 'writes']],
+                             use_container_width=True)
+
+            st.caption(f"캐시: {cache_stats()}")
+            st.download_button("Prometheus 텍스트 받기", instrumentation.prometheus_text(),
+                               file_name="inventory_metrics.prom")
+        elif entered:
+            st.error("잘못된 관리자 코드입니다.")
+
 # 하단 푸터
 st.markdown("---")
 st.markdown("© 2026 유한화학 재고 시스템")
+
+instrumentation.end_rerun()
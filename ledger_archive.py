@@ -0,0 +1,256 @@
+# 거래 기록 보관(아카이브) / 재고 스냅샷
+"""
+거래 기록(transactions, raw_material_transactions)은 계속 늘어나기만 하므로,
+보관 기준보다 오래된 달의 기록을 월별 압축 Parquet 파일로 옮기고 운영 저장소에서 지운다.
+
+- 보관 기준: 이번 달로부터 INVENTORY_ARCHIVE_MONTHS(기본 12)개월 이전 달 전체
+- 파일: {INVENTORY_ARCHIVE_DIR}/{원장}/YYYY-MM.parquet (zstd 압축, 달은 기록 시각 timestamp 기준)
+- 보관 전에 재고 스냅샷을 남겨 두므로, 특정 시점 재고는
+  '그 시점 이전 최근 스냅샷 + 스냅샷 이후 거래 합계'로 계산한다 (stock_at).
+- 보관된 기간이 포함된 조회(get_usage_between, rebuild_usage_monthly, load_history)는 파일도 함께 읽는다.
+
+파일을 먼저 쓰고(거래 id로 중복 제거) 운영 저장소에서 지우므로, 중간에 실패하면 다시 실행하면 된다.
+
+    python ledger_archive.py            # 기준보다 오래된 기록 보관
+    python ledger_archive.py --months 6
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import storage
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), 'archive')
+DEFAULT_ARCHIVE_MONTHS = 12
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# 거래 시각은 쓰기 잠금을 잡기 전에 찍히므로(SQLite 잠금 대기 최대 5초), 스냅샷 뒤에 커밋된 거래도
+# taken_at보다 이른 시각일 수 있다. 그만큼 앞에서부터 읽고 ledger_id로 거른다.
+LEDGER_STAMP_SLACK = timedelta(minutes=1)
+
+# 원장 -> 컬럼 (모든 저장소의 load_ledger가 같은 컬럼을 돌려준다)
+LEDGERS = {
+    'transactions': ['id', 'item_type', 'item_id', 'delta', 'note', 'timestamp'],
+    'raw_material_transactions': ['id', '품명', 'Grade', '수량변경', '구분', '날짜', 'timestamp'],
+}
+
+
+def archive_dir():
+    return os.environ.get('INVENTORY_ARCHIVE_DIR', DEFAULT_ARCHIVE_DIR)
+
+
+def archive_months():
+    return int(os.environ.get('INVENTORY_ARCHIVE_MONTHS', DEFAULT_ARCHIVE_MONTHS))
+
+
+def _add_months(month_start, n):
+    index = month_start.year * 12 + month_start.month - 1 + n
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def cutoff(now=None, months=None):
+    """보관 기준 시각: 이 시각(달의 1일) 이전 기록이 보관 대상"""
+    now = now or datetime.now()
+    months = archive_months() if months is None else months
+    return _add_months(datetime(now.year, now.month, 1), -months)
+
+
+def archive_path(ledger, month):
+    """월별 보관 파일 경로 (month: 'YYYY-MM')"""
+    return os.path.join(archive_dir(), ledger, f"{month}.parquet")
+
+
+def archived_months(ledger):
+    """보관 파일이 있는 달 목록 ('YYYY-MM', 오름차순)"""
+    folder = os.path.join(archive_dir(), ledger)
+    if not os.path.isdir(folder):
+        return []
+    return sorted(name[:-len('.parquet')] for name in os.listdir(folder) if name.endswith('.parquet'))
+
+
+# ==================== 보관 파일 읽기 ====================
+
+def read_archive(ledger, start=None, end=None, filters=None):
+    """
+    보관 파일에서 timestamp가 [start, end)인 기록 읽기
+
+    Args:
+        filters: pyarrow 필터 [(컬럼, 연산자, 값), ...] (예: [('item_id', '==', 'R-001')])
+
+    Returns:
+        DataFrame: LEDGERS[ledger] 컬럼 (보관 파일이 없으면 빈 프레임)
+    """
+    columns = LEDGERS[ledger]
+    first = start.strftime("%Y-%m") if start is not None else None
+    last = end.strftime("%Y-%m") if end is not None else None
+    months = [m for m in archived_months(ledger)
+              if (first is None or m >= first) and (last is None or m <= last)]
+    if not months:
+        return pd.DataFrame(columns=columns)
+
+    conditions = list(filters or [])
+    if start is not None:
+        conditions.append(('timestamp', '>=', start.strftime(TIMESTAMP_FORMAT)))
+    if end is not None:
+        conditions.append(('timestamp', '<', end.strftime(TIMESTAMP_FORMAT)))
+
+    frames = [pd.read_parquet(archive_path(ledger, m), columns=columns, filters=conditions or None) for m in months]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def archived_usage(item_type, item_id, start, end):
+    """[start, end) 구간 중 보관된 기록의 사용량(출고) 합계"""
+    df = read_archive('transactions', start, end, filters=[
+        ('item_type', '==', item_type), ('item_id', '==', str(item_id)), ('delta', '<', 0)
+    ])
+    return float(-df['delta'].sum()) if not df.empty else 0.0
+
+
+def archived_monthly_usage():
+    """보관된 기록 전체의 월별 사용량 {(item_type, item_id, 'YYYY-MM'): 사용량} (rebuild_usage_monthly용)"""
+    totals = {}
+    out = read_archive('transactions', filters=[('delta', '<', 0)])
+    if not out.empty:
+        usage = (-out['delta']).groupby([out['item_type'], out['item_id'], out['timestamp'].str[:7]]).sum()
+        totals.update(usage.to_dict())
+
+    raw = read_archive('raw_material_transactions', filters=[('수량변경', '<', 0)])
+    if not raw.empty:
+        keys = raw['품명'].astype(str) + '_' + raw['Grade'].astype(str)
+        usage = (-raw['수량변경']).groupby([keys, raw['날짜'].astype(str).str[:7]]).sum()
+        for (item_id, month), total in usage.items():
+            key = ('raw', item_id, month)
+            totals[key] = totals.get(key, 0.0) + total
+    return {key: float(total) for key, total in totals.items()}
+
+
+def load_history(ledger, start=None, end=None):
+    """보관 파일 + 운영 저장소의 거래 기록을 합쳐 timestamp 순으로 반환"""
+    frames = [read_archive(ledger, start, end), storage.get_function('load_ledger')(ledger, start, end)]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=LEDGERS[ledger])
+    df = pd.concat(frames, ignore_index=True)
+    return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+# ==================== 보관 작업 ====================
+
+def _write_month(ledger, month, df):
+    """월별 파일에 기록 추가 (이미 있으면 합친 뒤 id로 중복 제거, 임시 파일에 쓴 뒤 교체)"""
+    path = archive_path(ledger, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df = df[LEDGERS[ledger]].astype({'id': str, 'timestamp': str})
+    if os.path.exists(path):
+        df = pd.concat([pd.read_parquet(path), df], ignore_index=True).drop_duplicates('id', keep='last')
+    df = df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+    tmp = path + '.tmp'
+    df.to_parquet(tmp, index=False, compression='zstd')
+    os.replace(tmp, path)
+
+
+def archive_ledgers(before=None, snapshot=True):
+    """
+    before(기본: cutoff()) 이전 거래 기록을 달별로 보관 파일에 쓰고 운영 저장소에서 삭제
+
+    Args:
+        snapshot: 보관 전에 재고 스냅샷을 남긴다
+
+    Returns:
+        dict: {원장: 보관한 기록 수}
+    """
+    before = before or cutoff()
+    load_ledger = storage.get_function('load_ledger')
+    delete_entries = storage.get_function('delete_ledger_entries')
+
+    if snapshot:
+        storage.get_function('take_stock_snapshot')()
+
+    archived = {}
+    for ledger in LEDGERS:
+        archived[ledger] = 0
+        oldest = storage.get_function('oldest_ledger_time')(ledger)
+        if oldest is None or oldest >= before:
+            continue
+        # 한 번에 한 달씩 읽어 메모리 사용량을 한 달 분량으로 제한한다
+        month = datetime(oldest.year, oldest.month, 1)
+        while month < before:
+            month_end = min(_add_months(month, 1), before)
+            df = load_ledger(ledger, month, month_end)
+            if not df.empty:
+                _write_month(ledger, month.strftime("%Y-%m"), df)
+                archived[ledger] += delete_entries(ledger, df['id'].tolist())
+            month = _add_months(month, 1)
+    return archived
+
+
+# ==================== 재고 스냅샷 ====================
+
+def _ledger_deltas(item_type, item_id, start, end, after_id=None):
+    """[start, end) 구간 품목의 재고 변화량 합계 (보관 파일 포함, after_id가 있으면 id > after_id인 기록만)"""
+    if item_type == 'raw':
+        df = load_history('raw_material_transactions', start, end)
+        df = df[df['품명'].astype(str) + '_' + df['Grade'].astype(str) == str(item_id)]
+        column = '수량변경'
+    else:
+        df = load_history('transactions', start, end)
+        df = df[(df['item_type'] == item_type) & (df['item_id'].astype(str) == str(item_id))]
+        column = 'delta'
+    if after_id is not None:
+        df = df[pd.to_numeric(df['id']) > after_id]
+    return float(df[column].sum())
+
+
+def _current_stock(item_type, item_id):
+    if item_type == 'roll':
+        df = storage.get_function('load_roll_inventory')()
+        match = df.loc[df['제품ID'].astype(str) == str(item_id), '현재고(롤)']
+    elif item_type == 'cut':
+        df = storage.get_function('load_cut_inventory')()
+        match = df.loc[df['재단ID'].astype(str) == str(item_id), '현재고(장)']
+    else:
+        df = storage.get_function('load_raw_materials')()
+        keys = df['품명'].astype(str) + '_' + df['Grade'].astype(str)
+        match = df.loc[keys == str(item_id), '현재고_kg']
+    return float(match.iloc[0]) if not match.empty else 0.0
+
+
+def stock_at(item_type, item_id, when):
+    """
+    when 시점의 재고
+
+    when 이전 최근 스냅샷이 있으면 스냅샷 + (스냅샷 이후 ~ when) 거래 합계,
+    없으면 현재고 - (when ~ 지금) 거래 합계로 계산한다.
+    스냅샷 이후 거래는 스냅샷의 ledger_id보다 id가 큰 기록이다.
+    ledger_id가 없는 스냅샷(Firestore)은 taken_at 이후 시각의 기록을 더한다.
+    """
+    snapshot = storage.get_function('load_stock_snapshot')(when)
+    row = snapshot[(snapshot['item_type'] == item_type) & (snapshot['item_id'].astype(str) == str(item_id))]
+    if not row.empty:
+        taken_at = datetime.strptime(row['taken_at'].iloc[0], TIMESTAMP_FORMAT)
+        stock = float(row['stock'].iloc[0])
+        ledger_id = row['ledger_id'].iloc[0]
+        if pd.isna(ledger_id):
+            return stock + _ledger_deltas(item_type, item_id, taken_at, when)
+        return stock + _ledger_deltas(item_type, item_id, taken_at - LEDGER_STAMP_SLACK, when, int(ledger_id))
+    return _current_stock(item_type, item_id) - _ledger_deltas(item_type, item_id, when, datetime.max)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='오래된 거래 기록을 월별 Parquet 파일로 보관')
+    parser.add_argument('--months', type=int, default=None, help=f'보관 기준 개월 수 (기본 {DEFAULT_ARCHIVE_MONTHS})')
+    parser.add_argument('--no-snapshot', action='store_true', help='보관 전 재고 스냅샷을 남기지 않음')
+    args = parser.parse_args()
+
+    result = archive_ledgers(cutoff(months=args.months), snapshot=not args.no_snapshot)
+    for ledger, count in result.items():
+        print(f"{ledger}: {count}건 보관 -> {os.path.join(archive_dir(), ledger)}")
+
+
+if __name__ == '__main__':
+    main()
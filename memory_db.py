@@ -0,0 +1,507 @@
+# 메모리 저장소
+"""
+db_functions / firebase_db와 같은 함수 API를 프로세스 메모리(dict)로 구현
+테스트·데모·벤치마크용이며 프로세스 종료 시 데이터가 사라진다
+"""
+import itertools
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+import pandas as pd
+
+from frame_diff import diff_frame, remember_snapshot
+import ledger_archive
+import paging
+import spec_index
+
+ROLL_COLUMNS = ['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)', '최근업데이트']
+CUT_COLUMNS = ['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)', '최근업데이트']
+RAW_COLUMNS = ['품명', 'Grade', '현재고_kg', '입고일', '비고']
+WORKFLOW_COLUMNS = ['작업ID', '업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모', '등록일']
+WORKFLOW_FIELDS = ['업체명', '제품규격', '수량', '단위', '담당자', '상태', '우선순위', '납기일', '메모']
+WORKFLOW_ARCHIVE_COLUMNS = WORKFLOW_COLUMNS + ['완료일']
+COMPLETED_STATUS = '납품완료'
+
+# update_*_item에서 받는 이름(표시명/DB명) -> 표시 컬럼
+ROLL_FIELDS = {
+    '두께_mm': '두께(mm)', '두께(mm)': '두께(mm)',
+    '폭_cm': '폭(cm)', '폭(cm)': '폭(cm)',
+    '롤길이_m': '롤 길이(m)', '롤 길이(m)': '롤 길이(m)',
+    '현재고_롤': '현재고(롤)', '현재고(롤)': '현재고(롤)',
+}
+CUT_FIELDS = {
+    '업체명': '업체명',
+    '가로_cm': '가로(cm)', '가로(cm)': '가로(cm)',
+    '세로_cm': '세로(cm)', '세로(cm)': '세로(cm)',
+    '두께_mm': '두께(mm)', '두께(mm)': '두께(mm)',
+    '현재고_장': '현재고(장)', '현재고(장)': '현재고(장)',
+}
+
+_lock = threading.RLock()
+_roll = {}
+_cut = {}
+_workflow = {}
+_workflow_archive = {}
+_raw = {}
+_transactions = []
+_raw_transactions = []
+_usage = defaultdict(float)
+_reorder = {}
+_snapshots = []
+_ledger_ids = itertools.count(1)
+
+
+def init_db():
+    """다른 저장소와 API를 맞추기 위한 자리 (메모리 저장소는 준비가 필요 없음)"""
+
+
+def reset():
+    """모든 데이터 삭제"""
+    with _lock:
+        for store in (_roll, _cut, _workflow, _workflow_archive, _raw, _usage, _reorder):
+            store.clear()
+        del _transactions[:]
+        del _raw_transactions[:]
+        del _snapshots[:]
+
+
+def _frame(rows, columns):
+    return pd.DataFrame(rows, columns=columns) if rows else pd.DataFrame(columns=columns)
+
+
+def _save_frame(store, df, keys, columns):
+    """스냅샷 대비 변경/추가분만 store에 반영 (삭제는 delete_*_item)"""
+    changed = diff_frame(df, keys, columns)
+    with _lock:
+        for key, row in zip(keys.loc[changed.index].astype(str), changed[columns].to_dict('records')):
+            # 프레임에 없는 필드(작업 완료일 등)는 유지
+            store[key] = {**store.get(key, {}), **row}
+    remember_snapshot(df, keys, columns)
+
+
+# ==================== 롤 재고 ====================
+
+def load_roll_inventory():
+    """롤 재고 데이터 로드"""
+    with _lock:
+        df = _frame([dict(r) for r in _roll.values()], ROLL_COLUMNS)
+    remember_snapshot(df, df['제품ID'], ROLL_COLUMNS)
+    return df
+
+
+def save_roll_inventory(df):
+    """롤 재고 데이터 저장 (load_roll_inventory 이후 변경/추가된 행만 기록)"""
+    if (pd.to_numeric(df['현재고(롤)']) < 0).any():
+        raise ValueError("현재고(롤)은 음수일 수 없습니다")
+    _save_frame(_roll, df, df['제품ID'], ROLL_COLUMNS)
+
+
+def _update_row(store, item_id, kwargs, field_map, stock_col):
+    fields = {field_map[k]: v for k, v in kwargs.items() if k in field_map}
+    if stock_col in fields and float(fields[stock_col]) < 0:
+        raise ValueError(f"{stock_col}은 음수일 수 없습니다")
+    with _lock:
+        if item_id not in store:
+            raise KeyError(f"{item_id} 없음")
+        store[item_id].update(fields)
+        store[item_id]['최근업데이트'] = datetime.now().strftime("%Y-%m-%d %H:%M")
+
+
+def update_roll_item(product_id, **kwargs):
+    _update_row(_roll, product_id, kwargs, ROLL_FIELDS, '현재고(롤)')
+
+
+def delete_roll_item(product_id):
+    with _lock:
+        _roll.pop(product_id, None)
+
+
+def find_rolls_by_spec(thickness=None, width=None, length=None):
+    """두께/폭/길이 범위에 맞는 롤 (spec_index 정렬 색인)"""
+    with _lock:
+        df = _frame([dict(r) for r in _roll.values()], ROLL_COLUMNS)
+    return spec_index.SpecIndex(df).query(thickness, width, length).reset_index(drop=True)
+
+
+# ==================== 재단 재고 ====================
+
+def load_cut_inventory():
+    """재단 재고 데이터 로드"""
+    with _lock:
+        df = _frame([dict(r) for r in _cut.values()], CUT_COLUMNS)
+    remember_snapshot(df, df['재단ID'], CUT_COLUMNS)
+    return df
+
+
+def save_cut_inventory(df):
+    """재단 재고 데이터 저장 (load_cut_inventory 이후 변경/추가된 행만 기록)"""
+    if (pd.to_numeric(df['현재고(장)']) < 0).any():
+        raise ValueError("현재고(장)은 음수일 수 없습니다")
+    _save_frame(_cut, df, df['재단ID'], CUT_COLUMNS)
+
+
+def update_cut_item(item_id, **kwargs):
+    _update_row(_cut, item_id, kwargs, CUT_FIELDS, '현재고(장)')
+
+
+def delete_cut_item(item_id):
+    with _lock:
+        _cut.pop(item_id, None)
+
+
+# ==================== 거래 기록 / 사용량 ====================
+
+def _append_transaction(item_type, item_id, delta, note, now):
+    """거래 기록 추가 + 월별 사용량 집계 (호출자가 _lock 보유)"""
+    _transactions.append({'id': str(next(_ledger_ids)), 'item_type': item_type, 'item_id': item_id,
+                          'delta': delta, 'note': note, 'timestamp': now})
+    if delta < 0:
+        _usage[(item_type, item_id, now.strftime("%Y-%m"))] += -delta
+
+
+def record_roll_transaction(item_id, delta, note=""):
+    with _lock:
+        _append_transaction('roll', item_id, delta, note, datetime.now())
+
+
+def record_cut_transaction(item_id, delta, note=""):
+    with _lock:
+        _append_transaction('cut', item_id, delta, note, datetime.now())
+
+
+def _adjust_stock(store, stock_col, item_type, item_id, delta, note):
+    """재고 증감(음수 재고 거부) + 거래 기록을 한 번의 잠금 안에서 처리"""
+    with _lock:
+        if item_id not in store:
+            raise KeyError(f"{item_id} 없음")
+        row = store[item_id]
+        current = row[stock_col]
+        if current + delta < 0:
+            raise ValueError(f"{stock_col}은 음수일 수 없습니다 (현재고: {current}, 변경: {delta})")
+        now = datetime.now()
+        row[stock_col] = current + delta
+        row['최근업데이트'] = now.strftime("%Y-%m-%d %H:%M")
+        _append_transaction(item_type, item_id, delta, note, now)
+        return row[stock_col]
+
+
+def adjust_roll_stock(item_id, delta, note=""):
+    """롤 재고 증감 + 거래 기록. 변경 후 재고 반환"""
+    return _adjust_stock(_roll, '현재고(롤)', 'roll', item_id, delta, note)
+
+
+def adjust_cut_stock(item_id, delta, note=""):
+    """재단 재고 증감 + 거래 기록. 변경 후 재고 반환"""
+    return _adjust_stock(_cut, '현재고(장)', 'cut', item_id, delta, note)
+
+
+def _month_range(year=None, month=None):
+    """연/월의 [시작, 끝) 구간 반환. 기본은 현재 달."""
+    if year is None or month is None:
+        now = datetime.now()
+        year = now.year
+        month = now.month
+
+    start = datetime(year, month, 1)
+    if month == 12:
+        end = datetime(year + 1, 1, 1)
+    else:
+        end = datetime(year, month + 1, 1)
+    return start, end
+
+
+def _get_monthly_usage(item_type, item_id, year=None, month=None):
+    start, _ = _month_range(year, month)
+    with _lock:
+        return float(_usage.get((item_type, item_id, start.strftime("%Y-%m")), 0.0))
+
+
+def get_monthly_usage_roll(item_id, year=None, month=None):
+    return _get_monthly_usage('roll', item_id, year, month)
+
+
+def get_monthly_usage_cut(item_id, year=None, month=None):
+    return _get_monthly_usage('cut', item_id, year, month)
+
+
+def get_monthly_usage_bulk(item_type, year=None, month=None):
+    """item_type('roll'/'cut'/'raw') 전체 품목의 월 사용량 {item_id: 사용량}"""
+    key_month = _month_range(year, month)[0].strftime("%Y-%m")
+    with _lock:
+        return {item_id: float(total) for (t, item_id, m), total in _usage.items()
+                if t == item_type and m == key_month}
+
+
+def get_usage_between(item_type, item_id, start, end):
+    """[start, end) 구간의 사용량(출고) 합계를 거래 기록(보관 파일 포함)에서 직접 계산"""
+    with _lock:
+        hot = float(sum(-t['delta'] for t in _transactions
+                        if t['item_type'] == item_type and t['item_id'] == item_id
+                        and t['delta'] < 0 and start <= t['timestamp'] < end))
+    return hot + ledger_archive.archived_usage(item_type, item_id, start, end)
+
+
+def rebuild_usage_monthly():
+    """월별 사용량 집계를 거래 기록으로부터 재생성"""
+    with _lock:
+        _usage.clear()
+        for t in _transactions:
+            if t['delta'] < 0:
+                _usage[(t['item_type'], t['item_id'], t['timestamp'].strftime("%Y-%m"))] += -t['delta']
+        for t in _raw_transactions:
+            if t['수량변경'] < 0:
+                _usage[('raw', f"{t['품명']}_{t['Grade']}", str(t['날짜'])[:7])] += -t['수량변경']
+        for key, usage in ledger_archive.archived_monthly_usage().items():
+            _usage[key] += usage
+
+
+# ==================== 재주문 임계값 ====================
+
+def set_reorder_level(item_type, item_id, threshold):
+    with _lock:
+        _reorder[(item_type, item_id)] = float(threshold)
+
+
+def set_reorder_levels(item_type, thresholds):
+    """여러 품목의 재주문 임계값 설정. thresholds: {item_id: 임계값}"""
+    with _lock:
+        for item_id, threshold in thresholds.items():
+            _reorder[(item_type, str(item_id))] = float(threshold)
+
+
+def get_reorder_level(item_type, item_id):
+    with _lock:
+        return _reorder.get((item_type, item_id))
+
+
+def load_reorder_levels(item_type, item_ids=None):
+    """item_type의 재주문 임계값 {item_id: 임계값}. item_ids가 주어지면 해당 품목만."""
+    with _lock:
+        levels = {item_id: t for (kind, item_id), t in _reorder.items() if kind == item_type}
+    if item_ids is not None:
+        wanted = {str(i) for i in item_ids}
+        levels = {k: v for k, v in levels.items() if k in wanted}
+    return levels
+
+
+# ==================== 작업 플로우 ====================
+
+def load_workflow(statuses=None):
+    """작업 플로우 데이터 로드 (statuses: 이 상태의 작업만)"""
+    with _lock:
+        rows = [dict(r) for r in _workflow.values() if statuses is None or r['상태'] in statuses]
+    df = _frame(rows, WORKFLOW_COLUMNS)
+    remember_snapshot(df, df['작업ID'], WORKFLOW_COLUMNS)
+    return df
+
+
+def save_workflow(df):
+    """작업 플로우 데이터 저장 (load_workflow 이후 변경/추가된 작업만 기록)"""
+    _save_frame(_workflow, df, df['작업ID'], WORKFLOW_COLUMNS)
+
+
+def update_workflow_item(work_id, **kwargs):
+    """작업 1건의 지정 필드만 수정"""
+    fields = {k: v for k, v in kwargs.items() if k in WORKFLOW_FIELDS}
+    if '상태' in fields:
+        fields['완료일'] = datetime.now().strftime("%Y-%m-%d") if fields['상태'] == COMPLETED_STATUS else ''
+    with _lock:
+        if work_id not in _workflow:
+            raise KeyError(f"작업ID {work_id} 없음")
+        _workflow[work_id].update(fields)
+
+
+def delete_workflow_item(work_id):
+    with _lock:
+        _workflow.pop(work_id, None)
+        _workflow_archive.pop(work_id, None)
+
+
+def archive_workflow(before):
+    """완료일이 before('YYYY-MM-DD')보다 이른 납품완료 작업을 보관 저장소로 옮긴다 (옮긴 작업 수)"""
+    today = datetime.now().strftime("%Y-%m-%d")
+    with _lock:
+        done = [work_id for work_id, r in _workflow.items() if r['상태'] == COMPLETED_STATUS]
+        for work_id in done:
+            if not _workflow[work_id].get('완료일'):
+                _workflow[work_id]['완료일'] = today
+        moved = [work_id for work_id in done if _workflow[work_id]['완료일'] < before]
+        for work_id in moved:
+            _workflow_archive[work_id] = _workflow.pop(work_id)
+    return len(moved)
+
+
+def load_workflow_archive(limit=50, after=None):
+    """보관된 작업 한 페이지 (완료일 최신순, after: 이전 페이지 마지막 행의 (완료일, 작업ID))"""
+    with _lock:
+        rows = [{col: r.get(col, '') for col in WORKFLOW_ARCHIVE_COLUMNS} for r in _workflow_archive.values()]
+    rows.sort(key=lambda r: (r['완료일'], r['작업ID']), reverse=True)
+    if after is not None:
+        rows = [r for r in rows if (r['완료일'], r['작업ID']) < tuple(after)]
+    return _frame(rows[:limit], WORKFLOW_ARCHIVE_COLUMNS)
+
+
+def workflow_archive_count():
+    """보관된 작업 수"""
+    with _lock:
+        return len(_workflow_archive)
+
+
+# ==================== 원료 재고 ====================
+
+def _raw_material_keys(df):
+    """원료ID ('품명_Grade') Series"""
+    return df['품명'].astype(str) + '_' + df['Grade'].astype(str)
+
+
+def load_raw_materials():
+    """원료 재고 데이터 로드"""
+    with _lock:
+        df = _frame([dict(r) for r in _raw.values()], RAW_COLUMNS)
+    remember_snapshot(df, _raw_material_keys(df), RAW_COLUMNS)
+    return df
+
+
+def save_raw_materials(df):
+    """원료 재고 데이터 저장 (load_raw_materials 이후 변경/추가된 행만 기록)"""
+    _save_frame(_raw, df, _raw_material_keys(df), RAW_COLUMNS)
+
+
+def _append_raw_transaction(product_name, grade, change_amount, transaction_type, date):
+    """원료 입출고 기록 + 월별 사용량 집계 (호출자가 _lock 보유)"""
+    _raw_transactions.append({'id': str(next(_ledger_ids)), '품명': product_name, 'Grade': grade, '수량변경': float(change_amount),
+                              '구분': transaction_type, '날짜': date, 'timestamp': datetime.now()})
+    if change_amount < 0:
+        _usage[('raw', f"{product_name}_{grade}", str(date)[:7])] += -float(change_amount)
+
+
+def log_raw_material_transaction(product_name, grade, change_amount, transaction_type, date):
+    """원료 입출고 기록"""
+    with _lock:
+        _append_raw_transaction(product_name, grade, change_amount, transaction_type, date)
+
+
+def adjust_raw_material_stock(product_name, grade, delta, transaction_type, date):
+    """원료 재고 증감 + 입출고 기록. 변경 후 재고(kg) 반환"""
+    material_id = f"{product_name}_{grade}"
+    with _lock:
+        if material_id not in _raw:
+            raise KeyError(f"원료 {material_id} 없음")
+        row = _raw[material_id]
+        current = float(row['현재고_kg'])
+        if current + delta < 0:
+            raise ValueError(f"현재고_kg은 음수일 수 없습니다 (현재고: {current}, 변경: {delta})")
+        row['현재고_kg'] = current + float(delta)
+        _append_raw_transaction(product_name, grade, delta, transaction_type, date)
+        return row['현재고_kg']
+
+
+# ==================== 가져오기/내보내기 ====================
+
+def _transaction_rows():
+    return [{**t, 'timestamp': t['timestamp'].strftime("%Y-%m-%d %H:%M:%S")} for t in _transactions]
+
+
+# 내보내기 대상: kind -> (행 목록 함수, 컬럼)
+TABLES = {
+    'roll': (lambda: _roll.values(), ROLL_COLUMNS),
+    'cut': (lambda: _cut.values(), CUT_COLUMNS),
+    'raw': (lambda: _raw.values(), RAW_COLUMNS),
+    'workflow': (lambda: _workflow.values(), WORKFLOW_COLUMNS),
+    'transactions': (_transaction_rows, ['item_type', 'item_id', 'delta', 'note', 'timestamp']),
+}
+
+
+def iter_table(kind, chunk_size=5000):
+    """kind('roll'/'cut'/'raw'/'workflow'/'transactions') 전체를 chunk_size행씩 DataFrame으로 차례로 반환"""
+    rows_of, columns = TABLES[kind]
+    with _lock:
+        rows = [dict(r) for r in rows_of()]
+    for i in range(0, len(rows), chunk_size):
+        yield _frame(rows[i:i + chunk_size], columns)
+
+
+def import_transactions(df):
+    """거래 기록 일괄 추가 (item_type, item_id, delta, note, timestamp 'YYYY-MM-DD HH:MM:SS')"""
+    with _lock:
+        for row in df[['item_type', 'item_id', 'delta', 'note', 'timestamp']].itertuples(index=False):
+            _append_transaction(row.item_type, str(row.item_id), float(row.delta), row.note,
+                                datetime.strptime(row.timestamp, "%Y-%m-%d %H:%M:%S"))
+
+
+# ==================== 목록 페이지 ====================
+
+def load_inventory_page(kind, sort_by=None, descending=False, filters=None,
+                        limit=paging.DEFAULT_PAGE_SIZE, after=None):
+    """kind('roll'/'cut'/'raw') 목록 한 페이지 (정렬/필터/커서는 paging 참고)"""
+    rows_of, columns = TABLES[kind]
+    with _lock:
+        rows = [dict(r) for r in rows_of()]
+    return _frame(paging.page_rows(kind, rows, sort_by, descending, filters, limit, after), columns)
+
+
+def inventory_summary(kind, filters=None):
+    """kind 목록의 {'count': 품목 수, 'total': 현재고 합계} (필터 적용)"""
+    rows_of, _ = TABLES[kind]
+    with _lock:
+        return paging.summarize_rows(kind, list(rows_of()), filters)
+
+
+# ==================== 거래 기록 보관 / 재고 스냅샷 ====================
+
+LEDGERS = {'transactions': _transactions, 'raw_material_transactions': _raw_transactions}
+SNAPSHOT_COLUMNS = ['taken_at', 'item_type', 'item_id', 'stock', 'ledger_id']
+
+
+def load_ledger(ledger, start=None, end=None):
+    """거래 기록 중 timestamp가 [start, end)인 행 (보관 파일 제외, timestamp 순)"""
+    with _lock:
+        rows = [dict(t) for t in LEDGERS[ledger]
+                if (start is None or t['timestamp'] >= start) and (end is None or t['timestamp'] < end)]
+    for row in rows:
+        row['timestamp'] = row['timestamp'].strftime("%Y-%m-%d %H:%M:%S")
+    df = _frame(rows, ledger_archive.LEDGERS[ledger])
+    return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+def oldest_ledger_time(ledger):
+    """가장 오래된 거래 기록 시각 (없으면 None)"""
+    with _lock:
+        return min((t['timestamp'] for t in LEDGERS[ledger]), default=None)
+
+
+def delete_ledger_entries(ledger, ids):
+    """거래 기록 삭제 (보관 후 호출). 삭제한 건수 반환"""
+    ids = set(map(str, ids))
+    with _lock:
+        entries = LEDGERS[ledger]
+        kept = [t for t in entries if t['id'] not in ids]
+        deleted = len(entries) - len(kept)
+        entries[:] = kept
+    return deleted
+
+
+def take_stock_snapshot():
+    """
+    롤/재단/원료 현재고를 한 번의 잠금 안에서 기록. 기록 시각 반환
+
+    거래 id를 하나 받아 ledger_id로 남기므로 스냅샷 이후 거래는 모두 id > ledger_id이다.
+    """
+    with _lock:
+        taken_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ledger_id = next(_ledger_ids)
+        rows = [(taken_at, 'roll', k, float(r['현재고(롤)']), ledger_id) for k, r in _roll.items()]
+        rows += [(taken_at, 'cut', k, float(r['현재고(장)']), ledger_id) for k, r in _cut.items()]
+        rows += [(taken_at, 'raw', k, float(r['현재고_kg']), ledger_id) for k, r in _raw.items()]
+        _snapshots[:] = [s for s in _snapshots if s[0] != taken_at] + rows
+    return taken_at
+
+
+def load_stock_snapshot(at=None):
+    """at(기본: 지금) 이전 가장 최근 스냅샷의 품목별 재고 (taken_at, item_type, item_id, stock, ledger_id)"""
+    at = (at or datetime.now()).strftime("%Y-%m-%d %H:%M:%S")
+    with _lock:
+        latest = max((s[0] for s in _snapshots if s[0] <= at), default=None)
+        rows = [s for s in _snapshots if s[0] == latest]
+    return pd.DataFrame(rows, columns=SNAPSHOT_COLUMNS)
@@ -0,0 +1,104 @@
+# 재고 목록 페이지 조회
+"""
+재고 목록 화면이 보이는 한 페이지만 읽도록 저장소들이 함께 쓰는 정의와 도우미
+
+- 정렬: sort_by 컬럼 + 품목 ID (값이 같은 품목끼리 순서를 고정)
+- 다음 페이지: 이전 페이지 마지막 행의 (정렬 값, 품목 ID) 다음부터 읽는다 (keyset/커서, OFFSET 없음)
+- 필터: {컬럼: 값} 일치 조건 (저장소에서 적용)
+  필터가 있으면 filtered_sort 컬럼으로만 정렬할 수 있다 (Firestore 복합 색인은 이 조합만 firestore.indexes.json에 선언)
+- 합계: 품목 수와 현재고 합계를 집계 쿼리로 따로 구한다
+"""
+DEFAULT_PAGE_SIZE = 50
+
+# kind -> 품목 ID 컬럼, 현재고 컬럼, 정렬 가능 컬럼(첫 번째가 기본), 필터 가능 컬럼,
+#         필터가 있을 때 정렬 가능 컬럼(첫 번째가 기본)
+PAGE_KINDS = {
+    'roll': {
+        'id': '제품ID', 'stock': '현재고(롤)',
+        'sort': ['제품ID', '두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)'],
+        'filters': ['두께(mm)', '폭(cm)'],
+        'filtered_sort': ['제품ID', '현재고(롤)'],
+    },
+    'cut': {
+        'id': '재단ID', 'stock': '현재고(장)',
+        'sort': ['재단ID', '업체명', '가로(cm)', '세로(cm)', '두께(mm)', '현재고(장)'],
+        'filters': ['업체명', '두께(mm)'],
+        'filtered_sort': ['재단ID', '현재고(장)'],
+    },
+    'raw': {
+        'id': '원료ID', 'stock': '현재고_kg',
+        'sort': ['품명', 'Grade', '현재고_kg', '입고일'],
+        'filters': ['품명', 'Grade'],
+        'filtered_sort': ['품명', '현재고_kg'],
+    },
+}
+
+
+def sort_columns(kind, filtered=False):
+    """정렬 가능 컬럼 목록 (filtered: 필터가 걸려 있는지)"""
+    return PAGE_KINDS[kind]['filtered_sort' if filtered else 'sort']
+
+
+def check_query(kind, sort_by=None, filters=None):
+    """정렬/필터 컬럼 검사 후 (정렬 컬럼, 필터 dict) 반환 (지원하지 않는 컬럼이면 ValueError)"""
+    spec = PAGE_KINDS[kind]
+    filters = dict(filters or {})
+    unknown = [col for col in filters if col not in spec['filters']]
+    if unknown:
+        raise ValueError(f"필터할 수 없는 컬럼: {', '.join(unknown)} (가능: {', '.join(spec['filters'])})")
+    allowed = sort_columns(kind, bool(filters))
+    sort_by = sort_by or allowed[0]
+    if sort_by not in allowed:
+        condition = "필터와 함께 " if filters else ""
+        raise ValueError(f"{condition}정렬할 수 없는 컬럼: {sort_by} (가능: {', '.join(allowed)})")
+    return sort_by, filters
+
+
+def item_id(kind, row):
+    """표시 행(dict) -> 품목 ID (원료는 '품명_Grade')"""
+    if kind == 'raw':
+        return f"{row['품명']}_{row['Grade']}"
+    return str(row[PAGE_KINDS[kind]['id']])
+
+
+def _plain(value):
+    # numpy 값 -> 파이썬 값 (캐시 키/SQL 인자로 쓰기 위해)
+    return value.item() if hasattr(value, 'item') else value
+
+
+def next_cursor(kind, page, sort_by=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    page 다음 페이지를 읽을 커서 (정렬 값, 품목 ID)
+
+    Returns:
+        tuple 또는 None (마지막 페이지)
+    """
+    if len(page) < limit:
+        return None
+    sort_by = sort_by or PAGE_KINDS[kind]['sort'][0]
+    last = page.iloc[-1]
+    return _plain(last[sort_by]), item_id(kind, last)
+
+
+def page_rows(kind, rows, sort_by=None, descending=False, filters=None, limit=DEFAULT_PAGE_SIZE, after=None):
+    """
+    표시 행(dict) 목록에서 한 페이지 고르기 (메모리 저장소, Firestore 미러용)
+
+    Returns:
+        list[dict]
+    """
+    sort_by, filters = check_query(kind, sort_by, filters)
+    rows = [r for r in rows if all(r.get(col) == value for col, value in filters.items())]
+    keyed = sorted((((r[sort_by], item_id(kind, r)), r) for r in rows), key=lambda kr: kr[0], reverse=descending)
+    if after is not None:
+        after = tuple(after)
+        keyed = [(k, r) for k, r in keyed if (k < after if descending else k > after)]
+    return [r for _, r in keyed[:limit]]
+
+
+def summarize_rows(kind, rows, filters=None):
+    """표시 행(dict) 목록의 {'count': 품목 수, 'total': 현재고 합계}"""
+    _, filters = check_query(kind, None, filters)
+    stock = PAGE_KINDS[kind]['stock']
+    rows = [r for r in rows if all(r.get(col) == value for col, value in filters.items())]
+    return {'count': len(rows), 'total': float(sum(float(r[stock] or 0) for r in rows))}
@@ -0,0 +1,30 @@
+# 재주문 알림
+"""
+재고 프레임과 재주문 임계값을 병합해 재주문이 필요한 품목을 한 번에 찾는다
+"""
+import pandas as pd
+
+
+def find_reorder_alerts(df, thresholds, id_col, stock_col):
+    """
+    현재고가 임계값 이하인 품목 찾기 (벡터 연산)
+
+    Args:
+        df: 재고 데이터프레임 (load_roll_inventory/load_cut_inventory 결과)
+        thresholds: {품목ID: 임계값} (load_reorder_levels 결과)
+        id_col: 품목ID 컬럼명 ('제품ID', '재단ID')
+        stock_col: 현재고 컬럼명 ('현재고(롤)', '현재고(장)')
+
+    Returns:
+        DataFrame: 알림 대상 행 (id_col, stock_col, '임계값')
+    """
+    if df.empty or not thresholds:
+        return pd.DataFrame(columns=[id_col, stock_col, '임계값'])
+
+    levels = pd.DataFrame({
+        id_col: [str(k) for k in thresholds.keys()],
+        '임계값': [float(v) for v in thresholds.values()]
+    })
+    merged = df[[id_col, stock_col]].astype({id_col: str}).merge(levels, on=id_col, how='inner')
+    low = merged[pd.to_numeric(merged[stock_col], errors='coerce') <= merged['임계값']]
+    return low.reset_index(drop=True)
@@ -0,0 +1,82 @@
+# 롤 규격 검색
+"""
+"0.05T, 폭 90~110cm"처럼 두께/폭/길이 범위로 롤을 찾는다.
+
+- SQLite: (두께_mm, 폭_cm, 롤길이_m) 인덱스 범위 쿼리 (db_functions.find_rolls_by_spec)
+- Firestore/메모리: 캐시된 롤 목록을 (두께, 폭, 길이) 순으로 정렬한 색인에서
+  두께 구간은 bisect로 자르고 폭/길이는 그 구간 안에서만 비교한다.
+  색인은 롤 재고가 바뀔 때까지(roll_inventory 캐시 버전) 다시 만들지 않는다.
+
+범위는 (최소, 최대) 튜플이며 한쪽이 None이면 그쪽은 제한하지 않는다.
+"""
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+import pandas as pd
+
+import storage
+from data_cache import DataCache, cache
+
+SPEC_COLUMNS = ['두께(mm)', '폭(cm)', '롤 길이(m)']
+INDEXED_BACKENDS = ('sqlite',)   # 저장소 자체 인덱스로 검색하는 저장소
+
+index_cache = DataCache(max_entries=4)
+
+
+def spec_range(value, tolerance):
+    """기준값 ± 허용오차 -> (최소, 최대)"""
+    return value - tolerance, value + tolerance
+
+
+class SpecIndex:
+    """(두께, 폭, 길이, 제품ID) 순으로 정렬한 롤 규격 색인"""
+
+    def __init__(self, df):
+        df = df.astype({col: 'float64' for col in SPEC_COLUMNS})
+        self.frame = df.sort_values(SPEC_COLUMNS + ['제품ID'], kind='stable').reset_index(drop=True)
+        self._thickness = self.frame['두께(mm)'].tolist()
+        self._width = self.frame['폭(cm)'].to_numpy()
+        self._length = self.frame['롤 길이(m)'].to_numpy()
+
+    def __len__(self):
+        return len(self._thickness)
+
+    def query(self, thickness=None, width=None, length=None):
+        """범위 안의 롤 (두께, 폭, 길이 순)"""
+        low, high = thickness or (None, None)
+        start = 0 if low is None else bisect_left(self._thickness, low)
+        stop = len(self._thickness) if high is None else bisect_right(self._thickness, high)
+        if start >= stop:
+            return self.frame.iloc[0:0]
+
+        mask = np.ones(stop - start, dtype=bool)
+        for values, bounds in ((self._width, width), (self._length, length)):
+            if bounds is None:
+                continue
+            low, high = bounds
+            if low is not None:
+                mask &= values[start:stop] >= low
+            if high is not None:
+                mask &= values[start:stop] <= high
+        return self.frame.iloc[start:stop][mask]
+
+
+def get_index():
+    """현재 롤 재고의 규격 색인 (캐시, 롤 재고 쓰기 시 다시 만듦)"""
+    key = (storage.cache_scope(), cache.version('roll_inventory'))
+    return index_cache.get_or_load('roll_spec', key, lambda: SpecIndex(storage.load_roll_inventory()))
+
+
+def find_rolls(thickness=None, width=None, length=None):
+    """
+    규격 범위에 맞는 롤 후보
+
+    Args:
+        thickness / width / length: (최소, 최대) 또는 None
+
+    Returns:
+        DataFrame: 롤 재고 컬럼 (두께, 폭, 길이 순)
+    """
+    if storage.current_backend_name() in INDEXED_BACKENDS:
+        return storage.find_rolls_by_spec(thickness, width, length)
+    return get_index().query(thickness, width, length).reset_index(drop=True)
@@ -0,0 +1,128 @@
+# 시작 시간 측정
+"""
+앱 콜드 스타트(첫 화면까지) 구간별 시간을 기록하고 보고한다.
+
+- 런타임: inventory_app이 import 완료 / 첫 화면 / Firebase 준비(백그라운드) 시각을 남긴다.
+  INVENTORY_STARTUP_PROFILE=1이면 프로세스의 첫 보고서를 한 번 출력한다.
+- import 시간: 새 프로세스에서 `python -X importtime`으로 앱 모듈을 import해 모듈별 누적 시간을 보여 준다.
+  --budget-ms를 넘으면 종료 코드 1 (CI에서 회귀 확인).
+
+    python startup_profile.py
+    python startup_profile.py --json --budget-ms 2000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# 앱 첫 화면까지 import되는 모듈 (import 순서대로)
+APP_MODULES = ['pandas', 'streamlit', 'storage', 'firebase_config', 'reorder_alerts', 'paging', 'spec_index',
+               'workflow_archive', 'instrumentation']
+# 페이지를 열 때 import되는 모듈 (지연 import)
+LAZY_MODULES = ['firebase_db', 'db_functions', 'data_io', 'usage_analytics', 'demand_forecast', 'cutting_planner']
+
+_started = time.perf_counter()
+_phases = {}
+_lock = threading.Lock()
+_logged = False
+
+
+def record(name, seconds):
+    """구간 시간 기록 (같은 이름은 처음 값만 유지: 콜드 스타트 기준)"""
+    with _lock:
+        _phases.setdefault(name, seconds)
+
+
+def mark(name):
+    """프로세스 시작(이 모듈 import)부터 지금까지의 시간을 name으로 기록"""
+    record(name, time.perf_counter() - _started)
+
+
+def report():
+    """{구간 이름: 밀리초}"""
+    with _lock:
+        return {name: round(seconds * 1000, 1) for name, seconds in _phases.items()}
+
+
+def log_once():
+    """INVENTORY_STARTUP_PROFILE=1이면 첫 보고서를 한 번 출력"""
+    global _logged
+
+    if os.environ.get('INVENTORY_STARTUP_PROFILE', '0') != '1':
+        return
+    with _lock:
+        if _logged:
+            return
+        _logged = True
+    print(f"[startup] {json.dumps(report(), ensure_ascii=False)}", file=sys.stderr)
+
+
+# ==================== import 시간 ====================
+
+def parse_importtime(text):
+    """
+    -X importtime 출력 -> {최상위 import 모듈: 누적 밀리초}
+
+    들여쓰기가 없는 줄(다른 모듈 안에서 import되지 않은 모듈)만 센다.
+    """
+    times = {}
+    for line in text.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith('  '):
+            continue
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def import_times(modules, cwd=None):
+    """
+    새 프로세스에서 modules를 차례로 import한 시간
+
+    Returns:
+        {모듈: 누적 밀리초} (앞 모듈이 이미 import한 부분은 뒤 모듈에 포함되지 않는다)
+    """
+    code = '; '.join(f'import {m}' for m in modules)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                            cwd=cwd or os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import 실패')
+    times = parse_importtime(result.stderr)
+    return {m: times.get(m, 0.0) for m in modules}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="앱 모듈 import 시간 보고")
+    parser.add_argument('--json', action='store_true', help="JSON으로 출력")
+    parser.add_argument('--budget-ms', type=float, default=None, help="첫 화면 import 합계가 이 값을 넘으면 종료 코드 1")
+    args = parser.parse_args(argv)
+
+    eager = import_times(APP_MODULES)
+    lazy = import_times(APP_MODULES + LAZY_MODULES)
+    lazy = {m: lazy[m] for m in LAZY_MODULES}
+    total = sum(eager.values())
+
+    if args.json:
+        print(json.dumps({'first_paint_imports_ms': eager, 'lazy_imports_ms': lazy, 'total_ms': round(total, 1)},
+                         ensure_ascii=False, indent=2))
+    else:
+        print("첫 화면 import (ms)")
+        for name, ms in sorted(eager.items(), key=lambda kv: -kv[1]):
+            print(f"  {name:<20} {ms:8.1f}")
+        print(f"  {'합계':<20} {total:8.1f}")
+        print("페이지별 지연 import (ms)")
+        for name, ms in sorted(lazy.items(), key=lambda kv: -kv[1]):
+            print(f"  {name:<20} {ms:8.1f}")
+
+    if args.budget_ms is not None and total > args.budget_ms:
+        print(f"첫 화면 import {total:.1f}ms > 예산 {args.budget_ms:.1f}ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,255 @@
+# 저장소 선택
+"""
+재고 앱이 사용하는 저장소(backend)를 환경변수 INVENTORY_BACKEND로 선택한다
+  - firestore (기본): firebase_db
+  - sqlite: db_functions (DB_PATH 파일)
+  - memory: memory_db (프로세스 메모리, 테스트/데모용)
+
+각 backend 모듈은 InventoryStore 프로토콜의 함수들을 모듈 수준 함수로 제공한다.
+앱은 `from storage import load_roll_inventory, ...`처럼 가져다 쓰며(저장소 모듈은 처음 호출할 때 import),
+읽기 함수는 data_cache로 캐시되고 쓰기 함수는 해당 컬렉션 캐시를 무효화한다.
+"""
+import functools
+import importlib
+import os
+import threading
+from typing import Iterator, Protocol
+
+import pandas as pd
+
+from data_cache import cache, cached_loader, invalidates
+
+BACKENDS = {
+    'firestore': 'firebase_db',
+    'sqlite': 'db_functions',
+    'memory': 'memory_db',
+}
+DEFAULT_BACKEND = 'firestore'
+
+
+class InventoryStore(Protocol):
+    """모든 저장소가 같은 의미로 구현하는 함수 목록
+
+    - load_*: 표시용 컬럼의 DataFrame 반환 (실패/미연결 시 빈 프레임)
+    - save_*: load_* 이후 변경/추가된 행만 기록 (재고 음수면 ValueError). 프레임에서 빠진 행은 지우지 않는다 (삭제는 delete_*_item)
+    - update_*_item: 표시명/DB명 모두 허용, 없는 품목은 KeyError
+    - adjust_*: 재고 증감과 거래 기록을 원자적으로 처리, 부족하면 ValueError
+    - iter_table: 내보내기용으로 표 전체를 DataFrame 묶음(chunk)으로 차례로 반환
+    - load_inventory_page: 정렬/필터를 저장소에서 적용해 한 페이지만 반환 (커서는 paging.next_cursor)
+    """
+
+    # 롤 재고
+    def load_roll_inventory(self) -> pd.DataFrame: ...
+    def save_roll_inventory(self, df: pd.DataFrame) -> None: ...
+    def update_roll_item(self, product_id, **kwargs) -> None: ...
+    def delete_roll_item(self, product_id) -> None: ...
+    def adjust_roll_stock(self, item_id, delta, note="") -> float: ...
+    def find_rolls_by_spec(self, thickness=None, width=None, length=None) -> pd.DataFrame: ...
+
+    # 재단 재고
+    def load_cut_inventory(self) -> pd.DataFrame: ...
+    def save_cut_inventory(self, df: pd.DataFrame) -> None: ...
+    def update_cut_item(self, item_id, **kwargs) -> None: ...
+    def delete_cut_item(self, item_id) -> None: ...
+    def adjust_cut_stock(self, item_id, delta, note="") -> float: ...
+
+    # 원료 재고
+    def load_raw_materials(self) -> pd.DataFrame: ...
+    def save_raw_materials(self, df: pd.DataFrame) -> None: ...
+    def log_raw_material_transaction(self, product_name, grade, change_amount, transaction_type, date) -> None: ...
+    def adjust_raw_material_stock(self, product_name, grade, delta, transaction_type, date) -> float: ...
+
+    # 작업 플로우
+    def load_workflow(self, statuses=None) -> pd.DataFrame: ...
+    def save_workflow(self, df: pd.DataFrame) -> None: ...
+    def update_workflow_item(self, work_id, **kwargs) -> None: ...
+    def delete_workflow_item(self, work_id) -> None: ...
+    def archive_workflow(self, before) -> int: ...
+    def load_workflow_archive(self, limit=50, after=None) -> pd.DataFrame: ...
+    def workflow_archive_count(self) -> int: ...
+
+    # 거래 기록 / 사용량
+    def record_roll_transaction(self, item_id, delta, note="") -> None: ...
+    def record_cut_transaction(self, item_id, delta, note="") -> None: ...
+    def get_monthly_usage_roll(self, item_id, year=None, month=None) -> float: ...
+    def get_monthly_usage_cut(self, item_id, year=None, month=None) -> float: ...
+    def get_monthly_usage_bulk(self, item_type, year=None, month=None) -> dict: ...
+    def get_usage_between(self, item_type, item_id, start, end) -> float: ...
+    def rebuild_usage_monthly(self) -> None: ...
+
+    # 재주문 임계값
+    def set_reorder_level(self, item_type, item_id, threshold) -> None: ...
+    def set_reorder_levels(self, item_type, thresholds: dict) -> None: ...
+    def get_reorder_level(self, item_type, item_id): ...
+    def load_reorder_levels(self, item_type, item_ids=None) -> dict: ...
+
+    # 목록 페이지 (kind: 'roll' / 'cut' / 'raw')
+    def load_inventory_page(self, kind, sort_by=None, descending=False, filters=None,
+                            limit=50, after=None) -> pd.DataFrame: ...
+    def inventory_summary(self, kind, filters=None) -> dict: ...
+
+    # 가져오기/내보내기
+    def iter_table(self, kind, chunk_size=5000) -> Iterator[pd.DataFrame]: ...
+    def import_transactions(self, df: pd.DataFrame) -> None: ...
+
+    # 거래 기록 보관 / 재고 스냅샷 (ledger_archive)
+    def load_ledger(self, ledger, start=None, end=None) -> pd.DataFrame: ...
+    def oldest_ledger_time(self, ledger): ...
+    def delete_ledger_entries(self, ledger, ids) -> int: ...
+    def take_stock_snapshot(self) -> str: ...
+    def load_stock_snapshot(self, at=None) -> pd.DataFrame: ...
+
+
+# 프로토콜에 포함된 함수 이름 (storage 모듈에서 바로 가져올 수 있는 이름)
+API = sorted(name for name in vars(InventoryStore) if not name.startswith('_'))
+
+# 캐시되는 읽기 함수 -> 읽는 컬렉션
+CACHED_LOADERS = {
+    'load_roll_inventory': 'roll_inventory',
+    'find_rolls_by_spec': 'roll_inventory',
+    'load_cut_inventory': 'cut_inventory',
+    'load_workflow': 'workflow',
+    'load_workflow_archive': 'workflow_archive',
+    'workflow_archive_count': 'workflow_archive',
+    'load_raw_materials': 'raw_materials',
+    'get_monthly_usage_roll': 'usage_monthly',
+    'get_monthly_usage_cut': 'usage_monthly',
+    'get_monthly_usage_bulk': 'usage_monthly',
+    'get_reorder_level': 'reorder_levels',
+    'load_reorder_levels': 'reorder_levels',
+}
+
+# 첫 인자 kind에 따라 읽는 컬렉션이 달라지는 읽기 함수
+KIND_LOADERS = ('load_inventory_page', 'inventory_summary')
+KIND_COLLECTIONS = {'roll': 'roll_inventory', 'cut': 'cut_inventory', 'raw': 'raw_materials'}
+
+# 쓰기 함수 -> 바뀌는 컬렉션 (실행 후 캐시 버전 증가)
+WRITES = {
+    'save_roll_inventory': ('roll_inventory',),
+    'update_roll_item': ('roll_inventory',),
+    'delete_roll_item': ('roll_inventory',),
+    'adjust_roll_stock': ('roll_inventory', 'usage_monthly'),
+    'record_roll_transaction': ('usage_monthly',),
+    'save_cut_inventory': ('cut_inventory',),
+    'update_cut_item': ('cut_inventory',),
+    'delete_cut_item': ('cut_inventory',),
+    'adjust_cut_stock': ('cut_inventory', 'usage_monthly'),
+    'record_cut_transaction': ('usage_monthly',),
+    'save_raw_materials': ('raw_materials',),
+    'log_raw_material_transaction': ('usage_monthly',),
+    'adjust_raw_material_stock': ('raw_materials', 'usage_monthly'),
+    'save_workflow': ('workflow',),
+    'update_workflow_item': ('workflow',),
+    'delete_workflow_item': ('workflow', 'workflow_archive'),
+    'archive_workflow': ('workflow', 'workflow_archive'),
+    'rebuild_usage_monthly': ('usage_monthly',),
+    'import_transactions': ('usage_monthly',),
+    'set_reorder_level': ('reorder_levels',),
+    'set_reorder_levels': ('reorder_levels',),
+}
+
+_backend = None
+_backend_name = None
+_backend_lock = threading.RLock()   # 백그라운드 준비 스레드와 세션이 동시에 불러도 한 번만 초기화
+_functions = {}
+
+
+def backend_name():
+    """환경변수로 지정된 저장소 이름"""
+    name = os.environ.get('INVENTORY_BACKEND', DEFAULT_BACKEND).strip().lower()
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 INVENTORY_BACKEND: {name} (가능: {', '.join(BACKENDS)})")
+    return name
+
+
+def get_backend(name=None):
+    """저장소 모듈 반환 (처음 호출 시 import 및 초기화)"""
+    global _backend, _backend_name
+
+    name = name or backend_name()
+    if _backend is not None and _backend_name == name:
+        return _backend
+
+    if name not in BACKENDS:
+        raise ValueError(f"알 수 없는 저장소: {name} (가능: {', '.join(BACKENDS)})")
+
+    with _backend_lock:
+        if _backend is not None and _backend_name == name:
+            return _backend
+
+        module = importlib.import_module(BACKENDS[name])
+        # SQLite는 테이블/마이그레이션 준비가 필요하다 (Firestore는 없음)
+        if hasattr(module, 'init_db'):
+            module.init_db()
+
+        _backend, _backend_name = module, name
+        _functions.clear()
+        return module
+
+
+def cache_scope():
+    """캐시 키의 저장소 구분 값 (SQLite는 DB 파일별로 구분)"""
+    return _backend_name, getattr(_backend, 'DB_PATH', None)
+
+
+def get_function(name):
+    """선택된 저장소의 함수를 캐시/무효화 래퍼로 감싸서 반환"""
+    backend = get_backend()
+    func = _functions.get(name)
+    if func is None:
+        func = getattr(backend, name)
+        if name in CACHED_LOADERS:
+            func = cached_loader(CACHED_LOADERS[name], scope=cache_scope)(func)
+        elif name in KIND_LOADERS:
+            func = _kind_cached(func)
+        elif name in WRITES:
+            func = invalidates(*WRITES[name])(func)
+        _functions[name] = func
+    return func
+
+
+def _kind_cached(func):
+    """kind별 컬렉션 네임스페이스로 캐시 (해당 컬렉션 쓰기 시 무효화)"""
+    loaders = {kind: cached_loader(collection, scope=cache_scope)(func)
+               for kind, collection in KIND_COLLECTIONS.items()}
+
+    @functools.wraps(func)
+    def wrapper(kind, *args, **kwargs):
+        return loaders[kind](kind, *args, **kwargs)
+    return wrapper
+
+
+def clear_cache():
+    """캐시 전체 무효화 (새로고침)"""
+    cache.clear()
+
+
+def cache_stats():
+    return cache.stats()
+
+
+def current_backend_name():
+    """현재 사용 중인 저장소 이름 (아직 선택 전이면 환경변수 값)"""
+    return _backend_name or backend_name()
+
+
+_proxies = {}
+
+
+def _lazy(name):
+    """처음 호출할 때 선택된 저장소의 함수를 찾는 대리 함수 (import만으로는 저장소를 불러오지 않는다)"""
+    proxy = _proxies.get(name)
+    if proxy is None:
+        def proxy(*args, **kwargs):
+            return get_function(name)(*args, **kwargs)
+        proxy.__name__ = proxy.__qualname__ = name
+        proxy.__doc__ = getattr(InventoryStore, name).__doc__
+        _proxies[name] = proxy
+    return proxy
+
+
+def __getattr__(name):
+    # from storage import load_roll_inventory 등을 선택된 저장소로 위임 (호출 시점에 저장소 선택)
+    if name in API:
+        return _lazy(name)
+    raise AttributeError(f"module 'storage' has no attribute '{name}'")
@@ -0,0 +1,18 @@
+import pytest
+
+import db_functions
+import memory_db
+import storage
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def backend(request, tmp_path, monkeypatch):
+    """INVENTORY_BACKEND를 sqlite/memory로 바꿔 가며 빈 저장소를 준비하고 백엔드 모듈을 돌려준다"""
+    monkeypatch.setenv('INVENTORY_BACKEND', request.param)
+    if request.param == 'sqlite':
+        db_functions.DB_PATH = str(tmp_path / "test_inventory.db")
+        db_functions.init_db()
+    else:
+        memory_db.reset()
+    storage.clear_cache()
+    return storage.get_backend()
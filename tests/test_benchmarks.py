@@ -0,0 +1,34 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_usage_query  # noqa: E402
+import generate_dataset  # noqa: E402
+import run_benchmarks  # noqa: E402
+
+
+def test_generate_dataset_scales_rows():
+    dataset = generate_dataset.generate(scale=0.001, seed=1)
+
+    assert len(dataset['roll']) == 5
+    assert len(dataset['ledger']) == 2000
+    assert dataset['ledger']['ts_epoch'].is_monotonic_increasing
+
+
+def test_benchmark_reports_every_scenario_for_both_backends():
+    dataset = generate_dataset.generate(scale=0.001, seed=1)
+
+    for bench in run_benchmarks.BACKENDS.values():
+        report = bench(dataset, repeat=2, seed=1)
+        assert list(report) == [s.__name__ for s in run_benchmarks.SCENARIOS]
+        assert report['stock_movement']['writes_per_op'] >= 2
+        assert report['roll_list']['p50_ms'] >= 0
+
+
+def test_usage_query_benchmark_runs_on_current_migrations():
+    # 마이그레이션을 바꾸면 이 벤치마크도 함께 돌아가야 한다
+    result = bench_usage_query.run(rows=2000, items=50, days=90, repeat=5)
+
+    assert 'idx_transactions_item_ts' in result['indexes']
+    assert 'USING INDEX idx_transactions_item_ts' in result['plan_after'][0]
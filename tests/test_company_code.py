@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import firebase_config  # noqa: E402
+from fake_firestore import FakeFirestore, installed  # noqa: E402
+
+
+@pytest.fixture
+def auth(tmp_path, monkeypatch):
+    monkeypatch.setenv('INVENTORY_AUTH_CACHE', str(tmp_path / 'auth.json'))
+    monkeypatch.setenv('COMPANY_CODE', '2026')
+    monkeypatch.setattr(firebase_config, 'HASH_ITERATIONS', 1000)
+    firebase_config.clear_auth_cache()
+    yield firebase_config
+    firebase_config.clear_auth_cache()
+
+
+def settings(client):
+    return client.collection('settings').document('auth').get().to_dict()
+
+
+def test_legacy_plain_code_is_replaced_by_salted_hash(auth):
+    client = FakeFirestore()
+    client.collection('settings').document('auth').set({'company_code': '7777', 'theme': 'blue'})
+
+    with installed(client, modules=[auth]):
+        assert auth.refresh_auth_cache()
+
+        stored = settings(client)
+        assert 'company_code' not in stored
+        assert stored['theme'] == 'blue'
+        assert auth.hash_code('7777', stored['code_salt'], stored['hash_iterations'])[1] == stored['code_hash']
+
+        client.reset_counters()
+        assert auth.verify_company_code('7777')
+        assert not auth.verify_company_code('2026')
+        # 캐시된 해시와 비교하므로 로그인마다 문서를 읽지 않는다
+        assert client.reads == 0
+
+
+def test_local_file_used_when_firestore_unavailable(auth):
+    client = FakeFirestore()
+    with installed(client, modules=[auth]):
+        assert auth.update_company_code('4321')
+
+    saved = json.loads(open(os.environ['INVENTORY_AUTH_CACHE'], encoding='utf-8').read())
+    assert set(saved) == {'salt', 'hash', 'iterations'}
+
+    # 재시작 + Firebase 미설정: 로컬 파일의 해시로 로그인
+    auth.clear_auth_cache()
+    with installed(None, modules=[auth]):
+        assert auth.verify_company_code('4321')
+        assert not auth.verify_company_code('2026')
+
+
+def test_env_code_without_firebase_or_local_file(auth):
+    with installed(None, modules=[auth]):
+        assert auth.verify_company_code('2026')
+        assert not auth.verify_company_code('0000')
+
+
+def test_failed_login_waits_for_first_refresh(auth):
+    client = FakeFirestore()
+    client.collection('settings').document('auth').set({'company_code': '9999'})
+
+    with installed(client, modules=[auth]):
+        # 캐시가 기본 코드(환경변수)뿐이어도 Firestore 값을 읽은 뒤 다시 비교한다
+        assert auth.verify_company_code('9999')
+        assert auth._current_auth()['source'] == 'firestore'
+
+
+def test_missing_settings_document_is_created_with_default_code(auth):
+    client = FakeFirestore()
+
+    with installed(client, modules=[auth]):
+        assert auth.refresh_auth_cache()
+        assert 'code_hash' in settings(client)
+        assert auth.verify_company_code('2026')
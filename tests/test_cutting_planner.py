@@ -0,0 +1,99 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import cutting_planner
+
+
+def orders(rows):
+    return pd.DataFrame(rows, columns=cutting_planner.ORDER_COLUMNS)
+
+
+def rolls(rows):
+    return pd.DataFrame([{'제품ID': pid, '두께(mm)': t, '폭(cm)': w, '롤 길이(m)': length, '현재고(롤)': stock,
+                          '최근업데이트': ''} for pid, t, w, length, stock in rows])
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('0.05T x 50cm x 70cm', (0.05, 50.0, 70.0)),
+    ('0.1mm 120cm*80.5cm', (0.1, 120.0, 80.5)),
+    ('0.05T x 100cm x 500m', None),
+    ('비닐 시트', None),
+])
+def test_parse_spec(text, expected):
+    assert cutting_planner.parse_spec(text) == expected
+
+
+def test_orders_from_workflow_keeps_open_sheet_jobs():
+    df = pd.DataFrame([
+        {'작업ID': 'W-1', '제품규격': '0.05T x 50cm x 70cm', '수량': 100, '단위': '장', '상태': '접수'},
+        {'작업ID': 'W-2', '제품규격': '0.05T x 50cm x 70cm', '수량': 100, '단위': '장', '상태': '납품완료'},
+        {'작업ID': 'W-3', '제품규격': '0.05T x 100cm x 500m', '수량': 2, '단위': '롤', '상태': '접수'},
+        {'작업ID': 'W-4', '제품규격': '규격 미정', '수량': 10, '단위': '장', '상태': '생산중'},
+    ])
+
+    result = cutting_planner.orders_from_workflow(df)
+
+    assert result['주문ID'].tolist() == ['W-1']
+    assert result.iloc[0][['두께(mm)', '가로(cm)', '세로(cm)', '수량']].tolist() == [0.05, 50.0, 70.0, 100]
+
+
+def test_sheet_is_rotated_to_fit_roll_width():
+    # 가로 150cm는 폭 100cm 롤에 들어가지 않으므로 세로(40cm)를 폭 방향에 둔다
+    plan = cutting_planner.plan_cuts(orders([['A', 0.05, 150, 40, 100]]),
+                                     rolls([('R1', 0.05, 100, 100, 5)]))
+
+    # 40cm 레인 2개 × 레인당 66장 = 132장 / 롤
+    assert plan['rolls'] == {'R1': 1}
+    assert plan['patterns'].iloc[0]['손실 폭(cm)'] == 20
+    assert plan['orders'].iloc[0][['생산 수량', '여분', '미배정']].tolist() == [132, 32, 0]
+
+
+def test_only_matching_thickness_is_used_and_missing_thickness_is_unplaced():
+    plan = cutting_planner.plan_cuts(
+        orders([['A', 0.05, 50, 50, 10], ['B', 0.1, 50, 50, 10]]),
+        rolls([('THIN', 0.05, 100, 100, 5), ('WIDE', 0.08, 300, 500, 5)]),
+    )
+
+    assert set(plan['patterns']['롤 제품ID']) == {'THIN'}
+    result = plan['orders'].set_index('주문ID')
+    assert result.loc['A', '미배정'] == 0
+    assert result.loc['B', '미배정'] == 10
+
+
+def test_stock_limits_rolls_used():
+    # 롤 1개에 100cm 레인 1개 × 10장, 재고 2롤이면 20장까지만
+    plan = cutting_planner.plan_cuts(orders([['A', 0.05, 100, 100, 35]]),
+                                     rolls([('R1', 0.05, 100, 10, 2)]))
+
+    assert plan['rolls'] == {'R1': 2}
+    assert plan['orders'].iloc[0][['생산 수량', '미배정']].tolist() == [20, 15]
+
+
+def test_plan_covers_hundreds_of_orders_quickly():
+    rng = np.random.default_rng(1)
+    n, m = 400, 40
+    thickness = [0.03, 0.05, 0.08, 0.1]
+    batch = pd.DataFrame({
+        '주문ID': [f'W-{i}' for i in range(n)],
+        '두께(mm)': rng.choice(thickness, n),
+        '가로(cm)': rng.integers(20, 120, n).astype(float),
+        '세로(cm)': rng.integers(20, 150, n).astype(float),
+        '수량': rng.integers(10, 2000, n),
+    })
+    stock = rolls(zip([f'V-{i}' for i in range(m)], rng.choice(thickness, m), rng.choice([100., 150., 200., 250.], m),
+                      rng.choice([200., 500.], m), rng.integers(5, 100, m)))
+
+    start = time.perf_counter()
+    plan = cutting_planner.plan_cuts(batch, stock)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    result = plan['orders']
+    assert (result['생산 수량'] + result['미배정'] - result['여분'] == result['수량']).all()
+    # 롤 재고를 넘겨 쓰지 않는다
+    used = pd.Series(plan['rolls'])
+    assert (used <= stock.set_index('제품ID')['현재고(롤)'].reindex(used.index)).all()
+    assert 0 < plan['yield'] <= 100
@@ -0,0 +1,61 @@
+import pandas as pd
+
+import memory_db
+import storage
+from data_cache import DataCache, cached_loader, invalidates
+
+
+def test_loader_hits_until_writer_bumps_version():
+    cache = DataCache(max_entries=8, ttl=60)
+    calls = []
+
+    @cached_loader('roll_inventory', data_cache=cache)
+    def load():
+        calls.append(1)
+        return pd.DataFrame({'제품ID': ['V-1'], '현재고(롤)': [len(calls)]})
+
+    @invalidates('roll_inventory', data_cache=cache)
+    def save():
+        pass
+
+    first = load()
+    first.loc[0, '현재고(롤)'] = 99  # 복사본이므로 캐시에 영향 없음
+    assert load().loc[0, '현재고(롤)'] == 1
+    assert len(calls) == 1
+
+    save()
+    assert load().loc[0, '현재고(롤)'] == 2
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 2
+
+
+def test_lru_eviction_and_ttl():
+    cache = DataCache(max_entries=2, ttl=60)
+
+    for key in ('a', 'b', 'a', 'c'):
+        cache.get_or_load('ns', key, lambda: key)
+
+    assert cache.stats()['entries'] == 2
+    assert cache.stats()['evictions'] == 1
+    cache.get_or_load('ns', 'b', lambda: 'b')  # 가장 오래된 b가 제거되었으므로 다시 로드
+    assert cache.misses == 4
+
+    expired = DataCache(ttl=0)
+    expired.get_or_load('ns', 'k', lambda: 1)
+    expired.get_or_load('ns', 'k', lambda: 1)
+    assert expired.hits == 0
+
+
+def test_storage_reads_own_writes(monkeypatch):
+    monkeypatch.setenv('INVENTORY_BACKEND', 'memory')
+    storage.get_backend('memory')
+    memory_db.reset()
+    storage.clear_cache()
+
+    storage.save_roll_inventory(pd.DataFrame([{'제품ID': 'V-1', '두께(mm)': 0.05, '폭(cm)': 100, '롤 길이(m)': 500,
+                                               '현재고(롤)': 5, '최근업데이트': ''}]))
+    assert int(storage.load_roll_inventory().loc[0, '현재고(롤)']) == 5
+
+    storage.adjust_roll_stock('V-1', -2)
+    assert int(storage.load_roll_inventory().loc[0, '현재고(롤)']) == 3
+    assert storage.get_monthly_usage_bulk('roll') == {'V-1': 2.0}
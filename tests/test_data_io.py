@@ -0,0 +1,122 @@
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import data_io  # noqa: E402
+import firebase_db  # noqa: E402
+import firestore_mirror  # noqa: E402
+import storage  # noqa: E402
+from fake_firestore import FakeFirestore, installed  # noqa: E402
+
+
+def csv_file(df):
+    return io.BytesIO(df.to_csv(index=False).encode('utf-8'))
+
+
+def rolls(n):
+    return pd.DataFrame({
+        '제품ID': [f'R{i:04d}' for i in range(n)],
+        '두께(mm)': 0.05, '폭(cm)': 100.0, '롤 길이(m)': 500.0,
+        '현재고(롤)': range(n),
+    })
+
+
+def test_validation_reports_all_bad_rows_at_once():
+    df = pd.DataFrame({
+        '제품ID': ['A', 'B', 'B', '', 'C'],
+        '두께(mm)': ['0.1', 'x', '1', '1', '1'],
+        '폭(cm)': '1', '롤 길이(m)': '1',
+        '현재고(롤)': ['1', '-2', '3', '4', '1.5'],
+    })
+
+    clean, errors = data_io.validate_import('roll', df)
+
+    assert clean['제품ID'].tolist() == ['A']
+    assert set(zip(errors['행'], errors['오류'])) == {
+        (3, '중복 키'), (3, '숫자가 아님'), (3, '음수일 수 없음'),
+        (4, '중복 키'), (5, '값 없음'), (6, '정수가 아님'),
+    }
+
+
+def test_missing_column_is_reported():
+    clean, errors = data_io.validate_import('roll', pd.DataFrame({'제품ID': ['A']}))
+    assert clean.empty
+    assert set(errors['컬럼']) == {'두께(mm)', '폭(cm)', '롤 길이(m)', '현재고(롤)'}
+
+
+def test_import_with_errors_writes_nothing(backend):
+    df = rolls(3)
+    df.loc[1, '현재고(롤)'] = -5
+
+    result = data_io.import_table('roll', csv_file(df), 'csv')
+
+    assert result['rows'] == 0
+    assert result['errors']['행'].tolist() == [3]
+    assert backend.load_roll_inventory().empty
+
+
+@pytest.mark.parametrize('fmt', ['csv', 'parquet'])
+def test_export_import_round_trip(backend, fmt):
+    data_io.import_table('roll', csv_file(rolls(12)), 'csv')
+
+    content, rows = data_io.export_bytes('roll', fmt, chunk_size=5)
+    assert rows == 12
+
+    for product_id in backend.load_roll_inventory()['제품ID']:
+        backend.delete_roll_item(product_id)
+    assert backend.load_roll_inventory().empty
+
+    result = data_io.import_table('roll', io.BytesIO(content), fmt)
+    assert result['rows'] == 12
+    loaded = backend.load_roll_inventory().sort_values('제품ID').reset_index(drop=True)
+    assert loaded['현재고(롤)'].tolist() == list(range(12))
+
+
+def test_import_updates_existing_and_keeps_others(backend):
+    data_io.import_table('roll', csv_file(rolls(3)), 'csv')
+    update = rolls(1).assign(**{'현재고(롤)': 40})
+
+    data_io.import_table('roll', csv_file(update), 'csv')
+
+    stock = backend.load_roll_inventory().set_index('제품ID')['현재고(롤)']
+    assert stock.to_dict() == {'R0000': 40, 'R0001': 1, 'R0002': 2}
+
+
+def test_import_transactions_updates_monthly_usage(backend):
+    ledger = pd.DataFrame({
+        'item_type': ['roll', 'roll', 'roll'],
+        'item_id': ['R1', 'R1', 'R1'],
+        'delta': [-2, -3, 10],
+        'timestamp': ['2026-01-02 09:00:00', '2026-01-20', '2026-01-21 10:00:00'],
+    })
+
+    assert data_io.import_table('transactions', csv_file(ledger), 'csv')['rows'] == 3
+
+    assert storage.get_monthly_usage_roll('R1', 2026, 1) == 5.0
+    exported = pd.read_csv(io.BytesIO(data_io.export_bytes('transactions', 'csv')[0]), encoding='utf-8-sig')
+    assert exported['delta'].tolist() == [-2, -3, 10]
+
+
+def test_firestore_export_pages_and_transactions_import(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+    client = FakeFirestore()
+    try:
+        with installed(client):
+            firebase_db.save_roll_inventory(rolls(7).assign(최근업데이트='2026-01-01 00:00'))
+            chunks = list(firebase_db.iter_table('roll', chunk_size=3))
+            assert [len(c) for c in chunks] == [3, 3, 1]
+            assert pd.concat(chunks)['제품ID'].tolist() == [f'R{i:04d}' for i in range(7)]
+
+            firebase_db.import_transactions(pd.DataFrame({
+                'item_type': ['cut', 'cut'], 'item_id': ['C1', 'C1'], 'delta': [-1.0, -4.0],
+                'note': '', 'timestamp': ['2026-02-01 00:00:00', '2026-02-03 00:00:00'],
+            }))
+            assert firebase_db.get_monthly_usage_cut('C1', 2026, 2) == 5.0
+            assert len(list(client.collection('transactions').stream())) == 2
+    finally:
+        firestore_mirror.stop_all()
@@ -0,0 +1,67 @@
+import pandas as pd
+import pytest
+
+import db_functions as app
+
+
+def setup_tmp_db(tmp_path):
+    app.DB_PATH = str(tmp_path / "test_inventory.db")
+    app.init_db()
+
+
+def test_connection_reused_and_tuned(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    conn = app.get_connection()
+    assert app.get_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+
+def test_connection_follows_db_path(tmp_path):
+    app.DB_PATH = str(tmp_path / "first.db")
+    app.init_db()
+    first = app.get_connection()
+
+    app.DB_PATH = str(tmp_path / "second.db")
+    app.init_db()
+    assert app.get_connection() is not first
+
+
+def test_transaction_groups_operations(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    df = pd.DataFrame([{ '제품ID': 'V-T', '두께(mm)': 0.2, '폭(cm)': 50.0, '롤 길이(m)': 100.0, '현재고(롤)': 2, '최근업데이트': '2026-01-05 00:00' }])
+    app.save_roll_inventory(df)
+
+    with pytest.raises(ValueError):
+        with app.transaction():
+            app.adjust_roll_stock('V-T', -1, note='출고')
+            app.adjust_roll_stock('V-T', -5, note='출고')
+
+    # 두 번째 작업이 실패하면 첫 번째 작업도 함께 롤백된다
+    assert int(app.load_roll_inventory().loc[0, '현재고(롤)']) == 2
+    assert app.get_monthly_usage_roll('V-T') == 0.0
+
+
+def test_migrations_applied_once(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    assert app.get_schema_version() == app.MIGRATIONS[-1][0]
+    # 다시 호출해도 적용할 것이 없다
+    assert app.migrate() == []
+
+    indexes = {row[0] for row in app.get_connection().execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions'")}
+    assert {'idx_transactions_item_ts', 'idx_transactions_type_ts'} <= indexes
+
+
+def test_usage_query_uses_index(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    plan = app.get_connection().execute(
+        "EXPLAIN QUERY PLAN SELECT SUM(-delta) FROM transactions "
+        "WHERE item_type = ? AND item_id = ? AND timestamp >= ? AND timestamp < ?",
+        ('roll', 'V-1', '2026-01-01 00:00:00', '2026-02-01 00:00:00')
+    ).fetchall()
+    assert any('idx_transactions_item_ts' in row[-1] for row in plan)
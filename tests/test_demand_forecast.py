@@ -0,0 +1,93 @@
+import math
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import demand_forecast
+import memory_db
+import storage
+import usage_analytics
+
+TODAY = date(2026, 3, 11)
+
+
+def roll(item_id, stock):
+    return {'제품ID': item_id, '두께(mm)': 0.05, '폭(cm)': 100, '롤 길이(m)': 500, '현재고(롤)': stock, '최근업데이트': ''}
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setenv('INVENTORY_BACKEND', 'memory')
+    monkeypatch.setenv('INVENTORY_ARCHIVE_DIR', str(tmp_path / 'archive'))
+    memory_db.reset()
+    storage.clear_cache()
+    storage.get_backend()
+    storage.save_roll_inventory(pd.DataFrame([roll('R1', 20), roll('R2', 3), roll('R3', 8)]))
+    # 최근 10일: R1은 매일 2롤, R2는 이틀에 한 번 4롤, 입고(+)는 사용량에서 제외
+    storage.import_transactions(pd.DataFrame({
+        'item_type': ['roll'] * 16,
+        'item_id': ['R1'] * 10 + ['R2'] * 5 + ['R1'],
+        'delta': [-2.0] * 10 + [-4.0] * 5 + [50.0],
+        'note': '',
+        'timestamp': [f'2026-03-{d:02d} 09:00:00' for d in range(1, 11)]
+                     + [f'2026-03-{d:02d} 09:00:00' for d in range(2, 11, 2)]
+                     + ['2026-03-05 10:00:00'],
+    }))
+
+
+def test_usage_stats_match_pandas(ledger):
+    stats = demand_forecast.usage_stats(lookback_days=10, span=3, today=TODAY).set_index('item_id')
+
+    r2 = pd.Series([0.0, 4.0] * 5)
+    assert stats.loc['R1', 'mean'] == pytest.approx(2.0)
+    assert stats.loc['R1', 'std'] == pytest.approx(0.0)
+    assert stats.loc['R2', 'mean'] == pytest.approx(r2.mean())
+    assert stats.loc['R2', 'std'] == pytest.approx(r2.std())
+    assert stats.loc['R2', 'ewma'] == pytest.approx(r2.ewm(span=3).mean().iloc[-1])
+    assert 'R3' not in stats.index
+
+
+def test_forecast_reorder_points(ledger):
+    result = demand_forecast.forecast('roll', lead_time_days=4, service_level=0.95,
+                                      lookback_days=10, span=3, today=TODAY).set_index('품목ID')
+
+    # 변동이 없는 R1: EWMA × 조달 기간
+    assert result.loc['R1', '제안 임계값'] == 8
+    assert result.loc['R1', '재고 일수'] == 10.0
+    # R2: 안전재고(z × σ × √L)가 더해짐
+    r2 = pd.Series([0.0, 4.0] * 5)
+    expected = r2.ewm(span=3).mean().iloc[-1] * 4 + 1.6449 * r2.std() * 2
+    assert result.loc['R2', '제안 임계값'] == math.ceil(expected)
+    # 사용 기록이 없는 품목은 0, 재고 일수는 무한
+    assert result.loc['R3', '제안 임계값'] == 0
+    assert np.isinf(result.loc['R3', '재고 일수'])
+    assert result.index[0] == 'R2'
+
+
+def test_apply_suggestions_saves_changed_levels(ledger):
+    storage.set_reorder_level('roll', 'R1', 8)
+    result = demand_forecast.forecast('roll', lead_time_days=4, lookback_days=10, span=3, today=TODAY)
+
+    assert demand_forecast.apply_suggestions('roll', result) == 2
+    levels = storage.load_reorder_levels('roll')
+    assert levels['R1'] == 8.0
+    assert levels['R3'] == 0.0
+
+    again = demand_forecast.forecast('roll', lead_time_days=4, lookback_days=10, span=3, today=TODAY)
+    assert demand_forecast.apply_suggestions('roll', again) == 0
+
+
+def test_new_transactions_refresh_stats(ledger):
+    demand_forecast.usage_stats(lookback_days=10, span=3, today=TODAY)
+    hits = usage_analytics.analytics_cache.hits
+    demand_forecast.usage_stats(lookback_days=10, span=3, today=TODAY)
+    assert usage_analytics.analytics_cache.hits == hits + 1
+
+    storage.import_transactions(pd.DataFrame({
+        'item_type': ['roll'], 'item_id': ['R3'], 'delta': [-1.0], 'note': '',
+        'timestamp': ['2026-03-09 09:00:00'],
+    }))
+    after = demand_forecast.usage_stats(lookback_days=10, span=3, today=TODAY)
+    assert 'R3' in after['item_id'].tolist()
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+import db_functions as app
+
+
+def setup_tmp_db(tmp_path):
+    app.DB_PATH = str(tmp_path / "test_inventory.db")
+    app.init_db()
+
+
+def seed_rolls():
+    df = pd.DataFrame([
+        { '제품ID': 'V-1', '두께(mm)': 0.1, '폭(cm)': 50.0, '롤 길이(m)': 100.0, '현재고(롤)': 5, '최근업데이트': '2026-01-05 00:00' },
+        { '제품ID': 'V-2', '두께(mm)': 0.2, '폭(cm)': 60.0, '롤 길이(m)': 100.0, '현재고(롤)': 7, '최근업데이트': '2026-01-05 00:00' },
+    ])
+    app.save_roll_inventory(df)
+
+
+def test_save_writes_only_changed_rows(tmp_path):
+    setup_tmp_db(tmp_path)
+    seed_rolls()
+
+    df = app.load_roll_inventory()
+    df.loc[df['제품ID'] == 'V-1', '현재고(롤)'] = 9
+
+    # 다른 작업자가 그 사이 V-2를 변경
+    app.adjust_roll_stock('V-2', -2, note='출고')
+
+    app.save_roll_inventory(df)
+    loaded = app.load_roll_inventory().set_index('제품ID')
+
+    assert int(loaded.loc['V-1', '현재고(롤)']) == 9
+    # 변경하지 않은 V-2는 다시 쓰지 않으므로 다른 작업자의 변경이 유지된다
+    assert int(loaded.loc['V-2', '현재고(롤)']) == 5
+
+
+def test_saving_filtered_view_keeps_other_rows(tmp_path):
+    setup_tmp_db(tmp_path)
+    seed_rolls()
+
+    # 필터한 프레임에도 스냅샷(attrs)이 따라가지만, 빠진 행을 삭제로 보지 않는다
+    df = app.load_roll_inventory()
+    thin = df[df['두께(mm)'] == 0.1].copy()
+    thin['현재고(롤)'] = 8
+    app.save_roll_inventory(thin)
+    app.save_roll_inventory(df.head(0))
+
+    loaded = app.load_roll_inventory().set_index('제품ID')
+    assert sorted(loaded.index) == ['V-1', 'V-2']
+    assert int(loaded.loc['V-1', '현재고(롤)']) == 8
+
+    app.delete_roll_item('V-2')
+    assert app.load_roll_inventory()['제품ID'].tolist() == ['V-1']
+
+
+def test_save_new_frame_without_snapshot_only_upserts(tmp_path):
+    setup_tmp_db(tmp_path)
+    seed_rolls()
+
+    new_data = pd.DataFrame([{ '제품ID': 'V-3', '두께(mm)': 0.3, '폭(cm)': 70.0, '롤 길이(m)': 100.0, '현재고(롤)': 1, '최근업데이트': '2026-01-05 00:00' }])
+    app.save_roll_inventory(new_data)
+
+    assert sorted(app.load_roll_inventory()['제품ID']) == ['V-1', 'V-2', 'V-3']
+
+
+def test_update_roll_item_missing_raises(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    with pytest.raises(KeyError):
+        app.update_roll_item('V-NONE', 현재고_롤=1)
+
+
+def workflow_row(work_id, status='접수'):
+    return {'작업ID': work_id, '업체명': 'A', '제품규격': 's1', '수량': 1, '단위': '장', '담당자': 'a',
+            '상태': status, '우선순위': '보통', '납기일': '2026-01-10', '메모': '', '등록일': '2026-01-05 00:00'}
+
+
+def test_workflow_registration_and_status_change_touch_single_job(tmp_path):
+    setup_tmp_db(tmp_path)
+    app.save_workflow(pd.DataFrame([workflow_row('W-1'), workflow_row('W-2')]))
+
+    # 신규 등록: 새 행만 저장해도 기존 작업은 유지된다
+    app.save_workflow(pd.DataFrame([workflow_row('W-3')]))
+    app.update_workflow_item('W-1', 상태='생산중')
+
+    app.delete_workflow_item('W-2')
+
+    loaded = app.load_workflow().set_index('작업ID')
+    assert sorted(loaded.index) == ['W-1', 'W-3']
+    assert loaded.loc['W-1', '상태'] == '생산중'
@@ -0,0 +1,99 @@
+import os
+import sys
+
+import pytest
+from google.api_core import exceptions as gexc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import firestore_bulk  # noqa: E402
+from fake_firestore import FakeFirestore  # noqa: E402
+
+
+class FlakyFirestore(FakeFirestore):
+    """처음 failures번의 커밋은 ServiceUnavailable로 실패"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def batch(self):
+        batch = super().batch()
+        commit = batch.commit
+
+        def flaky_commit():
+            with self._lock:
+                fail = self.failures > 0
+                self.failures -= 1
+            if fail:
+                raise gexc.ServiceUnavailable('try again')
+            return commit()
+
+        batch.commit = flaky_commit
+        return batch
+
+
+def set_ops(client, n):
+    return [('set', client.collection('c').document(f'D{i:05d}'), {'n': i}) for i in range(n)]
+
+
+def test_commit_ops_chunks_and_reports_results():
+    client = FakeFirestore()
+
+    results = firestore_bulk.commit_ops(client, set_ops(client, 1201), max_workers=4)
+
+    assert [r['ops'] for r in results] == [500, 500, 201]
+    assert all(r['ok'] and r['attempts'] == 1 for r in results)
+    assert client.writes == 1201
+
+
+def test_commit_ops_retries_transient_errors():
+    client = FlakyFirestore(failures=2)
+
+    results = firestore_bulk.commit_ops(client, set_ops(client, 10), backoff=0)
+
+    assert results[0]['ok'] and results[0]['attempts'] == 3
+    assert client.writes == 10
+
+
+def test_commit_ops_raises_after_retries():
+    client = FlakyFirestore(failures=100)
+
+    with pytest.raises(firestore_bulk.BulkWriteError) as info:
+        firestore_bulk.commit_ops(client, set_ops(client, 10), retries=1, backoff=0)
+
+    assert info.value.results[0]['attempts'] == 2
+    assert 'ServiceUnavailable' in info.value.results[0]['error']
+
+
+def test_commit_ops_keeps_order_when_a_document_spans_chunks():
+    client = FakeFirestore()
+    client.collection('c').document('D00000').set({'n': -1})
+    ops = [('delete', client.collection('c').document(f'D{i:05d}'), None) for i in range(600)] + set_ops(client, 600)
+
+    results = firestore_bulk.commit_ops(client, ops, max_workers=4)
+
+    assert [r['chunk'] for r in results] == [0, 1, 2]
+    assert len(client.collection('c').get()) == 600
+
+
+def test_commit_ops_stops_after_failed_chunk_when_order_matters():
+    client = FlakyFirestore(failures=100)
+    ops = [('delete', client.collection('c').document(f'D{i:05d}'), None) for i in range(600)] + set_ops(client, 600)
+
+    with pytest.raises(firestore_bulk.BulkWriteError) as info:
+        firestore_bulk.commit_ops(client, ops, retries=0, backoff=0)
+
+    assert [r['attempts'] for r in info.value.results] == [1, 0, 0]
+
+
+def test_commit_ops_with_one_worker_stops_after_failed_chunk():
+    client = FlakyFirestore(failures=1)
+    client.collection('c').document('D00000').set({'n': -1})
+    ops = [('delete', client.collection('c').document(f'D{i:05d}'), None) for i in range(600)] + set_ops(client, 600)
+
+    with pytest.raises(firestore_bulk.BulkWriteError) as info:
+        firestore_bulk.commit_ops(client, ops, max_workers=1, retries=0, backoff=0)
+
+    assert [(r['ok'], r['attempts']) for r in info.value.results] == [(False, 1), (False, 0), (False, 0)]
+    assert client.collection('c').document('D00000').get().to_dict() == {'n': -1}
@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import firebase_db  # noqa: E402
+import firestore_mirror  # noqa: E402
+from fake_firestore import FakeFirestore, installed  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '1')
+    client = FakeFirestore()
+    client.load('roll_inventory', {
+        'V-1': {'두께_mm': 0.05, '폭_cm': 100.0, '롤길이_m': 500.0, '현재고_롤': 5, '최근업데이트': ''},
+    })
+    with installed(client):
+        yield client
+    firestore_mirror.stop_all()
+
+
+def test_loads_cost_no_reads_after_initial_sync(client):
+    firebase_db.load_roll_inventory()
+    client.reset_counters()
+
+    df = firebase_db.load_roll_inventory()
+
+    assert df['제품ID'].tolist() == ['V-1']
+    assert client.reads == 0
+
+
+def test_remote_and_local_writes_reach_mirror(client):
+    firebase_db.load_roll_inventory()
+
+    # 다른 작업자의 변경 (리스너로 전달)
+    client.collection('roll_inventory').document('V-2').set({'현재고_롤': 7})
+    firebase_db.adjust_roll_stock('V-1', -2)
+
+    df = firebase_db.load_roll_inventory().set_index('제품ID')
+    assert int(df.loc['V-1', '현재고(롤)']) == 3
+    assert int(df.loc['V-2', '현재고(롤)']) == 7
+
+
+def test_disconnected_listener_falls_back_to_stream(client):
+    firebase_db.load_roll_inventory()
+    for watch in list(client._watches):
+        watch.disconnect()
+    client.reset_counters()
+
+    df = firebase_db.load_roll_inventory()
+
+    assert df['제품ID'].tolist() == ['V-1']
+    assert client.reads == 1
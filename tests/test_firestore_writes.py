@@ -0,0 +1,65 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import firebase_db  # noqa: E402
+import firestore_mirror  # noqa: E402
+from fake_firestore import FakeFirestore, installed  # noqa: E402
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+    client = FakeFirestore()
+    with installed(client):
+        yield client
+    firestore_mirror.stop_all()
+
+
+def jobs(n):
+    return pd.DataFrame([
+        {'작업ID': f'W{i:05d}', '업체명': 'A', '제품규격': 's1', '수량': 1, '단위': '장', '담당자': 'a',
+         '상태': '접수', '우선순위': '보통', '납기일': '2026-01-10', '메모': '', '등록일': '2026-01-05 00:00'}
+        for i in range(n)
+    ])
+
+
+def test_save_workflow_splits_large_saves_into_batches(client):
+    firebase_db.save_workflow(jobs(1200))
+
+    assert client.writes == 1200
+    assert client.commits == 3
+    assert len(firebase_db.load_workflow()) == 1200
+
+
+def test_workflow_status_change_is_one_write(client):
+    firebase_db.save_workflow(jobs(3))
+    client.reset_counters()
+
+    firebase_db.update_workflow_item('W00001', 상태='생산중')
+
+    assert client.counters() == {'reads': 0, 'writes': 1, 'commits': 0}
+    with pytest.raises(KeyError):
+        firebase_db.update_workflow_item('W99999', 상태='완료')
+
+
+def test_rebuild_usage_monthly_over_500_docs_keeps_every_rollup(client, tmp_path, monkeypatch):
+    monkeypatch.setenv('INVENTORY_ARCHIVE_DIR', str(tmp_path / 'archive'))
+    for i in range(1200):
+        client.collection('transactions').document(f'T{i:05d}').set(
+            {'item_type': 'roll', 'item_id': f'V-{i:04d}', 'delta': -2, 'note': '', 'timestamp': '2026-01-05 00:00:00'})
+        client.collection('usage_monthly').document(f'roll_V-{i:04d}_2026-01').set({'usage': 99})
+    client.collection('usage_monthly').document('roll_OLD_2025-01').set({'usage': 1})
+
+    # 재실행해도 같은 결과 (묶음 커밋 순서와 무관)
+    for _ in range(3):
+        firebase_db.rebuild_usage_monthly()
+
+        docs = {doc.id: doc.to_dict() for doc in client.collection('usage_monthly').stream()}
+        assert len(docs) == 1200
+        assert 'roll_OLD_2025-01' not in docs
+        assert all(d['usage'] == 2 for d in docs.values())
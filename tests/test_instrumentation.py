@@ -0,0 +1,153 @@
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import db_functions  # noqa: E402
+import fake_firestore  # noqa: E402
+import firebase_db  # noqa: E402
+import firestore_mirror  # noqa: E402
+import instrumentation  # noqa: E402
+from fake_firestore import FakeFirestore, installed  # noqa: E402
+
+# FakeFirestore에서 문서를 읽고 쓰는 메서드 (SDK는 instrumentation.firestore_targets)
+FAKE_TARGETS = [
+    (fake_firestore.Query, 'stream', 'query'),
+    (fake_firestore.DocumentReference, 'get', 'read'),
+    (fake_firestore.DocumentReference, 'set', 'write'),
+    (fake_firestore.DocumentReference, 'update', 'write'),
+    (fake_firestore.DocumentReference, 'delete', 'write'),
+    (fake_firestore.AggregationQuery, 'get', 'read'),
+    (fake_firestore.WriteBatch, 'commit', 'commit'),
+]
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    instrumentation.reset()
+    yield instrumentation
+    instrumentation.reset()
+
+
+def rolls(n):
+    return pd.DataFrame([{'제품ID': f'V-{i:04d}', '두께(mm)': 0.05, '폭(cm)': 100.0, '롤 길이(m)': 500.0,
+                          '현재고(롤)': 3, '최근업데이트': '2026-01-05 00:00'} for i in range(n)])
+
+
+def stats(backend, name):
+    return next(s for s in instrumentation.function_stats() if (s['backend'], s['function']) == (backend, name))
+
+
+def test_calls_latency_and_errors_are_recorded():
+    def load_workflow(statuses=None):
+        time.sleep(0.01)
+        if statuses == 'bad':
+            raise ValueError(statuses)
+        return pd.DataFrame({'작업ID': ['W-1', 'W-2']})
+
+    namespace = {'load_workflow': load_workflow, '_helper': load_workflow}
+    instrumentation.instrument_module(namespace, 'test', count_rows=True)
+    assert namespace['_helper'] is load_workflow
+
+    namespace['load_workflow']()
+    with pytest.raises(ValueError):
+        namespace['load_workflow']('bad')
+
+    s = stats('test', 'load_workflow')
+    assert (s['calls'], s['errors'], s['reads']) == (2, 1, 2)
+    assert s['seconds'] >= 0.02
+    assert sum(s['buckets']) == 2 and s['buckets'][0] == 0
+
+
+def test_nested_calls_count_once_per_page():
+    namespace = {}
+
+    def load_roll_inventory():
+        instrumentation.count(reads=3)
+        return None
+
+    def find_rolls_by_spec(thickness=None, width=None, length=None):
+        namespace['load_roll_inventory']()
+        instrumentation.count(reads=1)
+
+    namespace.update(load_roll_inventory=load_roll_inventory, find_rolls_by_spec=find_rolls_by_spec)
+    instrumentation.instrument_module(namespace, 'test')
+
+    instrumentation.begin_rerun()
+    instrumentation.set_page('롤 재고 현황 보기')
+    namespace['find_rolls_by_spec']()
+    instrumentation.count(reads=2)   # 데이터 함수 밖의 읽기도 페이지로 간다
+    rerun = instrumentation.end_rerun()
+
+    assert stats('test', 'find_rolls_by_spec')['reads'] == 4
+    assert stats('test', 'load_roll_inventory')['reads'] == 3
+    assert (rerun['calls'], rerun['reads']) == (1, 6)
+    assert list(rerun['functions']) == ['find_rolls_by_spec']
+    page = instrumentation.page_stats()['롤 재고 현황 보기']
+    assert (page['reruns'], page['calls'], page['reads']) == (1, 1, 6)
+    assert instrumentation.recent_reruns() == [rerun]
+
+
+def test_firestore_reads_and_writes_match_billing(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+    instrumentation.install_firestore_hooks(FAKE_TARGETS)
+    client = FakeFirestore()
+    try:
+        with installed(client):
+            instrumentation.begin_rerun('신규 롤 규격 등록')
+            # 500건이 넘으면 firestore_bulk가 작업 스레드에서 묶음을 동시에 커밋한다
+            firebase_db.save_roll_inventory(rolls(1200))
+            firebase_db.adjust_roll_stock('V-0001', -1, note='출고')
+            saved = instrumentation.end_rerun()
+
+            instrumentation.begin_rerun('롤 재고 현황 보기')
+            firebase_db.load_roll_inventory()
+            firebase_db.load_inventory_page('roll', limit=50)
+            viewed = instrumentation.end_rerun()
+
+        assert saved['writes'] + viewed['writes'] == client.writes
+        assert saved['reads'] + viewed['reads'] == client.reads
+        assert saved['writes'] >= 1200 and viewed['writes'] == 0
+        assert stats('firestore', 'load_roll_inventory')['reads'] == 1200
+        assert stats('firestore', 'load_inventory_page')['reads'] == 50
+    finally:
+        firestore_mirror.stop_all()
+
+
+def test_sqlite_rows_read_and_written(tmp_path):
+    db_functions.DB_PATH = str(tmp_path / "test_inventory.db")
+    db_functions.init_db()
+
+    db_functions.save_roll_inventory(rolls(5))
+    db_functions.update_roll_item('V-0001', 현재고_롤=9)
+    loaded = db_functions.load_roll_inventory()
+
+    assert len(loaded) == 5
+    assert stats('sqlite', 'save_roll_inventory')['writes'] == 5
+    assert stats('sqlite', 'update_roll_item')['writes'] == 1
+    assert stats('sqlite', 'load_roll_inventory')['reads'] == 5
+
+
+def test_prometheus_and_json_export(tmp_path):
+    namespace = {'load_cut_inventory': lambda: pd.DataFrame({'재단ID': ['C-1']})}
+    instrumentation.instrument_module(namespace, 'test', count_rows=True)
+    instrumentation.begin_rerun('재단 "재고"')
+    namespace['load_cut_inventory']()
+    instrumentation.end_rerun()
+
+    text = instrumentation.prometheus_text()
+    assert '# TYPE inventory_data_call_seconds histogram' in text
+    assert 'inventory_data_call_seconds_bucket{backend="test",function="load_cut_inventory",le="+Inf"} 1' in text
+    assert 'inventory_page_reads_total{page="재단 \\"재고\\""} 1' in text
+
+    path = str(tmp_path / 'metrics.json')
+    instrumentation.write_metrics(path)
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert saved['pages']['재단 "재고"']['reruns'] == 1
+    assert len(saved['functions'][0]['buckets']) == len(instrumentation.LATENCY_BUCKETS) + 1
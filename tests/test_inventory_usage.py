@@ -0,0 +1,78 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import db_functions as app
+
+
+def setup_tmp_db(tmp_path):
+    app.DB_PATH = str(tmp_path / "test_inventory.db")
+    app.init_db()
+
+
+def test_monthly_usage_bulk_groups_by_item(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    app.record_roll_transaction('V-A', -3, note='출고')
+    app.record_roll_transaction('V-A', -2, note='출고')
+    app.record_roll_transaction('V-A', 5, note='입고')
+    app.record_roll_transaction('V-B', -1, note='출고')
+    app.record_cut_transaction('C-A', -4, note='출고')
+
+    usage = app.get_monthly_usage_bulk('roll')
+
+    assert usage == {'V-A': pytest.approx(5.0), 'V-B': pytest.approx(1.0)}
+    assert app.get_monthly_usage_bulk('cut') == {'C-A': pytest.approx(4.0)}
+    # 단건 조회와 결과가 같아야 한다
+    assert app.get_monthly_usage_roll('V-A') == pytest.approx(usage['V-A'])
+
+
+def test_monthly_usage_bulk_other_month_empty(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    app.record_roll_transaction('V-A', -3, note='출고')
+
+    assert app.get_monthly_usage_bulk('roll', year=2000, month=1) == {}
+
+
+def test_usage_rollup_matches_rebuild(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    app.record_roll_transaction('V-A', -3, note='출고')
+    app.record_roll_transaction('V-A', 4, note='입고')
+    app.record_cut_transaction('C-A', -2, note='출고')
+    app.log_raw_material_transaction('LDPE', '530', -25.0, '출고', '2026-01-05')
+
+    before = (app.get_monthly_usage_bulk('roll'), app.get_monthly_usage_bulk('cut'),
+              app.get_monthly_usage_bulk('raw', year=2026, month=1))
+    assert before == ({'V-A': 3.0}, {'C-A': 2.0}, {'LDPE_530': 25.0})
+
+    app.rebuild_usage_monthly()
+
+    after = (app.get_monthly_usage_bulk('roll'), app.get_monthly_usage_bulk('cut'),
+             app.get_monthly_usage_bulk('raw', year=2026, month=1))
+    assert after == before
+
+
+def test_raw_materials_roundtrip(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    df = pd.DataFrame([{'품명': 'LDPE', 'Grade': '530', '현재고_kg': 100.0, '입고일': '2026-01-05', '비고': ''}])
+    app.save_raw_materials(df)
+    loaded = app.load_raw_materials()
+
+    assert len(loaded) == 1
+    assert loaded.loc[0, '품명'] == 'LDPE'
+    assert float(loaded.loc[0, '현재고_kg']) == pytest.approx(100.0)
+
+
+def test_usage_between_reads_ledger_range(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    app.record_roll_transaction('V-A', -3, note='출고')
+    app.record_roll_transaction('V-A', 2, note='입고')
+
+    start, end = app._month_range()
+    assert app.get_usage_between('roll', 'V-A', start, end) == pytest.approx(3.0)
+    assert app.get_usage_between('roll', 'V-A', datetime(2000, 1, 1), datetime(2000, 2, 1)) == 0.0
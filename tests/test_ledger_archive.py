@@ -0,0 +1,123 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import db_functions  # noqa: E402
+import firebase_db  # noqa: E402
+import firestore_mirror  # noqa: E402
+import ledger_archive  # noqa: E402
+import memory_db  # noqa: E402
+import storage  # noqa: E402
+from fake_firestore import FakeFirestore, installed  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def archive_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv('INVENTORY_ARCHIVE_DIR', str(tmp_path / 'archive'))
+    return tmp_path / 'archive'
+
+
+def ledger():
+    return pd.DataFrame({
+        'item_type': 'roll', 'item_id': 'R1', 'note': '',
+        'delta': [-2.0, -3.0, 4.0, -1.0],
+        'timestamp': ['2024-01-05 09:00:00', '2024-01-20 10:00:00', '2024-02-01 08:00:00', '2026-03-01 12:00:00'],
+    })
+
+
+def test_cutoff_is_start_of_month():
+    assert ledger_archive.cutoff(datetime(2026, 3, 15, 10), months=12) == datetime(2025, 3, 1)
+    assert ledger_archive.cutoff(datetime(2026, 1, 2), months=1) == datetime(2025, 12, 1)
+
+
+def test_archive_moves_old_rows_and_reads_stay_transparent(backend, archive_dir):
+    backend.import_transactions(ledger())
+
+    result = ledger_archive.archive_ledgers(before=datetime(2025, 1, 1))
+
+    assert result['transactions'] == 3
+    assert sorted(os.listdir(archive_dir / 'transactions')) == ['2024-01.parquet', '2024-02.parquet']
+    assert backend.load_ledger('transactions')['timestamp'].tolist() == ['2026-03-01 12:00:00']
+    assert backend.get_usage_between('roll', 'R1', datetime(2024, 1, 1), datetime(2024, 2, 1)) == 5.0
+    assert backend.get_usage_between('roll', 'R1', datetime(2024, 1, 10), datetime(2026, 4, 1)) == 4.0
+    assert len(ledger_archive.load_history('transactions')) == 4
+
+    backend.rebuild_usage_monthly()
+    assert backend.get_monthly_usage_roll('R1', 2024, 1) == 5.0
+    assert backend.get_monthly_usage_roll('R1', 2026, 3) == 1.0
+
+    # 다시 실행해도 보관 대상이 없고 중복도 생기지 않는다
+    assert ledger_archive.archive_ledgers(before=datetime(2025, 1, 1), snapshot=False)['transactions'] == 0
+    assert len(ledger_archive.read_archive('transactions')) == 3
+
+
+def test_raw_ledger_is_archived(backend, archive_dir):
+    backend.save_raw_materials(pd.DataFrame([{'품명': 'PE', 'Grade': 'A', '현재고_kg': 100.0, '입고일': '', '비고': ''}]))
+    backend.adjust_raw_material_stock('PE', 'A', -30, '출고', '2026-01-10')
+
+    result = ledger_archive.archive_ledgers(before=datetime.now() + timedelta(days=1), snapshot=False)
+
+    assert result['raw_material_transactions'] == 1
+    assert backend.load_ledger('raw_material_transactions').empty
+    backend.rebuild_usage_monthly()
+    assert backend.get_monthly_usage_bulk('raw', 2026, 1) == {'PE_A': 30.0}
+
+
+def test_stock_at_is_snapshot_plus_newer_deltas(backend):
+    backend.save_roll_inventory(pd.DataFrame([{'제품ID': 'R1', '두께(mm)': 0.05, '폭(cm)': 100.0,
+                                               '롤 길이(m)': 500.0, '현재고(롤)': 10, '최근업데이트': ''}]))
+    backend.adjust_roll_stock('R1', -3)
+    taken_at = backend.take_stock_snapshot()
+    backend.adjust_roll_stock('R1', 5)
+
+    snapshot = backend.load_stock_snapshot()
+    assert snapshot['taken_at'].unique().tolist() == [taken_at]
+    assert snapshot.set_index('item_id')['stock'].to_dict() == {'R1': 7.0}
+
+    later = datetime.now() + timedelta(seconds=2)
+    assert ledger_archive.stock_at('roll', 'R1', later) == 12.0
+    # 스냅샷이 없는 과거 시점은 현재고에서 이후 거래를 빼서 계산
+    assert ledger_archive.stock_at('roll', 'R1', datetime(2020, 1, 1)) == 10.0
+
+
+def test_stock_at_counts_writes_stamped_before_but_committed_after_snapshot(backend):
+    backend.save_roll_inventory(pd.DataFrame([{'제품ID': 'R1', '두께(mm)': 0.05, '폭(cm)': 100.0,
+                                               '롤 길이(m)': 500.0, '현재고(롤)': 10, '최근업데이트': ''}]))
+    taken_at = backend.take_stock_snapshot()
+    backend.adjust_roll_stock('R1', 5)
+
+    # 쓰기 잠금을 기다리는 동안 taken_at보다 먼저 시각을 찍은 거래
+    stamp = datetime.strptime(taken_at, ledger_archive.TIMESTAMP_FORMAT) - timedelta(seconds=3)
+    if backend is db_functions:
+        with db_functions.transaction() as conn:
+            conn.execute("UPDATE transactions SET timestamp = ? WHERE id = (SELECT MAX(id) FROM transactions)",
+                         (stamp.strftime(ledger_archive.TIMESTAMP_FORMAT),))
+    else:
+        memory_db._transactions[-1]['timestamp'] = stamp
+
+    assert ledger_archive.stock_at('roll', 'R1', datetime.now() + timedelta(seconds=2)) == 15.0
+
+
+def test_firestore_archive_and_usage(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+    monkeypatch.setenv('INVENTORY_BACKEND', 'firestore')
+    client = FakeFirestore()
+    try:
+        with installed(client):
+            storage.get_backend()
+            storage.clear_cache()
+            firebase_db.import_transactions(ledger())
+
+            result = ledger_archive.archive_ledgers(before=datetime(2025, 1, 1))
+
+            assert result['transactions'] == 3
+            assert len(list(client.collection('transactions').stream())) == 1
+            assert firebase_db.get_usage_between('roll', 'R1', datetime(2024, 1, 1), datetime(2026, 4, 1)) == 6.0
+            assert firebase_db.oldest_ledger_time('transactions') == datetime(2026, 3, 1, 12)
+    finally:
+        firestore_mirror.stop_all()
@@ -0,0 +1,191 @@
+import itertools
+import json
+import os
+import sys
+
+import pandas as pd
+import pytest
+from google.api_core import exceptions as gexc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import fake_firestore  # noqa: E402
+import firebase_db  # noqa: E402
+import firestore_mirror  # noqa: E402
+import memory_db  # noqa: E402
+import paging  # noqa: E402
+import storage  # noqa: E402
+from fake_firestore import FakeFirestore, installed  # noqa: E402
+
+
+def rolls(n):
+    return pd.DataFrame([{'제품ID': f'R{i:03d}', '두께(mm)': [0.05, 0.1][i % 2], '폭(cm)': 100.0,
+                          '롤 길이(m)': 500.0, '현재고(롤)': i % 4, '최근업데이트': ''} for i in range(n)])
+
+
+def read_all(load, kind, sort_by, descending, filters=None, limit=4):
+    """커서를 따라 끝까지 읽은 품목 ID 목록"""
+    ids, after = [], None
+    while True:
+        page = load(kind, sort_by, descending, filters, limit, after)
+        assert len(page) <= limit
+        ids += [paging.item_id(kind, row) for _, row in page.iterrows()]
+        after = paging.next_cursor(kind, page, sort_by, limit)
+        if after is None:
+            return ids
+
+
+def expected(df, sort_by, descending):
+    ordered = df.sort_values([sort_by, '제품ID'], ascending=not descending)
+    return ordered['제품ID'].tolist()
+
+
+@pytest.fixture
+def backend(backend):
+    storage.save_roll_inventory(rolls(10))
+    return storage
+
+
+@pytest.mark.parametrize('sort_by, descending', [('제품ID', False), ('현재고(롤)', False), ('현재고(롤)', True)])
+def test_keyset_pages_cover_sorted_list(backend, sort_by, descending):
+    ids = read_all(backend.load_inventory_page, 'roll', sort_by, descending)
+
+    assert ids == expected(rolls(10), sort_by, descending)
+
+
+def test_filter_and_summary(backend):
+    filters = {'두께(mm)': 0.1}
+    ids = read_all(backend.load_inventory_page, 'roll', '현재고(롤)', True, filters)
+
+    thin = rolls(10)[rolls(10)['두께(mm)'] == 0.1]
+    assert ids == expected(thin, '현재고(롤)', True)
+    assert backend.inventory_summary('roll', filters) == {'count': 5, 'total': float(thin['현재고(롤)'].sum())}
+    assert backend.inventory_summary('roll') == {'count': 10, 'total': 13.0}
+
+
+def test_page_cache_invalidated_by_writes(backend):
+    first = backend.load_inventory_page('roll', limit=3)
+    backend.update_roll_item('R000', 현재고_롤=9)
+
+    assert backend.load_inventory_page('roll', limit=3)['현재고(롤)'].tolist()[0] == 9
+    assert first['현재고(롤)'].tolist()[0] == 0
+    assert backend.inventory_summary('roll')['total'] == 22.0
+
+
+def test_raw_pages_use_name_grade_key(backend):
+    backend.save_raw_materials(pd.DataFrame([
+        {'품명': 'PE', 'Grade': g, '현재고_kg': 10.0, '입고일': '2026-01-01', '비고': ''} for g in 'CAB'
+    ]))
+
+    assert read_all(backend.load_inventory_page, 'raw', '현재고_kg', False, limit=2) == ['PE_A', 'PE_B', 'PE_C']
+
+
+def test_unknown_sort_column_rejected(backend):
+    with pytest.raises(ValueError):
+        backend.load_inventory_page('roll', sort_by='최근업데이트')
+
+
+def test_firestore_pages_read_only_visible_docs(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+    client = FakeFirestore()
+    try:
+        with installed(client):
+            firebase_db.save_roll_inventory(rolls(10))
+
+            assert read_all(firebase_db.load_inventory_page, 'roll', '현재고(롤)', True) == \
+                expected(rolls(10), '현재고(롤)', True)
+            assert read_all(firebase_db.load_inventory_page, 'roll', '현재고(롤)', False, {'두께(mm)': 0.05}) == \
+                expected(rolls(10)[rolls(10)['두께(mm)'] == 0.05], '현재고(롤)', False)
+
+            client.reset_counters()
+            page = firebase_db.load_inventory_page('roll', '현재고(롤)', limit=4)
+            summary = firebase_db.inventory_summary('roll')
+            assert len(page) == 4
+            assert summary == {'count': 10, 'total': 13.0}
+            # 한 페이지(4건) + 집계 쿼리(1건)
+            assert client.reads == 5
+    finally:
+        firestore_mirror.stop_all()
+
+
+def test_reorder_alerts_and_pickers_cover_items_beyond_the_page(monkeypatch):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.setenv('INVENTORY_BACKEND', 'memory')
+    memory_db.reset()
+    storage.clear_cache()
+    df = rolls(paging.DEFAULT_PAGE_SIZE + 10)
+    last = df['제품ID'].iloc[-1]
+    df.loc[df.index[-1], '현재고(롤)'] = 0
+    storage.save_roll_inventory(df)
+    storage.set_reorder_level('roll', last, 2)
+
+    at = AppTest.from_file(os.path.join(os.path.dirname(__file__), '..', 'inventory_app.py'), default_timeout=60)
+    at.session_state['authenticated'] = True
+    at.run()
+
+    assert not at.exception
+    assert [w.value for w in at.warning] == [f"재주문 필요: [{last}] 현재 0 ≤ 임계값 2"]
+    pickers = [s for s in at.selectbox if s.label in ('편집할 제품 선택', '제품 선택')]
+    assert [len(s.options) for s in pickers] == [len(df), len(df)]
+
+
+def test_filtered_sorts_are_limited_to_indexed_columns(backend):
+    assert paging.sort_columns('roll', filtered=True) == ['제품ID', '현재고(롤)']
+    with pytest.raises(ValueError):
+        backend.load_inventory_page('roll', '폭(cm)', filters={'두께(mm)': 0.1})
+    with pytest.raises(ValueError):
+        backend.load_inventory_page('cut', '가로(cm)', filters={'업체명': 'A'})
+
+
+def test_firestore_indexes_cover_every_filtered_sort():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(root, 'firestore.indexes.json'), encoding='utf-8') as f:
+        declared = {(i['collectionGroup'], tuple((x['fieldPath'], x['order']) for x in i['fields']))
+                    for i in json.load(f)['indexes']}
+
+    missing = []
+    for kind, spec in paging.PAGE_KINDS.items():
+        collection = firebase_db.TABLES[kind][0]
+        for subset in [c for n in (1, 2) for c in itertools.combinations(spec['filters'], n)]:
+            filters = dict.fromkeys(subset)
+            for sort_by in spec['filtered_sort']:
+                for direction in ('ASCENDING', 'DESCENDING'):
+                    order = firebase_db._page_order(kind, sort_by, filters)
+                    if order == ['__name__'] and direction == 'ASCENDING':
+                        continue   # 일치 조건 + 문서 ID 오름차순은 단일 필드 색인으로 처리
+                    fields = tuple((firebase_db.PAGE_FIELDS[kind][c], 'ASCENDING') for c in subset)
+                    fields += tuple((field, direction) for field in order)
+                    if (collection, fields) not in declared:
+                        missing.append((collection, fields))
+    assert missing == []
+
+
+def test_firestore_raw_pages_filtered_by_name(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+    client = FakeFirestore()
+    try:
+        with installed(client):
+            firebase_db.save_raw_materials(pd.DataFrame([
+                {'품명': name, 'Grade': g, '현재고_kg': 10.0, '입고일': '', '비고': ''} for name in ('PE', 'PP') for g in 'CAB'
+            ]))
+
+            assert read_all(firebase_db.load_inventory_page, 'raw', '품명', True, {'품명': 'PE'}, limit=2) == \
+                ['PE_C', 'PE_B', 'PE_A']
+    finally:
+        firestore_mirror.stop_all()
+
+
+def test_firestore_query_errors_are_raised(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+
+    def missing_index(self):
+        raise gexc.FailedPrecondition('The query requires an index')
+
+    monkeypatch.setattr(fake_firestore.Query, 'stream', missing_index)
+    try:
+        with installed(FakeFirestore()):
+            with pytest.raises(gexc.FailedPrecondition):
+                firebase_db.load_inventory_page('roll', '현재고(롤)', filters={'두께(mm)': 0.05})
+    finally:
+        firestore_mirror.stop_all()
@@ -0,0 +1,49 @@
+import pandas as pd
+
+import db_functions as app
+from reorder_alerts import find_reorder_alerts
+
+
+def setup_tmp_db(tmp_path):
+    app.DB_PATH = str(tmp_path / "test_inventory.db")
+    app.init_db()
+
+
+def test_load_reorder_levels_by_type(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    app.set_reorder_level('roll', 'V-A', 3)
+    app.set_reorder_level('roll', 'V-B', 1)
+    app.set_reorder_level('cut', 'C-A', 10)
+
+    assert app.load_reorder_levels('roll') == {'V-A': 3.0, 'V-B': 1.0}
+    assert app.load_reorder_levels('cut') == {'C-A': 10.0}
+
+
+def test_find_reorder_alerts_vectorized():
+    df = pd.DataFrame([
+        {'제품ID': 'V-A', '현재고(롤)': 2},
+        {'제품ID': 'V-B', '현재고(롤)': 5},
+        {'제품ID': 'V-C', '현재고(롤)': 0},
+    ])
+
+    alerts = find_reorder_alerts(df, {'V-A': 3.0, 'V-B': 5.0, 'V-X': 9.0}, '제품ID', '현재고(롤)')
+
+    # 임계값이 없는 V-C, 재고에 없는 V-X는 제외
+    assert alerts['제품ID'].tolist() == ['V-A', 'V-B']
+    assert alerts['임계값'].tolist() == [3.0, 5.0]
+
+
+def test_find_reorder_alerts_empty():
+    df = pd.DataFrame(columns=['재단ID', '현재고(장)'])
+
+    assert find_reorder_alerts(df, {'C-A': 1.0}, '재단ID', '현재고(장)').empty
+
+
+def test_load_reorder_levels_filtered_by_ids(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    app.set_reorder_level('roll', 'V-A', 3)
+    app.set_reorder_level('roll', 'V-B', 1)
+
+    assert app.load_reorder_levels('roll', ['V-B', 'V-Z']) == {'V-B': 1.0}
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import spec_index
+import storage
+
+
+def rolls(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        '제품ID': [f'V-{i:04d}' for i in range(n)],
+        '두께(mm)': rng.choice([0.03, 0.05, 0.08, 0.1], n),
+        '폭(cm)': rng.integers(50, 150, n).astype(float),
+        '롤 길이(m)': rng.choice([200.0, 500.0, 1000.0], n),
+        '현재고(롤)': rng.integers(0, 20, n),
+        '최근업데이트': '',
+    })
+
+
+def brute_force(df, thickness=None, width=None, length=None):
+    mask = pd.Series(True, index=df.index)
+    for col, bounds in (('두께(mm)', thickness), ('폭(cm)', width), ('롤 길이(m)', length)):
+        low, high = bounds or (None, None)
+        if low is not None:
+            mask &= df[col] >= low
+        if high is not None:
+            mask &= df[col] <= high
+    return sorted(df.loc[mask, '제품ID'])
+
+
+@pytest.mark.parametrize('thickness, width, length', [
+    ((0.05, 0.05), (90, 110), None),
+    (spec_index.spec_range(0.08, 0.03), None, (500, None)),
+    (None, (None, 60), (200, 200)),
+    ((0.5, 1.0), None, None),
+    (None, None, None),
+])
+def test_index_matches_brute_force(thickness, width, length):
+    df = rolls()
+    found = spec_index.SpecIndex(df).query(thickness, width, length)
+
+    assert sorted(found['제품ID']) == brute_force(df, thickness, width, length)
+    assert found[spec_index.SPEC_COLUMNS].equals(found.sort_values(spec_index.SPEC_COLUMNS)[spec_index.SPEC_COLUMNS])
+
+
+@pytest.fixture
+def backend(backend):
+    storage.save_roll_inventory(rolls())
+    return storage
+
+
+def test_find_rolls_on_each_backend(backend):
+    found = spec_index.find_rolls((0.05, 0.05), (90, 110))
+
+    df = rolls()
+    expected = df[df['제품ID'].isin(brute_force(df, (0.05, 0.05), (90, 110)))]
+    assert list(found['제품ID']) == expected.sort_values(spec_index.SPEC_COLUMNS + ['제품ID'])['제품ID'].tolist()
+    assert list(found.columns) == list(df.columns)
+
+
+def test_find_rolls_sees_writes(backend):
+    assert spec_index.find_rolls((0.07, 0.07)).empty
+
+    backend.update_roll_item('V-0000', 두께_mm=0.07)
+
+    assert spec_index.find_rolls((0.07, 0.07))['제품ID'].tolist() == ['V-0000']
@@ -0,0 +1,118 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import firebase_config
+import startup_profile
+
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _json
+import time:       900 |       1020 | json
+import time:        50 |         50 |     pkg.inner
+import time:       300 |        350 |   pkg.sub
+import time:      2000 |       2350 | pkg
+"""
+
+
+def test_parse_importtime_keeps_top_level_modules():
+    assert startup_profile.parse_importtime(SAMPLE) == {'json': 1.02, 'pkg': 2.35}
+
+
+def test_import_times_runs_in_fresh_process():
+    times = startup_profile.import_times(['json', 'paging'])
+
+    assert set(times) == {'json', 'paging'}
+    assert times['paging'] > 0
+
+
+def test_record_keeps_cold_start_value(monkeypatch):
+    monkeypatch.setattr(startup_profile, '_phases', {})
+    startup_profile.record('first_paint', 0.5)
+    startup_profile.record('first_paint', 0.1)
+
+    assert startup_profile.report() == {'first_paint': 500.0}
+
+
+@pytest.fixture
+def fresh_firebase(monkeypatch):
+    for name, value in (('_db', None), ('_initialized', False), ('_init_error', None), ('_warmup_thread', None)):
+        monkeypatch.setattr(firebase_config, name, value)
+    return firebase_config
+
+
+def test_concurrent_sessions_share_one_client(fresh_firebase, monkeypatch, tmp_path):
+    created = []
+
+    def client():
+        time.sleep(0.05)
+        created.append(object())
+        return created[-1]
+
+    fake_admin = SimpleNamespace(
+        credentials=SimpleNamespace(Certificate=lambda path: path),
+        firestore=SimpleNamespace(client=client),
+        get_app=lambda: None,
+    )
+    monkeypatch.setitem(sys.modules, 'firebase_admin', fake_admin)
+    monkeypatch.setitem(sys.modules, 'firebase_admin.credentials', fake_admin.credentials)
+    monkeypatch.setitem(sys.modules, 'firebase_admin.firestore', fake_admin.firestore)
+    cred_path = tmp_path / 'cred.json'
+    cred_path.write_text('{}')
+    monkeypatch.setenv('FIREBASE_CREDENTIALS_PATH', str(cred_path))
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fresh_firebase.get_firestore_client()))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(created) == 1
+    assert all(r is created[0] for r in results)
+    assert fresh_firebase.firebase_status() == 'connected'
+
+
+def test_warmup_runs_once_in_background(fresh_firebase, monkeypatch, tmp_path):
+    monkeypatch.setenv('FIREBASE_CREDENTIALS_PATH', str(tmp_path / 'missing.json'))
+    calls = []
+
+    first = fresh_firebase.start_warmup(lambda: calls.append(threading.current_thread().name))
+    second = fresh_firebase.start_warmup(lambda: calls.append('again'))
+    first.join(5)
+
+    assert first is second
+    assert calls == ['firebase-warmup']
+    assert fresh_firebase.firebase_status() == 'offline'
+    assert 'firebase_warmup' in startup_profile.report()
+
+
+APP_IMPORT_CHECK = """
+import sys
+import firebase_config
+firebase_config.start_warmup = lambda *preload: None
+from streamlit.testing.v1 import AppTest
+import storage
+at = AppTest.from_file({path!r}, default_timeout=60).run()
+assert not at.exception, at.exception
+print('firebase_db' in sys.modules, storage._backend is None)
+"""
+
+
+def test_app_first_paint_does_not_import_backend(tmp_path):
+    # 백그라운드 준비를 끈 상태에서 로그인 화면까지 그려도 저장소 모듈은 import되지 않아야 한다
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, '-c', APP_IMPORT_CHECK.format(path=os.path.join(root, 'inventory_app.py'))],
+        capture_output=True, text=True, cwd=root, timeout=120,
+        env={**os.environ, 'INVENTORY_BACKEND': 'firestore', 'INVENTORY_AUTH_CACHE': str(tmp_path / 'auth.json')},
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ['False', 'True']
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+import db_functions as app
+
+
+def setup_tmp_db(tmp_path):
+    app.DB_PATH = str(tmp_path / "test_inventory.db")
+    app.init_db()
+
+
+def test_adjust_roll_stock_records_ledger(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    df = pd.DataFrame([{ '제품ID': 'V-ADJ', '두께(mm)': 0.2, '폭(cm)': 50.0, '롤 길이(m)': 100.0, '현재고(롤)': 5, '최근업데이트': '2026-01-05 00:00' }])
+    app.save_roll_inventory(df)
+
+    assert app.adjust_roll_stock('V-ADJ', 3, note='입고') == 8
+    assert app.adjust_roll_stock('V-ADJ', -6, note='출고') == 2
+
+    loaded = app.load_roll_inventory()
+    assert int(loaded.loc[0, '현재고(롤)']) == 2
+    assert app.get_monthly_usage_roll('V-ADJ') == pytest.approx(6.0)
+
+
+def test_adjust_roll_stock_rejects_negative(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    df = pd.DataFrame([{ '제품ID': 'V-ADJ', '두께(mm)': 0.2, '폭(cm)': 50.0, '롤 길이(m)': 100.0, '현재고(롤)': 1, '최근업데이트': '2026-01-05 00:00' }])
+    app.save_roll_inventory(df)
+
+    with pytest.raises(ValueError):
+        app.adjust_roll_stock('V-ADJ', -2, note='출고')
+
+    # 재고와 사용량 모두 변경되지 않아야 한다
+    assert int(app.load_roll_inventory().loc[0, '현재고(롤)']) == 1
+    assert app.get_monthly_usage_roll('V-ADJ') == 0.0
+
+
+def test_adjust_cut_stock_unknown_item(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    with pytest.raises(KeyError):
+        app.adjust_cut_stock('C-NONE', 1)
+
+
+def test_adjust_raw_material_stock(tmp_path):
+    setup_tmp_db(tmp_path)
+
+    df = pd.DataFrame([{'품명': 'LDPE', 'Grade': '530', '현재고_kg': 100.0, '입고일': '2026-01-05', '비고': ''}])
+    app.save_raw_materials(df)
+
+    assert app.adjust_raw_material_stock('LDPE', '530', -40.0, '출고', '2026-01-06') == pytest.approx(60.0)
+    with pytest.raises(ValueError):
+        app.adjust_raw_material_stock('LDPE', '530', -61.0, '출고', '2026-01-06')
+
+    assert app.get_monthly_usage_bulk('raw', year=2026, month=1) == {'LDPE_530': 40.0}
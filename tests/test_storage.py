@@ -0,0 +1,86 @@
+import pandas as pd
+import pytest
+
+import db_functions
+import memory_db
+import storage
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def backend(request, tmp_path):
+    if request.param == 'sqlite':
+        db_functions.DB_PATH = str(tmp_path / "test_inventory.db")
+        db_functions.init_db()
+        return db_functions
+    memory_db.reset()
+    return memory_db
+
+
+def test_backends_implement_protocol():
+    for module in (db_functions, memory_db):
+        missing = [name for name in storage.API if not callable(getattr(module, name, None))]
+        assert missing == []
+
+
+def test_get_backend_from_env(monkeypatch):
+    monkeypatch.setenv('INVENTORY_BACKEND', 'memory')
+    assert storage.get_backend() is memory_db
+    assert storage.get_function('load_roll_inventory').__wrapped__ is memory_db.load_roll_inventory
+
+    monkeypatch.setenv('INVENTORY_BACKEND', 'oracle')
+    with pytest.raises(ValueError):
+        storage.backend_name()
+
+
+def test_roll_roundtrip_and_adjust(backend):
+    df = pd.DataFrame([{'제품ID': 'V-1', '두께(mm)': 0.05, '폭(cm)': 100, '롤 길이(m)': 500,
+                        '현재고(롤)': 5, '최근업데이트': '2026-01-01 09:00'}])
+    backend.save_roll_inventory(df)
+
+    assert backend.adjust_roll_stock('V-1', -2, note='출고') == 3
+    with pytest.raises(ValueError):
+        backend.adjust_roll_stock('V-1', -10)
+    with pytest.raises(KeyError):
+        backend.adjust_roll_stock('V-404', 1)
+
+    loaded = backend.load_roll_inventory()
+    assert int(loaded.loc[0, '현재고(롤)']) == 3
+    assert backend.get_monthly_usage_bulk('roll') == {'V-1': 2.0}
+
+
+def test_cut_update_accepts_display_and_db_names(backend):
+    df = pd.DataFrame([{'재단ID': 'C-1', '업체명': 'A', '가로(cm)': 10, '세로(cm)': 20,
+                        '두께(mm)': 0.1, '현재고(장)': 100, '최근업데이트': ''}])
+    backend.save_cut_inventory(df)
+
+    backend.update_cut_item('C-1', **{'가로(cm)': 15, '현재고_장': 80})
+
+    row = backend.load_cut_inventory().iloc[0]
+    assert float(row['가로(cm)']) == 15
+    assert int(row['현재고(장)']) == 80
+
+
+def test_reorder_levels_keyed_by_type(backend):
+    backend.set_reorder_level('roll', 'X-1', 3)
+    backend.set_reorder_level('cut', 'X-1', 50)
+
+    assert backend.load_reorder_levels('roll') == {'X-1': 3.0}
+    assert backend.load_reorder_levels('cut', ['X-1']) == {'X-1': 50.0}
+
+
+def test_workflow_update_and_delete_single_job(backend):
+    df = pd.DataFrame([
+        {'작업ID': f'W-{i}', '업체명': 'A', '제품규격': '0.05x100', '수량': 10, '단위': '롤', '담당자': '김',
+         '상태': '대기', '우선순위': '보통', '납기일': '2026-02-01', '메모': '', '등록일': '2026-01-01'}
+        for i in range(2)
+    ])
+    backend.save_workflow(df)
+
+    backend.update_workflow_item('W-0', 상태='진행중')
+    backend.delete_workflow_item('W-1')
+    with pytest.raises(KeyError):
+        backend.update_workflow_item('W-9', 상태='완료')
+
+    loaded = backend.load_workflow()
+    assert loaded['작업ID'].tolist() == ['W-0']
+    assert loaded.loc[0, '상태'] == '진행중'
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+import memory_db
+import storage
+import usage_analytics
+
+
+@pytest.fixture
+def ledger(tmp_path, monkeypatch):
+    monkeypatch.setenv('INVENTORY_BACKEND', 'memory')
+    monkeypatch.setenv('INVENTORY_ARCHIVE_DIR', str(tmp_path / 'archive'))
+    memory_db.reset()
+    storage.clear_cache()
+    storage.get_backend()
+    storage.import_transactions(pd.DataFrame({
+        'item_type': ['roll', 'roll', 'roll', 'cut', 'roll'],
+        'item_id': ['R1', 'R1', 'R2', 'C1', 'R1'],
+        'delta': [-2.0, -3.0, -4.0, -1.0, 10.0],
+        'note': '',
+        'timestamp': ['2025-12-30 09:00:00', '2026-01-02 10:00:00', '2026-01-20 08:00:00',
+                      '2026-01-21 08:00:00', '2026-01-22 08:00:00'],
+    }))
+    storage.log_raw_material_transaction('PE', 'A', -7.0, '출고', '2026-01-15')
+
+
+def test_ledger_frame_is_columnar(ledger):
+    frame = usage_analytics.build_ledger_frame()
+
+    assert isinstance(frame['item_id'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(frame['timestamp'])
+    assert len(frame) == 6
+
+
+def test_monthly_matrix_matches_rollup(ledger):
+    matrix = usage_analytics.get_usage_matrix('roll', 'M')
+
+    assert list(usage_analytics.period_labels(matrix).columns) == ['2025-12', '2026-01']
+    assert matrix.loc['R1'].tolist() == [2.0, 3.0]
+    assert matrix.loc['R2'].tolist() == [0.0, 4.0]
+    assert matrix.loc['R1', pd.Period('2026-01', 'M')] == storage.get_monthly_usage_roll('R1', 2026, 1)
+    assert usage_analytics.get_usage_matrix('raw', 'M').loc['PE_A'].sum() == 7.0
+
+
+def test_range_fills_empty_periods(ledger):
+    matrix = usage_analytics.get_usage_matrix('cut', 'D', datetime(2026, 1, 20), datetime(2026, 1, 23))
+
+    assert usage_analytics.period_labels(matrix).columns.tolist() == ['2026-01-20', '2026-01-21', '2026-01-22']
+    assert matrix.loc['C1'].tolist() == [0.0, 1.0, 0.0]
+
+
+def test_parallel_path_matches_serial(ledger):
+    frame = usage_analytics.build_ledger_frame()
+    for freq in usage_analytics.FREQS:
+        serial = usage_analytics.usage_matrix(frame, freq, 'roll', parallel=False)
+        parallel = usage_analytics.usage_matrix(frame, freq, 'roll', parallel=True, workers=2)
+        pd.testing.assert_frame_equal(serial, parallel, check_dtype=False)
+
+
+def test_results_are_cached_until_ledger_changes(ledger):
+    usage_analytics.get_usage_matrix('roll', 'W')
+    hits = usage_analytics.analytics_cache.hits
+    usage_analytics.get_usage_matrix('roll', 'W')
+    assert usage_analytics.analytics_cache.hits == hits + 1
+
+    storage.record_roll_transaction('R3', -1)
+    assert 'R3' in usage_analytics.get_usage_matrix('roll', 'W').index
@@ -0,0 +1,181 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+from google.api_core import exceptions as gexc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import db_functions  # noqa: E402
+import firestore_bulk  # noqa: E402
+import firebase_db  # noqa: E402
+import firestore_mirror  # noqa: E402
+import storage  # noqa: E402
+import workflow_archive  # noqa: E402
+from fake_firestore import FakeFirestore, installed  # noqa: E402
+
+STATUSES = ['접수', '생산중', '납품완료']
+
+
+def jobs(n):
+    return pd.DataFrame([{
+        '작업ID': f'W-{i:03d}', '업체명': 'A', '제품규격': 's', '수량': 1, '단위': '장', '담당자': 'kim',
+        '상태': STATUSES[i % 3], '우선순위': '보통', '납기일': '2026-01-10', '메모': '', '등록일': '2026-01-05 00:00',
+    } for i in range(n)])
+
+
+def later(days):
+    return datetime.now() + timedelta(days=days)
+
+
+def read_archive(load, limit):
+    ids, after = [], None
+    while True:
+        page = load(limit, after)
+        ids += page['작업ID'].tolist()
+        after = workflow_archive.next_cursor(page, limit)
+        if after is None:
+            return ids
+
+
+@pytest.fixture
+def backend(backend):
+    storage.save_workflow(jobs(9))
+    return storage
+
+
+def test_load_workflow_by_status(backend):
+    active = backend.load_workflow(['접수', '생산중'])
+
+    assert sorted(active['작업ID']) == [f'W-{i:03d}' for i in range(9) if i % 3 != 2]
+    assert list(active.columns) == db_functions.WORKFLOW_COLUMNS
+    assert len(backend.load_workflow()) == 9
+
+
+def test_completed_jobs_move_to_archive_after_retention(backend):
+    backend.update_workflow_item('W-000', 상태='납품완료')
+
+    # 오늘 완료된 작업은 보관 기간 안이므로 남는다
+    assert workflow_archive.archive_completed() == 0
+    assert len(backend.load_workflow(['납품완료'])) == 4
+
+    assert workflow_archive.archive_completed(now=later(31)) == 4
+    assert backend.load_workflow(['납품완료']).empty
+    assert len(backend.load_workflow()) == 5
+    assert backend.workflow_archive_count() == 4
+
+    archived = backend.load_workflow_archive(10)
+    assert set(archived['완료일']) == {datetime.now().strftime("%Y-%m-%d")}
+    assert archived['작업ID'].tolist() == ['W-008', 'W-005', 'W-002', 'W-000']
+
+
+def test_reopened_job_is_not_archived(backend):
+    backend.update_workflow_item('W-002', 상태='납품완료')
+    backend.update_workflow_item('W-002', 상태='생산중')
+
+    workflow_archive.archive_completed(now=later(31))
+
+    assert 'W-002' in backend.load_workflow(['생산중'])['작업ID'].tolist()
+
+
+def test_archive_pages_and_delete(backend):
+    backend.save_workflow(jobs(30))
+    workflow_archive.archive_completed(now=later(31))
+
+    ids = read_archive(backend.load_workflow_archive, 3)
+    assert ids == sorted((f'W-{i:03d}' for i in range(30) if i % 3 == 2), reverse=True)
+
+    backend.delete_workflow_item('W-029')
+    assert backend.workflow_archive_count() == 9
+    assert 'W-029' not in backend.load_workflow_archive(10)['작업ID'].tolist()
+
+
+def test_maybe_archive_runs_once_a_day(backend):
+    now = later(31)
+    workflow_archive._last_run.clear()
+
+    assert workflow_archive.maybe_archive(now) == 3
+    backend.save_workflow(jobs(12).tail(1))
+    assert workflow_archive.maybe_archive(now) is None
+    assert workflow_archive.maybe_archive(now + timedelta(days=1)) == 1
+
+
+def test_firestore_status_query_and_archive(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+    client = FakeFirestore()
+    try:
+        with installed(client):
+            firebase_db.save_workflow(jobs(30))
+
+            client.reset_counters()
+            active = firebase_db.load_workflow(['접수', '생산중'])
+            assert len(active) == 20
+            assert client.reads == 20
+
+            firebase_db.update_workflow_item('W-000', 상태='납품완료')
+            # 완료일이 없는 완료 작업은 오늘 완료된 것으로 본다
+            assert firebase_db.archive_workflow(datetime.now().strftime("%Y-%m-%d")) == 0
+            assert firebase_db.archive_workflow(later(31).strftime("%Y-%m-%d")) == 11
+
+            assert len(firebase_db.load_workflow()) == 19
+            assert firebase_db.workflow_archive_count() == 11
+            ids = read_archive(firebase_db.load_workflow_archive, 4)
+            assert ids[0] == 'W-029' and len(ids) == 11
+
+            # 다시 저장해도 남아 있는 작업의 완료일은 유지
+            firebase_db.update_workflow_item('W-003', 상태='납품완료')
+            firebase_db.save_workflow(firebase_db.load_workflow().assign(메모='x'))
+            assert firebase_db.archive_workflow(later(31).strftime("%Y-%m-%d")) == 1
+    finally:
+        firestore_mirror.stop_all()
+
+
+def test_firestore_save_workflow_keeps_completion_date(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+    client = FakeFirestore()
+    try:
+        with installed(client):
+            firebase_db.save_workflow(jobs(3))
+            firebase_db.update_workflow_item('W-000', 상태='납품완료')
+
+            # 페이지에서 메모만 고쳐 저장해도 완료일(보관 기준)은 남는다
+            firebase_db.save_workflow(firebase_db.load_workflow().assign(메모='x'))
+
+            stored = client.collection('workflow').document('W-000').get().to_dict()
+            assert stored['메모'] == 'x'
+            assert stored['완료일'] == datetime.now().strftime("%Y-%m-%d")
+    finally:
+        firestore_mirror.stop_all()
+
+
+def test_firestore_failed_archive_write_keeps_originals(monkeypatch):
+    monkeypatch.setenv('INVENTORY_REALTIME', '0')
+    client = FakeFirestore()
+    try:
+        with installed(client):
+            firebase_db.save_workflow(jobs(9))
+            firebase_db.archive_workflow(datetime.now().strftime("%Y-%m-%d"))
+
+            def fail_archive_batch():
+                batch = FakeFirestore.batch(client)
+                commit = batch.commit
+
+                def flaky_commit():
+                    if any(ref.collection_name == 'workflow_archive' for _, ref, _, _ in batch._ops):
+                        raise gexc.PermissionDenied('denied')
+                    return commit()
+                batch.commit = flaky_commit
+                return batch
+
+            monkeypatch.setattr(client, 'batch', fail_archive_batch)
+            with pytest.raises(firestore_bulk.BulkWriteError):
+                firebase_db.archive_workflow(later(31).strftime("%Y-%m-%d"))
+            assert len(firebase_db.load_workflow(['납품완료'])) == 3
+
+            # 다시 실행하면 옮긴다
+            monkeypatch.delattr(client, 'batch')
+            assert firebase_db.archive_workflow(later(31).strftime("%Y-%m-%d")) == 3
+    finally:
+        firestore_mirror.stop_all()
@@ -0,0 +1,172 @@
+# 사용량 분석
+"""
+전체 품목의 일/주/월별 사용량(출고)을 한 번에 계산한다.
+
+get_monthly_usage_*는 품목×월마다 조회해야 하므로, 거래 기록(보관 파일 포함)을 한 번 읽어
+열 지향 프레임(범주형 품목ID, datetime64 시각, float 변화량)으로 만든 뒤
+groupby 한 번으로 품목×기간 사용량 행렬을 만든다.
+
+- 결과는 거래 기록이 바뀔 때까지(usage_monthly 캐시 버전) 또는 INVENTORY_ANALYTICS_TTL초(기본 600) 동안 캐시
+- 거래 기록이 PARALLEL_MIN_ROWS행 이상이고 여러 해에 걸치면 연도별로 나눠 프로세스 풀에서 계산
+  (작업 프로세스 수: INVENTORY_ANALYTICS_WORKERS, 기본 CPU 수)
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+from functools import reduce
+
+import pandas as pd
+
+import ledger_archive
+import storage
+from data_cache import DataCache, cache
+
+FREQS = {'D': '일별', 'W': '주별', 'M': '월별'}
+ITEM_TYPES = {'roll': '롤', 'cut': '재단', 'raw': '원료'}
+FRAME_COLUMNS = ['item_type', 'item_id', 'delta', 'timestamp']
+PARALLEL_MIN_ROWS = 1_000_000
+DEFAULT_WORKERS = int(os.environ.get('INVENTORY_ANALYTICS_WORKERS', '0')) or None
+
+analytics_cache = DataCache(max_entries=16, ttl=float(os.environ.get('INVENTORY_ANALYTICS_TTL', '600')))
+
+
+# ==================== 열 지향 거래 프레임 ====================
+
+def _columnar(item_type, item_id, delta, timestamp):
+    return pd.DataFrame({
+        'item_type': pd.Categorical(item_type, categories=list(ITEM_TYPES)),
+        'item_id': pd.Series(item_id, dtype=str).astype('category'),
+        'delta': pd.to_numeric(delta, errors='coerce').astype('float64'),
+        'timestamp': pd.to_datetime(timestamp, errors='coerce', format='mixed'),
+    })
+
+
+def build_ledger_frame(start=None, end=None):
+    """
+    거래 기록(transactions + raw_material_transactions, 보관 파일 포함)을 열 지향 프레임으로 읽기
+
+    원료 기록은 월별 사용량 집계와 같게 '날짜'(입출고일) 기준으로 둔다.
+    기록 시각과 입출고일이 다를 수 있으므로 앞뒤 31일을 더 읽은 뒤 날짜로 다시 자른다.
+
+    Returns:
+        DataFrame: item_type(category), item_id(category), delta(float64), timestamp(datetime64)
+    """
+    tx = ledger_archive.load_history('transactions', start, end)
+    margin = timedelta(days=31)
+    raw = ledger_archive.load_history('raw_material_transactions',
+                                      start - margin if start is not None else None,
+                                      end + margin if end is not None else None)
+
+    frames = []
+    if not tx.empty:
+        frames.append(pd.DataFrame({
+            'item_type': tx['item_type'], 'item_id': tx['item_id'].astype(str),
+            'delta': tx['delta'], 'timestamp': tx['timestamp'],
+        }))
+    if not raw.empty:
+        frames.append(pd.DataFrame({
+            'item_type': 'raw', 'item_id': raw['품명'].astype(str) + '_' + raw['Grade'].astype(str),
+            'delta': raw['수량변경'], 'timestamp': raw['날짜'],
+        }))
+    if not frames:
+        return _columnar([], [], [], [])
+
+    merged = pd.concat(frames, ignore_index=True)
+    df = _columnar(merged['item_type'], merged['item_id'], merged['delta'], merged['timestamp'])
+    df = df.dropna(subset=['delta', 'timestamp'])
+    if start is not None:
+        df = df[df['timestamp'] >= start]
+    if end is not None:
+        df = df[df['timestamp'] < end]
+    return df.sort_values('timestamp', kind='stable').reset_index(drop=True)
+
+
+# ==================== 사용량 행렬 ====================
+
+def _matrix_part(df, freq):
+    """출고 행만 받은 프레임 -> 품목×기간 사용량 (프로세스 풀에서도 호출)"""
+    periods = df['timestamp'].dt.to_period(freq).rename('period')
+    usage = (-df['delta']).groupby([df['item_id'], periods], observed=True).sum()
+    return usage.unstack(fill_value=0.0)
+
+
+def _fill_periods(matrix, freq, start=None, end=None):
+    """사용량이 없는 기간도 0으로 채워 연속된 기간 컬럼으로 맞춤"""
+    if matrix.empty:
+        return matrix
+    first = matrix.columns.min() if start is None else pd.Period(start, freq)
+    last = matrix.columns.max() if end is None else pd.Period(end - timedelta(microseconds=1), freq)
+    columns = pd.period_range(first, last, freq=freq, name='period')
+    return matrix.reindex(columns=columns, fill_value=0.0)
+
+
+def usage_matrix(frame, freq='M', item_type=None, workers=None, parallel=None):
+    """
+    품목×기간 사용량(출고량 합계) 행렬
+
+    Args:
+        frame: build_ledger_frame 결과
+        freq: 'D'(일) / 'W'(주) / 'M'(월)
+        item_type: 'roll' / 'cut' / 'raw' (없으면 전체)
+        parallel: True/False로 강제 (None이면 행 수와 기간으로 결정)
+
+    Returns:
+        DataFrame: index=item_id, columns=PeriodIndex, 값=사용량
+    """
+    if freq not in FREQS:
+        raise ValueError(f"지원하지 않는 기간: {freq} (가능: {', '.join(FREQS)})")
+
+    out = frame[frame['delta'] < 0]
+    if item_type is not None:
+        out = out[out['item_type'] == item_type]
+    if out.empty:
+        return pd.DataFrame(index=pd.Index([], name='item_id'))
+
+    years = out['timestamp'].dt.year
+    if parallel is None:
+        parallel = len(out) >= PARALLEL_MIN_ROWS and years.nunique() > 1
+    if parallel:
+        matrix = _parallel_matrix(out, years, freq, workers)
+    else:
+        matrix = _matrix_part(out, freq)
+
+    matrix = matrix.loc[matrix.sum(axis=1) > 0]
+    matrix.index = matrix.index.astype(str)
+    matrix.index.name = 'item_id'
+    return _fill_periods(matrix.sort_index(), freq)
+
+
+def _parallel_matrix(out, years, freq, workers=None):
+    """연도별로 나눠 프로세스 풀에서 계산 후 합산 (주 단위는 해를 걸치므로 더해서 합친다)"""
+    parts = [part for _, part in out.groupby(years)]
+    with ProcessPoolExecutor(max_workers=min(workers or DEFAULT_WORKERS or os.cpu_count() or 1, len(parts))) as pool:
+        results = list(pool.map(_matrix_part, parts, [freq] * len(parts)))
+    return reduce(lambda a, b: a.add(b, fill_value=0.0), results).fillna(0.0)
+
+
+# ==================== 캐시 ====================
+
+def cache_key(*parts):
+    # 거래 기록 쓰기는 usage_monthly 버전을 올리므로 버전이 바뀌면 새로 계산된다
+    return (storage.cache_scope(), cache.version('usage_monthly')) + parts
+
+
+def ledger_frame(start=None, end=None):
+    """build_ledger_frame 캐시 버전"""
+    return analytics_cache.get_or_load('ledger', cache_key('frame', start, end),
+                                       lambda: build_ledger_frame(start, end))
+
+
+def get_usage_matrix(item_type=None, freq='M', start=None, end=None):
+    """[start, end) 구간의 품목×기간 사용량 행렬 (캐시)"""
+    def compute():
+        matrix = usage_matrix(ledger_frame(start, end), freq, item_type)
+        return _fill_periods(matrix, freq, start, end)
+    return analytics_cache.get_or_load('matrix', cache_key('matrix', item_type, freq, start, end), compute)
+
+
+def period_labels(matrix):
+    """표시용: Period 컬럼을 문자열로 (주는 시작일)"""
+    if isinstance(matrix.columns, pd.PeriodIndex) and matrix.columns.freqstr.startswith('W'):
+        return matrix.rename(columns=lambda p: p.start_time.strftime("%Y-%m-%d"))
+    return matrix.rename(columns=str)
@@ -0,0 +1,82 @@
+# 완료 작업 보관
+"""
+작업 플로우는 등록된 작업이 계속 쌓이므로, 납품완료 후 보관 기간이 지난 작업을
+보관 테이블/컬렉션(workflow_archive)으로 옮겨 운영 작업 목록(칸반, 상태 변경)을 작게 유지한다.
+
+- 보관 기준: 완료일(납품완료로 바뀐 날)이 INVENTORY_WORKFLOW_RETENTION_DAYS(기본 30)일보다 이전인 작업
+- 앱은 작업 목록을 읽을 때 프로세스당 하루 한 번 자동으로 보관한다 (maybe_archive)
+- 보관된 작업은 "완료된 작업 보기"에서 완료일 최신순으로 페이지 단위로 본다
+
+    python workflow_archive.py            # 기준보다 오래된 완료 작업 보관
+    python workflow_archive.py --days 7
+"""
+import argparse
+import os
+import threading
+from datetime import datetime, timedelta
+
+import storage
+
+DEFAULT_RETENTION_DAYS = 30
+
+_lock = threading.Lock()
+_last_run = {}   # 캐시 구분(저장소) -> 마지막 자동 보관 날짜
+
+
+def retention_days():
+    return int(os.environ.get('INVENTORY_WORKFLOW_RETENTION_DAYS', DEFAULT_RETENTION_DAYS))
+
+
+def cutoff(now=None, days=None):
+    """보관 기준 날짜 'YYYY-MM-DD': 완료일이 이 날짜 이전인 작업이 보관 대상"""
+    now = now or datetime.now()
+    days = retention_days() if days is None else days
+    return (now - timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def archive_completed(now=None, days=None):
+    """보관 기간이 지난 완료 작업을 보관 저장소로 옮긴다 (옮긴 작업 수)"""
+    return storage.archive_workflow(cutoff(now, days))
+
+
+def maybe_archive(now=None):
+    """
+    오늘 아직 보관하지 않았으면 보관 실행 (저장소별 하루 한 번)
+
+    Returns:
+        int 또는 None: 옮긴 작업 수 (이미 실행했으면 None)
+    """
+    today = (now or datetime.now()).date()
+    scope = storage.cache_scope()
+    with _lock:
+        if _last_run.get(scope) == today:
+            return None
+        _last_run[scope] = today
+    try:
+        return archive_completed(now)
+    except Exception as e:
+        # 보관은 다음 날 다시 시도한다 (작업 목록 조회는 계속)
+        print(f"완료 작업 보관 오류: {e}")
+        return None
+
+
+def next_cursor(page, limit):
+    """보관 작업 페이지의 다음 커서 (완료일, 작업ID). 마지막 페이지면 None"""
+    if len(page) < limit:
+        return None
+    last = page.iloc[-1]
+    return last['완료일'], last['작업ID']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="보관 기간이 지난 완료 작업을 workflow_archive로 옮긴다")
+    parser.add_argument('--days', type=int, default=None,
+                        help=f"보관 기간(일, 기본 INVENTORY_WORKFLOW_RETENTION_DAYS 또는 {DEFAULT_RETENTION_DAYS})")
+    args = parser.parse_args(argv)
+
+    moved = archive_completed(days=args.days)
+    print(f"{cutoff(days=args.days)} 이전에 완료된 작업 {moved}건 보관")
+
+
+if __name__ == '__main__':
+    main()